@@ -1,107 +1,14 @@
-import csv
+import argparse
 import json
-import os
-import re
+import time
 from pathlib import Path
 
-# Define the service markers
-SERVICES = ["ARMY", "ROYAL NAVY", "ROYAL AIR FORCE", "ROYAL  NAVY", "ROYAL NAYY", "*ARMY"]
-# Normalize service names
-SERVICE_NORMALIZE = {
-    "ARMY": "Army",
-    "*ARMY": "Army",
-    "ROYAL NAVY": "Royal Navy",
-    "ROYAL  NAVY": "Royal Navy",
-    "ROYAL NAYY": "Royal Navy",
-    "ROYAL AIR FORCE": "Royal Air Force"
-}
+from afm_dataset import (build_wall_slice, entry_offsets, join_slices, sha256_bytes,
+                         sha256_file, write_bytes_atomic, write_json_atomic)
+from afm_panels import (iter_wall_entries, list_wall_csvs, parse_walls, read_wall_panels,
+                        resolve_jobs)
 
-def is_service_marker(text):
-    """Check if the text is a service marker."""
-    if not text or not isinstance(text, str):
-        return False
-    text = text.strip()
-    return text in SERVICES
-
-def is_date_marker(text):
-    """Check if the text is a date marker (4-digit year)."""
-    if not text or not isinstance(text, str):
-        return False
-    text = text.strip()
-    # Check if it's a 4-digit year between 1940-2030
-    if re.match(r'^\d{4}$', text):
-        year = int(text)
-        if 1940 <= year <= 2030:
-            return True
-    return False
-
-def is_panel_number(text):
-    """Check if the text is a panel number (first row)."""
-    if not text or not isinstance(text, str):
-        return False
-    text = text.strip()
-    # Panel numbers are 1-77 or higher
-    if re.match(r'^\d{1,3}$', text):
-        num = int(text)
-        if 1 <= num <= 300:  # Allow up to 300 panels
-            return True
-    return False
-
-def is_name(text):
-    """Check if the text appears to be a person's name."""
-    if not text or not isinstance(text, str):
-        return False
-    
-    text = text.strip()
-    
-    # Skip empty strings
-    if not text:
-        return False
-    
-    # Skip service markers
-    if is_service_marker(text):
-        return False
-    
-    # Skip date markers
-    if is_date_marker(text):
-        return False
-    
-    # Skip panel numbers
-    if is_panel_number(text):
-        return False
-    
-    # Names typically have at least 2 characters
-    if len(text) < 2:
-        return False
-    
-    # Names should contain at least one letter
-    if not re.search(r'[A-Za-z]', text):
-        return False
-    
-    return True
-
-def calculate_panel_location(position, total_names):
-    """
-    Calculate if a name is in the top, middle, or bottom third of the panel.
-    
-    Args:
-        position: The position of the name (0-indexed)
-        total_names: Total number of names in the panel
-    
-    Returns:
-        'Top', 'Middle', or 'Bottom'
-    """
-    if total_names == 0:
-        return 'Top'
-    
-    third = total_names / 3.0
-    
-    if position < third:
-        return 'Top'
-    elif position < 2 * third:
-        return 'Middle'
-    else:
-        return 'Bottom'
+MANIFEST_VERSION = 1
 
 def process_csv_file(filepath):
     """
@@ -113,154 +20,209 @@ def process_csv_file(filepath):
     Returns:
         List of memorial entries
     """
-    entries = []
-    
-    # Read the CSV file
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        rows = list(reader)
-    
-    if not rows:
-        return entries
-    
-    # First row contains panel numbers
-    panel_numbers = []
-    for cell in rows[0]:
-        if is_panel_number(cell):
-            panel_numbers.append(int(cell.strip()))
-        else:
-            panel_numbers.append(None)
-    
-    # Track current service and date (persist across columns)
-    current_service = None
-    current_date = None
-    
-    # Process each column (panel)
-    num_columns = len(panel_numbers)
-    
-    for col_idx in range(num_columns):
-        panel_num = panel_numbers[col_idx]
-        
-        # Skip if no valid panel number
-        if panel_num is None:
-            continue
-        
-        # First pass: collect all names in this column to count them
-        column_names = []
-        temp_service = current_service
-        temp_date = current_date
-        
-        for row_idx in range(1, len(rows)):  # Skip first row (panel numbers)
-            if col_idx >= len(rows[row_idx]):
-                continue
-            
-            cell = rows[row_idx][col_idx].strip()
-            
-            # Check for service marker
-            if is_service_marker(cell):
-                temp_service = SERVICE_NORMALIZE.get(cell, cell)
-                continue
-            
-            # Check for date marker
-            if is_date_marker(cell):
-                temp_date = int(cell)
-                continue
-            
-            # Check if it's a name
-            if is_name(cell):
-                column_names.append({
-                    'name': cell,
-                    'service': temp_service,
-                    'date': temp_date
-                })
-        
-        # Update the persistent service and date after processing this column
-        current_service = temp_service
-        current_date = temp_date
-        
-        # Second pass: assign panel locations based on position
-        total_names = len(column_names)
-        
-        for position, name_data in enumerate(column_names):
-            panel_loc = calculate_panel_location(position, total_names)
-            
-            entry = {
-                'name': name_data['name'],
-                'service': name_data['service'],
-                'date': name_data['date'],
-                'panel': panel_num,
-                'panel_Loc': panel_loc,
-                'panel_number': position + 1  # 1-indexed position on the panel
-            }
-            entries.append(entry)
-    
-    return entries
+    return list(iter_wall_entries(filepath))
 
-def process_all_csv_files(directory):
+def load_manifest(manifest_file):
     """
-    Process all CSV files in the AFM-Panels directory.
+    Load the ingest manifest written by a previous run.
     
     Args:
-        directory: Path to the directory containing CSV files
+        manifest_file: Path to the manifest JSON file
     
     Returns:
-        List of all memorial entries
+        The manifest dict, or None if it is missing or from another version
     """
-    all_entries = []
-    
-    # Get all CSV files in the directory
-    csv_files = sorted(Path(directory).glob('*.csv'))
-    
-    print(f"Found {len(csv_files)} CSV file(s) to process...")
-    
-    for csv_file in csv_files:
-        print(f"Processing {csv_file.name}...")
-        entries = process_csv_file(csv_file)
-        all_entries.extend(entries)
-        print(f"  Found {len(entries)} entries")
-    
-    return all_entries
+    if not manifest_file.exists():
+        return None
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
 
-def main():
-    # Define paths
-    script_dir = Path(__file__).parent
-    data_dir = script_dir.parent / 'data' / 'AFM-Panels'
-    output_file = script_dir.parent / 'data' / 'afm-memorials.json'
+def index_existing_walls(raw, wall_ranges):
+    """
+    Find the byte slice each wall occupies in an existing afm-memorials.json.
     
-    print("="*60)
-    print("AFM Names CSV to JSON Converter")
-    print("="*60)
-    print(f"Input directory: {data_dir}")
-    print(f"Output file: {output_file}")
-    print()
+    Args:
+        raw: Contents of afm-memorials.json as bytes
+        wall_ranges: Dict of wall name -> (first_panel, last_panel)
     
-    # Load existing data from JSON file if it exists
-    existing_entries = []
-    if output_file.exists():
-        print(f"Loading existing data from {output_file}...")
-        with open(output_file, 'r', encoding='utf-8') as f:
-            existing_entries = json.load(f)
-        print(f"Found {len(existing_entries)} existing entries")
-        print()
+    Returns:
+        Dict of wall name -> {'offset': [start, end], 'entries': count}
     
-    # Process all CSV files
-    new_entries = process_all_csv_files(data_dir)
+    Raises:
+        ValueError: If an entry belongs to no wall or a wall's entries are
+            not stored contiguously
+    """
+    entries = json.loads(raw)
+    offsets = entry_offsets(raw)
+    if len(offsets) != len(entries):
+        raise ValueError("Could not locate every entry in the existing file")
+    
+    panel_to_wall = {}
+    for wall, (first, last) in wall_ranges.items():
+        for panel in range(first, last + 1):
+            panel_to_wall[panel] = wall
+    
+    walls = {}
+    current_wall = None
+    for index, entry in enumerate(entries):
+        wall = panel_to_wall.get(entry.get('panel'))
+        if wall is None:
+            raise ValueError(f"Entry {index} (panel {entry.get('panel')}) does not belong to any wall CSV")
+        if wall != current_wall:
+            if wall in walls:
+                raise ValueError(f"Entries for wall {wall} are not stored contiguously")
+            walls[wall] = {'offset': [offsets[index][0], offsets[index][1]], 'entries': 0}
+            current_wall = wall
+        walls[wall]['offset'][1] = offsets[index][1]
+        walls[wall]['entries'] += 1
+    
+    return walls
+
+def ingest(csv_dir, output_file, manifest_file, full=False, jobs=1):
+    """
+    Bring afm-memorials.json up to date with the wall CSVs.
     
-    print()
-    print(f"New entries found: {len(new_entries)}")
+    Each wall CSV's content hash and the byte slice its entries occupy in the
+    output are kept in a manifest. Walls whose CSV is unchanged are copied
+    across byte-for-byte without being parsed; only changed or new walls are
+    parsed and serialized, and their slice is replaced in place.
     
-    # Combine existing and new entries
-    all_entries = existing_entries + new_entries
-    print(f"Total entries after merge: {len(all_entries)}")
+    The first run without a manifest adopts the existing output file as up to
+    date with the current CSVs, so fixes applied by the other scripts are kept.
     
-    # Write to JSON file
-    print(f"\nWriting to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_entries, f, indent=2, ensure_ascii=False)
+    Args:
+        csv_dir: Directory containing the wall CSVs
+        output_file: Path to afm-memorials.json
+        manifest_file: Path to the ingest manifest
+        full: Re-parse every wall and rewrite the whole file
+        jobs: Number of worker processes used to parse and serialize changed
+            walls (0 uses one per CPU)
     
-    print("Done!")
+    Returns:
+        Dict with 'changed', 'unchanged' and 'removed' wall lists, the
+        'entries' produced for changed walls, per-wall build 'timings' in
+        seconds and whether the file was 'written'
+    """
+    csv_files = list_wall_csvs(csv_dir)
+    csv_hashes = {csv_file.stem: sha256_file(csv_file) for csv_file in csv_files}
+    
+    manifest = None if full else load_manifest(manifest_file)
+    raw = output_file.read_bytes() if output_file.exists() and not full else None
+    walls = dict(manifest['walls']) if manifest else {}
+    
+    # The fix-up scripts rewrite afm-memorials.json, which moves every slice.
+    # Re-locate the walls from the file itself when it no longer matches.
+    reindexed = raw is not None and (manifest is None or manifest.get('output_sha256') != sha256_bytes(raw))
+    if reindexed:
+        wall_ranges = {}
+        for csv_file in csv_files:
+            record = walls.get(csv_file.stem)
+            if record:
+                wall_ranges[csv_file.stem] = tuple(record['panels'])
+            else:
+                panels = read_wall_panels(csv_file)
+                if panels:
+                    wall_ranges[csv_file.stem] = (min(panels), max(panels))
+        located = index_existing_walls(raw, wall_ranges)
+        for wall, first_last in wall_ranges.items():
+            record = walls.get(wall)
+            if record is None:
+                if wall not in located:
+                    # A wall that was never ingested is parsed below
+                    continue
+                record = {
+                    'csv': f"{wall}.csv",
+                    'sha256': csv_hashes[wall],
+                    'panels': list(first_last),
+                }
+            record = dict(record, **located.get(wall, {'offset': None, 'entries': 0}))
+            walls[wall] = record
+    elif raw is None:
+        walls = {}
+    
+    changed = []
+    unchanged = []
+    new_entries = []
+    timings = {}
+    slices = {}
+    to_parse = []
     
-    # Print some statistics
+    for csv_file in csv_files:
+        wall = csv_file.stem
+        record = walls.get(wall)
+        if record and record['sha256'] == csv_hashes[wall]:
+            offset = record.get('offset')
+            slices[wall] = raw[offset[0]:offset[1]] if offset else b''
+            unchanged.append(wall)
+        else:
+            to_parse.append(csv_file)
+    
+    for csv_file, (entries, data, seconds) in parse_walls(to_parse, jobs, build_wall_slice):
+        wall = csv_file.stem
+        timings[wall] = seconds
+        new_entries.extend(entries)
+        slices[wall] = data
+        if entries:
+            panels = [entries[0]['panel'], entries[-1]['panel']]
+        else:
+            header_panels = read_wall_panels(csv_file) or [0]
+            panels = [min(header_panels), max(header_panels)]
+        walls[wall] = {
+            'csv': csv_file.name,
+            'sha256': csv_hashes[wall],
+            'panels': panels,
+            'entries': len(entries),
+        }
+        changed.append(wall)
+    
+    removed = sorted(wall for wall in walls if wall not in csv_hashes)
+    for wall in removed:
+        del walls[wall]
+    
+    result = {
+        'changed': changed,
+        'unchanged': unchanged,
+        'removed': removed,
+        'entries': new_entries,
+        'timings': timings,
+        'written': False,
+    }
+    
+    order = sorted(walls, key=lambda wall: walls[wall]['panels'][0])
+    
+    if not changed and not removed and raw is not None:
+        output = raw
+        if not reindexed:
+            return result
+    else:
+        # Reassemble in panel order, recording where each slice lands
+        position = 2  # len(b'[\n')
+        for wall in order:
+            data = slices[wall]
+            if data:
+                walls[wall]['offset'] = [position, position + len(data)]
+                position += len(data) + 2  # len(b',\n')
+            else:
+                walls[wall]['offset'] = None
+        
+        output = join_slices(slices[wall] for wall in order)
+        write_bytes_atomic(output_file, output)
+        result['written'] = True
+    
+    write_json_atomic(manifest_file, {
+        'version': MANIFEST_VERSION,
+        'output': output_file.name,
+        'output_sha256': sha256_bytes(output),
+        'walls': {wall: walls[wall] for wall in order},
+    })
+    
+    return result
+
+def print_statistics(all_entries):
+    """Print service, date, location and panel statistics for the entries."""
     print("\n" + "="*60)
     print("Statistics:")
     print("="*60)
@@ -309,5 +271,68 @@ def main():
     for i, entry in enumerate(all_entries[:5]):
         print(f"\n{i+1}. {json.dumps(entry, indent=2)}")
 
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert the AFM wall CSVs into data/afm-memorials.json.'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Re-parse every wall CSV and rewrite the whole file '
+             '(default: only walls whose CSV changed since the last run)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes used to build the wall CSVs '
+             '(default: 1, 0 = one per CPU)'
+    )
+    args = parser.parse_args()
+    
+    # Define paths
+    script_dir = Path(__file__).parent
+    data_dir = script_dir.parent / 'data' / 'AFM-Panels'
+    output_file = script_dir.parent / 'data' / 'afm-memorials.json'
+    manifest_file = script_dir.parent / 'data' / 'afm-ingest-manifest.json'
+    
+    print("="*60)
+    print("AFM Names CSV to JSON Converter")
+    print("="*60)
+    print(f"Input directory: {data_dir}")
+    print(f"Output file: {output_file}")
+    print(f"Manifest: {manifest_file}")
+    print(f"Mode: {'full rebuild' if args.full else 'incremental'}")
+    print(f"Workers: {resolve_jobs(args.jobs)}")
+    print()
+    
+    start = time.perf_counter()
+    result = ingest(data_dir, output_file, manifest_file, full=args.full, jobs=args.jobs)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    for wall in result['unchanged']:
+        print(f"  {wall}: unchanged, skipped")
+    for wall in result['changed']:
+        print(f"  {wall}: rebuilt and replaced ({result['timings'][wall] * 1000:.1f} ms)")
+    for wall in result['removed']:
+        print(f"  {wall}: CSV removed, entries dropped")
+    
+    print()
+    if result['timings']:
+        build_ms = sum(result['timings'].values()) * 1000
+        print(f"Build time summed over walls: {build_ms:.1f} ms")
+        # Share of the workers' wall-clock time spent building walls (not a speedup)
+        workers = min(resolve_jobs(args.jobs), len(result['timings']))
+        print(f"Worker utilisation: {100 * build_ms / (elapsed_ms * workers):.0f}% of {workers} worker(s)")
+    if result['written']:
+        print(f"Updated {output_file.name} in {elapsed_ms:.1f} ms")
+    else:
+        print(f"Nothing to do ({elapsed_ms:.1f} ms)")
+    
+    if not result['entries']:
+        return
+    
+    print_statistics(result['entries'])
+
 if __name__ == '__main__':
     main()
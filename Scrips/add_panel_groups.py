@@ -1,41 +1,21 @@
 import json
 from pathlib import Path
 
+from panel_registry import registry
+
 def get_panel_group(panel_number):
     """
     Determine which group a panel belongs to based on the panel number.
     
+    The ranges are defined in data/afm-panel-registry.json (see panel_registry.py).
+    
     Args:
         panel_number: The panel number
     
     Returns:
         Group letter (A-I) or None if outside known ranges
     """
-    if panel_number is None:
-        return None
-    
-    panel = int(panel_number)
-    
-    if 1 <= panel <= 77:
-        return 'A'
-    elif 78 <= panel <= 118:
-        return 'B'
-    elif 119 <= panel <= 134:
-        return 'C'
-    elif 135 <= panel <= 150:
-        return 'D'
-    elif 151 <= panel <= 166:
-        return 'E'
-    elif 167 <= panel <= 182:
-        return 'F'
-    elif 183 <= panel <= 205:
-        return 'G'
-    elif 207 <= panel <= 223:  # Note: 206 is not assigned to any group
-        return 'H'
-    elif 224 <= panel <= 230:
-        return 'I'
-    else:
-        return None  # Panel outside defined ranges
+    return registry().wall(panel_number)
 
 def main():
     # Define paths
@@ -47,15 +27,8 @@ def main():
     print("AFM Panel Groups Assignment")
     print("="*80)
     print("\nPanel Group Ranges:")
-    print("  Group A: Panels 1-77")
-    print("  Group B: Panels 78-118")
-    print("  Group C: Panels 119-134")
-    print("  Group D: Panels 135-150")
-    print("  Group E: Panels 151-166")
-    print("  Group F: Panels 167-182")
-    print("  Group G: Panels 183-205")
-    print("  Group H: Panels 207-223")
-    print("  Group I: Panels 224-230")
+    for group, first, last in registry().wall_ranges():
+        print(f"  Group {group}: Panels {first}-{last}")
     print()
     
     # Load the JSON data
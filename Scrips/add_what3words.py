@@ -1,48 +1,21 @@
 import json
 from pathlib import Path
 
+from panel_registry import registry
+
 def get_what3words_code(panel_number):
     """
     Get the what3words code for a panel number based on defined ranges.
     
+    The ranges are defined in data/afm-panel-registry.json (see panel_registry.py).
+    
     Args:
         panel_number: The panel number
     
     Returns:
         what3words code string or None if not defined
     """
-    if panel_number is None:
-        return None
-    
-    panel = int(panel_number)
-    
-    # Define the what3words mapping for each panel range
-    w3w_ranges = [
-        (1, 5, "///woke.fastening.rinses"),
-        (6, 10, "///timeless.craziest.tasteful"),
-        (11, 15, "///doll.caravans.begun"),
-        (16, 20, "///vandalism.angle.copiers"),
-        (21, 25, "///ripe.decorated.risk"),
-        (26, 30, "///quaking.public.ranted"),
-        (31, 35, "///wrenching.directors.aliens"),
-        (36, 40, "///icon.scrubbing.survey"),
-        (41, 45, "///coil.initial.gourmet"),
-        (46, 49, "///outer.simulator.harder"),
-        (50, 53, "///salaried.waddled.clashes"),
-        (54, 57, "///condiment.irrigate.exhales"),
-        (58, 61, "///marathons.crispier.crystal"),
-        (62, 65, "///talkative.term.universes"),
-        (66, 69, "///feasted.residual.stitch"),
-        (70, 73, "///rosier.landscape.minds"),
-        (74, 77, "///upgrading.revolting.belong"),
-    ]
-    
-    # Find the matching range
-    for start, end, code in w3w_ranges:
-        if start <= panel <= end:
-            return code
-    
-    return None  # Panel outside defined ranges
+    return registry().what3words_code(panel_number)
 
 def main():
     # Define paths
@@ -54,23 +27,8 @@ def main():
     print("AFM what3words Assignment")
     print("="*80)
     print("\nwhat3words Coverage:")
-    print("  Panels 1-5:    ///woke.fastening.rinses")
-    print("  Panels 6-10:   ///timeless.craziest.tasteful")
-    print("  Panels 11-15:  ///doll.caravans.begun")
-    print("  Panels 16-20:  ///vandalism.angle.copiers")
-    print("  Panels 21-25:  ///ripe.decorated.risk")
-    print("  Panels 26-30:  ///quaking.public.ranted")
-    print("  Panels 31-35:  ///wrenching.directors.aliens")
-    print("  Panels 36-40:  ///icon.scrubbing.survey")
-    print("  Panels 41-45:  ///coil.initial.gourmet")
-    print("  Panels 46-49:  ///outer.simulator.harder")
-    print("  Panels 50-53:  ///salaried.waddled.clashes")
-    print("  Panels 54-57:  ///condiment.irrigate.exhales")
-    print("  Panels 58-61:  ///marathons.crispier.crystal")
-    print("  Panels 62-65:  ///talkative.term.universes")
-    print("  Panels 66-69:  ///feasted.residual.stitch")
-    print("  Panels 70-73:  ///rosier.landscape.minds")
-    print("  Panels 74-77:  ///upgrading.revolting.belong")
+    for r in registry().what3words.ranges:
+        print(f"  {'Panels ' + str(r['first']) + '-' + str(r['last']) + ':':<15}{r['code']}")
     print()
     
     # Load the JSON data
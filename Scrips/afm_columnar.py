@@ -0,0 +1,287 @@
+"""
+Compact columnar encoding for data/afm-memorials.json.
+
+The row format repeats every key and most values ~16k times. This encoding
+stores one column per field instead:
+
+  name          all names joined into a single "\\n"-separated string table
+  panel, date   run-length encoded values:            [value, run, value, run, ...]
+  panel_number  run-length encoded deltas from the previous value
+  other fields  (service, panel_Loc, panel_group, ...) dictionary encoded as
+                small integers, then run-length encoded: [code, run, ...]
+
+Column encodings:
+  {"type": "strings", "data": "..."}
+  {"type": "rle", "runs": [...]}
+  {"type": "delta", "first": n, "runs": [...]}
+  {"type": "dict", "values": [...], "runs": [...]}
+
+Every record must have the same keys in the same order. decode() returns
+exactly the records that were passed to encode().
+
+Usage:
+  python Scrips/afm_columnar.py    writes data/afm-memorials.columns.json
+"""
+
+import json
+import time
+from pathlib import Path
+
+from afm_dataset import write_json_atomic
+
+FORMAT_VERSION = 1
+
+# Columns with a dedicated encoding; anything else is dictionary encoded
+STRING_COLUMNS = ('name',)
+RLE_COLUMNS = ('panel', 'date')
+DELTA_COLUMNS = ('panel_number',)
+
+NAME_SEPARATOR = '\n'
+
+
+def run_length_encode(values):
+    """
+    Run-length encode a sequence.
+
+    Args:
+        values: Sequence of JSON scalars
+
+    Returns:
+        Flat list [value, run_length, value, run_length, ...]
+    """
+    runs = []
+    previous = None
+    count = 0
+    for value in values:
+        # Compare type too so 1, 1.0 and True never share a run
+        if count and value == previous and type(value) is type(previous):
+            count += 1
+            continue
+        if count:
+            runs.append(previous)
+            runs.append(count)
+        previous = value
+        count = 1
+    if count:
+        runs.append(previous)
+        runs.append(count)
+    return runs
+
+
+def run_length_decode(runs):
+    """Expand a flat [value, run_length, ...] list."""
+    values = []
+    for i in range(0, len(runs), 2):
+        values.extend([runs[i]] * runs[i + 1])
+    return values
+
+
+def _encode_strings(values):
+    for value in values:
+        if not isinstance(value, str) or NAME_SEPARATOR in value:
+            return None
+    return {'type': 'strings', 'data': NAME_SEPARATOR.join(values)}
+
+
+def _encode_delta(values):
+    if not values or not all(type(value) is int for value in values):
+        return None
+    deltas = [b - a for a, b in zip(values, values[1:])]
+    return {'type': 'delta', 'first': values[0], 'runs': run_length_encode(deltas)}
+
+
+def _encode_dict(values):
+    codes = []
+    lookup = {}
+    table = []
+    for value in values:
+        key = (type(value), value)
+        code = lookup.get(key)
+        if code is None:
+            code = lookup[key] = len(table)
+            table.append(value)
+        codes.append(code)
+    return {'type': 'dict', 'values': table, 'runs': run_length_encode(codes)}
+
+
+def encode_column(field, values):
+    """
+    Encode one column, choosing the encoding by field name.
+
+    Falls back to dictionary encoding when a column does not suit its
+    preferred encoding (e.g. a name containing a newline, or a null
+    panel_number).
+
+    Args:
+        field: The field name
+        values: List of the field's values, one per record
+
+    Returns:
+        The encoded column dict
+    """
+    column = None
+    if field in STRING_COLUMNS:
+        column = _encode_strings(values)
+    elif field in DELTA_COLUMNS:
+        column = _encode_delta(values)
+    elif field in RLE_COLUMNS:
+        column = {'type': 'rle', 'runs': run_length_encode(values)}
+    return column or _encode_dict(values)
+
+
+def decode_column(column, count):
+    """
+    Decode one column back into a list of values.
+
+    Args:
+        column: The encoded column dict
+        count: Number of records
+
+    Returns:
+        List of values
+
+    Raises:
+        ValueError: If the column type is unknown or the length is wrong
+    """
+    kind = column['type']
+    if kind == 'strings':
+        values = column['data'].split(NAME_SEPARATOR) if count else []
+    elif kind == 'rle':
+        values = run_length_decode(column['runs'])
+    elif kind == 'delta':
+        values = [column['first']]
+        current = column['first']
+        for delta in run_length_decode(column['runs']):
+            current += delta
+            values.append(current)
+    elif kind == 'dict':
+        table = column['values']
+        values = [table[code] for code in run_length_decode(column['runs'])]
+    else:
+        raise ValueError(f"Unknown column type: {kind}")
+
+    if len(values) != count:
+        raise ValueError(f"Column decoded to {len(values)} values, expected {count}")
+    return values
+
+
+def encode(entries):
+    """
+    Encode a list of memorial records into the columnar format.
+
+    Args:
+        entries: List of record dicts, all with the same keys in the same order
+
+    Returns:
+        The columnar document (a JSON-serializable dict)
+
+    Raises:
+        ValueError: If the records do not all share the same keys
+    """
+    fields = list(entries[0].keys()) if entries else []
+    for index, entry in enumerate(entries):
+        if list(entry.keys()) != fields:
+            raise ValueError(f"Record {index} has keys {list(entry.keys())}, expected {fields}")
+
+    return {
+        'version': FORMAT_VERSION,
+        'count': len(entries),
+        'fields': fields,
+        'columns': {
+            field: encode_column(field, [entry[field] for entry in entries])
+            for field in fields
+        },
+    }
+
+
+def decode_columns(document):
+    """
+    Decode a columnar document into column lists without building records.
+
+    Args:
+        document: The columnar document
+
+    Returns:
+        Dict of field name -> list of values
+    """
+    if document.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format version: {document.get('version')}")
+    count = document['count']
+    return {
+        field: decode_column(document['columns'][field], count)
+        for field in document['fields']
+    }
+
+
+def decode(document):
+    """
+    Decode a columnar document back into a list of record dicts.
+
+    Args:
+        document: The columnar document
+
+    Returns:
+        List of records identical to those given to encode()
+    """
+    columns = decode_columns(document)
+    fields = document['fields']
+    return [dict(zip(fields, row)) for row in zip(*(columns[field] for field in fields))] \
+        if fields else [{} for _ in range(document['count'])]
+
+
+def read_columnar(path):
+    """Load a columnar file and return its records."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return decode(json.load(f))
+
+
+def write_columnar(path, entries):
+    """Encode records and write them as compact JSON."""
+    write_json_atomic(path, encode(entries), indent=None)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    json_file = script_dir.parent / 'data' / 'afm-memorials.json'
+    output_file = script_dir.parent / 'data' / 'afm-memorials.columns.json'
+
+    print("="*60)
+    print("AFM Columnar Export")
+    print("="*60)
+    print(f"Input file: {json_file}")
+    print(f"Output file: {output_file}")
+    print()
+
+    raw = json_file.read_bytes()
+    start = time.perf_counter()
+    entries = json.loads(raw)
+    row_parse_ms = (time.perf_counter() - start) * 1000
+
+    write_columnar(output_file, entries)
+    packed = output_file.read_bytes()
+
+    start = time.perf_counter()
+    document = json.loads(packed)
+    columnar_parse_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    decoded = decode(document)
+    decode_ms = (time.perf_counter() - start) * 1000
+
+    if decoded != entries:
+        raise SystemExit("✗ Round trip failed: decoded records differ from the input")
+
+    print(f"Records: {len(entries)}")
+    print(f"Row JSON:      {len(raw) / 1024:>8.1f} KB  parse {row_parse_ms:.1f} ms")
+    print(f"Columnar JSON: {len(packed) / 1024:>8.1f} KB  parse {columnar_parse_ms:.1f} ms "
+          f"(+{decode_ms:.1f} ms to rebuild records)")
+    print(f"Size reduction: {len(raw) / len(packed):.1f}x")
+    print()
+    for field, column in document['columns'].items():
+        size = len(json.dumps(column, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        print(f"  {field:<14} {column['type']:<8} {size / 1024:>8.1f} KB")
+
+    print("\n✓ Round trip verified")
+
+
+if __name__ == '__main__':
+    main()
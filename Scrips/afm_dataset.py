@@ -0,0 +1,148 @@
+"""
+Helpers for reading and writing data/afm-memorials.json.
+
+The dataset is a JSON array written with indent=2, one object per memorial
+entry. Because the layout is fixed, each top-level entry occupies a known
+byte range in the file, which lets callers replace a slice of entries without
+re-serializing the rest of the file.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from afm_panels import iter_wall_entries
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+AFM_JSON = DATA_DIR / 'afm-memorials.json'
+
+# Top-level entries of an indent=2 array start with "  {" and end with "  }"
+_ENTRY_START = re.compile(rb'\n  \{\n')
+_ENTRY_END = re.compile(rb'\n  \}(?=,\n|\n\])')
+
+
+def sha256_bytes(data):
+    """Return the hex SHA-256 digest of a bytes object."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path):
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def format_entries(entries):
+    """
+    Serialize entries exactly as they appear inside an indent=2 JSON array.
+
+    Args:
+        entries: Iterable of entry dicts
+
+    Returns:
+        UTF-8 bytes of the entries joined with ",\\n" (no surrounding brackets)
+    """
+    parts = []
+    for entry in entries:
+        text = json.dumps(entry, indent=2, ensure_ascii=False)
+        parts.append('  ' + text.replace('\n', '\n  '))
+    return ',\n'.join(parts).encode('utf-8')
+
+
+def build_wall_slice(csv_file):
+    """
+    Parse a wall CSV and serialize its entries, timing both.
+
+    Kept at module level so it can be sent to a process pool; doing the
+    serialization in the worker as well keeps the parent process free.
+
+    Args:
+        csv_file: Path to the wall CSV file
+
+    Returns:
+        Tuple of (entries, serialized bytes, seconds)
+    """
+    start = time.perf_counter()
+    entries = list(iter_wall_entries(csv_file))
+    data = format_entries(entries)
+    return entries, data, time.perf_counter() - start
+
+
+def join_slices(slices):
+    """
+    Assemble a JSON array file from pre-serialized entry slices.
+
+    Args:
+        slices: Iterable of bytes produced by format_entries() or cut from an
+            existing file with entry_offsets()
+
+    Returns:
+        The complete file contents as bytes
+    """
+    slices = [s for s in slices if s]
+    if not slices:
+        return b'[]'
+    return b'[\n' + b',\n'.join(slices) + b'\n]'
+
+
+def entry_offsets(raw):
+    """
+    Locate every top-level entry in an indent=2 JSON array.
+
+    Args:
+        raw: The file contents as bytes
+
+    Returns:
+        List of (start, end) byte offsets, one per entry, where raw[start:end]
+        is the entry text including its leading indentation
+    """
+    starts = [m.start() + 1 for m in _ENTRY_START.finditer(raw)]
+    ends = [m.end() for m in _ENTRY_END.finditer(raw)]
+    if len(starts) != len(ends):
+        raise ValueError("File is not an indent=2 JSON array of objects")
+    return list(zip(starts, ends))
+
+
+def write_bytes_atomic(path, data):
+    """
+    Write bytes to a file atomically (temp file in the same folder + rename).
+
+    Args:
+        path: Destination path
+        data: Bytes to write
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates the file private (0600); keep the file readable like a normal write
+        os.chmod(tmp_path, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(path, data, indent=2):
+    """
+    Write a JSON document atomically, matching the repo's json.dump settings.
+
+    Args:
+        path: Destination path
+        data: JSON-serializable object
+        indent: Indentation passed to json.dumps (None for compact output)
+    """
+    if indent is None:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(data, indent=indent, ensure_ascii=False)
+    write_bytes_atomic(path, text.encode('utf-8'))
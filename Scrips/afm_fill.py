@@ -0,0 +1,114 @@
+"""
+Forward/backward fill of missing fields (service, date) in AFM entries.
+
+A null field takes the value of the nearest earlier entry that has one
+(forward fill); entries before the first value take the nearest later one
+(backward fill). With a scope, entries only borrow from the same panel or
+the same wall (panel group A-I), so a gap never picks up a neighbouring
+wall's service or year. Each direction is one pass with a dict of the last
+value seen per group, so the whole fill is O(n).
+
+Fills are planned first and returned as a list of changes; apply_changes()
+writes them, which gives a dry run for free.
+"""
+
+from add_panel_groups import get_panel_group
+
+FILL_FIELDS = ('service', 'date')
+SCOPES = ('all', 'wall', 'panel')
+DIRECTIONS = ('forward', 'backward', 'both')
+
+
+def scope_key(entry, scope):
+    """
+    Return the group an entry fills within.
+
+    Args:
+        entry: Memorial entry
+        scope: 'all', 'wall' or 'panel'
+
+    Returns:
+        Hashable group key
+    """
+    if scope == 'panel':
+        return entry.get('panel')
+    if scope == 'wall':
+        return get_panel_group(entry.get('panel'))
+    return None
+
+
+def plan_fill(entries, fields=FILL_FIELDS, scope='all', direction='both'):
+    """
+    Work out which null fields would be filled, without changing entries.
+
+    Args:
+        entries: List of memorial entries, in wall order
+        fields: Field names to fill
+        scope: 'all', 'wall' or 'panel'
+        direction: 'forward', 'backward' or 'both' (forward first)
+
+    Returns:
+        List of (entry index, field, new value), in entry order per field
+    """
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown scope {scope!r}; expected one of {SCOPES}")
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Unknown direction {direction!r}; expected one of {DIRECTIONS}")
+
+    keys = [scope_key(entry, scope) for entry in entries]
+    changes = []
+    for field in fields:
+        values = [entry.get(field) for entry in entries]
+        filled = {}
+
+        if direction in ('forward', 'both'):
+            last = {}
+            for index, value in enumerate(values):
+                if value is not None:
+                    last[keys[index]] = value
+                elif keys[index] in last:
+                    filled[index] = last[keys[index]]
+
+        if direction in ('backward', 'both'):
+            following = {}
+            for index in range(len(values) - 1, -1, -1):
+                value = values[index]
+                if value is not None:
+                    following[keys[index]] = value
+                elif index not in filled and keys[index] in following:
+                    filled[index] = following[keys[index]]
+
+        changes.extend((index, field, filled[index]) for index in sorted(filled))
+    return changes
+
+
+def apply_changes(entries, changes):
+    """
+    Write planned fills into entries.
+
+    Returns:
+        Number of distinct entries changed
+    """
+    for index, field, value in changes:
+        entries[index][field] = value
+    return len({index for index, _, _ in changes})
+
+
+def fill(entries, fields=FILL_FIELDS, scope='all', direction='both'):
+    """
+    Plan and apply a fill in one call.
+
+    Returns:
+        List of changes made, as returned by plan_fill()
+    """
+    changes = plan_fill(entries, fields, scope, direction)
+    apply_changes(entries, changes)
+    return changes
+
+
+def format_change(entries, change):
+    """One line of a dry-run diff: "P8#12 SMITH J: date null -> 1948"."""
+    index, field, value = change
+    entry = entries[index]
+    return (f"P{entry.get('panel')}#{entry.get('panel_number')} {entry.get('name')}: "
+            f"{field} null -> {value!r}")
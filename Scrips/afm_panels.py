@@ -0,0 +1,360 @@
+"""
+Shared parser for the Armed Forces Memorial wall CSVs (data/AFM-Panels/A.csv - I.csv).
+
+Each wall CSV is laid out with one panel per column: the first row holds the
+panel numbers and the rows below hold names interleaved with service markers
+(e.g. "ROYAL NAVY") and year markers (e.g. "1945"). The current service and
+year carry over from one column to the next until a new marker is found.
+
+The file is read once, transposed into per-panel column arrays and every cell
+is classified exactly once. Entries are yielded as a generator so callers can
+stream walls without holding the full roll of honour in memory.
+"""
+
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Define the service markers
+SERVICES = ["ARMY", "ROYAL NAVY", "ROYAL AIR FORCE", "ROYAL  NAVY", "ROYAL NAYY", "*ARMY"]
+# Normalize service names
+SERVICE_NORMALIZE = {
+    "ARMY": "Army",
+    "*ARMY": "Army",
+    "ROYAL NAVY": "Royal Navy",
+    "ROYAL  NAVY": "Royal Navy",
+    "ROYAL NAYY": "Royal Navy",
+    "ROYAL AIR FORCE": "Royal Air Force"
+}
+
+# Year markers accepted by default (process_F_temp.py narrows this to 1985)
+MIN_YEAR = 1940
+MAX_YEAR = 2030
+
+# Panel numbers found in the header row
+MIN_PANEL = 1
+MAX_PANEL = 300
+
+# Cell kinds produced by classify_cell()
+CELL_SKIP = 0
+CELL_SERVICE = 1
+CELL_DATE = 2
+CELL_NAME = 3
+
+_SERVICE_SET = frozenset(SERVICES)
+
+
+def _has_letter(text):
+    """Check if the text contains at least one ASCII letter."""
+    for ch in text:
+        if ('A' <= ch <= 'Z') or ('a' <= ch <= 'z'):
+            return True
+    return False
+
+
+def parse_panel_number(text):
+    """
+    Parse a header cell as a panel number.
+
+    Args:
+        text: The raw header cell
+
+    Returns:
+        The panel number as an int, or None if the cell is not a panel number
+    """
+    if not text or not isinstance(text, str):
+        return None
+    text = text.strip()
+    if 1 <= len(text) <= 3 and text.isdecimal():
+        num = int(text)
+        if MIN_PANEL <= num <= MAX_PANEL:
+            return num
+    return None
+
+
+def classify_cell(text, min_year=MIN_YEAR, max_year=MAX_YEAR):
+    """
+    Classify a single (already stripped) body cell.
+
+    Args:
+        text: The stripped cell text
+        min_year: Earliest year accepted as a date marker
+        max_year: Latest year accepted as a date marker
+
+    Returns:
+        Tuple of (kind, value) where kind is one of CELL_SKIP, CELL_SERVICE,
+        CELL_DATE or CELL_NAME and value is the normalized service, the year
+        as an int, or the name
+    """
+    if not text:
+        return CELL_SKIP, None
+
+    if text in _SERVICE_SET:
+        return CELL_SERVICE, SERVICE_NORMALIZE.get(text, text)
+
+    if text.isdecimal():
+        # 4-digit years inside the range are date markers; anything else that
+        # is purely numeric (panel numbers, OCR noise) has no letters and so
+        # can never be a name
+        if len(text) == 4:
+            year = int(text)
+            if min_year <= year <= max_year:
+                return CELL_DATE, year
+        return CELL_SKIP, None
+
+    # Names have at least 2 characters and at least one letter
+    if len(text) >= 2 and _has_letter(text):
+        return CELL_NAME, text
+
+    return CELL_SKIP, None
+
+
+def calculate_panel_location(position, total_names):
+    """
+    Calculate if a name is in the top, middle, or bottom third of the panel.
+
+    Args:
+        position: The position of the name (0-indexed)
+        total_names: Total number of names in the panel
+
+    Returns:
+        'Top', 'Middle', or 'Bottom'
+    """
+    if total_names == 0:
+        return 'Top'
+
+    third = total_names / 3.0
+
+    if position < third:
+        return 'Top'
+    elif position < 2 * third:
+        return 'Middle'
+    else:
+        return 'Bottom'
+
+
+def read_wall_panels(filepath):
+    """
+    Read only the header row of a wall CSV.
+
+    Args:
+        filepath: Path to the wall CSV file
+
+    Returns:
+        List of the panel numbers in the header, in column order
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        header = next(csv.reader(f), None)
+    if header is None:
+        return []
+    return [panel for panel in map(parse_panel_number, header) if panel is not None]
+
+
+def read_wall_columns(filepath, min_year=MIN_YEAR, max_year=MAX_YEAR):
+    """
+    Read a wall CSV in a single pass and transpose it into panel columns.
+
+    Only cells that matter (service markers, date markers and names) are kept,
+    already classified, so the column arrays can be replayed without looking
+    at the text again.
+
+    Args:
+        filepath: Path to the wall CSV file
+        min_year: Earliest year accepted as a date marker
+        max_year: Latest year accepted as a date marker
+
+    Returns:
+        Tuple of (panel_numbers, columns). panel_numbers has one entry per
+        header cell (None where the header is not a panel number) and
+        columns[i] is the list of (kind, value) events for that column.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return [], []
+
+        panel_numbers = [parse_panel_number(cell) for cell in header]
+        columns = [[] for _ in panel_numbers]
+        # Columns without a panel number are never read, so don't classify them
+        wanted = [i for i, panel in enumerate(panel_numbers) if panel is not None]
+        num_columns = len(panel_numbers)
+
+        for row in reader:
+            if len(row) >= num_columns:
+                indices = wanted
+            else:
+                indices = [i for i in wanted if i < len(row)]
+            for col_idx in indices:
+                kind, value = classify_cell(row[col_idx].strip(), min_year, max_year)
+                if kind != CELL_SKIP:
+                    columns[col_idx].append((kind, value))
+
+    return panel_numbers, columns
+
+
+def iter_wall_entries(filepath, min_year=MIN_YEAR, max_year=MAX_YEAR):
+    """
+    Yield memorial entries for a single wall CSV in panel order.
+
+    The service and date carry over between columns: a panel without its own
+    marker inherits the last marker seen on the previous panel of the wall.
+
+    Args:
+        filepath: Path to the wall CSV file
+        min_year: Earliest year accepted as a date marker
+        max_year: Latest year accepted as a date marker
+
+    Yields:
+        Memorial entry dicts with name, service, date, panel, panel_Loc and
+        panel_number keys
+    """
+    panel_numbers, columns = read_wall_columns(filepath, min_year, max_year)
+
+    # Track current service and date (persist across columns)
+    current_service = None
+    current_date = None
+
+    for panel_num, events in zip(panel_numbers, columns):
+        # Skip if no valid panel number
+        if panel_num is None:
+            continue
+
+        column_names = []
+        for kind, value in events:
+            if kind == CELL_NAME:
+                column_names.append((value, current_service, current_date))
+            elif kind == CELL_SERVICE:
+                current_service = value
+            else:
+                current_date = value
+
+        total_names = len(column_names)
+        for position, (name, service, date) in enumerate(column_names):
+            yield {
+                'name': name,
+                'service': service,
+                'date': date,
+                'panel': panel_num,
+                'panel_Loc': calculate_panel_location(position, total_names),
+                'panel_number': position + 1  # 1-indexed position on the panel
+            }
+
+
+def iter_panel_first_dates(filepath, min_year=MIN_YEAR, max_year=MAX_YEAR):
+    """
+    Yield (panel, year) pairs using the first date marker of each column.
+
+    A panel without a date marker inherits the first date of the most recent
+    panel that had one. Panels before the first date marker are not yielded.
+
+    Args:
+        filepath: Path to the wall CSV file
+        min_year: Earliest year accepted as a date marker
+        max_year: Latest year accepted as a date marker
+
+    Yields:
+        Tuples of (panel_number, year)
+    """
+    panel_numbers, columns = read_wall_columns(filepath, min_year, max_year)
+
+    current_date = None
+    for panel_num, events in zip(panel_numbers, columns):
+        if panel_num is None:
+            continue
+
+        for kind, value in events:
+            if kind == CELL_DATE:
+                current_date = value
+                break
+
+        if current_date:
+            yield panel_num, current_date
+
+
+def list_wall_csvs(directory):
+    """
+    List the wall CSV files in a directory in processing order.
+
+    Args:
+        directory: Path to the directory containing the wall CSVs
+
+    Returns:
+        Sorted list of Path objects
+    """
+    return sorted(Path(directory).glob('*.csv'))
+
+
+def iter_all_entries(directory, min_year=MIN_YEAR, max_year=MAX_YEAR):
+    """
+    Yield memorial entries for every wall CSV in a directory.
+
+    Service and date state resets at each file boundary.
+
+    Args:
+        directory: Path to the directory containing the wall CSVs
+        min_year: Earliest year accepted as a date marker
+        max_year: Latest year accepted as a date marker
+
+    Yields:
+        Memorial entry dicts in wall then panel order
+    """
+    for csv_file in list_wall_csvs(directory):
+        yield from iter_wall_entries(csv_file, min_year, max_year)
+
+
+def parse_wall(filepath, min_year=MIN_YEAR, max_year=MAX_YEAR):
+    """
+    Parse a whole wall CSV and time it.
+
+    Kept at module level so it can be sent to a process pool.
+
+    Args:
+        filepath: Path to the wall CSV file
+        min_year: Earliest year accepted as a date marker
+        max_year: Latest year accepted as a date marker
+
+    Returns:
+        Tuple of (entries, seconds)
+    """
+    start = time.perf_counter()
+    entries = list(iter_wall_entries(filepath, min_year, max_year))
+    return entries, time.perf_counter() - start
+
+
+def resolve_jobs(jobs):
+    """Turn a --jobs value into a worker count (0 or None means one per CPU)."""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def parse_walls(csv_files, jobs=1, worker=parse_wall):
+    """
+    Run a per-wall worker over several wall CSVs, optionally in parallel.
+
+    Walls are independent (service and date state resets at each file), so
+    they can be handled in separate processes. Results come back in the order
+    of csv_files whatever order the workers finish in.
+
+    Args:
+        csv_files: List of wall CSV paths
+        jobs: Number of worker processes (1 runs in this process, 0 uses
+            one per CPU)
+        worker: Module-level function taking a CSV path (default parse_wall)
+
+    Yields:
+        Tuples of (csv_file, worker result) in the order of csv_files
+    """
+    csv_files = list(csv_files)
+    workers = min(resolve_jobs(jobs), len(csv_files))
+
+    if workers <= 1:
+        for csv_file in csv_files:
+            yield csv_file, worker(csv_file)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from zip(csv_files, executor.map(worker, csv_files))
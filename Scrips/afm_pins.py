@@ -0,0 +1,112 @@
+"""
+Resolve every AFM panel to its map pin in data/AFM-Wall-<A-I>.json.
+
+Each wall file is a GeoJSON FeatureCollection of Point features, one per
+panel in panel order (pin 0 is the wall's first panel). The panel registry
+says which file and pin index a panel uses; this module does that join once
+at build time, so pages get [lng, lat] per panel instead of fetching a wall
+file and indexing into it.
+
+Pin counts are checked against the registry ranges at the same time: a wall
+with fewer pins than panels leaves its last panels without a location, and a
+wall with more pins than panels has pins nobody uses.
+
+Usage:
+  python Scrips/afm_pins.py    prints the pin check for every wall
+"""
+
+import json
+
+from afm_dataset import DATA_DIR
+from panel_registry import registry
+
+# Pins are stored with 7 decimal places (about 1 cm), which is plenty
+COORD_DIGITS = 7
+
+
+def load_wall_pins(path):
+    """
+    Read the pin coordinates from one wall file.
+
+    Args:
+        path: Path to an AFM-Wall-<X>.json FeatureCollection
+
+    Returns:
+        List of [lng, lat] in file order (None for non-Point features)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    pins = []
+    for feature in data.get('features', []):
+        geometry = feature.get('geometry') or {}
+        if geometry.get('type') == 'Point':
+            lng, lat = geometry['coordinates'][:2]
+            pins.append([round(lng, COORD_DIGITS), round(lat, COORD_DIGITS)])
+        else:
+            pins.append(None)
+    return pins
+
+
+def resolve_panel_pins(data_dir=DATA_DIR, reg=None):
+    """
+    Join every registry panel to its pin.
+
+    Args:
+        data_dir: Directory holding the AFM-Wall-<X>.json files
+        reg: PanelRegistry (defaults to the shared registry)
+
+    Returns:
+        Tuple of (dict panel -> [lng, lat], list of per-wall check dicts with
+        wall, panels, pins, missing (panels without a pin) and unused pins)
+    """
+    reg = reg or registry()
+    panel_pins = {}
+    checks = []
+    for wall_range in reg.walls.ranges:
+        first, last = wall_range['first'], wall_range['last']
+        path = data_dir / wall_range['pins']
+        pins = load_wall_pins(path) if path.exists() else []
+
+        missing = []
+        for panel in range(first, last + 1):
+            index = panel - first
+            pin = pins[index] if index < len(pins) else None
+            if pin is None:
+                missing.append(panel)
+            else:
+                panel_pins[panel] = pin
+
+        panel_count = last - first + 1
+        checks.append({
+            'wall': wall_range['wall'],
+            'file': wall_range['pins'],
+            'panels': panel_count,
+            'pins': len(pins),
+            'missing': missing,
+            'unused': max(len(pins) - panel_count, 0),
+        })
+    return panel_pins, checks
+
+
+def main():
+    print("="*60)
+    print("AFM Panel Pin Check")
+    print("="*60)
+
+    panel_pins, checks = resolve_panel_pins()
+    print(f"{'Wall':<6}{'File':<18}{'Panels':>8}{'Pins':>6}  Result")
+    print("-"*60)
+    for check in checks:
+        if check['missing']:
+            result = f"✗ no pin for panel(s) {check['missing']}"
+        elif check['unused']:
+            result = f"⚠ {check['unused']} unused pin(s)"
+        else:
+            result = "✓"
+        print(f"{check['wall']:<6}{check['file']:<18}{check['panels']:>8}{check['pins']:>6}  {result}")
+
+    print(f"\nPanels with a location: {len(panel_pins)}")
+
+
+if __name__ == '__main__':
+    main()
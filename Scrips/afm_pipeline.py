@@ -0,0 +1,225 @@
+"""
+Run the AFM fix-up transforms over afm-memorials.json in one load.
+
+fill_null_values.py, update_multiple_panels.py, update_panel1_dates.py,
+fix_missing_service_date.py, add_panel_groups.py, add_what3words.py and
+clean_afm_names.py each load and re-write the whole 2.3 MB file. This runner
+loads the dataset once, applies an ordered list of stages and writes the
+result once, atomically, and only if something changed.
+
+A stage is either
+
+  - a record stage: called with one entry, returns True if it changed it.
+    Consecutive record stages are fused into a single loop over the data.
+  - a dataset stage: called with the whole list, returns the number of
+    entries it changed (used where order matters, e.g. filling gaps from
+    neighbouring entries).
+
+New stages are added by registering them in STAGES.
+
+Usage:
+  python Scrips/afm_pipeline.py [--stages clean_names,panel_dates,fill_service_date]
+                                [--dry-run] [--list]
+"""
+
+import argparse
+import json
+import time
+
+from add_panel_groups import get_panel_group
+from add_what3words import get_what3words_code
+from afm_dataset import AFM_JSON, write_json_atomic
+from afm_fill import apply_changes, plan_fill
+from name_cleaner import NameCleaner
+
+# Dates for panels whose entries have no date on the wall
+# (update_panel1_dates.py and update_multiple_panels.py)
+PANEL_DATE_OVERRIDES = {
+    8: 1948,
+    27: 1950,
+    121: 1960,
+    133: 1964,
+    168: 1976,
+    208: 1995,
+    209: 1996,
+    227: 2012,
+}
+
+
+class Stage:
+    """
+    One named transform.
+
+    Args:
+        name: Stage name used on the command line
+        description: One-line summary for --list
+        record: Function(entry) -> bool, for per-entry stages
+        dataset: Function(entries) -> int, for whole-dataset stages
+    """
+
+    def __init__(self, name, description, record=None, dataset=None):
+        if (record is None) == (dataset is None):
+            raise ValueError(f"Stage {name!r} needs exactly one of record= or dataset=")
+        self.name = name
+        self.description = description
+        self.record = record
+        self.dataset = dataset
+
+
+def _clean_names_stage():
+    cleaner = NameCleaner()
+
+    def clean(entry):
+        name = entry.get('name')
+        if not name:
+            return False
+        cleaned = cleaner.clean(name)
+        if cleaned == name:
+            return False
+        entry['name'] = cleaned
+        return True
+    return clean
+
+
+def panel_dates(entry):
+    """Give undated entries on PANEL_DATE_OVERRIDES panels their panel's date."""
+    if entry.get('date') is None and entry.get('panel') in PANEL_DATE_OVERRIDES:
+        entry['date'] = PANEL_DATE_OVERRIDES[entry['panel']]
+        return True
+    return False
+
+
+def fill_service_date(entries):
+    """
+    Fill null service/date from the previous entry that has one, then fill
+    any leading nulls from the first entry that has one
+    (fix_missing_service_date.py).
+
+    Returns:
+        Number of entries changed
+    """
+    return apply_changes(entries, plan_fill(entries))
+
+
+def _set_field(field, compute):
+    def assign(entry):
+        value = compute(entry.get('panel'))
+        if field in entry and entry[field] == value:
+            return False
+        entry[field] = value
+        return True
+    return assign
+
+
+STAGES = {stage.name: stage for stage in (
+    Stage('clean_names', 'Remove OCR debris from names (clean_afm_names.py)',
+          record=_clean_names_stage()),
+    Stage('panel_dates', 'Date undated entries on known panels (update_*_dates.py)',
+          record=panel_dates),
+    Stage('fill_service_date', 'Fill null service/date from neighbours (fix_missing_service_date.py)',
+          dataset=fill_service_date),
+    Stage('panel_groups', 'Set panel_group A-I (add_panel_groups.py)',
+          record=_set_field('panel_group', get_panel_group)),
+    Stage('what3words', 'Set what3words for panels 1-77 (add_what3words.py)',
+          record=_set_field('what3words', get_what3words_code)),
+)}
+
+DEFAULT_STAGES = ['clean_names', 'panel_dates', 'fill_service_date']
+
+
+def run_pipeline(entries, stage_names):
+    """
+    Apply stages to entries in place.
+
+    Args:
+        entries: List of memorial entries
+        stage_names: Ordered list of names from STAGES
+
+    Returns:
+        List of per-stage dicts with 'stage', 'changed' and 'seconds'
+    """
+    stages = [STAGES[name] for name in stage_names]
+    results = {stage.name: {'stage': stage.name, 'changed': 0, 'seconds': 0.0} for stage in stages}
+
+    pos = 0
+    while pos < len(stages):
+        if stages[pos].dataset is not None:
+            stage = stages[pos]
+            start = time.perf_counter()
+            results[stage.name]['changed'] = stage.dataset(entries)
+            results[stage.name]['seconds'] = time.perf_counter() - start
+            pos += 1
+            continue
+
+        # Fuse the run of record stages into one loop over the entries
+        run = []
+        while pos < len(stages) and stages[pos].record is not None:
+            run.append(stages[pos])
+            pos += 1
+        changed = [0] * len(run)
+        seconds = [0.0] * len(run)
+        clock = time.perf_counter
+        for entry in entries:
+            for i, stage in enumerate(run):
+                start = clock()
+                if stage.record(entry):
+                    changed[i] += 1
+                seconds[i] += clock() - start
+        for i, stage in enumerate(run):
+            results[stage.name]['changed'] = changed[i]
+            results[stage.name]['seconds'] = seconds[i]
+
+    return [results[stage.name] for stage in stages]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply the AFM fix-up stages in one load and one write.')
+    parser.add_argument('--stages', type=str, default=','.join(DEFAULT_STAGES),
+                        help=f"Comma-separated stages in order (default: {','.join(DEFAULT_STAGES)})")
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing the file')
+    parser.add_argument('--list', action='store_true', help='List the available stages and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for stage in STAGES.values():
+            kind = 'record' if stage.record else 'dataset'
+            print(f"  {stage.name:<20}{kind:<9}{stage.description}")
+        return
+
+    stage_names = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (see --list)")
+
+    print("="*60)
+    print("AFM Transform Pipeline")
+    print("="*60)
+    print(f"Stages: {' -> '.join(stage_names)}")
+
+    start = time.perf_counter()
+    with open(AFM_JSON, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    load_s = time.perf_counter() - start
+    print(f"Loaded {len(entries)} entries in {load_s * 1000:.0f} ms")
+    print()
+
+    results = run_pipeline(entries, stage_names)
+    print(f"{'Stage':<22}{'Changed':>10}{'ms':>10}")
+    print("-"*42)
+    for result in results:
+        print(f"{result['stage']:<22}{result['changed']:>10}{result['seconds'] * 1000:>10.1f}")
+    print("-"*42)
+
+    total_changed = sum(result['changed'] for result in results)
+    if args.dry_run:
+        print("\nDry run: file not written")
+    elif total_changed == 0:
+        print("\nNo changes: file not written")
+    else:
+        start = time.perf_counter()
+        write_json_atomic(AFM_JSON, entries)
+        print(f"\nSaved {AFM_JSON} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
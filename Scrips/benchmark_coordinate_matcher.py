@@ -0,0 +1,196 @@
+"""
+Accuracy and speed benchmark for coordinate_matcher.py.
+
+Builds a synthetic photo survey from the memorial names in memorials.json:
+one photo per memorial, named the way phone photos drift (--kinds):
+
+  exact       the name as it is
+  case        upper or lower case
+  spacing     doubled spaces and stray spaces around punctuation
+  copy        " 2" or "(1)" appended by the phone
+  typo        two adjacent letters swapped in one word
+  apostrophe  apostrophes and hyphens dropped
+
+plus --decoys photos that belong to no memorial (IMG_1234, Panorama 7, ...).
+A --holdout share of the memorials get no photo at all ('no photo'): for
+them any match is wrong. Memorial names have many near-siblings ("Burma
+Railway Memorial" / "Sumatra Railway Memorial", "No 47 / No 49 Squadron"),
+so these catch a sibling's photo being taken; the report counts how many
+held-out memorials have a sibling photo within MIN_CONFIDENCE similarity.
+Each memorial is then resolved against the survey both by the old O(N x M)
+substring loop from update_memorial_coordinates.py and by MutualMatcher,
+and the benchmark reports, per kind, how many memorials got the right
+photo, a wrong photo, or none, along with the time taken (best of
+--repeat runs; the matcher's time includes building its indexes). It fails
+when the matcher is slower than the loop.
+
+Usage:
+  python Scrips/benchmark_coordinate_matcher.py [--decoys 2000] [--holdout 0.25] [--seed 1] [--repeat 3]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from difflib import SequenceMatcher
+
+from coordinate_matcher import MIN_CONFIDENCE, MutualMatcher, normalize
+
+KINDS = ['exact', 'case', 'spacing', 'copy', 'typo', 'apostrophe']
+# Memorials with no photo of their own; the right answer is no match
+NO_PHOTO = 'no photo'
+
+def perturb(name, kind, rng):
+    """Photo name for a memorial, drifted as described by kind."""
+    if kind == 'case':
+        return name.upper() if rng.random() < 0.5 else name.lower()
+    if kind == 'spacing':
+        return name.replace(' ', '  ', 1).replace('(', ' ( ').replace('-', ' - ') + ' '
+    if kind == 'copy':
+        return name + rng.choice([' 2', ' 3', '(1)', ' (2)'])
+    if kind == 'typo':
+        words = name.split(' ')
+        long_words = [i for i, word in enumerate(words) if len(word) >= 5 and word.isalpha()]
+        if long_words:
+            i = rng.choice(long_words)
+            word = words[i]
+            j = rng.randint(1, len(word) - 3)
+            words[i] = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+        return ' '.join(words)
+    if kind == 'apostrophe':
+        return name.replace("'", '').replace('’', '').replace('-', ' ')
+    return name
+
+def make_survey(names, decoys, seed=1, holdout=0.25):
+    """
+    Build photo name -> coordinates, and the photo each memorial should get.
+
+    Returns:
+        Tuple of (coordinates dict, dict memorial name -> (photo name or
+        None, kind))
+    """
+    rng = random.Random(seed)
+    coordinates = {}
+    truth = {}
+    for i, name in enumerate(names):
+        if rng.random() < holdout:
+            truth[name] = (None, NO_PHOTO)
+            continue
+        kind = KINDS[i % len(KINDS)]
+        photo = perturb(name, kind, rng)
+        if photo in coordinates:
+            continue
+        coordinates[photo] = {'lat': 52.72 + i * 1e-5, 'lng': -1.73 - i * 1e-5}
+        truth[name] = (photo, kind)
+    for i in range(decoys):
+        photo = rng.choice(['IMG_{:04d}', 'Panorama {}', 'Path view {}', 'Car park {}']).format(i)
+        coordinates[photo] = {'lat': 52.70, 'lng': -1.70}
+    # Photos arrive in file order, not memorial order
+    items = list(coordinates.items())
+    rng.shuffle(items)
+    return dict(items), truth
+
+def substring_match(name, coordinates):
+    """The old loop: first photo equal to, inside, or containing the name."""
+    name = name.strip().replace('  ', ' ')
+    for coord_name in coordinates:
+        coord = coord_name.strip().replace('  ', ' ')
+        if coord == name or coord in name or name in coord:
+            return coord_name
+    return None
+
+def has_sibling(name, photos):
+    """True if a photo name is as similar to name as a match needs to be."""
+    normalized = normalize(name)
+    return any(SequenceMatcher(None, normalized, normalize(photo), autojunk=False).ratio() >= MIN_CONFIDENCE
+               for photo in photos)
+
+def score(results, truth):
+    """Count right / wrong / missed per kind ('no photo' is right when nothing matched)."""
+    counts = {kind: [0, 0, 0] for kind in KINDS + [NO_PHOTO]}
+    for name, (photo, kind) in truth.items():
+        got = results[name]
+        if kind == NO_PHOTO:
+            counts[kind][0 if got is None else 1] += 1
+        else:
+            counts[kind][0 if got == photo else 1 if got is not None else 2] += 1
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the indexed coordinate matcher.')
+    parser.add_argument('--decoys', type=int, default=2000, help='Unrelated photos in the survey (default: 2000)')
+    parser.add_argument('--holdout', type=float, default=0.25,
+                        help='Share of memorials with no photo (default: 0.25)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs, best is reported (default: 3)')
+    args = parser.parse_args()
+
+    json_file = Path(__file__).parent.parent / 'data' / 'memorials.json'
+    with open(json_file, 'r', encoding='utf-8') as f:
+        names = list(dict.fromkeys(memorial['name'] for memorial in json.load(f)))
+
+    coordinates, truth = make_survey(names, args.decoys, args.seed, args.holdout)
+    photos = [photo for photo, _ in truth.values() if photo is not None]
+    held_out = [name for name, (_, kind) in truth.items() if kind == NO_PHOTO]
+    siblings = sum(has_sibling(name, photos) for name in held_out)
+
+    print("="*60)
+    print("Coordinate Matcher Benchmark")
+    print("="*60)
+    print(f"Memorials: {len(truth)}, photos: {len(coordinates)} ({args.decoys} decoys)")
+    print(f"No photo: {len(held_out)} memorials, {siblings} of them with a sibling photo")
+
+    old_s = build_s = match_s = float('inf')
+    for _ in range(max(args.repeat, 1)):
+        start = time.perf_counter()
+        old = {name: substring_match(name, coordinates) for name in truth}
+        old_s = min(old_s, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        matcher = MutualMatcher(coordinates.keys(), names)
+        built = time.perf_counter()
+        matches = {name: matcher.match(name) for name in truth}
+        build_s = min(build_s, built - start)
+        match_s = min(match_s, time.perf_counter() - built)
+    new = {name: match.key if match.accepted else None for name, match in matches.items()}
+
+    old_counts = score(old, truth)
+    new_counts = score(new, truth)
+
+    print(f"\n{'kind':<12} {'substring right/wrong/none':>28} {'matcher right/wrong/none':>26}")
+    for kind in KINDS + [NO_PHOTO]:
+        print(f"{kind:<12} {'/'.join(map(str, old_counts[kind])):>28} {'/'.join(map(str, new_counts[kind])):>26}")
+    old_total = [sum(counts[i] for counts in old_counts.values()) for i in range(3)]
+    new_total = [sum(counts[i] for counts in new_counts.values()) for i in range(3)]
+    print(f"{'total':<12} {'/'.join(map(str, old_total)):>28} {'/'.join(map(str, new_total)):>26}")
+
+    ambiguous = sum(match.ambiguous for match in matches.values())
+    print()
+    print(f"  Substring loop:  {old_s * 1000:8.1f} ms ({old_s * 1e6 / len(truth):.0f} us/memorial)")
+    print(f"  Matcher build:   {build_s * 1000:8.1f} ms")
+    print(f"  Matcher lookups: {match_s * 1000:8.1f} ms ({match_s * 1e6 / len(truth):.0f} us/memorial)")
+    speedup = old_s / (build_s + match_s)
+    print(f"  Speedup:         {speedup:8.1f}x")
+    print(f"  Flagged ambiguous: {ambiguous}")
+
+    failures = []
+    if new_counts[NO_PHOTO][1]:
+        failures.append(f"{new_counts[NO_PHOTO][1]} memorials without a photo were given another memorial's photo")
+    if new_total[1] > 0.01 * len(truth):
+        failures.append(f"{new_total[1]} memorials matched to the wrong photo")
+    if new_total[0] < old_total[0]:
+        failures.append(f"fewer right matches than the substring loop ({new_total[0]} < {old_total[0]})")
+    if speedup < 1:
+        failures.append(f"slower than the substring loop ({speedup:.1f}x)")
+    if failures:
+        for failure in failures:
+            print(f"\n✗ {failure}")
+        sys.exit(1)
+    print("\n✓ Matcher is faster and at least as accurate as the substring loop, with at most 1% wrong "
+          "matches and none for memorials without a photo")
+
+if __name__ == '__main__':
+    main()
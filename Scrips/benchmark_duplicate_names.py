@@ -0,0 +1,110 @@
+"""
+Scaling benchmark for find_duplicate_names.py.
+
+Builds synthetic rolls of 1x-10x the current AFM size by splicing real
+surnames together (new people mostly bring new surnames) and sprinkling in
+OCR-style copies, then times the blocked duplicate search at each size.
+
+The growth exponent is fitted between the smallest and largest runs:
+1.0 is linear, 2.0 is the naive all-pairs comparison. Blocks fill up
+towards the sorted-neighbourhood window as the roll grows, so the exponent
+drifts down towards 1.0 with scale; the hard ceiling is
+records x blocking keys x WINDOW comparisons, which is checked too.
+
+Usage:
+  python Scrips/benchmark_duplicate_names.py [--scales 1,2,5,10]
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+from find_duplicate_names import WINDOW, find_candidates
+
+OCR_NOISE = 0.02
+
+def ocr_damage(name, rng):
+    """Apply one OCR-style edit: substitute, drop or duplicate a character."""
+    if len(name) < 3:
+        return name
+    pos = rng.randrange(1, len(name))
+    action = rng.random()
+    if action < 0.4:
+        return name[:pos] + rng.choice('EOILNRC') + name[pos + 1:]
+    if action < 0.7:
+        return name[:pos] + name[pos + 1:]
+    return name[:pos] + name[pos] + name[pos:]
+
+def synthetic_roll(entries, scale, seed=7):
+    """Grow the roll to scale x its size with new, plausible names."""
+    rng = random.Random(seed)
+    surnames = [entry['name'].split()[0] for entry in entries if entry['name'].split()]
+    initials = [entry['name'].split()[1] for entry in entries if len(entry['name'].split()) > 1]
+
+    roll = list(entries)
+    panel = max(entry['panel'] for entry in entries)
+    while len(roll) < len(entries) * scale:
+        panel += 1
+        for position in range(1, 81):
+            a, b = rng.choice(surnames), rng.choice(surnames)
+            surname = a[:max(2, len(a) // 2)] + b[len(b) // 2:]
+            name = f"{surname} {rng.choice(initials)}"
+            if rng.random() < OCR_NOISE:
+                name = ocr_damage(name, rng)
+            roll.append({'name': name, 'panel': panel, 'panel_number': position})
+    return roll
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark duplicate-name detection scaling.')
+    parser.add_argument('--scales', type=str, default='1,2,5,10',
+                        help='Comma-separated roll sizes relative to today (default: 1,2,5,10)')
+    args = parser.parse_args()
+    scales = [int(s) for s in args.scales.split(',')]
+
+    json_file = Path(__file__).parent.parent / 'data' / 'afm-memorials.json'
+    with open(json_file, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    print("="*72)
+    print("Duplicate Name Finder Scaling Benchmark")
+    print("="*72)
+    print(f"{'Scale':>6}{'Records':>10}{'Comparisons':>14}{'Per record':>12}{'Seconds':>10}{'Found':>10}")
+    print("-"*72)
+
+    results = []
+    for scale in scales:
+        roll = synthetic_roll(entries, scale)
+        start = time.perf_counter()
+        candidates, comparisons, _ = find_candidates(roll)
+        elapsed = time.perf_counter() - start
+        results.append((len(roll), comparisons, elapsed))
+        print(f"{scale:>5}x{len(roll):>10}{comparisons:>14}{comparisons / len(roll):>12.2f}"
+              f"{elapsed:>10.2f}{len(candidates):>10}")
+
+    if len(results) < 2:
+        return
+
+    (n1, c1, t1), (n2, c2, t2) = results[0], results[-1]
+    ratio = math.log(n2 / n1)
+    comparison_exponent = math.log(max(c2, 1) / max(c1, 1)) / ratio
+    time_exponent = math.log(t2 / t1) / ratio
+    print("-"*72)
+    print(f"Growth exponent: comparisons n^{comparison_exponent:.2f}, time n^{time_exponent:.2f} "
+          f"(all-pairs would be n^2.00)")
+
+    # Two blocking keys per name, each compared with at most WINDOW neighbours
+    over_cap = [(n, c) for n, c, _ in results if c > n * 2 * WINDOW]
+    print(f"Linear ceiling: {2 * WINDOW} comparisons per record "
+          f"(largest run used {c2 / n2:.2f})")
+
+    if comparison_exponent >= 1.9 or over_cap:
+        print("\n✗ Comparisons are not growing sub-quadratically")
+        sys.exit(1)
+    print("\n✓ Sub-quadratic scaling")
+
+if __name__ == '__main__':
+    main()
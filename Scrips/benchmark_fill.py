@@ -0,0 +1,112 @@
+"""
+Scaling benchmark and reference check for the fill engine (afm_fill.py).
+
+Grows the AFM roll to 1M rows (about 60 back-to-back copies), blanks 10%
+of service/date values and
+times plan_fill() for each scope at several sizes. Time per row must stay
+flat for the fill to be linear.
+
+On the real-sized roll the result is also compared with a straightforward
+reference: for each null, walk back (then forward) to the nearest value in
+the same scope.
+
+Usage:
+  python Scrips/benchmark_fill.py [--rows 1000000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from afm_fill import FILL_FIELDS, SCOPES, plan_fill, scope_key
+
+NULL_RATE = 0.10
+
+def synthetic_rows(entries, rows, seed=5):
+    """Repeat entries up to rows, blanking NULL_RATE of the fill fields."""
+    rng = random.Random(seed)
+    data = []
+    while len(data) < rows:
+        for entry in entries:
+            row = dict(entry)
+            for field in FILL_FIELDS:
+                if rng.random() < NULL_RATE:
+                    row[field] = None
+            data.append(row)
+            if len(data) == rows:
+                break
+    return data
+
+def reference_fill(entries, scope):
+    """Nearest-value search per null; only usable on small inputs."""
+    keys = [scope_key(entry, scope) for entry in entries]
+    changes = []
+    for field in FILL_FIELDS:
+        for index, entry in enumerate(entries):
+            if entry.get(field) is not None:
+                continue
+            value = None
+            for j in range(index - 1, -1, -1):
+                if keys[j] == keys[index] and entries[j].get(field) is not None:
+                    value = entries[j][field]
+                    break
+            if value is None:
+                for j in range(index + 1, len(entries)):
+                    if keys[j] == keys[index] and entries[j].get(field) is not None:
+                        value = entries[j][field]
+                        break
+            if value is not None:
+                changes.append((index, field, value))
+    return changes
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the grouped fill engine.')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Largest synthetic size (default: 1000000)')
+    args = parser.parse_args()
+
+    json_file = Path(__file__).parent.parent / 'data' / 'afm-memorials.json'
+    with open(json_file, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    print("="*60)
+    print("Fill Engine Benchmark")
+    print("="*60)
+
+    failures = 0
+    sample = synthetic_rows(entries, len(entries))
+    for scope in SCOPES:
+        matches = plan_fill(sample, scope=scope) == reference_fill(sample, scope)
+        failures += not matches
+        print(f"  {'✓' if matches else '✗'} scope={scope} matches the reference on {len(sample)} rows")
+
+    sizes = [len(entries), len(entries) * 10, args.rows]
+    print()
+    print(f"{'Rows':>10}" + ''.join(f"{scope + ' ms':>14}" for scope in SCOPES) + f"{'us/row':>10}")
+    print("-"*62)
+    per_row = []
+    for rows in sizes:
+        data = synthetic_rows(entries, rows)
+        timings = []
+        for scope in SCOPES:
+            start = time.perf_counter()
+            plan_fill(data, scope=scope)
+            timings.append(time.perf_counter() - start)
+        per_row.append(max(timings) / rows * 1e6)
+        print(f"{rows:>10}" + ''.join(f"{t * 1000:>14.1f}" for t in timings) + f"{per_row[-1]:>10.2f}")
+
+    growth = per_row[-1] / per_row[0]
+    print("-"*62)
+    print(f"Time per row at {sizes[-1]} rows vs {sizes[0]}: {growth:.2f}x")
+
+    if growth > 3:
+        print("\n✗ Fill time is growing faster than linearly")
+        failures += 1
+    if failures:
+        sys.exit(1)
+    print("\n✓ Linear and identical to the reference")
+
+if __name__ == '__main__':
+    main()
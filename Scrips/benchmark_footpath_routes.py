@@ -0,0 +1,137 @@
+"""
+Check and time the footpath routing engine (footpath_routes.py).
+
+  trees   every entrance tree in data/footpath-routes.json must give the same
+          node distances as Bellman-Ford over the compiled graph, and each
+          memorial's parent chain must add up to its stored distance
+  tours   random sets of memorials are planned with plan_tour(); small sets
+          are compared with the best order found by trying every permutation,
+          larger ones with the plain nearest-neighbour order, and every plan
+          must finish close to its time budget
+
+Usage:
+  python Scrips/benchmark_footpath_routes.py [--tours 30] [--budget 200] [--seed 1]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import statistics
+import sys
+import time
+
+from footpath_routes import ROUTES_FILE, RoutingGraph, plan_tour, tour_length
+
+EXACT_STOPS = 7
+SIZES = (EXACT_STOPS, 15, 30, 60)
+
+def bellman_ford(graph, seeds):
+    dist = [math.inf] * len(graph.nodes)
+    for node, d in seeds.items():
+        dist[node] = min(dist[node], d)
+    for _ in range(len(graph.nodes)):
+        changed = False
+        for a, links in enumerate(graph.adjacency):
+            if dist[a] == math.inf:
+                continue
+            for b, w in links:
+                if dist[a] + w < dist[b] - 1e-9:
+                    dist[b] = dist[a] + w
+                    changed = True
+        if not changed:
+            break
+    return dist
+
+def best_order(matrix):
+    """Shortest open tour from point 0 by trying every order."""
+    rest = range(1, len(matrix))
+    return min(tour_length(matrix, [0] + list(p)) for p in itertools.permutations(rest))
+
+def nearest_neighbour(matrix):
+    order, left = [0], set(range(1, len(matrix)))
+    while left:
+        nxt = min(left, key=lambda j: (matrix[order[-1]][j], j))
+        order.append(nxt)
+        left.remove(nxt)
+    return tour_length(matrix, order)
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and time the footpath routing engine.')
+    parser.add_argument('--tours', type=int, default=30, help='Random tours per size (default: 30)')
+    parser.add_argument('--budget', type=float, default=200, help='Tour budget in ms (default: 200)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    args = parser.parse_args()
+
+    graph = RoutingGraph.load()
+    with open(ROUTES_FILE, 'r', encoding='utf-8') as f:
+        routes = json.load(f)
+
+    print("="*60)
+    print("Footpath Routing Benchmark")
+    print("="*60)
+    print(f"Graph: {len(graph.nodes)} nodes")
+
+    failures = 0
+    for e, entrance in enumerate(routes['entrances']):
+        start = time.perf_counter()
+        dist, _ = graph.shortest_tree(graph.attach(*entrance['position']))
+        dijkstra_ms = (time.perf_counter() - start) * 1000
+        reference = bellman_ford(graph, graph.attach(*entrance['position']))
+        wrong_nodes = sum(1 for a, b, stored in zip(dist, reference, entrance['metres'])
+                          if (a == math.inf) != (b == math.inf)
+                          or (a < math.inf and (abs(a - b) > 0.01 or abs(stored - a) > 0.06)))
+        wrong_chains = 0
+        for i, per_entrance in enumerate(routes['memorials']['routes']):
+            if not per_entrance or not per_entrance[e]:
+                continue
+            metres, node = per_entrance[e]
+            chain = graph.path(entrance['parent'], node)
+            walked = sum(graph.edge_length(a, b) for a, b in zip(chain, chain[1:]))
+            seeds = graph.attach(*entrance['position'])
+            total = seeds.get(chain[0], math.inf) + walked + graph.memorial_seeds(i)[node]
+            wrong_chains += abs(total - metres) > 0.2
+        ok = not wrong_nodes and not wrong_chains
+        failures += not ok
+        print(f"  {'✓' if ok else '✗'} {entrance['name']}: tree in {dijkstra_ms:.1f} ms, "
+              f"{len(dist) - wrong_nodes}/{len(dist)} node distances match Bellman-Ford, "
+              f"{wrong_chains} memorial routes off")
+
+    rng = random.Random(args.seed)
+    located = [i for i in range(graph.memorial_count) if graph.memorial_seeds(i)]
+    start_seeds = graph.attach(*routes['entrances'][0]['position'])
+    from_start, _ = graph.shortest_tree(start_seeds)
+    reachable = [i for i in located if graph.reach(from_start, graph.memorial_seeds(i))[0] < math.inf]
+
+    print(f"\n{'stops':>6} {'matrix ms':>10} {'plan ms p50/max':>16} {'vs NN':>8} {'vs best':>8}")
+    for size in SIZES:
+        matrix_ms, plan_ms, gains, gaps = [], [], [], []
+        for _ in range(args.tours):
+            stops = rng.sample(reachable, size)
+            start = time.perf_counter()
+            matrix = graph.distance_matrix([start_seeds] + [graph.memorial_seeds(i) for i in stops])
+            matrix_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            order, length, _ = plan_tour(matrix, args.budget)
+            plan_ms.append((time.perf_counter() - start) * 1000)
+            if sorted(order) != list(range(size + 1)) or order[0] != 0:
+                failures += 1
+            gains.append(1 - length / nearest_neighbour(matrix))
+            if size == EXACT_STOPS:
+                gaps.append(length / best_order(matrix) - 1)
+        late = max(plan_ms) > args.budget * 1.5 + 20
+        poor = bool(gaps) and statistics.mean(gaps) > 0.03
+        failures += late or poor
+        best = f"{statistics.mean(gaps) * 100:+.1f}%" if gaps else '-'
+        print(f"{size:>6} {statistics.mean(matrix_ms):>10.1f} "
+              f"{statistics.median(plan_ms):>7.1f}/{max(plan_ms):<8.1f} {-statistics.mean(gains) * 100:>+7.1f}% {best:>8}"
+              f"{'  ✗ over budget' if late else ''}{'  ✗ too far from best' if poor else ''}")
+
+    if failures:
+        print(f"\n✗ {failures} check(s) failed")
+        sys.exit(1)
+    print("\n✓ Trees match Bellman-Ford; tours stay within budget and near the best order")
+
+if __name__ == '__main__':
+    main()
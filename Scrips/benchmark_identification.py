@@ -0,0 +1,332 @@
+"""
+Accuracy and latency benchmark for photo identification.
+
+Builds query photos from the memorial photos themselves by applying the
+kinds of damage a phone snapshot adds (--augment):
+
+  original     the photo as indexed (sanity check: top-5 must be 100%; top-1
+               only misses where two memorials have near-identical photos)
+  crop         keep 65-90% of each side, off centre
+  rotate       tilt by 4-12 degrees, then crop away the corners
+  perspective  move each corner inwards by up to 12% (camera not square on)
+  brightness   brightness x0.6-1.4 and contrast x0.7-1.3
+  jpeg         re-encode at quality 15-40
+  phone        crop + rotate + perspective + brightness + jpeg together
+
+Every descriptor is indexed over all photos and queried with every
+augmented photo through a batched k-NN matcher:
+
+  ahash, dhash, phash   64-bit hashes from image_hashes.py, Hamming distance
+                        (XOR + byte popcount over a query x index matrix)
+  hash_sum              ahash + dhash + phash distances (what the page ranks by)
+  colour_hist           8x4x4 HSV histogram, Hellinger distance
+  tiny_image            16x16 grey, zero mean, unit length, cosine distance
+  gradients             4x4 cells x 8 gradient orientations, cosine distance
+
+For each descriptor and augmentation it reports top-1 and top-5 accuracy,
+then the time to describe one query, the time to match one query against the
+index (batched), and the index size.
+
+Usage:
+  python Scrips/benchmark_identification.py [--augment crop,phone] [--limit 100]
+      [--seed 1] [--report identification_benchmark.json]
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageOps
+
+from image_hashes import ALGORITHMS, HASH_FUNCTIONS, POPCOUNT8
+from image_index import IMG_DIR, MEMORIALS_JSON, build_index, scan_images
+
+# Photos are decoded once at this size (long side); hashes use 32 px at most
+BASE_SIZE = 384
+TOP_K = 5
+
+
+# Augmentations
+
+def augment_crop(img, rng):
+    w, h = img.size
+    cw, ch = int(w * rng.uniform(0.65, 0.9)), int(h * rng.uniform(0.65, 0.9))
+    x, y = rng.randint(0, w - cw), rng.randint(0, h - ch)
+    return img.crop((x, y, x + cw, y + ch))
+
+
+def augment_rotate(img, rng):
+    angle = rng.uniform(4, 12) * rng.choice((-1, 1))
+    rotated = img.rotate(angle, resample=Image.Resampling.BILINEAR)
+    w, h = img.size
+    margin = 0.12
+    return rotated.crop((int(w * margin), int(h * margin), int(w * (1 - margin)), int(h * (1 - margin))))
+
+
+def perspective_coefficients(source, target):
+    """
+    Coefficients for Image.transform(PERSPECTIVE) mapping target corners to source corners.
+
+    Args:
+        source: Four (x, y) points in the input image
+        target: The four (x, y) points they should land on in the output
+    """
+    rows = []
+    for (x, y), (u, v) in zip(target, source):
+        rows.append([x, y, 1, 0, 0, 0, -u * x, -u * y])
+        rows.append([0, 0, 0, x, y, 1, -v * x, -v * y])
+    return np.linalg.solve(np.array(rows, dtype=np.float64), np.array(source, dtype=np.float64).ravel())
+
+
+def augment_perspective(img, rng):
+    w, h = img.size
+    corners = [(0, 0), (w, 0), (w, h), (0, h)]
+    moved = [(x + (1 if x == 0 else -1) * rng.uniform(0, 0.12) * w,
+              y + (1 if y == 0 else -1) * rng.uniform(0, 0.12) * h) for x, y in corners]
+    coefficients = perspective_coefficients(moved, corners)
+    return img.transform(img.size, Image.Transform.PERSPECTIVE, tuple(coefficients),
+                         resample=Image.Resampling.BILINEAR)
+
+
+def augment_brightness(img, rng):
+    img = ImageEnhance.Brightness(img).enhance(rng.uniform(0.6, 1.4))
+    return ImageEnhance.Contrast(img).enhance(rng.uniform(0.7, 1.3))
+
+
+def augment_jpeg(img, rng):
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=rng.randint(15, 40))
+    buffer.seek(0)
+    return Image.open(buffer).convert('RGB')
+
+
+def augment_phone(img, rng):
+    for step in (augment_crop, augment_rotate, augment_perspective, augment_brightness, augment_jpeg):
+        img = step(img, rng)
+    return img
+
+
+AUGMENTATIONS = {
+    'original': lambda img, rng: img,
+    'crop': augment_crop,
+    'rotate': augment_rotate,
+    'perspective': augment_perspective,
+    'brightness': augment_brightness,
+    'jpeg': augment_jpeg,
+    'phone': augment_phone,
+}
+
+
+# Descriptors: describe(rgb image) -> 1-D array; kind says how to compare them
+
+class Descriptor:
+    """
+    One way of describing a photo.
+
+    Args:
+        name: Name in the report
+        kind: 'hamming' (uint64 words) or 'cosine' (float32, unit length)
+        describe: Function(PIL RGB image) -> 1-D NumPy array
+    """
+
+    def __init__(self, name, kind, describe):
+        self.name = name
+        self.kind = kind
+        self.describe = describe
+
+
+def _hash_words(names):
+    def describe(img):
+        grey = img.convert('L')
+        return np.array([HASH_FUNCTIONS[name](grey) for name in names], dtype=np.uint64)
+    return describe
+
+
+def colour_histogram(img):
+    hsv = np.asarray(img.resize((64, 64), Image.Resampling.BOX).convert('HSV')).reshape(-1, 3)
+    bins = (hsv[:, 0] // 32).astype(np.int64) * 16 + (hsv[:, 1] // 64) * 4 + hsv[:, 2] // 64
+    hist = np.bincount(bins, minlength=128).astype(np.float32)
+    # Square roots of a distribution have unit length, and their cosine distance
+    # ranks like the Hellinger distance
+    return np.sqrt(hist / hist.sum())
+
+
+def tiny_image(img):
+    pixels = np.asarray(img.convert('L').resize((16, 16), Image.Resampling.BOX), dtype=np.float32).ravel()
+    pixels -= pixels.mean()
+    return pixels / (np.linalg.norm(pixels) or 1)
+
+
+def gradient_histogram(img):
+    grey = np.asarray(img.convert('L').resize((64, 64), Image.Resampling.BOX), dtype=np.float32)
+    gy, gx = np.gradient(grey)
+    magnitude = np.hypot(gx, gy)
+    orientation = ((np.arctan2(gy, gx) % np.pi) / np.pi * 8).astype(np.int64) % 8
+    cell = (np.arange(64) // 16)
+    index = (cell[:, None] * 4 + cell[None, :]) * 8 + orientation
+    hist = np.bincount(index.ravel(), weights=magnitude.ravel(), minlength=128).astype(np.float32)
+    return hist / (np.linalg.norm(hist) or 1)
+
+
+DESCRIPTORS = [Descriptor(name, 'hamming', _hash_words([name])) for name in ALGORITHMS] + [
+    Descriptor('hash_sum', 'hamming', _hash_words(ALGORITHMS)),
+    Descriptor('colour_hist', 'cosine', colour_histogram),
+    Descriptor('tiny_image', 'cosine', tiny_image),
+    Descriptor('gradients', 'cosine', gradient_histogram),
+]
+
+
+# Batched matcher
+
+def batch_distances(kind, queries, index):
+    """
+    Distance from every query to every index entry.
+
+    Args:
+        kind: Descriptor kind
+        queries: (Q, D) array
+        index: (N, D) array
+
+    Returns:
+        (Q, N) array, smaller is closer
+    """
+    if kind == 'hamming':
+        diff = np.bitwise_xor(queries[:, None, :], index[None, :, :])
+        return POPCOUNT8[diff.view(np.uint8)].reshape(len(queries), len(index), -1).sum(axis=2, dtype=np.int64)
+    return 1 - queries @ index.T
+
+
+def top_k(distances, k=TOP_K):
+    """Index positions of the k closest entries for every query, closest first."""
+    k = min(k, distances.shape[1])
+    part = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(distances, part, axis=1).argsort(axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1)
+
+
+def load_photos(limit=None, size=BASE_SIZE):
+    """
+    Decode every memorial photo once, upright and reduced.
+
+    Returns:
+        List of (memorial key, RGB image)
+    """
+    with open(MEMORIALS_JSON, 'r', encoding='utf-8') as f:
+        memorials = json.load(f)
+    images, _ = build_index(memorials, scan_images())
+    photos = []
+    for key in sorted(images)[:limit]:
+        with Image.open(Path(IMG_DIR) / images[key]['file']) as img:
+            img.draft('RGB', (size, size))
+            img = ImageOps.exif_transpose(img).convert('RGB')
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        photos.append((key, img))
+    return photos
+
+
+def run(photos, augmentations, descriptors, seed):
+    """
+    Benchmark every descriptor on every augmentation.
+
+    Returns:
+        List of result dicts (descriptor, augmentation, queries, top1, top5,
+        describe_us, match_us, index_bytes)
+    """
+    queries = {}
+    for augmentation in augmentations:
+        rng = random.Random(f"{seed}:{augmentation}")
+        queries[augmentation] = [AUGMENTATIONS[augmentation](img, rng) for _, img in photos]
+
+    truth = np.arange(len(photos))
+    results = []
+    for descriptor in descriptors:
+        index = np.stack([descriptor.describe(img) for _, img in photos])
+        for augmentation in augmentations:
+            start = time.perf_counter()
+            described = np.stack([descriptor.describe(img) for img in queries[augmentation]])
+            describe_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            best = top_k(batch_distances(descriptor.kind, described, index))
+            match_time = time.perf_counter() - start
+
+            results.append({
+                'descriptor': descriptor.name,
+                'augmentation': augmentation,
+                'queries': len(photos),
+                'top1': float(np.mean(best[:, 0] == truth)),
+                'top5': float(np.mean((best == truth[:, None]).any(axis=1))),
+                'describe_us': describe_time / len(photos) * 1e6,
+                'match_us': match_time / len(photos) * 1e6,
+                'index_bytes': index.nbytes,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark photo identification descriptors.')
+    parser.add_argument('--augment', type=str, default=','.join(AUGMENTATIONS),
+                        help=f"Comma-separated augmentations (default: all of {', '.join(AUGMENTATIONS)})")
+    parser.add_argument('--descriptors', type=str, default=','.join(d.name for d in DESCRIPTORS),
+                        help='Comma-separated descriptors (default: all)')
+    parser.add_argument('--limit', type=int, default=None, help='Only use the first N photos')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the augmentations (default: 1)')
+    parser.add_argument('--report', type=str, default=None, help='Also write the results as JSON')
+    args = parser.parse_args()
+
+    augmentations = args.augment.split(',')
+    wanted = args.descriptors.split(',')
+    unknown = [name for name in augmentations if name not in AUGMENTATIONS]
+    unknown += [name for name in wanted if name not in {d.name for d in DESCRIPTORS}]
+    if unknown:
+        parser.error(f"unknown augmentation or descriptor: {', '.join(unknown)}")
+    descriptors = [d for d in DESCRIPTORS if d.name in wanted]
+
+    print("="*80)
+    print("Photo Identification Benchmark")
+    print("="*80)
+
+    start = time.perf_counter()
+    photos = load_photos(args.limit)
+    print(f"Photos: {len(photos)} (decoded at {BASE_SIZE}px in {time.perf_counter() - start:.1f} s)")
+    print(f"Augmentations: {', '.join(augmentations)} (seed {args.seed})")
+
+    results = run(photos, augmentations, descriptors, args.seed)
+
+    print()
+    print(f"{'Descriptor':<13}{'Augment':<13}{'Top-1':>8}{'Top-5':>8}{'Describe':>12}{'Match':>10}{'Index':>10}")
+    print("-"*80)
+    failures = 0
+    for result in results:
+        print(f"{result['descriptor']:<13}{result['augmentation']:<13}"
+              f"{result['top1']:>7.1%}{result['top5']:>8.1%}"
+              f"{result['describe_us']:>9.0f} us{result['match_us']:>7.1f} us"
+              f"{result['index_bytes'] / 1024:>7.1f} KB")
+        if result['augmentation'] == 'original' and result['top5'] < 1:
+            failures += 1
+            print(f"  ✗ {result['descriptor']} does not find every unmodified photo in its top {TOP_K}")
+
+    print("-"*80)
+    print("Mean over augmentations (excluding original):")
+    for descriptor in descriptors:
+        rows = [r for r in results if r['descriptor'] == descriptor.name and r['augmentation'] != 'original']
+        if rows:
+            print(f"  {descriptor.name:<13}top-1 {np.mean([r['top1'] for r in rows]):>6.1%}"
+                  f"  top-5 {np.mean([r['top5'] for r in rows]):>6.1%}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'photos': len(photos), 'seed': args.seed, 'results': results}, f, indent=2)
+        print(f"\n📄 Report saved to: {args.report}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark and equivalence check for the compiled name cleaner (name_cleaner.py).
+
+Builds a roll of --names names (default 1,000,000) from the real AFM names
+plus randomly damaged copies that hit every rule (stray punctuation, odd
+Unicode spaces, accents, "&Bar" spacing, trailing numbers), then cleans it
+with the original clean_name(), NameCleaner.clean() and
+NameCleaner.clean_many(). All three must give exactly the same strings.
+
+Usage:
+  python Scrips/benchmark_name_cleaner.py [--names 1000000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from clean_afm_names import clean_name
+from name_cleaner import NameCleaner
+
+NOISE = ['•', '*', ':', '!', '"', '+', '﻿', '°', ',', '\xa0', '​', ' ',
+         ' ', ' ', 'É', 'Ư', 'Ñ', '  ', '\t', '\n', '　', ' ', '&']
+SUFFIXES = ['', '', '', ' 595', '  12', ' 7\n', ' DFC&Bar', ' DFC & 2Bars', ' DSO&  3 Bar',
+            ' & Bar 12', '& 1234', ' ٣٤']
+
+def damaged(name, rng):
+    """Return name with a few random OCR-style insertions and a suffix."""
+    chars = list(name)
+    for _ in range(rng.randint(0, 3)):
+        chars.insert(rng.randint(0, len(chars)), rng.choice(NOISE))
+    return ''.join(chars) + rng.choice(SUFFIXES)
+
+def build_roll(names, size, seed=3):
+    """Grow the real names to size entries, half of the extras damaged."""
+    rng = random.Random(seed)
+    roll = list(names)
+    while len(roll) < size:
+        name = rng.choice(names)
+        roll.append(damaged(name, rng) if rng.random() < 0.5 else name)
+    return roll[:size]
+
+def timed(label, func, names):
+    start = time.perf_counter()
+    result = func(names)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28}{elapsed:8.2f} s  {len(names) / elapsed / 1000:8.0f}k names/s")
+    return result, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the compiled name cleaner.')
+    parser.add_argument('--names', type=int, default=1_000_000, help='Roll size (default: 1000000)')
+    args = parser.parse_args()
+
+    json_file = Path(__file__).parent.parent / 'data' / 'afm-memorials.json'
+    with open(json_file, 'r', encoding='utf-8') as f:
+        names = [entry['name'] for entry in json.load(f)]
+
+    print("="*60)
+    print("Name Cleaner Benchmark")
+    print("="*60)
+    roll = build_roll(names, args.names)
+    print(f"Names: {len(roll)}")
+    print()
+
+    expected, legacy_s = timed('clean_name() per name', lambda ns: [clean_name(n) for n in ns], roll)
+    cleaner = NameCleaner()
+    per_name, per_name_s = timed('NameCleaner.clean()', lambda ns: [cleaner.clean(n) for n in ns], roll)
+    batch_cleaner = NameCleaner()
+    batch, batch_s = timed('NameCleaner.clean_many()', batch_cleaner.clean_many, roll)
+
+    print()
+    print(f"  Speedup: {legacy_s / per_name_s:.1f}x per name, {legacy_s / batch_s:.1f}x batched")
+
+    print("\nRule statistics (batched):")
+    for rule, count in batch_cleaner.report():
+        print(f"  {rule:<24}{count:>10}")
+
+    mismatches = [i for i, want in enumerate(expected) if per_name[i] != want or batch[i] != want]
+    if cleaner.stats != batch_cleaner.stats:
+        print("\n✗ Per-name and batched rule statistics differ")
+        sys.exit(1)
+    if mismatches:
+        for i in mismatches[:10]:
+            print(f"  {roll[i]!r}: expected {expected[i]!r}, got {per_name[i]!r} / {batch[i]!r}")
+        print(f"\n✗ {len(mismatches)} names differ from clean_name()")
+        sys.exit(1)
+    print("\n✓ Output identical to clean_name()")
+
+if __name__ == '__main__':
+    main()
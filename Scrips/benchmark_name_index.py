@@ -0,0 +1,106 @@
+"""
+Micro-benchmark for the sharded name index (name_index.py).
+
+Compares the indexed search against the linear scan the search pages do
+today (normalize every name, test each one for the query) and checks that
+both return the same records. --scale N repeats the AFM names N times to
+show how each approach behaves as the roll grows.
+
+Usage:
+  python Scrips/benchmark_name_index.py [--scale N] [--queries N]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from name_index import MIN_QUERY, NameIndex, load_sources, normalize_name, write_index_for_names
+
+def make_queries(names, count, seed=1):
+    """Pick realistic queries: prefixes and infixes of real names, 2-6 characters."""
+    rng = random.Random(seed)
+    normalized = [normalize_name(name) for name in names if len(normalize_name(name)) >= 2]
+    queries = []
+    while len(queries) < count:
+        text = rng.choice(normalized)
+        length = rng.randint(2, min(6, len(text)))
+        start = 0 if rng.random() < 0.6 else rng.randint(0, len(text) - length)
+        query = text[start:start + length].strip()
+        if len(query) >= MIN_QUERY:
+            queries.append(query)
+    return queries
+
+def linear_search(normalized, query):
+    """What the pages do today: scan every name."""
+    query = normalize_name(query)
+    if len(query) < MIN_QUERY:
+        return set()
+    return {i for i, text in enumerate(normalized) if query in text}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the sharded name index.')
+    parser.add_argument('--scale', type=int, default=1, help='Repeat the AFM names N times (default: 1)')
+    parser.add_argument('--queries', type=int, default=300, help='Number of queries (default: 300)')
+    args = parser.parse_args()
+
+    data_dir = Path(__file__).parent.parent / 'data'
+    names, sources = load_sources(data_dir)
+    if args.scale > 1:
+        afm = sources[0]
+        extra = names[afm['offset']:afm['offset'] + afm['count']] * (args.scale - 1)
+        names = names + extra
+        sources = sources + [{'name': 'synthetic', 'file': None, 'offset': len(names) - len(extra),
+                              'count': len(extra)}]
+
+    print("="*60)
+    print("Name Index Benchmark")
+    print("="*60)
+    print(f"Names: {len(names)} (scale x{args.scale})")
+
+    queries = make_queries(names, args.queries)
+    normalized = [normalize_name(name) for name in names]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        manifest = write_index_for_names(names, sources, tmp)
+        build_s = time.perf_counter() - start
+        print(f"Index build: {build_s:.2f} s, {len(manifest['shards'])} shards")
+
+        start = time.perf_counter()
+        expected = [linear_search(normalized, query) for query in queries]
+        linear_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        index = NameIndex(tmp)
+        start = time.perf_counter()
+        cold = [index.search(query) for query in queries]
+        cold_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        shards_loaded = index.shards_loaded
+
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query)
+        warm_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        loaded_sizes = [size for key, size in manifest['shards'].items() if key in index.loaded_keys]
+
+    mismatches = sum(1 for got, want in zip(cold, expected) if set(got) != want or len(got) != len(want))
+
+    print()
+    print(f"Queries: {len(queries)}")
+    print(f"  Linear scan:          {linear_ms:8.3f} ms/query")
+    print(f"  Index (cold shards):  {cold_ms:8.3f} ms/query")
+    print(f"  Index (warm shards):  {warm_ms:8.3f} ms/query")
+    print(f"  Speedup (warm):       {linear_ms / warm_ms:8.1f}x")
+    print(f"  Shards touched: {shards_loaded} of {len(manifest['shards'])}, "
+          f"average {sum(loaded_sizes) / max(len(loaded_sizes), 1) / 1024:.1f} KB each")
+
+    if mismatches:
+        print(f"\n✗ {mismatches} queries returned different records from the linear scan")
+        sys.exit(1)
+    print("\n✓ Results identical to the linear scan")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Check and time the memorial spatial grid (spatial_index.py) against brute force.
+
+Random positions across the site (and a margin around it) are queried both
+ways:
+
+  brute force  haversine to every memorial, sort, filter (what the nearby
+               list and AR view did on every GPS update)
+  grid         read the cells the radius covers, measure those memorials
+
+Radius queries must return the same memorials as brute force (apart from
+points within --tolerance metres of the radius, where the flat projection
+and haversine may disagree), k-nearest queries the same distances, and the
+neighbour lists in data/memorial-grid.json must match a fresh brute-force
+computation. --scale N adds N-1 jittered copies of every memorial to show how
+both approaches grow.
+
+Usage:
+  python Scrips/benchmark_spatial_index.py [--queries 2000] [--scale 1] [--seed 1]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from spatial_index import GRID_FILE, NEIGHBOURS, SpatialIndex, haversine, load_memorials, memorial_position
+
+RADII = (50, 200)
+
+def brute_within(positions, lat, lng, radius):
+    found = [(i, haversine(lat, lng, p[0], p[1])) for i, p in enumerate(positions) if p is not None]
+    found.sort(key=lambda item: (item[1], item[0]))
+    return [item for item in found if item[1] <= radius]
+
+def brute_nearest(positions, lat, lng, k, exclude=None):
+    found = [(i, haversine(lat, lng, p[0], p[1])) for i, p in enumerate(positions)
+             if p is not None and i != exclude]
+    found.sort(key=lambda item: (item[1], item[0]))
+    return found[:k]
+
+def same_within(got, want, radius, tolerance):
+    """Same memorials, ignoring ones within tolerance of the radius."""
+    got_ids = {i for i, d in got if d < radius - tolerance}
+    want_ids = {i for i, d in want if d < radius - tolerance}
+    edge = {i for i, d in got + want if abs(d - radius) <= tolerance}
+    return got_ids - edge == want_ids - edge and {i for i, _ in got} - edge == {i for i, _ in want} - edge
+
+def same_distances(got, want, tolerance):
+    return len(got) == len(want) and all(abs(a[1] - b[1]) <= tolerance for a, b in zip(got, want))
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the memorial spatial grid against brute force.')
+    parser.add_argument('--queries', type=int, default=2000, help='Random positions (default: 2000)')
+    parser.add_argument('--scale', type=int, default=1, help='Jittered copies of each memorial (default: 1)')
+    parser.add_argument('--tolerance', type=float, default=0.05, help='Metres of disagreement allowed (default: 0.05)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    memorials = load_memorials()
+    positions = [memorial_position(m) for m in memorials]
+    for _ in range(args.scale - 1):
+        positions += [None if p is None else (p[0] + rng.uniform(-2e-4, 2e-4), p[1] + rng.uniform(-3e-4, 3e-4))
+                      for p in positions[:len(memorials)]]
+
+    located = [p for p in positions if p is not None]
+    lat_min, lat_max = min(p[0] for p in located) - 5e-4, max(p[0] for p in located) + 5e-4
+    lng_min, lng_max = min(p[1] for p in located) - 8e-4, max(p[1] for p in located) + 8e-4
+    queries = [(rng.uniform(lat_min, lat_max), rng.uniform(lng_min, lng_max)) for _ in range(args.queries)]
+
+    print("="*60)
+    print("Spatial Grid Benchmark")
+    print("="*60)
+    print(f"Memorials: {len(positions)} ({len(located)} located, scale x{args.scale})")
+    print(f"Queries: {len(queries)}")
+
+    start = time.perf_counter()
+    index = SpatialIndex(positions)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Grid build: {build_ms:.1f} ms, {len(index.cells)} cells of {index.cell:g} m")
+
+    failures = 0
+    for radius in RADII:
+        start = time.perf_counter()
+        want = [brute_within(positions, lat, lng, radius) for lat, lng in queries]
+        brute_us = (time.perf_counter() - start) * 1e6 / len(queries)
+        start = time.perf_counter()
+        got = [index.within(lat, lng, radius) for lat, lng in queries]
+        grid_us = (time.perf_counter() - start) * 1e6 / len(queries)
+        wrong = sum(not same_within(g, w, radius, args.tolerance) for g, w in zip(got, want))
+        worst = max((abs(a[1] - b[1]) for g, w in zip(got, want) if len(g) == len(w) for a, b in zip(g, w)),
+                    default=0.0)
+        failures += wrong > 0
+        print(f"\n  Within {radius} m: brute force {brute_us:8.1f} us, grid {grid_us:6.1f} us "
+              f"({brute_us / grid_us:.0f}x), {sum(map(len, got)) / len(got):.1f} found on average")
+        print(f"    {'✓' if not wrong else '✗'} {len(queries) - wrong}/{len(queries)} match brute force, "
+              f"largest distance difference {worst * 100:.1f} cm")
+
+    start = time.perf_counter()
+    want = [brute_nearest(positions, lat, lng, NEIGHBOURS) for lat, lng in queries]
+    brute_us = (time.perf_counter() - start) * 1e6 / len(queries)
+    start = time.perf_counter()
+    got = [index.nearest(lat, lng, NEIGHBOURS) for lat, lng in queries]
+    grid_us = (time.perf_counter() - start) * 1e6 / len(queries)
+    wrong = sum(not same_distances(g, w, args.tolerance) for g, w in zip(got, want))
+    failures += wrong > 0
+    print(f"\n  Nearest {NEIGHBOURS}: brute force {brute_us:8.1f} us, grid {grid_us:6.1f} us "
+          f"({brute_us / grid_us:.0f}x)")
+    print(f"    {'✓' if not wrong else '✗'} {len(queries) - wrong}/{len(queries)} match brute force")
+
+    # The committed grid file must describe the current memorials.json
+    if args.scale == 1:
+        with open(GRID_FILE, 'r', encoding='utf-8') as f:
+            grid = json.load(f)
+        fresh = index.to_json(grid['k'])
+        stale = (grid['count'] != len(memorials) or grid.get('fingerprint') != fresh['fingerprint']
+                 or grid['cells'] != fresh['cells'])
+        wrong = 0
+        for i, items in enumerate(grid['neighbours']):
+            if items is None:
+                wrong += positions[i] is not None
+                continue
+            want = brute_nearest(positions, *positions[i], grid['k'], exclude=i)
+            wrong += not same_distances([tuple(item) for item in items], want, 0.05 + args.tolerance)
+        failures += stale or wrong > 0
+        print(f"\n  {'✓' if not (stale or wrong) else '✗'} {GRID_FILE.name}: "
+              f"{'stale, rebuild with spatial_index.py; ' if stale else ''}"
+              f"{len(grid['neighbours']) - wrong}/{len(grid['neighbours'])} neighbour lists match brute force")
+
+    if failures:
+        print(f"\n✗ {failures} check(s) failed")
+        sys.exit(1)
+    print("\n✓ Grid results match brute force")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Fault-injection and scaling check for validate_afm.py.
+
+First breaks a copy of the dataset in known ways (null date, wrong
+panel_group, gap in panel_number, panel split in two, unknown service,
+out-of-range year) and checks that each fault is reported by its rule.
+
+Then grows every panel to --scale times its length (names repeated,
+panel_number and panel_Loc recomputed so the structure stays valid) and
+times validate() at several sizes. Time per entry must stay flat.
+
+Usage:
+  python Scrips/benchmark_validator.py [--scale 100]
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+
+from afm_panels import calculate_panel_location
+from validate_afm import RULES, validate
+
+def scaled(entries, scale):
+    """Repeat every panel's entries scale times, keeping panels valid."""
+    panels = {}
+    for entry in entries:
+        panels.setdefault(entry['panel'], []).append(entry)
+    data = []
+    for panel_entries in panels.values():
+        total = len(panel_entries) * scale
+        for position in range(total):
+            entry = dict(panel_entries[position % len(panel_entries)])
+            entry['panel_number'] = position + 1
+            entry['panel_Loc'] = calculate_panel_location(position, total)
+            data.append(entry)
+    return data
+
+def inject_faults(entries):
+    """Return a broken copy of entries and the rules expected to fire."""
+    data = copy.deepcopy(entries)
+    data[10]['date'] = None
+    data[20]['panel_group'] = 'Z'
+    data[30]['panel_number'] += 1
+    data[40]['service'] = 'Home Guard'
+    data[50]['date'] = 1066
+    # A stray panel 1 entry at the end also shifts panel 1's thirds
+    data.append(dict(data[0]))
+    return data, {'required_fields', 'panel_group', 'panel_number_contiguous', 'service',
+                  'date_range', 'panels_contiguous', 'panel_location'}
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and benchmark the AFM validator.')
+    parser.add_argument('--scale', type=int, default=100, help='Largest size relative to today (default: 100)')
+    args = parser.parse_args()
+
+    json_file = Path(__file__).parent.parent / 'data' / 'afm-memorials.json'
+    with open(json_file, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    print("="*60)
+    print("Validator Fault Injection and Scaling")
+    print("="*60)
+
+    failures = 0
+    broken, expected = inject_faults(entries)
+    report, _ = validate(broken)
+    fired = {r['rule'] for r in report['rules'] if r['count'] and r['severity'] == 'error'}
+    for rule in sorted(expected):
+        ok = rule in fired
+        failures += not ok
+        print(f"  {'✓' if ok else '✗'} {rule} reports the injected fault")
+    for rule in sorted(fired - expected):
+        failures += 1
+        print(f"  ✗ {rule} fired without an injected fault")
+
+    print()
+    print(f"{'Scale':>6}{'Entries':>12}{'Seconds':>10}{'us/entry':>10}")
+    print("-"*38)
+    per_entry = []
+    for scale in sorted({1, 10, args.scale}):
+        data = scaled(entries, scale)
+        start = time.perf_counter()
+        report, _ = validate(data, RULES)
+        elapsed = time.perf_counter() - start
+        per_entry.append(elapsed / len(data) * 1e6)
+        print(f"{scale:>5}x{len(data):>12}{elapsed:>10.2f}{per_entry[-1]:>10.2f}")
+        if report['errors']:
+            failures += 1
+            print(f"  ✗ {report['errors']} errors on the scaled copy")
+        del data
+
+    growth = per_entry[-1] / per_entry[0]
+    print("-"*38)
+    print(f"Time per entry at {args.scale}x vs 1x: {growth:.2f}x")
+    if growth > 3:
+        failures += 1
+        print("\n✗ Validation time is growing faster than linearly")
+
+    if failures:
+        sys.exit(1)
+    print("\n✓ Faults detected and validation stays linear")
+
+if __name__ == '__main__':
+    main()
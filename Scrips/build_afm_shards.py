@@ -0,0 +1,190 @@
+"""
+Split data/afm-memorials.json into per-wall and per-panel shard files.
+
+Pages that only need one wall or one panel can fetch a few kilobytes instead
+of the full 2.3 MB roll of honour. The output goes to data/afm/:
+
+  data/afm/manifest.json      panel ranges -> shard URLs, counts and hashes
+                              (compact; "hash" is the first 16 hex digits of
+                              the shard's SHA-256, enough for cache busting),
+                              plus each panel's map pin [lng, lat] and the
+                              per-wall pin count check (afm_pins.py)
+  data/afm/walls/<A-I>.json   every entry on one wall
+  data/afm/panels/<n>.json    every entry on one panel
+
+Shards keep the same record format as afm-memorials.json but are written
+without indentation. URLs in the manifest are relative to the manifest.
+Shards whose content has not changed are left untouched, so re-running after
+a one-wall ingest only rewrites that wall's files.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from afm_dataset import sha256_bytes, write_bytes_atomic, write_json_atomic
+from afm_pins import resolve_panel_pins
+from panel_registry import registry
+
+MANIFEST_VERSION = 1
+HASH_LENGTH = 16
+
+def wall_ranges():
+    """
+    List the wall panel ranges from the panel registry.
+
+    Returns:
+        List of (wall, first_panel, last_panel) tuples in panel order
+    """
+    return registry().wall_ranges()
+
+def encode_shard(entries):
+    """Serialize a shard as compact UTF-8 JSON."""
+    return json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def write_shard(path, data):
+    """
+    Write a shard file unless it already holds exactly this content.
+
+    Returns:
+        True if the file was written
+    """
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_bytes_atomic(path, data)
+    return True
+
+def shard_record(url, entries, data):
+    """Build the manifest record for one shard."""
+    return {
+        'url': url,
+        'count': len(entries),
+        'bytes': len(data),
+        'hash': sha256_bytes(data)[:HASH_LENGTH],
+    }
+
+def build_shards(entries, output_dir, source_sha256=None):
+    """
+    Write wall and panel shards plus the manifest.
+
+    Args:
+        entries: List of memorial entries (afm-memorials.json order)
+        output_dir: Directory to write the shards and manifest into
+        source_sha256: Hash of the source file, recorded in the manifest
+
+    Returns:
+        Tuple of (manifest dict, number of files written, list of panels that
+        fall outside every wall range)
+    """
+    output_dir = Path(output_dir)
+    panel_pins, pin_checks = resolve_panel_pins()
+
+    by_panel = {}
+    for entry in entries:
+        by_panel.setdefault(entry.get('panel'), []).append(entry)
+
+    written = 0
+    walls = []
+    panels = {}
+    expected_files = set()
+
+    for wall, first, last in wall_ranges():
+        wall_entries = []
+        for panel in range(first, last + 1):
+            panel_entries = by_panel.pop(panel, None)
+            if not panel_entries:
+                continue
+            wall_entries.extend(panel_entries)
+
+            url = f"panels/{panel}.json"
+            data = encode_shard(panel_entries)
+            written += write_shard(output_dir / url, data)
+            expected_files.add(url)
+            panels[str(panel)] = dict(shard_record(url, panel_entries, data), wall=wall,
+                                      pin=panel_pins.get(panel))
+
+        url = f"walls/{wall}.json"
+        data = encode_shard(wall_entries)
+        written += write_shard(output_dir / url, data)
+        expected_files.add(url)
+        walls.append(dict(shard_record(url, wall_entries, data), wall=wall, panels=[first, last]))
+
+    # Drop shards for panels that no longer have any entries
+    for subdir in ('panels', 'walls'):
+        for path in (output_dir / subdir).glob('*.json'):
+            if f"{subdir}/{path.name}" not in expected_files:
+                path.unlink()
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': 'afm-memorials.json',
+        'source_sha256': source_sha256,
+        'count': len(entries),
+        'walls': walls,
+        'panels': panels,
+        'pin_check': [check for check in pin_checks if check['missing'] or check['unused']],
+    }
+    write_json_atomic(output_dir / 'manifest.json', manifest, indent=None)
+
+    unassigned = sorted(panel for panel in by_panel if panel is not None)
+    return manifest, written, unassigned
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Split afm-memorials.json into per-wall and per-panel shards.'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Output directory (default: data/afm)'
+    )
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent
+    json_file = script_dir.parent / 'data' / 'afm-memorials.json'
+    output_dir = Path(args.output) if args.output else script_dir.parent / 'data' / 'afm'
+
+    print("="*60)
+    print("AFM Shard Builder")
+    print("="*60)
+    print(f"Input file: {json_file}")
+    print(f"Output directory: {output_dir}")
+    print()
+
+    raw = json_file.read_bytes()
+    entries = json.loads(raw)
+    print(f"Loaded {len(entries)} entries ({len(raw) / 1024:.0f} KB)")
+
+    manifest, written, unassigned = build_shards(entries, output_dir, sha256_bytes(raw))
+
+    print(f"\n{'Wall':<6}{'Panels':<12}{'Entries':>8}{'Size':>10}")
+    print("-"*36)
+    for wall in manifest['walls']:
+        first, last = wall['panels']
+        print(f"{wall['wall']:<6}{f'{first}-{last}':<12}{wall['count']:>8}{wall['bytes'] / 1024:>8.1f} KB")
+
+    panel_sizes = [panel['bytes'] for panel in manifest['panels'].values()]
+    manifest_size = (output_dir / 'manifest.json').stat().st_size
+    print()
+    print(f"Panel shards: {len(panel_sizes)} "
+          f"(average {sum(panel_sizes) / max(len(panel_sizes), 1) / 1024:.1f} KB, "
+          f"largest {max(panel_sizes, default=0) / 1024:.1f} KB)")
+    print(f"Manifest: {manifest_size / 1024:.1f} KB")
+    print(f"Files written: {written} (unchanged shards were left alone)")
+
+    for check in manifest['pin_check']:
+        if check['missing']:
+            print(f"\n⚠ Wall {check['wall']}: {check['pins']} pins for {check['panels']} panels, "
+                  f"no location for panel(s) {check['missing']}")
+        else:
+            print(f"\n⚠ Wall {check['wall']}: {check['unused']} unused pin(s) in {check['file']}")
+
+    if unassigned:
+        print(f"\n⚠ Panels outside every wall range (not sharded): {unassigned}")
+
+    print("\nDone!")
+
+if __name__ == '__main__':
+    main()
@@ -2,9 +2,14 @@ import json
 import re
 from pathlib import Path
 
+from name_cleaner import NameCleaner
+
 def clean_name(name):
     """
     Clean OCR errors from names while preserving legitimate characters.
+
+    This is the reference definition of the rules; name_cleaner.NameCleaner
+    compiles the same rules into a single pass and must match it exactly.
     """
     original = name
     
@@ -96,10 +101,11 @@ def main():
     # Clean names
     print("\nCleaning names...")
     changes_made = 0
+    cleaner = NameCleaner()
+    cleaned_names = cleaner.clean_many([entry['name'] for entry in data])
     
-    for entry in data:
+    for entry, cleaned_name in zip(data, cleaned_names):
         original_name = entry['name']
-        cleaned_name = clean_name(original_name)
         
         if original_name != cleaned_name:
             entry['name'] = cleaned_name
@@ -107,6 +113,9 @@ def main():
             print(f"  {original_name} -> {cleaned_name}")
     
     print(f"\nTotal changes made: {changes_made}")
+    print("\nRule statistics:")
+    for rule, count in cleaner.report():
+        print(f"  {rule:<24}{count:>6}")
     
     # Save cleaned data
     print(f"\nSaving cleaned data to {json_file}...")
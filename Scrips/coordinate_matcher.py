@@ -0,0 +1,301 @@
+"""
+Match memorial names to photo / coordinate names through prebuilt indexes.
+
+Survey photos are named after the memorial they show, but not exactly:
+case, punctuation and spacing drift, phones add " 2" or "(1)" to repeats,
+and names get typos or are shortened. The old join compared every memorial
+with every photo name using substring tests in both directions, which is
+O(memorials x photos) and accepts loose matches ("Royal Scots" inside
+"Royal Scots Dragoon Guards").
+
+NameMatcher indexes the candidate names once:
+
+  exact       dict of the names as given
+  normalized  dict of NFKC + casefold, punctuation-free, single-spaced names
+              (copy suffixes like " 2" and "(1)" dropped)
+  tokens      inverted index token -> names containing it, with IDF weights
+  trigrams    inverted index of 3-character pieces, for names with typos
+
+and resolves a query in three steps. An exact or normalized hit is taken
+at once. Otherwise candidates come from the postings of the query's
+informative tokens (ones found in more than a quarter of all names, or in
+more than MAX_POSTINGS, are too common to narrow anything down), scored by
+IDF-weighted token overlap (Dice). Only when no candidate reaches
+MIN_CONFIDENCE that way (a typo, a dropped word) are trigram postings
+consulted too. The best few are then scored by the similarity of the
+normalized strings (the share of characters in their longest common
+subsequence, which catches typos), and ranked. Postings are capped, so the work per
+query stays the same however many photos are indexed.
+Each result carries a confidence and is flagged as ambiguous when a
+different name scores almost the same.
+
+A confident match can still be wrong when a memorial has no photo of its
+own and a sibling does ("Burma Railway Memorial" has no photo, "Sumatra
+Railway Memorial" does). MutualMatcher also indexes the memorial names and
+resolves the photo name back against them. A match is only accepted when
+the photo's best memorial is the one that asked for it (mutual best, so
+each photo goes to at most one memorial). Otherwise it is flagged
+ambiguous, with the competing memorial in claimed_by.
+
+Usage:
+  from coordinate_matcher import MutualMatcher
+  matcher = MutualMatcher(photo_names, memorial_names)
+  match = matcher.match('Royal Hussars Memorial')
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import chain
+
+# Confidence needed to use a match; below it the best candidate is only reported
+MIN_CONFIDENCE = 0.8
+# Two candidates this close in confidence are ambiguous
+AMBIGUITY_MARGIN = 0.05
+# Tokens and trigrams in more than this share of the names, or in more than
+# MAX_POSTINGS names, do not generate candidates
+COMMON_TOKEN_SHARE = 0.25
+MAX_POSTINGS = 64
+# Candidates (by token or trigram score) that also get the slower string similarity
+FUZZY_CANDIDATES = 10
+
+_SEPARATORS = re.compile(r"\W+")
+_COPY_SUFFIX = re.compile(r"(?:\s+\d{1,2}|\s*\(\d{1,2}\))$")
+
+
+def normalize(name):
+    """Comparable form of a name: NFKC, casefold, no punctuation or copy suffix."""
+    name = unicodedata.normalize('NFKC', name).casefold().replace("'", '').replace('’', '')
+    name = name.strip()
+    # The suffix pattern is anchored at the end; only names ending in it can match
+    if name[-1:].isdigit() or name.endswith(')'):
+        name = _COPY_SUFFIX.sub('', name)
+    return _SEPARATORS.sub(' ', name).strip()
+
+
+def tokenize(name):
+    """Tokens of a normalized name."""
+    return normalize(name).split()
+
+
+def character_masks(text):
+    """Bit mask of the positions of each character in text, for common_subsequence()."""
+    masks = {}
+    for i, char in enumerate(text):
+        masks[char] = masks.get(char, 0) | 1 << i
+    return masks
+
+
+def common_subsequence(a, b, masks=None):
+    """
+    Length of the longest common subsequence of two strings.
+
+    Bit-parallel (Allison-Dix): one pass over b with a bit per character of
+    a, a few integer operations per character instead of a len(a) x len(b)
+    table.
+
+    Args:
+        masks: character_masks(a), when a is compared many times
+    """
+    masks = masks if masks is not None else character_masks(a)
+    full = (1 << len(a)) - 1
+    row = full
+    for char in b:
+        matched = row & masks.get(char, 0)
+        row = ((row + matched) | (row - matched)) & full
+    return len(a) - row.bit_count()
+
+
+def trigrams(normalized):
+    """Set of 3-character pieces of a normalized name (padded at the ends)."""
+    padded = f"  {normalized} "
+    return set(map(''.join, zip(padded, padded[1:], padded[2:])))
+
+
+class Match:
+    """
+    Result of resolving one query.
+
+    Attributes:
+        query: The name looked up
+        key: Best matching name, or None
+        confidence: 0-1 (1.0 exact, 0.95 normalized, else scored)
+        method: 'exact', 'normalized', 'tokens', 'fuzzy' or None
+        ambiguous: True if another name scored within AMBIGUITY_MARGIN, or
+            (MutualMatcher) the key's best match is another memorial
+        claimed_by: That other memorial (MutualMatcher), else None
+        candidates: Ranked list of (key, confidence), best first
+    """
+
+    def __init__(self, query, candidates, method):
+        self.query = query
+        self.candidates = candidates
+        self.method = method if candidates else None
+        self.key = candidates[0][0] if candidates else None
+        self.confidence = candidates[0][1] if candidates else 0.0
+        # Copies of the same name ("X", "X 2") are not a competing match
+        best = normalize(self.key) if candidates else None
+        self.ambiguous = any(self.confidence - confidence < AMBIGUITY_MARGIN and normalize(key) != best
+                             for key, confidence in candidates[1:])
+        self.claimed_by = None
+
+    @property
+    def accepted(self):
+        """True if the match is confident and unambiguous enough to apply."""
+        return self.key is not None and self.confidence >= MIN_CONFIDENCE and not self.ambiguous
+
+    def __repr__(self):
+        return (f"Match({self.query!r} -> {self.key!r}, {self.confidence:.2f}, {self.method}"
+                f"{', ambiguous' if self.ambiguous else ''}"
+                f"{f', claimed by {self.claimed_by!r}' if self.claimed_by else ''})")
+
+
+class NameMatcher:
+    """
+    Index a list of names for exact, normalized and token/fuzzy lookup.
+
+    Args:
+        keys: Names to match against (duplicates are kept once)
+    """
+
+    def __init__(self, keys):
+        self.keys = sorted(set(keys))
+        self.exact = {key: key for key in self.keys}
+        self.normalized = {}
+        self.key_normalized = {}
+        self.key_tokens = {}
+        self.postings = defaultdict(list)
+        gram_postings = defaultdict(list)
+        for key in self.keys:
+            normalized = normalize(key)
+            self.normalized.setdefault(normalized, []).append(key)
+            self.key_normalized[key] = normalized
+            tokens = set(normalized.split())
+            self.key_tokens[key] = tokens
+            for token in tokens:
+                self.postings[token].append(key)
+            for gram in trigrams(normalized):
+                gram_postings[gram].append(key)
+        self.postings = dict(self.postings)
+
+        total = max(len(self.keys), 1)
+        self.idf = {token: math.log(1 + total / len(keys)) for token, keys in self.postings.items()}
+        limit = min(COMMON_TOKEN_SHARE * total, MAX_POSTINGS)
+        self.common = {token for token, keys in self.postings.items() if len(keys) > limit}
+        self.gram_postings = {gram: keys for gram, keys in gram_postings.items() if len(keys) <= limit}
+        self.default_idf = math.log(1 + total)
+        self.key_weight = {key: self._weight(tokens) for key, tokens in self.key_tokens.items()}
+        self.key_masks = {}
+
+    def _weight(self, tokens):
+        return sum(self.idf.get(token, self.default_idf) for token in tokens)
+
+    def _masks(self, key):
+        masks = self.key_masks.get(key)
+        if masks is None:
+            masks = self.key_masks[key] = character_masks(self.key_normalized[key])
+        return masks
+
+    def match(self, query, limit=5):
+        """
+        Resolve one name.
+
+        Args:
+            query: Name to look up
+            limit: Number of ranked candidates to keep
+
+        Returns:
+            Match
+        """
+        if query in self.exact:
+            return Match(query, [(query, 1.0)], 'exact')
+
+        normalized = normalize(query)
+        hits = self.normalized.get(normalized)
+        if hits:
+            return Match(query, [(key, 0.95) for key in hits][:limit], 'normalized')
+
+        tokens = set(normalized.split())
+        # Rarest tokens first; stop once there are enough candidates to rank
+        candidate_keys = set()
+        for token in sorted(tokens - self.common or tokens, key=lambda t: len(self.postings.get(t, ()))):
+            if len(candidate_keys) >= FUZZY_CANDIDATES:
+                break
+            candidate_keys.update(self.postings.get(token, ())[:MAX_POSTINGS])
+
+        query_weight = self._weight(tokens)
+        token_scores = {}
+        for key in candidate_keys:
+            shared = self._weight(tokens & self.key_tokens[key])
+            token_scores[key] = 2 * shared / (query_weight + self.key_weight[key])
+
+        # Trigrams only when the tokens found nothing good enough (typos, dropped words)
+        gram_hits = Counter()
+        grams = ()
+        if max(token_scores.values(), default=0.0) < MIN_CONFIDENCE:
+            grams = trigrams(normalized)
+            gram_hits.update(chain.from_iterable(self.gram_postings.get(gram, ()) for gram in grams))
+            for key, _ in gram_hits.most_common(FUZZY_CANDIDATES):
+                if key not in token_scores:
+                    shared = self._weight(tokens & self.key_tokens[key])
+                    token_scores[key] = 2 * shared / (query_weight + self.key_weight[key])
+        if not token_scores:
+            return Match(query, [], None)
+
+        scored = sorted(((max(token_score, gram_hits[key] / len(grams) if grams else 0.0), token_score, key)
+                         for key, token_score in token_scores.items()), key=lambda item: (-item[0], item[2]))
+
+        # A similarity below both MIN_CONFIDENCE and the best confidence so far
+        # by AMBIGUITY_MARGIN neither wins nor makes the match ambiguous, so
+        # candidates too different in length to reach that are not compared
+        candidates = scored[:FUZZY_CANDIDATES]
+        best = min(max(token_score for _, token_score, _ in candidates), 0.94)
+        ranked = []
+        for _, token_score, key in candidates:
+            other = self.key_normalized[key]
+            size = len(normalized) + len(other)
+            fuzzy = 0.0
+            if 2 * min(len(normalized), len(other)) >= (max(MIN_CONFIDENCE, best) - AMBIGUITY_MARGIN) * size:
+                fuzzy = 2 * common_subsequence(other, normalized, self._masks(key)) / size
+            confidence = round(min(max(token_score, fuzzy), 0.94), 3)
+            best = max(best, confidence)
+            ranked.append((key, confidence, 'tokens' if token_score >= fuzzy else 'fuzzy'))
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+
+        return Match(query, [(key, confidence) for key, confidence, _ in ranked[:limit]], ranked[0][2])
+
+
+class MutualMatcher:
+    """
+    Match memorial names to photo names, accepting mutual best matches only.
+
+    Args:
+        keys: Photo / coordinate names to match against
+        names: Every memorial name, including memorials that will not be
+            looked up (they can still be a photo's better match)
+    """
+
+    def __init__(self, keys, names):
+        self.forward = NameMatcher(keys)
+        self.reverse = NameMatcher(names)
+        self._reverse_cache = {}
+
+    def match(self, query, limit=5):
+        """
+        Resolve one memorial name.
+
+        Returns:
+            Match, flagged ambiguous when its key resolves back to another memorial
+        """
+        match = self.forward.match(query, limit)
+        # Only a match that would be applied needs confirming
+        if not match.accepted:
+            return match
+        if match.key not in self._reverse_cache:
+            self._reverse_cache[match.key] = self.reverse.match(match.key)
+        back = self._reverse_cache[match.key]
+        if back.key is None or back.ambiguous or normalize(back.key) != normalize(query):
+            match.ambiguous = True
+            match.claimed_by = back.key if back.key is not None and normalize(back.key) != normalize(query) else None
+        return match
@@ -1,153 +1,421 @@
 """
-Extract GPS coordinates from HEIC images in a folder.
-This script reads all HEIC files in the current directory and extracts
-their latitude and longitude coordinates from EXIF data.
+Extract GPS coordinates from HEIC (and JPEG) photos in one or more folders.
+
+Only the metadata is read; no image data is decoded. A HEIC file is an
+ISO base media file: its 'meta' box lists the items in the file (iinf) and
+where each item's bytes are (iloc). The EXIF block is an item of type
+'Exif', so reading it takes the meta box plus one short extent, usually
+well under 100 KB of a multi-megabyte photo. The EXIF block is a normal
+TIFF structure, parsed with Pillow. JPEG files are opened with Pillow,
+which also reads only the headers.
+
+Files are processed by a thread pool and every result is written as soon
+as it is ready, so a long run can be watched (or tailed) and no prompt
+blocks an unattended batch. The output format follows the file extension:
+
+  .csv     Filename,Latitude,Longitude,Status
+  .jsonl   one {"file", "lat", "lng", "status"} object per line
+
+Both can be read by Scrips/update_memorial_coordinates.py.
+
+Usage:
+  python Scrips/extract_heic_coordinates.py [FOLDER_OR_FILE ...] [--recursive]
+      [--output heic_coordinates.csv] [--jobs 16]
 """
 
-import os
+import argparse
+import csv
+import json
+import struct
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-try:
-    from PIL import Image
-    from pillow_heif import register_heif_opener
-except ImportError:
-    print("Required libraries not found. Please install them using:")
-    print("pip install pillow pillow-heif")
-    sys.exit(1)
+from PIL import Image
+
+HEIF_EXTENSIONS = {'.heic', '.heif'}
+JPEG_EXTENSIONS = {'.jpg', '.jpeg'}
+GPS_IFD = 0x8825
+DEFAULT_JOBS = 16
+
 
-# Register HEIF opener with Pillow
-register_heif_opener()
+class HeifError(ValueError):
+    """The file is not a HEIF container we can read metadata from."""
 
 
 def get_decimal_coordinates(gps_info):
     """
     Convert GPS coordinates from EXIF format to decimal degrees.
-    
+
     Args:
         gps_info: Dictionary containing GPS EXIF data
-        
+
     Returns:
         tuple: (latitude, longitude) in decimal degrees, or (None, None) if not available
     """
     def convert_to_degrees(value):
         """Convert GPS coordinates to degrees in float format."""
         d, m, s = value
-        return d + (m / 60.0) + (s / 3600.0)
-    
-    try:
-        # Get latitude
-        lat = gps_info.get(2)  # GPSLatitude
-        lat_ref = gps_info.get(1)  # GPSLatitudeRef (N or S)
-        
-        # Get longitude
-        lon = gps_info.get(4)  # GPSLongitude
-        lon_ref = gps_info.get(3)  # GPSLongitudeRef (E or W)
-        
-        if lat and lon and lat_ref and lon_ref:
-            lat_decimal = convert_to_degrees(lat)
-            if lat_ref == 'S':
-                lat_decimal = -lat_decimal
-                
-            lon_decimal = convert_to_degrees(lon)
-            if lon_ref == 'W':
-                lon_decimal = -lon_decimal
-                
-            return lat_decimal, lon_decimal
-    except Exception as e:
-        print(f"Error converting coordinates: {e}")
-    
+        return float(d) + (float(m) / 60.0) + (float(s) / 3600.0)
+
+    lat = gps_info.get(2)  # GPSLatitude
+    lat_ref = gps_info.get(1)  # GPSLatitudeRef (N or S)
+    lon = gps_info.get(4)  # GPSLongitude
+    lon_ref = gps_info.get(3)  # GPSLongitudeRef (E or W)
+
+    if lat and lon and lat_ref and lon_ref:
+        lat_decimal = convert_to_degrees(lat)
+        if lat_ref == 'S':
+            lat_decimal = -lat_decimal
+        lon_decimal = convert_to_degrees(lon)
+        if lon_ref == 'W':
+            lon_decimal = -lon_decimal
+        return lat_decimal, lon_decimal
+
     return None, None
 
 
+# ISO base media file (HEIF) boxes
+
+def iter_boxes(data, start=0, end=None):
+    """
+    Walk the boxes in data[start:end].
+
+    Yields:
+        Tuple of (box type, payload start, box end)
+    """
+    end = len(data) if end is None else end
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', data, pos)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from('>Q', data, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            raise HeifError(f"bad box size {size} for {box_type!r}")
+        yield box_type.decode('latin-1'), pos + header, pos + size
+        pos += size
+
+
+def read_meta_box(f):
+    """
+    Find the top-level 'meta' box, seeking over everything else (mdat is never read).
+
+    Returns:
+        The meta box payload (bytes)
+    """
+    f.seek(0, 2)
+    file_size = f.tell()
+    pos = 0
+    first = True
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        header = f.read(16)
+        size, box_type = struct.unpack_from('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from('>Q', header, 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = file_size - pos
+        if first and box_type != b'ftyp':
+            raise HeifError("no ftyp box")
+        first = False
+        if size < header_size:
+            raise HeifError(f"bad box size {size} for {box_type!r}")
+        if box_type == b'meta':
+            f.seek(pos + header_size)
+            return f.read(size - header_size)
+        pos += size
+    raise HeifError("no meta box")
+
+
+def parse_iinf(data, start, end):
+    """Item infos: dict item ID -> item type ('hvc1', 'Exif', ...)."""
+    version = data[start]
+    pos = start + 4
+    if version == 0:
+        pos += 2
+    else:
+        pos += 4
+    items = {}
+    for box_type, payload, box_end in iter_boxes(data, pos, end):
+        if box_type != 'infe':
+            continue
+        infe_version = data[payload]
+        if infe_version < 2:
+            continue
+        if infe_version == 2:
+            item_id = struct.unpack_from('>H', data, payload + 4)[0]
+            type_pos = payload + 8
+        else:
+            item_id = struct.unpack_from('>I', data, payload + 4)[0]
+            type_pos = payload + 10
+        items[item_id] = data[type_pos:type_pos + 4].decode('latin-1')
+    return items
+
+
+def parse_iloc(data, start, end):
+    """
+    Item locations.
+
+    Returns:
+        Dict item ID -> (construction method, base offset, list of (offset, length))
+    """
+    version = data[start]
+    pos = start + 4
+
+    def read_uint(size):
+        nonlocal pos
+        value = int.from_bytes(data[pos:pos + size], 'big') if size else 0
+        pos += size
+        return value
+
+    sizes = read_uint(2)
+    offset_size, length_size = sizes >> 12, (sizes >> 8) & 0xF
+    base_offset_size, index_size = (sizes >> 4) & 0xF, sizes & 0xF
+    item_count = read_uint(4 if version == 2 else 2)
+
+    locations = {}
+    for _ in range(item_count):
+        item_id = read_uint(4 if version == 2 else 2)
+        method = read_uint(2) & 0xF if version in (1, 2) else 0
+        read_uint(2)  # data_reference_index
+        base_offset = read_uint(base_offset_size)
+        extents = []
+        for _ in range(read_uint(2)):
+            if version in (1, 2):
+                read_uint(index_size)
+            extents.append((read_uint(offset_size), read_uint(length_size)))
+        locations[item_id] = (method, base_offset, extents)
+    if pos > end:
+        raise HeifError("iloc box is truncated")
+    return locations
+
+
+def read_heif_exif(path):
+    """
+    Read the raw EXIF (TIFF) block of a HEIF file without decoding the image.
+
+    Returns:
+        TIFF bytes, or None if the file has no Exif item
+    """
+    with open(path, 'rb') as f:
+        meta = read_meta_box(f)
+        item_types = {}
+        locations = {}
+        idat = None
+        for box_type, payload, box_end in iter_boxes(meta, 4):
+            if box_type == 'iinf':
+                item_types = parse_iinf(meta, payload, box_end)
+            elif box_type == 'iloc':
+                locations = parse_iloc(meta, payload, box_end)
+            elif box_type == 'idat':
+                idat = meta[payload:box_end]
+
+        exif_ids = [item_id for item_id, item_type in item_types.items() if item_type == 'Exif']
+        if not exif_ids or exif_ids[0] not in locations:
+            return None
+        method, base_offset, extents = locations[exif_ids[0]]
+
+        chunks = []
+        for offset, length in extents:
+            if method == 0:
+                f.seek(base_offset + offset)
+                chunks.append(f.read(length))
+            elif method == 1 and idat is not None:
+                chunks.append(idat[base_offset + offset:base_offset + offset + length])
+            else:
+                raise HeifError(f"unsupported iloc construction method {method}")
+    data = b''.join(chunks)
+
+    # The Exif item starts with the offset of the TIFF header from byte 4
+    if len(data) < 4:
+        raise HeifError("Exif item is truncated")
+    tiff_start = 4 + struct.unpack_from('>I', data)[0]
+    return data[tiff_start:]
+
+
+def read_exif(path):
+    """
+    Read a photo's EXIF tags from its headers.
+
+    Returns:
+        PIL.Image.Exif (empty if the file has none)
+    """
+    path = Path(path)
+    if path.suffix.lower() in HEIF_EXTENSIONS:
+        exif = Image.Exif()
+        tiff = read_heif_exif(path)
+        if tiff:
+            exif.load(tiff)
+        return exif
+    with Image.open(path) as image:
+        return image.getexif()
+
+
 def extract_coordinates_from_heic(file_path):
     """
-    Extract GPS coordinates from a HEIC file.
-    
+    Extract GPS coordinates from a HEIC (or JPEG) file.
+
     Args:
-        file_path: Path to the HEIC file
-        
+        file_path: Path to the photo
+
     Returns:
         tuple: (latitude, longitude) or (None, None) if not available
     """
+    gps_info = read_exif(file_path).get_ifd(GPS_IFD)
+    if not gps_info:
+        return None, None
+    return get_decimal_coordinates(gps_info)
+
+
+def extract_result(path):
+    """
+    Result record for one photo; errors are reported, not raised.
+
+    Returns:
+        Dict with file, lat, lng and status ('ok', 'no gps' or the error)
+    """
     try:
-        image = Image.open(file_path)
-        exif_data = image.getexif()
-        
-        if exif_data:
-            # GPS Info is stored in tag 34853
-            gps_info = exif_data.get_ifd(34853)
-            
-            if gps_info:
-                return get_decimal_coordinates(gps_info)
-            else:
-                return None, None
-        else:
-            return None, None
-            
+        lat, lng = extract_coordinates_from_heic(path)
     except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return None, None
+        return {'file': str(path), 'lat': None, 'lng': None, 'status': f"error: {type(e).__name__}: {e}"}
+    return {'file': str(path), 'lat': lat, 'lng': lng, 'status': 'ok' if lat is not None else 'no gps'}
+
+
+def find_photos(paths, recursive=False, extensions=HEIF_EXTENSIONS):
+    """
+    Collect photo files from folders and explicit file paths.
+
+    Returns:
+        Sorted list of Paths
+    """
+    photos = set()
+    for path in paths:
+        path = Path(path)
+        if path.is_file():
+            photos.add(path)
+            continue
+        candidates = path.rglob('*') if recursive else path.iterdir()
+        photos.update(p for p in candidates if p.suffix.lower() in extensions and p.is_file())
+    return sorted(photos)
+
+
+class StreamWriter:
+    """
+    Write result records one at a time to CSV or JSON Lines, flushing each.
+
+    Args:
+        path: Output file; '.jsonl' or '.json' gives JSON Lines, anything else CSV
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.jsonl = self.path.suffix.lower() in ('.jsonl', '.json')
+        self.file = open(self.path, 'w', encoding='utf-8', newline='')
+        if not self.jsonl:
+            self.csv = csv.writer(self.file)
+            self.csv.writerow(['Filename', 'Latitude', 'Longitude', 'Status'])
+
+    def write(self, result, name):
+        if self.jsonl:
+            self.file.write(json.dumps(dict(result, file=name), ensure_ascii=False) + '\n')
+        else:
+            self.csv.writerow([name, '' if result['lat'] is None else result['lat'],
+                               '' if result['lng'] is None else result['lng'], result['status']])
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def extract_all(photos, writer=None, jobs=DEFAULT_JOBS, root=None, on_result=None):
+    """
+    Extract coordinates from many photos in parallel, streaming results.
+
+    Args:
+        photos: List of paths
+        writer: StreamWriter (optional)
+        jobs: Worker threads
+        root: Folder that written file names are made relative to
+        on_result: Function(result, name) called as each result completes
+
+    Returns:
+        List of result dicts in completion order
+    """
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = [pool.submit(extract_result, path) for path in photos]
+        for future in as_completed(futures):
+            result = future.result()
+            path = Path(result['file'])
+            name = path.relative_to(root).as_posix() if root and path.is_relative_to(root) else path.name
+            if writer:
+                writer.write(result, name)
+            if on_result:
+                on_result(result, name)
+            results.append(result)
+    return results
 
 
 def main():
-    """Main function to process all HEIC files in the current directory."""
-    # Get current directory or use provided path
-    if len(sys.argv) > 1:
-        folder_path = Path(sys.argv[1])
-    else:
-        folder_path = Path.cwd()
-    
-    if not folder_path.exists():
-        print(f"Error: Folder '{folder_path}' does not exist.")
-        sys.exit(1)
-    
-    print(f"Scanning for HEIC files in: {folder_path}\n")
-    print("=" * 80)
-    
-    # Find all HEIC files (case-insensitive)
-    heic_files = []
-    for ext in ['*.heic', '*.HEIC', '*.heif', '*.HEIF']:
-        heic_files.extend(folder_path.glob(ext))
-    
-    if not heic_files:
-        print("No HEIC files found in the directory.")
+    parser = argparse.ArgumentParser(description='Extract GPS coordinates from HEIC photos (metadata only).')
+    parser.add_argument('paths', nargs='*', default=None, help='Folders or files (default: current folder)')
+    parser.add_argument('--recursive', action='store_true', help='Also scan subfolders')
+    parser.add_argument('--jpeg', action='store_true', help='Include .jpg/.jpeg files as well')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Output .csv or .jsonl (default: heic_coordinates.csv in the first folder)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f'Worker threads (default: {DEFAULT_JOBS})')
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in (args.paths or [Path.cwd()])]
+    for path in paths:
+        if not path.exists():
+            print(f"Error: '{path}' does not exist.")
+            sys.exit(1)
+    root = paths[0] if paths[0].is_dir() else paths[0].parent
+    output = Path(args.output) if args.output else root / 'heic_coordinates.csv'
+    extensions = HEIF_EXTENSIONS | JPEG_EXTENSIONS if args.jpeg else HEIF_EXTENSIONS
+
+    print(f"Scanning for photos in: {', '.join(str(p) for p in paths)}")
+    photos = find_photos(paths, args.recursive, extensions)
+    if not photos:
+        print("No HEIC files found.")
         return
-    
-    print(f"Found {len(heic_files)} HEIC file(s)\n")
-    
-    # Process each file
-    results = []
-    for file_path in sorted(heic_files):
-        lat, lon = extract_coordinates_from_heic(file_path)
-        results.append((file_path.name, lat, lon))
-    
-    # Display results
+    print(f"Found {len(photos)} file(s), {args.jobs} worker(s)\n")
     print(f"{'Filename':<40} {'Latitude':<15} {'Longitude':<15}")
     print("-" * 80)
-    
-    files_with_coords = 0
-    for filename, lat, lon in results:
-        if lat is not None and lon is not None:
-            print(f"{filename:<40} {lat:<15.6f} {lon:<15.6f}")
-            files_with_coords += 1
+
+    def show(result, name):
+        if result['lat'] is not None:
+            print(f"{name:<40} {result['lat']:<15.6f} {result['lng']:<15.6f}")
         else:
-            print(f"{filename:<40} {'No GPS data':<15} {'No GPS data':<15}")
-    
+            print(f"{name:<40} {result['status']}")
+
+    start = time.perf_counter()
+    with StreamWriter(output) as writer:
+        results = extract_all(photos, writer, args.jobs, root, on_result=show)
+    elapsed = time.perf_counter() - start
+
+    with_coords = sum(1 for r in results if r['lat'] is not None)
+    errors = sum(1 for r in results if r['status'].startswith('error'))
     print("=" * 80)
-    print(f"\nSummary: {files_with_coords} out of {len(heic_files)} files have GPS coordinates")
-    
-    # Optionally save to CSV
-    if files_with_coords > 0:
-        save_csv = input("\nWould you like to save the results to a CSV file? (y/n): ")
-        if save_csv.lower() == 'y':
-            csv_path = folder_path / "heic_coordinates.csv"
-            with open(csv_path, 'w') as f:
-                f.write("Filename,Latitude,Longitude\n")
-                for filename, lat, lon in results:
-                    if lat is not None and lon is not None:
-                        f.write(f"{filename},{lat},{lon}\n")
-            print(f"Results saved to: {csv_path}")
+    print(f"\nSummary: {with_coords} out of {len(results)} files have GPS coordinates"
+          + (f", {errors} could not be read" if errors else ''))
+    print(f"Time: {elapsed:.2f} s ({elapsed / len(results) * 1000:.1f} ms per file)")
+    print(f"Results saved to: {output}")
 
 
 if __name__ == "__main__":
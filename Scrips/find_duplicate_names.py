@@ -0,0 +1,384 @@
+"""
+Find likely OCR near-duplicates in data/afm-memorials.json.
+
+Comparing every name with every other is O(n^2), so records are first
+grouped into blocks that any real duplicate pair is very likely to share:
+
+  - phonetic key (Soundex) of the surname + first initial
+  - full initials + last three letters of the surname
+    (catches OCR damage to the start of the surname, e.g. McNEIL / MeNBIL)
+
+Edit distance is then computed only between records inside the same block,
+with an early cut-off once the distance exceeds what the threshold allows.
+Identical spellings are collapsed before scoring. Blocks still get denser
+as the roll grows, so a block larger than the window is sorted by name and
+each spelling is only compared with its next WINDOW neighbours (sorted
+neighbourhood). Blocks smaller than the window are still compared in full,
+so comparisons grow faster than the roll but sub-quadratically: about
+n^1.6 from the current roll to ten times its size. They only approach
+distinct names x keys x WINDOW once most blocks exceed the window.
+
+Every pair gets a kind, and the report is ranked by kind, then by
+similarity (same-panel pairs first on ties):
+
+  variant   the same name once case, accents, punctuation and spacing are
+            normalized, but spelled differently ("O CALLAGHAN DJ" /
+            "O'CALLAGHAN DJ"): the OCR slips this report is for, on any
+            panel
+  exact     the same spelling on the same panel
+  spelling  different spellings within the threshold
+  initials  the same name apart from one initials token, on different
+            panels (COLLINGWOOD RE / COLLINGWOOD RA)
+
+Identical spellings on different panels (there are many "SMITH J") and
+initials pairs are normally different people, so they are left out unless
+--include-exact or --include-initials is given; the summary counts them.
+
+The report is written as JSON, keyed by panel and panel_number.
+
+Usage:
+  python Scrips/find_duplicate_names.py [--threshold 0.85] [--output report.json]
+                                         [--include-exact] [--include-initials]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from name_index import normalize_name
+
+DEFAULT_THRESHOLD = 0.85
+# Names in a large block are compared with this many sorted neighbours
+WINDOW = 10
+# Report order of the pair kinds
+KINDS = ('variant', 'exact', 'spelling', 'initials')
+# Longest token treated as initials by differs_in_initials()
+INITIALS_LENGTH = 4
+
+_SOUNDEX_CODES = {}
+for _letters, _digit in (('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'),
+                         ('l', '4'), ('mn', '5'), ('r', '6')):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = _digit
+
+
+def soundex(word):
+    """
+    American Soundex code for a word (e.g. "robert" -> "R163").
+
+    Args:
+        word: Lowercase ASCII word
+
+    Returns:
+        Four-character code, or '' if the word has no letters
+    """
+    letters = [ch for ch in word if 'a' <= ch <= 'z']
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if ch not in 'hw':
+            previous = digit
+    return (code + '000')[:4]
+
+
+def split_name(normalized):
+    """
+    Split a normalized AFM name into surname and initials.
+
+    AFM names are written "SURNAME INITIALS [HONOURS]", e.g. "evans hr".
+
+    Returns:
+        Tuple of (surname, initials)
+    """
+    tokens = normalized.split()
+    if not tokens:
+        return '', ''
+    surname = tokens[0]
+    initials = tokens[1] if len(tokens) > 1 else ''
+    return surname, initials
+
+
+def raw_spelling(name):
+    """A name as written, ignoring only runs of whitespace."""
+    return ' '.join((name or '').split())
+
+
+def differs_in_initials(text_a, text_b):
+    """
+    True if two normalized names differ only in one initials token.
+
+    The surname (first token) and every other token must match; the
+    differing tokens must both be short enough to be initials. A name split
+    by normalizing ("o callaghan dj") keeps its surname parts as tokens.
+    """
+    tokens_a, tokens_b = text_a.split(), text_b.split()
+    if len(tokens_a) != len(tokens_b) or len(tokens_a) < 2 or tokens_a[0] != tokens_b[0]:
+        return False
+    differing = [(a, b) for a, b in zip(tokens_a, tokens_b) if a != b]
+    return len(differing) == 1 and all(len(token) <= INITIALS_LENGTH for token in differing[0])
+
+
+def blocking_keys(normalized):
+    """Return the block keys a normalized name belongs to."""
+    surname, initials = split_name(normalized)
+    if not surname:
+        return []
+    keys = [('p', soundex(surname), initials[:1])]
+    if len(surname) >= 3:
+        keys.append(('i', initials, surname[-3:]))
+    return keys
+
+
+def bounded_levenshtein(a, b, max_distance):
+    """
+    Levenshtein distance between a and b, giving up early.
+
+    The shared prefix and suffix are trimmed first, and only the diagonal
+    band of width 2 * max_distance + 1 is computed (Ukkonen's cut-off).
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Largest distance of interest
+
+    Returns:
+        The distance, or max_distance + 1 if it is larger than max_distance
+    """
+    too_far = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return too_far
+
+    # Trim the common prefix and suffix; they never add to the distance
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        distance = len(a) + len(b)
+        return distance if distance <= max_distance else too_far
+
+    len_b = len(b)
+    previous = [j if j <= max_distance else too_far for j in range(len_b + 1)]
+    for i, ca in enumerate(a, 1):
+        low = max(1, i - max_distance)
+        high = min(len_b, i + max_distance)
+        current = [too_far] * (len_b + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        for j in range(low, high + 1):
+            value = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return too_far
+        previous = current
+    return previous[len_b] if previous[len_b] <= max_distance else too_far
+
+
+def build_blocks(texts):
+    """
+    Group distinct normalized names into comparison blocks.
+
+    Args:
+        texts: List of distinct normalized names
+
+    Returns:
+        List of text-index lists sorted by name, one per block with at least
+        two members
+    """
+    blocks = {}
+    for index, text in enumerate(texts):
+        for key in blocking_keys(text):
+            blocks.setdefault(key, []).append(index)
+
+    return [sorted(members, key=lambda i: texts[i])
+            for members in blocks.values() if len(members) >= 2]
+
+
+def block_pairs(members, window=WINDOW):
+    """
+    Yield the index pairs to compare inside one sorted block.
+
+    Every pair is compared in blocks up to window + 1 names; larger blocks
+    only pair each name with the next `window` names.
+    """
+    for pos, i in enumerate(members):
+        for j in members[pos + 1:pos + 1 + window]:
+            yield i, j
+
+
+def _candidate(entries, i, j, kind, score, distance):
+    if i > j:
+        i, j = j, i
+    first, second = entries[i], entries[j]
+    return {
+        'kind': kind,
+        'score': score,
+        'distance': distance,
+        'same_panel': first.get('panel') == second.get('panel'),
+        'a': {
+            'index': i,
+            'name': first.get('name'),
+            'panel': first.get('panel'),
+            'panel_number': first.get('panel_number'),
+        },
+        'b': {
+            'index': j,
+            'name': second.get('name'),
+            'panel': second.get('panel'),
+            'panel_number': second.get('panel_number'),
+        },
+    }
+
+
+def find_candidates(entries, threshold=DEFAULT_THRESHOLD, include_exact=False, include_initials=False):
+    """
+    Find near-duplicate name pairs.
+
+    Names that normalize the same are collapsed first, so each distinct
+    spelling is scored once no matter how many records share it.
+
+    Args:
+        entries: List of memorial entries
+        threshold: Minimum similarity (1 - distance / longer length)
+        include_exact: Also report identical spellings on different panels
+        include_initials: Also report pairs on different panels that differ
+            only in an initials token
+
+    Returns:
+        Tuple of (candidate list ranked best first, number of edit-distance
+        comparisons made, dict kind -> pairs left out)
+    """
+    records_by_text = {}
+    for index, entry in enumerate(entries):
+        records_by_text.setdefault(normalize_name(entry.get('name')), []).append(index)
+    texts = list(records_by_text)
+
+    candidates = []
+    left_out = {'exact': 0, 'initials': 0}
+
+    # Same normalized text: a different raw spelling is an OCR variant, an
+    # identical one is only suspicious on the same panel
+    for text, indexes in records_by_text.items():
+        if len(indexes) < 2:
+            continue
+        spellings = [raw_spelling(entries[i].get('name')) for i in indexes]
+        for pos, i in enumerate(indexes):
+            for other, j in enumerate(indexes[pos + 1:], pos + 1):
+                if spellings[pos] != spellings[other]:
+                    candidates.append(_candidate(entries, i, j, 'variant', 1.0, 0))
+                elif include_exact or entries[i].get('panel') == entries[j].get('panel'):
+                    candidates.append(_candidate(entries, i, j, 'exact', 1.0, 0))
+                else:
+                    left_out['exact'] += 1
+
+    # Different spellings: score inside blocks only
+    seen_pairs = set()
+    comparisons = 0
+    for members in build_blocks(texts):
+        for a, b in block_pairs(members):
+            pair = (a, b) if a < b else (b, a)
+            if pair in seen_pairs:
+                continue
+            seen_pairs.add(pair)
+
+            text_a, text_b = texts[a], texts[b]
+            longest = max(len(text_a), len(text_b)) or 1
+            max_distance = int(longest * (1 - threshold))
+            comparisons += 1
+            distance = bounded_levenshtein(text_a, text_b, max_distance)
+            if distance > max_distance:
+                continue
+
+            score = round(1 - distance / longest, 4)
+            initials = differs_in_initials(text_a, text_b)
+            for i in records_by_text[text_a]:
+                for j in records_by_text[text_b]:
+                    if not initials or entries[i].get('panel') == entries[j].get('panel'):
+                        candidates.append(_candidate(entries, i, j, 'spelling', score, distance))
+                    elif include_initials:
+                        candidates.append(_candidate(entries, i, j, 'initials', score, distance))
+                    else:
+                        left_out['initials'] += 1
+
+    candidates.sort(key=lambda c: (KINDS.index(c['kind']), -c['score'], not c['same_panel'],
+                                   c['a']['panel'] or 0, c['a']['panel_number'] or 0))
+    return candidates, comparisons, left_out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find likely OCR duplicate names in the AFM dataset.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum similarity 0-1 (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--include-exact', action='store_true',
+                        help='Also report identical names on different panels')
+    parser.add_argument('--include-initials', action='store_true',
+                        help='Also report names on different panels that differ only in an initial')
+    parser.add_argument('--output', type=str, default='duplicate_names_report.json',
+                        help='Report file (default: duplicate_names_report.json)')
+    args = parser.parse_args()
+
+    json_file = Path(__file__).parent.parent / 'data' / 'afm-memorials.json'
+
+    print("="*80)
+    print("AFM Near-Duplicate Name Finder")
+    print("="*80)
+
+    with open(json_file, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    print(f"Loaded {len(entries)} entries")
+
+    start = time.perf_counter()
+    candidates, comparisons, left_out = find_candidates(entries, args.threshold, args.include_exact,
+                                                        args.include_initials)
+    elapsed = time.perf_counter() - start
+
+    all_pairs = len(entries) * (len(entries) - 1) // 2
+    print(f"Compared {comparisons} pairs ({comparisons / max(all_pairs, 1):.4%} of all {all_pairs}) "
+          f"in {elapsed:.2f} s")
+    print(f"Candidates at similarity >= {args.threshold}: {len(candidates)}")
+    for kind in KINDS:
+        count = sum(c['kind'] == kind for c in candidates)
+        skipped = left_out.get(kind, 0)
+        print(f"  {kind:<9} {count:>6}" + (f"  ({skipped} on different panels left out)" if skipped else ''))
+
+    print("\nTop candidates:")
+    for c in candidates[:25]:
+        a, b = c['a'], c['b']
+        flag = ' (same panel)' if c['same_panel'] else ''
+        print(f"  {c['kind']:<9} {c['score']:.2f}  P{a['panel']}#{a['panel_number']} {a['name']!r:<28} "
+              f"P{b['panel']}#{b['panel_number']} {b['name']!r}{flag}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'source': 'afm-memorials.json',
+            'threshold': args.threshold,
+            'include_exact': args.include_exact,
+            'include_initials': args.include_initials,
+            'candidates': candidates,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\n📄 Report saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,74 +1,11 @@
-import csv
 import json
-import re
 from pathlib import Path
 
-def is_date_marker(text):
-    """Check if the text is a date marker (4-digit year)."""
-    if not text or not isinstance(text, str):
-        return False
-    text = text.strip()
-    if re.match(r'^\d{4}$', text):
-        year = int(text)
-        if 1940 <= year <= 2030:
-            return True
-    return False
+from afm_panels import iter_panel_first_dates
 
 def extract_dates_from_csv(csv_file):
     """Extract panel-to-date mappings from CSV file."""
-    panel_dates = {}
-    
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        rows = list(reader)
-    
-    if not rows:
-        return panel_dates
-    
-    # First row contains panel numbers
-    panel_numbers = []
-    for cell in rows[0]:
-        cell = cell.strip()
-        if re.match(r'^\d{1,3}$', cell):
-            num = int(cell)
-            if 1 <= num <= 300:
-                panel_numbers.append(num)
-            else:
-                panel_numbers.append(None)
-        else:
-            panel_numbers.append(None)
-    
-    # Track current date across columns (persists until new date found)
-    current_date = None
-    
-    # Process each column (panel)
-    for col_idx in range(len(panel_numbers)):
-        panel_num = panel_numbers[col_idx]
-        if panel_num is None:
-            continue
-        
-        # Look for a date marker in this column
-        column_date = None
-        for row_idx in range(1, len(rows)):
-            if col_idx >= len(rows[row_idx]):
-                continue
-            
-            cell = rows[row_idx][col_idx].strip()
-            
-            # Check for date marker
-            if is_date_marker(cell):
-                column_date = int(cell)
-                current_date = column_date
-                break
-        
-        # If we found a date in this column, use it
-        # Otherwise, use the persisted date from previous columns
-        if column_date:
-            panel_dates[panel_num] = column_date
-        elif current_date:
-            panel_dates[panel_num] = current_date
-    
-    return panel_dates
+    return dict(iter_panel_first_dates(csv_file))
 
 def main():
     script_dir = Path(__file__).parent
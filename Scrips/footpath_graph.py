@@ -0,0 +1,576 @@
+"""
+Compile data/footpaths.geojson into a ready-made routing graph.
+
+js/map-view.js used to rebuild the footpath graph on every visit: download
+the 168 KB GeoJSON, key each vertex to 6 decimal places, join close
+endpoints and then scan every node and edge to snap the route's ends. This
+script does the graph work offline, once:
+
+  1. Merge vertices closer than --merge metres (paths drawn separately
+     rarely share exact coordinates where they meet).
+  2. Split segments where they cross or where a path ends on another one,
+     so every junction is a node.
+  3. Bridge dangling path ends to the nearest path within --bridge metres
+     when the network does not already connect them (the browser's old
+     endpoint bridging, but onto any point of a path, not only its ends).
+  4. Measure every edge (haversine, as the browser does).
+  5. Snap every memorial and every AFM panel pin to its nearest edge.
+
+and writes data/footpath-graph.json, an adjacency list in CSR form:
+
+  {"version": 1,
+   "nodes":   [[lat, lng], ...],
+   "offsets": [0, ...],          node i's edges are targets/weights[offsets[i]:offsets[i + 1]]
+   "targets": [node, ...],
+   "weights": [metres, ...],
+   "bridges": [[a, b], ...],     edges added in step 3
+   "memorials": {"count": <records in memorials.json>,
+                 "fingerprint": <spatial_index.positions_fingerprint>,
+                 "snaps": [[a, b, t, metres] or null, ...]},
+   "panels": {"<panel>": [a, b, t, metres]}}
+
+A snap [a, b, t, metres] is the point t of the way from node a to node b,
+metres away from the memorial. Memorial snaps are by position in
+memorials.json; if count or fingerprint no longer matches (a memorial was
+added or moved), the browser snaps at runtime.
+
+It also reports the graph's connected components: every component except
+the largest is a part of the network routes cannot reach, and memorials or
+panels that snap onto one of them (or lie far from every path) are listed.
+
+Usage:
+  python Scrips/footpath_graph.py [--merge 1.0] [--bridge 3.0] [--report footpath_report.json]
+"""
+
+import argparse
+import heapq
+import json
+import math
+import time
+from pathlib import Path
+
+from afm_dataset import write_json_atomic
+from afm_pins import resolve_panel_pins
+from spatial_index import LocalPlane, haversine, memorial_position, positions_fingerprint
+
+ROOT_DIR = Path(__file__).parent.parent
+FOOTPATHS_FILE = ROOT_DIR / 'data' / 'footpaths.geojson'
+MEMORIALS_JSON = ROOT_DIR / 'data' / 'memorials.json'
+GRAPH_FILE = ROOT_DIR / 'data' / 'footpath-graph.json'
+GRAPH_VERSION = 1
+
+# Vertices closer than this are one node
+MERGE_METERS = 1.0
+# Dangling ends this close to another path get a bridge edge (BRIDGE_MAX_METERS in map-view.js)
+BRIDGE_METERS = 3.0
+# ...unless the network already reaches that point within this distance
+BRIDGE_MIN_DETOUR = 10.0
+# Memorials further than this from every path are reported (map-view.js snaps its start at 30 m)
+FAR_METERS = 30.0
+# Cell size of the edge index
+EDGE_CELL = 25.0
+
+
+def load_lines(path=FOOTPATHS_FILE):
+    """
+    Read the footpath polylines.
+
+    Returns:
+        List of lists of (lat, lng), one per LineString (MultiLineStrings are split)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    lines = []
+    for feature in data.get('features', []):
+        geometry = feature.get('geometry') or {}
+        if geometry.get('type') == 'LineString':
+            parts = [geometry.get('coordinates') or []]
+        elif geometry.get('type') == 'MultiLineString':
+            parts = geometry.get('coordinates') or []
+        else:
+            continue
+        for part in parts:
+            line = [(c[1], c[0]) for c in part
+                    if isinstance(c, list) and len(c) >= 2 and math.isfinite(c[0]) and math.isfinite(c[1])]
+            if len(line) >= 2:
+                lines.append(line)
+    return lines
+
+
+def point_segment(p, a, b):
+    """
+    Nearest point of segment ab to p.
+
+    Returns:
+        Tuple of (t along ab in [0, 1], distance)
+    """
+    vx, vy = b[0] - a[0], b[1] - a[1]
+    length2 = vx * vx + vy * vy
+    t = 0.0 if not length2 else min(max(((p[0] - a[0]) * vx + (p[1] - a[1]) * vy) / length2, 0.0), 1.0)
+    return t, math.hypot(p[0] - a[0] - t * vx, p[1] - a[1] - t * vy)
+
+
+def segment_intersection(a, b, c, d):
+    """
+    Where segments ab and cd meet.
+
+    Returns:
+        Tuple of (t along ab, u along cd), both in [0, 1], or None
+        (parallel segments are treated as not meeting)
+    """
+    rx, ry = b[0] - a[0], b[1] - a[1]
+    sx, sy = d[0] - c[0], d[1] - c[1]
+    denominator = rx * sy - ry * sx
+    if abs(denominator) < 1e-12:
+        return None
+    qx, qy = c[0] - a[0], c[1] - a[1]
+    t = (qx * sy - qy * sx) / denominator
+    u = (qx * ry - qy * rx) / denominator
+    if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0:
+        return t, u
+    return None
+
+
+class EdgeIndex:
+    """
+    Uniform grid over graph edges for nearest-edge and overlap queries.
+
+    Args:
+        nodes: List of (x, y) in metres
+        edges: List of (a, b) node pairs
+        cell: Cell edge in metres
+    """
+
+    def __init__(self, nodes, edges, cell=EDGE_CELL):
+        self.nodes = nodes
+        self.edges = edges
+        self.cell = cell
+        self.cells = {}
+        for i, (a, b) in enumerate(edges):
+            for key in self._cells_between(nodes[a], nodes[b]):
+                self.cells.setdefault(key, []).append(i)
+        if self.cells:
+            self.bounds = (min(cx for cx, _ in self.cells), min(cy for _, cy in self.cells),
+                           max(cx for cx, _ in self.cells), max(cy for _, cy in self.cells))
+        else:
+            self.bounds = None
+
+    def _cells_between(self, p, q, margin=0.0):
+        cx0, cy0 = math.floor((min(p[0], q[0]) - margin) / self.cell), math.floor((min(p[1], q[1]) - margin) / self.cell)
+        cx1, cy1 = math.floor((max(p[0], q[0]) + margin) / self.cell), math.floor((max(p[1], q[1]) + margin) / self.cell)
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+    def overlapping(self, i, margin=0.0):
+        """Edges sharing a grid cell with edge i (widened by margin)."""
+        a, b = self.edges[i]
+        found = set()
+        for key in self._cells_between(self.nodes[a], self.nodes[b], margin):
+            found.update(self.cells.get(key, ()))
+        found.discard(i)
+        return found
+
+    def nearest(self, p, max_distance=None, skip=None):
+        """
+        Nearest edge to point p.
+
+        Args:
+            max_distance: Ignore edges further than this
+            skip: Function(edge index) -> True to leave an edge out
+
+        Returns:
+            Tuple of (edge index, t along the edge, distance), or None
+        """
+        if self.bounds is None:
+            return None
+        qx, qy = math.floor(p[0] / self.cell), math.floor(p[1] / self.cell)
+        min_cx, min_cy, max_cx, max_cy = self.bounds
+        last_ring = max(qx - min_cx, max_cx - qx, qy - min_cy, max_cy - qy)
+        if max_distance is not None:
+            last_ring = min(last_ring, math.ceil(max_distance / self.cell))
+
+        best = None
+        seen = set()
+        for ring in range(max(last_ring, 0) + 1):
+            for cx in range(qx - ring, qx + ring + 1):
+                edge = cx in (qx - ring, qx + ring)
+                for cy in (range(qy - ring, qy + ring + 1) if edge else (qy - ring, qy + ring)):
+                    for i in self.cells.get((cx, cy), ()):
+                        if i in seen or (skip and skip(i)):
+                            continue
+                        seen.add(i)
+                        a, b = self.edges[i]
+                        t, d = point_segment(p, self.nodes[a], self.nodes[b])
+                        if (max_distance is None or d <= max_distance) and (best is None or d < best[2]):
+                            best = (i, t, d)
+            # Anything in ring + 1 is at least ring * cell away
+            if best is not None and best[2] < ring * self.cell:
+                break
+        return best
+
+
+def merge_vertices(lines, tolerance):
+    """
+    Turn polyline vertices into nodes, merging vertices closer than tolerance.
+
+    Clusters are joined transitively and placed at their mean.
+
+    Args:
+        lines: Lists of (x, y) in metres
+
+    Returns:
+        Tuple of (node positions, list of node ids per line)
+    """
+    points = [p for line in lines for p in line]
+    parent = list(range(len(points)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    cells = {}
+    for i, (x, y) in enumerate(points):
+        cx, cy = math.floor(x / tolerance), math.floor(y / tolerance)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in cells.get((cx + dx, cy + dy), ()):
+                    if math.hypot(points[j][0] - x, points[j][1] - y) < tolerance:
+                        parent[find(i)] = find(j)
+        cells.setdefault((cx, cy), []).append(i)
+
+    node_of_root = {}
+    sums = []
+    labels = []
+    for i, (x, y) in enumerate(points):
+        root = find(i)
+        if root not in node_of_root:
+            node_of_root[root] = len(sums)
+            sums.append([0.0, 0.0, 0])
+        node = node_of_root[root]
+        sums[node][0] += x
+        sums[node][1] += y
+        sums[node][2] += 1
+        labels.append(node)
+    nodes = [(sx / n, sy / n) for sx, sy, n in sums]
+
+    node_lines = []
+    start = 0
+    for line in lines:
+        node_lines.append(labels[start:start + len(line)])
+        start += len(line)
+    return nodes, node_lines
+
+
+def apply_splits(edges, splits):
+    """Replace each split edge by the chain through its split nodes (splits: edge -> [(t, node)])."""
+    result = set()
+    for i, (a, b) in enumerate(edges):
+        chain = [a] + [node for _, node in sorted(splits.get(i, ()))] + [b]
+        for u, v in zip(chain, chain[1:]):
+            if u != v:
+                result.add((min(u, v), max(u, v)))
+    return sorted(result)
+
+
+def split_crossings(nodes, edges, tolerance):
+    """
+    Add a node wherever two edges cross or one ends on the other.
+
+    A meeting point within tolerance of an existing end node reuses that node.
+
+    Returns:
+        Tuple of (new edge list, number of junctions found)
+    """
+    index = EdgeIndex(nodes, edges)
+    splits = {}
+    junctions = 0
+    for i, (a, b) in enumerate(edges):
+        for j in index.overlapping(i):
+            c, d = edges[j]
+            if j < i or len({a, b, c, d}) < 4:
+                continue
+            hit = segment_intersection(nodes[a], nodes[b], nodes[c], nodes[d])
+            if hit is None:
+                continue
+            t, u = hit
+            point = (nodes[a][0] + t * (nodes[b][0] - nodes[a][0]), nodes[a][1] + t * (nodes[b][1] - nodes[a][1]))
+            near = [n for n in (a, b, c, d) if math.hypot(nodes[n][0] - point[0], nodes[n][1] - point[1]) < tolerance]
+            if near:
+                node = near[0]
+            else:
+                node = len(nodes)
+                nodes.append(point)
+            if node not in (a, b):
+                splits.setdefault(i, []).append((t, node))
+            if node not in (c, d):
+                splits.setdefault(j, []).append((u, node))
+            junctions += 1
+    return apply_splits(edges, splits), junctions
+
+
+def network_distances(adjacency, source, limit):
+    """Dijkstra from source, stopping at limit metres (weights are planar lengths)."""
+    dist = {source: 0.0}
+    queue = [(0.0, source)]
+    while queue:
+        d, node = heapq.heappop(queue)
+        if d > dist.get(node, math.inf) or d > limit:
+            continue
+        for other, w in adjacency.get(node, ()):
+            nd = d + w
+            if nd < dist.get(other, math.inf) and nd <= limit:
+                dist[other] = nd
+                heapq.heappush(queue, (nd, other))
+    return dist
+
+
+def bridge_dangling_ends(nodes, edges, max_gap, tolerance):
+    """
+    Join path ends that stop just short of another path.
+
+    An end node (one edge) is bridged to the nearest point of another edge
+    within max_gap, unless the network already reaches that point within
+    BRIDGE_MIN_DETOUR metres (then the nearby edge is part of the same path).
+
+    Returns:
+        Tuple of (new edge list, set of bridge edges (a, b) with a < b)
+    """
+    adjacency = {}
+    for a, b in edges:
+        w = math.dist(nodes[a], nodes[b])
+        adjacency.setdefault(a, []).append((b, w))
+        adjacency.setdefault(b, []).append((a, w))
+    index = EdgeIndex(nodes, edges)
+
+    splits = {}
+    bridges = set()
+    for end in sorted(node for node, links in adjacency.items() if len(links) == 1):
+        found = index.nearest(nodes[end], max_gap, skip=lambda i: end in edges[i])
+        if found is None:
+            continue
+        i, t, gap = found
+        a, b = edges[i]
+        reach = network_distances(adjacency, end, BRIDGE_MIN_DETOUR)
+        length = math.dist(nodes[a], nodes[b])
+        via_network = min(reach.get(a, math.inf) + t * length, reach.get(b, math.inf) + (1 - t) * length)
+        if via_network < BRIDGE_MIN_DETOUR:
+            continue
+        point = (nodes[a][0] + t * (nodes[b][0] - nodes[a][0]), nodes[a][1] + t * (nodes[b][1] - nodes[a][1]))
+        if math.dist(point, nodes[a]) < tolerance:
+            target = a
+        elif math.dist(point, nodes[b]) < tolerance:
+            target = b
+        else:
+            target = len(nodes)
+            nodes.append(point)
+            splits.setdefault(i, []).append((t, target))
+        bridges.add((min(end, target), max(end, target)))
+
+    edges = apply_splits(edges, splits)
+    return sorted(set(edges) | bridges), bridges
+
+
+def components(node_count, edges):
+    """Connected component id of every node, largest component first."""
+    adjacency = [[] for _ in range(node_count)]
+    for a, b in edges:
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+    label = [-1] * node_count
+    groups = []
+    for start in range(node_count):
+        if label[start] != -1 or not adjacency[start]:
+            continue
+        label[start] = len(groups)
+        group = [start]
+        for node in group:
+            for other in adjacency[node]:
+                if label[other] == -1:
+                    label[other] = label[start]
+                    group.append(other)
+        groups.append(group)
+    order = sorted(range(len(groups)), key=lambda g: -len(groups[g]))
+    rank = {g: r for r, g in enumerate(order)}
+    return [rank[g] if g != -1 else None for g in label], [groups[g] for g in order]
+
+
+def compile_graph(lines, merge=MERGE_METERS, bridge=BRIDGE_METERS):
+    """
+    Build the routing graph from footpath polylines.
+
+    Args:
+        lines: Result of load_lines()
+        merge: Vertex merge distance in metres
+        bridge: Largest gap bridged from a dangling end, in metres
+
+    Returns:
+        Dict with plane (LocalPlane), nodes ((x, y) list), edges ((a, b) list),
+        bridges (set), component (id per node), groups (node lists, largest
+        first) and stats
+    """
+    plane = LocalPlane.around([p for line in lines for p in line])
+    projected = [[plane.project(lat, lng) for lat, lng in line] for line in lines]
+    stats = {'lines': len(lines), 'vertices': sum(map(len, lines))}
+
+    nodes, node_lines = merge_vertices(projected, merge)
+    edges = sorted({(min(u, v), max(u, v)) for line in node_lines for u, v in zip(line, line[1:]) if u != v})
+    stats['merged_nodes'] = len(nodes)
+    stats['segments'] = len(edges)
+
+    edges, stats['junctions'] = split_crossings(nodes, edges, merge)
+    edges, bridges = bridge_dangling_ends(nodes, edges, bridge, merge)
+    stats['bridges'] = len(bridges)
+
+    # Drop nodes no edge uses (merged away), renumbering the rest
+    used = sorted({n for edge in edges for n in edge})
+    renumber = {old: new for new, old in enumerate(used)}
+    nodes = [nodes[old] for old in used]
+    edges = [(renumber[a], renumber[b]) for a, b in edges]
+    bridges = {(renumber[a], renumber[b]) for a, b in bridges}
+    component, groups = components(len(nodes), edges)
+    stats['nodes'] = len(nodes)
+    stats['edges'] = len(edges)
+    stats['components'] = len(groups)
+    return {'plane': plane, 'nodes': nodes, 'edges': edges, 'bridges': bridges,
+            'component': component, 'groups': groups, 'stats': stats}
+
+
+def snap(index, plane, position):
+    """[a, b, t, metres] of the nearest edge point to a (lat, lng), or None."""
+    if position is None:
+        return None
+    found = index.nearest(plane.project(*position))
+    if found is None:
+        return None
+    i, t, distance = found
+    a, b = index.edges[i]
+    return [a, b, round(t, 4), round(distance, 1)]
+
+
+def to_json(graph, memorial_snaps, panel_snaps, memorial_positions):
+    """The data/footpath-graph.json document (CSR adjacency)."""
+    plane = graph['plane']
+    latlng = [plane.unproject(x, y) for x, y in graph['nodes']]
+    adjacency = [[] for _ in latlng]
+    for a, b in graph['edges']:
+        w = round(haversine(*latlng[a], *latlng[b]), 2)
+        adjacency[a].append((b, w))
+        adjacency[b].append((a, w))
+    offsets = [0]
+    targets = []
+    weights = []
+    for links in adjacency:
+        for other, w in sorted(links):
+            targets.append(other)
+            weights.append(w)
+        offsets.append(len(targets))
+    return {
+        'version': GRAPH_VERSION,
+        'nodes': [[round(lat, 7), round(lng, 7)] for lat, lng in latlng],
+        'offsets': offsets,
+        'targets': targets,
+        'weights': weights,
+        'bridges': sorted(list(edge) for edge in graph['bridges']),
+        'memorials': {'count': len(memorial_positions), 'fingerprint': positions_fingerprint(memorial_positions),
+                      'snaps': memorial_snaps},
+        'panels': {str(panel): panel_snaps[panel] for panel in sorted(panel_snaps)},
+    }
+
+
+def build_report(graph, memorials, memorial_snaps, panel_snaps):
+    """Components and the memorials / panels routes cannot reach well."""
+    plane = graph['plane']
+    component_info = []
+    for rank, group in enumerate(graph['groups']):
+        members = set(group)
+        length = sum(math.dist(graph['nodes'][a], graph['nodes'][b])
+                     for a, b in graph['edges'] if a in members)
+        x = sum(graph['nodes'][n][0] for n in group) / len(group)
+        y = sum(graph['nodes'][n][1] for n in group) / len(group)
+        lat, lng = plane.unproject(x, y)
+        component_info.append({'component': rank, 'nodes': len(group), 'metres': round(length, 1),
+                               'centre': [round(lat, 6), round(lng, 6)]})
+
+    def problem(item, snapped):
+        if snapped is None:
+            return dict(item, problem='no position')
+        if snapped[3] > FAR_METERS:
+            return dict(item, problem=f"{snapped[3]:g} m from the nearest path")
+        component = graph['component'][snapped[0]]
+        if component != 0:
+            return dict(item, problem=f"on disconnected component {component}")
+        return None
+
+    unreachable = [problem({'name': m.get('name'), 'index': i}, s) for i, (m, s) in enumerate(zip(memorials, memorial_snaps))]
+    panels = [problem({'panel': panel}, s) for panel, s in sorted(panel_snaps.items())]
+    return {
+        'stats': graph['stats'],
+        'components': component_info,
+        'memorials': [item for item in unreachable if item],
+        'panels': [item for item in panels if item],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile data/footpaths.geojson into data/footpath-graph.json.')
+    parser.add_argument('--merge', type=float, default=MERGE_METERS,
+                        help=f'Merge vertices closer than this, in metres (default: {MERGE_METERS:g})')
+    parser.add_argument('--bridge', type=float, default=BRIDGE_METERS,
+                        help=f'Bridge path ends this close to another path (default: {BRIDGE_METERS:g})')
+    parser.add_argument('--report', type=str, default=None, help='Also write the full report as JSON')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("Footpath Graph Compiler")
+    print("="*60)
+
+    start = time.perf_counter()
+    lines = load_lines()
+    graph = compile_graph(lines, args.merge, args.bridge)
+
+    with open(MEMORIALS_JSON, 'r', encoding='utf-8') as f:
+        memorials = json.load(f)
+    index = EdgeIndex(graph['nodes'], graph['edges'])
+    positions = [memorial_position(m) for m in memorials]
+    memorial_snaps = [snap(index, graph['plane'], p) for p in positions]
+    panel_pins, _ = resolve_panel_pins()
+    panel_snaps = {panel: snap(index, graph['plane'], (lat, lng)) for panel, (lng, lat) in panel_pins.items()}
+    document = to_json(graph, memorial_snaps, panel_snaps, positions)
+    report = build_report(graph, memorials, memorial_snaps, panel_snaps)
+    elapsed = time.perf_counter() - start
+
+    write_json_atomic(GRAPH_FILE, document, indent=None)
+
+    stats = graph['stats']
+    print(f"Lines: {stats['lines']}, vertices: {stats['vertices']}")
+    print(f"Merged within {args.merge:g} m: {stats['vertices']} vertices -> {stats['merged_nodes']} nodes")
+    print(f"Junctions split: {stats['junctions']}")
+    print(f"Bridges within {args.bridge:g} m: {stats['bridges']}")
+    print(f"Graph: {stats['nodes']} nodes, {stats['edges']} edges")
+
+    main_nodes = report['components'][0]['nodes'] if report['components'] else 0
+    print(f"\nComponents: {stats['components']} (largest has {main_nodes} of {stats['nodes']} nodes)")
+    for item in report['components'][1:]:
+        print(f"  ⚠ Component {item['component']}: {item['nodes']} nodes, {item['metres']:g} m "
+              f"near {item['centre'][0]}, {item['centre'][1]}")
+
+    snapped = sum(s is not None for s in memorial_snaps)
+    print(f"\nMemorials snapped: {snapped} of {len(memorials)}")
+    for item in report['memorials']:
+        print(f"  ⚠ {item['name']}: {item['problem']}")
+    print(f"AFM panels snapped: {len(panel_snaps)}")
+    for item in report['panels']:
+        print(f"  ⚠ Panel {item['panel']}: {item['problem']}")
+
+    print(f"\nTime: {elapsed * 1000:.1f} ms")
+    print(f"Graph: {GRAPH_FILE} ({GRAPH_FILE.stat().st_size / 1024:.1f} KB)")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📄 Report saved to: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
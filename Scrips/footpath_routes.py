@@ -0,0 +1,525 @@
+"""
+Shortest paths, walking-time isochrones and visit-order planning on the footpaths.
+
+Works on the graph compiled by footpath_graph.py (data/footpath-graph.json).
+The map used to route one memorial at a time in the browser, and the saved
+list could not plan a walk at all. This module precomputes what does not
+depend on the visitor and answers the rest quickly:
+
+  * a Dijkstra shortest-path tree from each site entrance (ENTRANCES, or
+    --entrance) to every node, and so to every memorial
+  * walking-time isochrone bands at WALK_SPEED_MPS (the speed map-view.js
+    uses): which memorials are within 2, 5, 10, 15 and 20 minutes
+  * visit-order tours for any set of memorials: nearest-neighbour start,
+    then 2-opt and Or-opt moves until nothing improves or the time budget
+    runs out
+
+and writes data/footpath-routes.json:
+
+  {"version": 1, "speed": 1.4, "minutes": [2, 5, 10, 15, 20],
+   "entrances": [{"name": ..., "position": [lat, lng],
+                  "parent": [node, ...],      tree: previous node, -1 at the roots / unreached
+                  "metres": [metres, ...],    per node, null if unreached
+                  "bands": [[memorial index, ...], ...]}],   memorials 0-2, 2-5, ... minutes away
+   "memorials": {"count": <records in memorials.json>,
+                 "fingerprint": <positions the graph snapped, see footpath_graph.py>,
+                 "routes": [[[metres, node], ...] per entrance, or null]}}
+
+A route to memorial i from entrance e ends at memorials.routes[i][e][1]; follow
+parent from there back to the entrance. js/map-view.js draws these routes
+straight away, and js/walk-planner.js plans tours of saved memorials in the
+browser with the same algorithms. Both ignore the file when its count or
+fingerprint does not match the memorials.json they loaded.
+
+The same answers are available from a small local HTTP API (--serve):
+
+  /route?from=lat,lng&to=<memorial index>
+  /tour?memorials=3,17,250[&from=lat,lng][&budget=200][&return=1]
+  /isochrone?from=lat,lng[&minutes=5,10]     GeoJSON lines
+
+Usage:
+  python Scrips/footpath_routes.py [--entrance "Name=lat,lng"]
+  python Scrips/footpath_routes.py --tour 3,17,250 [--from lat,lng] [--budget 200]
+  python Scrips/footpath_routes.py --serve [--port 8765]
+"""
+
+import argparse
+import heapq
+import json
+import math
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from afm_dataset import write_json_atomic
+from footpath_graph import GRAPH_FILE, MEMORIALS_JSON, EdgeIndex
+from spatial_index import LocalPlane, haversine, memorial_position, positions_fingerprint
+
+ROOT_DIR = Path(__file__).parent.parent
+ROUTES_FILE = ROOT_DIR / 'data' / 'footpath-routes.json'
+ROUTES_VERSION = 1
+
+# Metres per second (WALK_SPEED_MPS in map-view.js)
+WALK_SPEED_MPS = 1.4
+ISOCHRONE_MINUTES = [2, 5, 10, 15, 20]
+# DEFAULT_START_POINT in map-view.js
+ENTRANCES = [('Visitor Centre', (52.727859987183336, -1.7313294102227985))]
+# Milliseconds a tour may spend improving its order
+TOUR_BUDGET_MS = 200
+
+
+class RoutingGraph:
+    """
+    The compiled footpath graph with routing queries.
+
+    Args:
+        document: Contents of data/footpath-graph.json
+    """
+
+    def __init__(self, document):
+        self.nodes = [tuple(node) for node in document['nodes']]
+        offsets, targets, weights = document['offsets'], document['targets'], document['weights']
+        self.adjacency = [list(zip(targets[offsets[i]:offsets[i + 1]], weights[offsets[i]:offsets[i + 1]]))
+                          for i in range(len(self.nodes))]
+        self.memorial_count = document['memorials']['count']
+        self.memorial_fingerprint = document['memorials'].get('fingerprint')
+        self.memorial_snaps = document['memorials']['snaps']
+        self.plane = LocalPlane.around(self.nodes)
+        projected = [self.plane.project(lat, lng) for lat, lng in self.nodes]
+        edges = [(a, b) for a, links in enumerate(self.adjacency) for b, _ in links if a < b]
+        self.edge_index = EdgeIndex(projected, edges)
+
+    @classmethod
+    def load(cls, path=GRAPH_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def edge_length(self, a, b):
+        for other, w in self.adjacency[a]:
+            if other == b:
+                return w
+        return haversine(*self.nodes[a], *self.nodes[b])
+
+    def _seeds_from_snap(self, snap):
+        a, b, t, offset = snap
+        length = self.edge_length(a, b)
+        return {a: offset + t * length, b: offset + (1 - t) * length}
+
+    def attach(self, lat, lng):
+        """
+        Join a position to the network at the nearest point of a path.
+
+        Returns:
+            Dict node -> metres from the position to that node (walking
+            straight to the path, then along it)
+        """
+        found = self.edge_index.nearest(self.plane.project(lat, lng))
+        if found is None:
+            return {}
+        i, t, offset = found
+        a, b = self.edge_index.edges[i]
+        return self._seeds_from_snap([a, b, t, offset])
+
+    def memorial_seeds(self, index):
+        """attach() for memorial records, from the compiled snaps (empty without a position)."""
+        snap = self.memorial_snaps[index] if 0 <= index < len(self.memorial_snaps) else None
+        return self._seeds_from_snap(snap) if snap else {}
+
+    def shortest_tree(self, seeds, limit=math.inf):
+        """
+        Dijkstra from one or more seeded nodes.
+
+        Args:
+            seeds: Dict node -> starting metres
+            limit: Stop expanding beyond this many metres
+
+        Returns:
+            Tuple of (metres per node, math.inf if unreached; parent per node, -1 at roots)
+        """
+        dist = [math.inf] * len(self.nodes)
+        parent = [-1] * len(self.nodes)
+        queue = []
+        for node, d in seeds.items():
+            if d < dist[node]:
+                dist[node] = d
+                queue.append((d, node))
+        heapq.heapify(queue)
+        while queue:
+            d, node = heapq.heappop(queue)
+            if d > dist[node] or d > limit:
+                continue
+            for other, w in self.adjacency[node]:
+                nd = d + w
+                if nd < dist[other]:
+                    dist[other] = nd
+                    parent[other] = node
+                    heapq.heappush(queue, (nd, other))
+        return dist, parent
+
+    @staticmethod
+    def reach(dist, seeds):
+        """
+        Distance to a target given a tree and the target's seeds.
+
+        Returns:
+            Tuple of (metres, node the route arrives through), or (math.inf, -1)
+        """
+        best = (math.inf, -1)
+        for node, d in seeds.items():
+            if dist[node] + d < best[0]:
+                best = (dist[node] + d, node)
+        return best
+
+    @staticmethod
+    def path(parent, node):
+        """Nodes from the tree's root to node."""
+        nodes = []
+        while node != -1:
+            nodes.append(node)
+            node = parent[node]
+        return nodes[::-1]
+
+    def route(self, start, target_seeds, target_position):
+        """
+        Shortest walk from a position to a target.
+
+        Args:
+            start: (lat, lng)
+            target_seeds: Result of attach() or memorial_seeds() for the target
+            target_position: (lat, lng) of the target, for the last step
+
+        Returns:
+            Dict with metres, seconds and coords ([lat, lng] list), or None if unreachable
+        """
+        dist, parent = self.shortest_tree(self.attach(*start))
+        metres, node = self.reach(dist, target_seeds)
+        if node == -1:
+            return None
+        coords = [list(start)] + [list(self.nodes[n]) for n in self.path(parent, node)] + [list(target_position)]
+        return {'metres': round(metres, 1), 'seconds': round(metres / WALK_SPEED_MPS), 'coords': coords}
+
+    def isochrone(self, dist, minutes, speed=WALK_SPEED_MPS):
+        """
+        Path pieces reachable within a walking time.
+
+        Returns:
+            List of [[lat, lng], [lat, lng]] pieces (whole edges, or the reachable
+            part of an edge from each end)
+        """
+        budget = minutes * 60 * speed
+        pieces = []
+        for a, links in enumerate(self.adjacency):
+            for b, w in links:
+                if b < a:
+                    continue
+                from_a = max(0.0, min(budget - dist[a], w)) if dist[a] < budget else 0.0
+                from_b = max(0.0, min(budget - dist[b], w)) if dist[b] < budget else 0.0
+                if from_a + from_b >= w:
+                    pieces.append([list(self.nodes[a]), list(self.nodes[b])])
+                    continue
+                for start, end, part in ((a, b, from_a), (b, a, from_b)):
+                    if part > 0:
+                        f = part / w
+                        (lat0, lng0), (lat1, lng1) = self.nodes[start], self.nodes[end]
+                        pieces.append([[lat0, lng0], [lat0 + f * (lat1 - lat0), lng0 + f * (lng1 - lng0)]])
+        return pieces
+
+    def distance_matrix(self, seed_list):
+        """Walking metres between every pair of seeded points (one Dijkstra per point)."""
+        matrix = []
+        for seeds in seed_list:
+            dist, _ = self.shortest_tree(seeds)
+            matrix.append([self.reach(dist, other)[0] for other in seed_list])
+        return matrix
+
+
+def tour_length(matrix, order, closed=False):
+    total = sum(matrix[a][b] for a, b in zip(order, order[1:]))
+    return total + (matrix[order[-1]][order[0]] if closed and len(order) > 1 else 0.0)
+
+
+def plan_tour(matrix, budget_ms=TOUR_BUDGET_MS, closed=False):
+    """
+    Order in which to visit points, starting at point 0.
+
+    Nearest neighbour first, then 2-opt (reverse a stretch) and Or-opt (move
+    a run of 1-3 stops elsewhere) improvements until none helps or budget_ms
+    has passed.
+
+    Args:
+        matrix: Distances between points (row / column 0 is the start)
+        closed: Return to the start at the end
+
+    Returns:
+        Tuple of (order as point indexes beginning with 0, length, whether
+        the improvement loop finished before the budget)
+    """
+    deadline = time.perf_counter() + budget_ms / 1000
+    n = len(matrix)
+    order = [0]
+    left = set(range(1, n))
+    while left:
+        last = order[-1]
+        nxt = min(left, key=lambda j: (matrix[last][j], j))
+        order.append(nxt)
+        left.remove(nxt)
+    if closed:
+        order.append(0)
+
+    def cost(a, b):
+        return matrix[a][b]
+
+    converged = False
+    while time.perf_counter() < deadline:
+        improved = False
+        # 2-opt: reverse order[i..j]; the start stays first (and last when closed)
+        last_index = len(order) - 1
+        for i in range(1, last_index + (0 if closed else 1)):
+            for j in range(i + 1, last_index + (0 if closed else 1)):
+                before = cost(order[i - 1], order[i]) + (cost(order[j], order[j + 1]) if j < last_index else 0.0)
+                after = cost(order[i - 1], order[j]) + (cost(order[i], order[j + 1]) if j < last_index else 0.0)
+                if after < before - 1e-9:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    improved = True
+            if time.perf_counter() >= deadline:
+                break
+        # Or-opt: move a run of 1-3 stops (either way round) to another position
+        for run in (1, 2, 3):
+            i = 1
+            while i + run <= last_index + (0 if closed else 1) and time.perf_counter() < deadline:
+                segment = order[i:i + run]
+                rest = order[:i] + order[i + run:]
+                after_segment = order[i + run] if i + run <= last_index else None
+                saved = cost(order[i - 1], segment[0])
+                if after_segment is not None:
+                    saved += cost(segment[-1], after_segment) - cost(order[i - 1], after_segment)
+                best = None
+                for k in range(1, len(rest) + (0 if closed else 1)):
+                    if k == i:
+                        continue
+                    for piece in (segment, segment[::-1]):
+                        added = cost(rest[k - 1], piece[0])
+                        if k < len(rest):
+                            added += cost(piece[-1], rest[k]) - cost(rest[k - 1], rest[k])
+                        if added < saved - 1e-9 and (best is None or added < best[0]):
+                            best = (added, k, piece)
+                if best:
+                    _, k, piece = best
+                    order = rest[:k] + piece + rest[k:]
+                    improved = True
+                i += 1
+        if not improved:
+            converged = True
+            break
+
+    if closed:
+        order = order[:-1]
+    return order, tour_length(matrix, order, closed), converged
+
+
+def target_position(graph, memorials, index):
+    """(lat, lng) of a memorial for drawing the last step (the path node it snaps to if the record has none)."""
+    found = memorial_position(memorials[index]) if 0 <= index < len(memorials) else None
+    if found is None and graph.memorial_snaps[index]:
+        return graph.nodes[graph.memorial_snaps[index][0]]
+    return found
+
+
+def tour(graph, memorials, indexes, start=None, budget_ms=TOUR_BUDGET_MS, closed=False):
+    """
+    Plan a walk past memorials.
+
+    Args:
+        graph: RoutingGraph
+        memorials: memorials.json records
+        indexes: Memorial indexes to visit (ones without a position, or on a
+            part of the network the start cannot reach, are skipped)
+        start: (lat, lng) to start from (default: the first entrance)
+
+    Returns:
+        Dict with order (memorial indexes), legs (metres per leg), metres,
+        seconds, converged, skipped and milliseconds
+    """
+    begin = time.perf_counter()
+    start = start or ENTRANCES[0][1]
+    start_seeds = graph.attach(*start)
+    from_start, _ = graph.shortest_tree(start_seeds)
+    stops = [i for i in dict.fromkeys(indexes)
+             if graph.memorial_seeds(i) and graph.reach(from_start, graph.memorial_seeds(i))[0] < math.inf]
+    matrix = graph.distance_matrix([start_seeds] + [graph.memorial_seeds(i) for i in stops])
+    remaining = max(budget_ms - (time.perf_counter() - begin) * 1000, 0)
+    order, metres, converged = plan_tour(matrix, remaining, closed)
+    legs = [matrix[a][b] for a, b in zip(order, order[1:] + ([0] if closed else []))]
+    return {
+        'order': [stops[k - 1] for k in order[1:]],
+        'legs': [round(leg, 1) for leg in legs],
+        'metres': round(metres, 1),
+        'seconds': round(metres / WALK_SPEED_MPS),
+        'converged': converged,
+        'skipped': [i for i in indexes if i not in stops],
+        'milliseconds': round((time.perf_counter() - begin) * 1000, 1),
+    }
+
+
+def build_routes(graph, entrances=ENTRANCES, minutes=ISOCHRONE_MINUTES):
+    """The data/footpath-routes.json document."""
+    document = {
+        'version': ROUTES_VERSION,
+        'speed': WALK_SPEED_MPS,
+        'minutes': list(minutes),
+        'entrances': [],
+        'memorials': {'count': graph.memorial_count, 'fingerprint': graph.memorial_fingerprint,
+                      'routes': [None] * graph.memorial_count},
+    }
+    targets = [graph.memorial_seeds(i) for i in range(graph.memorial_count)]
+    for e, (name, position) in enumerate(entrances):
+        dist, parent = graph.shortest_tree(graph.attach(*position))
+        bands = [[] for _ in minutes]
+        for i, seeds in enumerate(targets):
+            if not seeds:
+                continue
+            metres, node = graph.reach(dist, seeds)
+            routes = document['memorials']['routes']
+            if routes[i] is None:
+                routes[i] = []
+            routes[i].append([round(metres, 1), node] if node != -1 else None)
+            # Each memorial is in the first band it fits (bands do not overlap)
+            for band, limit in enumerate(minutes):
+                if metres <= limit * 60 * WALK_SPEED_MPS:
+                    bands[band].append(i)
+                    break
+        document['entrances'].append({
+            'name': name,
+            'position': list(position),
+            'parent': parent,
+            'metres': [round(d, 1) if d < math.inf else None for d in dist],
+            'bands': bands,
+        })
+    return document
+
+
+def parse_position(text):
+    lat, lng = (float(part) for part in text.split(','))
+    return lat, lng
+
+
+def make_handler(graph, memorials):
+    """HTTP handler class for the local API."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                start = parse_position(query['from']) if 'from' in query else ENTRANCES[0][1]
+                if url.path == '/route':
+                    index = int(query['to'])
+                    result = graph.route(start, graph.memorial_seeds(index), target_position(graph, memorials, index))
+                    self._send(200 if result else 404, result or {'error': 'unreachable'})
+                elif url.path == '/tour':
+                    indexes = [int(part) for part in query['memorials'].split(',') if part]
+                    self._send(200, tour(graph, memorials, indexes, start, float(query.get('budget', TOUR_BUDGET_MS)),
+                                         query.get('return') == '1'))
+                elif url.path == '/isochrone':
+                    minutes = [float(part) for part in query.get('minutes', '5,10').split(',')]
+                    dist, _ = graph.shortest_tree(graph.attach(*start))
+                    features = [{'type': 'Feature', 'properties': {'minutes': m},
+                                 'geometry': {'type': 'MultiLineString',
+                                              'coordinates': [[[lng, lat] for lat, lng in piece]
+                                                              for piece in graph.isochrone(dist, m)]}}
+                                for m in minutes]
+                    self._send(200, {'type': 'FeatureCollection', 'features': features})
+                else:
+                    self._send(404, {'error': 'unknown endpoint'})
+            except (KeyError, ValueError, IndexError) as e:
+                self._send(400, {'error': f"{type(e).__name__}: {e}"})
+
+        def log_message(self, format, *args):
+            print(f"  {self.command} {self.path}")
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute footpath routes and plan memorial walks.')
+    parser.add_argument('--entrance', action='append', default=None,
+                        help='Entrance as "Name=lat,lng" (repeatable; default: the visitor centre)')
+    parser.add_argument('--tour', type=str, default=None, help='Plan a walk past these memorial indexes (1,5,9)')
+    parser.add_argument('--from', dest='start', type=str, default=None, help='Start of --tour as lat,lng')
+    parser.add_argument('--budget', type=float, default=TOUR_BUDGET_MS,
+                        help=f'Milliseconds for --tour (default: {TOUR_BUDGET_MS})')
+    parser.add_argument('--return', dest='closed', action='store_true', help='--tour returns to the start')
+    parser.add_argument('--serve', action='store_true', help='Run the local HTTP API')
+    parser.add_argument('--port', type=int, default=8765, help='Port for --serve (default: 8765)')
+    args = parser.parse_args()
+
+    graph = RoutingGraph.load()
+    with open(MEMORIALS_JSON, 'r', encoding='utf-8') as f:
+        memorials = json.load(f)
+    current = positions_fingerprint([memorial_position(m) for m in memorials])
+    if graph.memorial_count != len(memorials) or graph.memorial_fingerprint != current:
+        print("✗ footpath-graph.json was built from a different memorials.json; run footpath_graph.py first")
+        sys.exit(1)
+
+    if args.serve:
+        server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(graph, memorials))
+        print(f"Serving /route, /tour and /isochrone on http://127.0.0.1:{args.port} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.tour:
+        indexes = [int(part) for part in args.tour.split(',') if part]
+        start = parse_position(args.start) if args.start else None
+        result = tour(graph, memorials, indexes, start, args.budget, args.closed)
+        print(f"Walk past {len(result['order'])} memorials: {result['metres']:.0f} m, "
+              f"about {result['seconds'] / 60:.0f} min (planned in {result['milliseconds']} ms"
+              f"{'' if result['converged'] else ', budget reached'})")
+        for stop, leg in zip(result['order'], result['legs']):
+            print(f"  {leg:7.0f} m  {memorials[stop]['name']}")
+        for index in result['skipped']:
+            print(f"  ⚠ Skipped (no position, or not reachable from the start): {memorials[index]['name'] if 0 <= index < len(memorials) else index}")
+        return
+
+    entrances = ENTRANCES
+    if args.entrance:
+        entrances = []
+        for text in args.entrance:
+            name, _, position = text.rpartition('=')
+            entrances.append((name or f"Entrance {len(entrances) + 1}", parse_position(position)))
+
+    print("="*60)
+    print("Footpath Routes")
+    print("="*60)
+    start = time.perf_counter()
+    document = build_routes(graph, entrances)
+    elapsed = time.perf_counter() - start
+    write_json_atomic(ROUTES_FILE, document, indent=None)
+
+    for e, entrance in enumerate(document['entrances']):
+        reached = [r[e] for r in document['memorials']['routes'] if r and r[e]]
+        print(f"{entrance['name']}: {len(reached)} memorials reachable, "
+              f"furthest {max((m for m, _ in reached), default=0):.0f} m")
+        lower = 0
+        for minutes, members in zip(document['minutes'], entrance['bands']):
+            print(f"  {lower:>2}-{minutes:<2} min: {len(members)}")
+            lower = minutes
+    print(f"\nTime: {elapsed * 1000:.1f} ms")
+    print(f"Routes: {ROUTES_FILE} ({ROUTES_FILE.stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,552 @@
+"""
+Simplify the footpath lines and quantise the map geometry.
+
+data/footpaths.geojson and data/AFM-Wall-<A-I>.json were exported with
+16-digit coordinates in indented JSON: around a nanometre of precision for
+positions a phone's GPS knows to a few metres. They stay the masters: this
+stage only reads them, and writes a smaller footpath copy under data/min/
+for the browser to download:
+
+  1. Simplifies every footpath LineString with Douglas-Peucker to within
+     --tolerance metres, without changing the network's topology:
+     - Vertices where paths meet are kept: vertices within the graph's
+       merge distance of another path's vertex, both ends of segments that
+       cross another path, and both ends of segments another path ends
+       near enough to be bridged (see footpath_graph.py).
+     - A shortcut that would move a path across another path's vertex is
+       refused.
+  2. Rounds every coordinate to --digits decimal places (7 by default, the
+     grid afm_pins.py already reads the pins on, about 1 cm).
+  3. Writes the footpath copy as compact JSON under the same name, and
+     with --topojson also one TopoJSON-style topology of the footpaths and
+     the quantised wall files: integer coordinates on the same grid
+     (transform), with line coordinates delta-encoded as arcs.
+
+No wall copies are written: the browser reads its pins from
+js/afm-panels.js, not from the wall files. The footpath copy is only
+fetched on js/map-view.js's fallback path (loadFootpathsGeoJSON), when
+data/footpath-graph.json is missing; normally the compiled graph is drawn
+instead. footpath_graph.py and footpath_routes.py read the masters.
+
+Every run starts again from the masters, so running it twice gives the
+same files, and the error reported is always the distance from the master
+geometry.
+
+The report gives the size of every master and its copy (the walls only
+with --topojson), the largest
+distance between a master vertex and the output geometry, and the
+footpath graph's junctions, bridges and components before and after.
+
+Usage:
+  python Scrips/geometry_simplify.py [--tolerance 0.5] [--digits 7] [--out-dir data/min] [--dry-run]
+  python Scrips/geometry_simplify.py --topojson data/geometry.topojson
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+from afm_dataset import write_json_atomic
+from afm_pins import COORD_DIGITS
+from footpath_graph import (BRIDGE_METERS, FOOTPATHS_FILE, GRAPH_FILE, MERGE_METERS, EdgeIndex, compile_graph,
+                            point_segment, segment_intersection)
+from spatial_index import LocalPlane
+
+ROOT_DIR = Path(__file__).parent.parent
+DATA_DIR = ROOT_DIR / 'data'
+MIN_DIR = DATA_DIR / 'min'
+
+# Largest distance a simplified path may move from the drawn one
+TOLERANCE_METERS = 0.5
+
+
+def load_geojson(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def wall_files(data_dir=DATA_DIR):
+    return sorted(data_dir.glob('AFM-Wall-*.json'))
+
+
+def simplify_masters(tolerance=TOLERANCE_METERS, digits=COORD_DIGITS, footpaths_file=FOOTPATHS_FILE,
+                     data_dir=DATA_DIR, walls=False):
+    """
+    Simplified and quantised copies of the master geometry files.
+
+    Args:
+        walls: Also quantise the AFM-Wall-<X>.json files (for the topology)
+
+    Returns:
+        Tuple of (dict master path -> new document, list of (master path,
+        largest error in metres), simplify_footpaths() stats)
+    """
+    outputs = {}
+    errors = []
+    footpaths, stats = simplify_footpaths(load_geojson(footpaths_file), tolerance, digits)
+    outputs[footpaths_file] = footpaths
+    errors.append((footpaths_file, stats['error']))
+    for path in wall_files(data_dir) if walls else []:
+        document, error = quantise_points(load_geojson(path), digits)
+        outputs[path] = document
+        errors.append((path, error))
+    return outputs, errors, stats
+
+
+def write_outputs(outputs, out_dir=MIN_DIR):
+    """
+    Write simplify_masters() documents as compact JSON under out_dir.
+
+    Returns:
+        List of paths written
+    """
+    written = []
+    for path, document in outputs.items():
+        target = Path(out_dir) / path.name
+        if target.resolve() == path.resolve():
+            raise ValueError(f"{target} is a master file; choose another output directory")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(target, document, indent=None)
+        written.append(target)
+    return written
+
+
+def line_parts(document):
+    """
+    The footpath polylines of a FeatureCollection.
+
+    Returns:
+        List of (feature index, part index or None, [[lng, lat], ...]);
+        part is None for a LineString, else the part of a MultiLineString
+    """
+    parts = []
+    for f, feature in enumerate(document.get('features', [])):
+        geometry = feature.get('geometry') or {}
+        if geometry.get('type') == 'LineString':
+            parts.append((f, None, geometry['coordinates']))
+        elif geometry.get('type') == 'MultiLineString':
+            for p, part in enumerate(geometry['coordinates']):
+                parts.append((f, p, part))
+    return parts
+
+
+def quantise_coordinates(coordinates, digits):
+    """Round a GeoJSON coordinate array of any depth to digits decimal places."""
+    if coordinates and isinstance(coordinates[0], (int, float)):
+        return [round(value, digits) for value in coordinates]
+    return [quantise_coordinates(item, digits) for item in coordinates]
+
+
+def inside(point, ring):
+    """Whether point lies inside the polygon closed by ring (even-odd rule)."""
+    x, y = point
+    result = False
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            result = not result
+    return result
+
+
+def junction_anchors(lines, tolerance, merge=MERGE_METERS, bridge=BRIDGE_METERS):
+    """
+    Vertices simplification must keep so paths still meet where they did.
+
+    Args:
+        lines: Lists of (x, y) in metres
+
+    Returns:
+        List of sets of vertex positions, one per line
+    """
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+    nodes = [p for line in lines for p in line]
+    owner = [(l, i) for l, line in enumerate(lines) for i in range(len(line))]
+    anchors = [{0, len(line) - 1} for line in lines]
+
+    # Vertices the graph would merge with another path's vertex
+    cells = {}
+    for n, (x, y) in enumerate(nodes):
+        cx, cy = math.floor(x / merge), math.floor(y / merge)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for m in cells.get((cx + dx, cy + dy), ()):
+                    if owner[m][0] != owner[n][0] and math.dist(nodes[m], nodes[n]) < merge:
+                        for l, i in (owner[m], owner[n]):
+                            anchors[l].add(i)
+        cells.setdefault((cx, cy), []).append(n)
+
+    # Segments that cross another path, or that another path ends close to
+    edges = [(offsets[l] + i, offsets[l] + i + 1) for l, line in enumerate(lines) for i in range(len(line) - 1)]
+    index = EdgeIndex(nodes, edges)
+    reach = bridge + tolerance
+    ends = {offsets[l] for l in range(len(lines))} | {offsets[l + 1] - 1 for l in range(len(lines))}
+    for e, (a, b) in enumerate(edges):
+        (la, ia), ib = owner[a], owner[b][1]
+        for other in index.overlapping(e, reach):
+            c, d = edges[other]
+            lc, ic = owner[c]
+            if lc == la and abs(ic - ia) <= 1:
+                continue
+            touched = any(n in ends and point_segment(nodes[n], nodes[a], nodes[b])[1] <= reach for n in (c, d))
+            if touched or segment_intersection(nodes[a], nodes[b], nodes[c], nodes[d]) is not None:
+                anchors[la].update((ia, ib))
+                if not touched:
+                    anchors[lc].update((ic, ic + 1))
+    return anchors
+
+
+def simplify_lines(lines, tolerance, anchors):
+    """
+    Topology-preserving Douglas-Peucker.
+
+    Each run between consecutive anchors is simplified on its own. A
+    shortcut is only taken when every vertex it drops is within tolerance
+    of it and no vertex of any other path (or of the rest of this one)
+    lies between the shortcut and the original run.
+
+    Args:
+        lines: Lists of (x, y) in metres
+        anchors: Result of junction_anchors()
+
+    Returns:
+        List of sorted kept vertex positions, one per line
+    """
+    cell = 10.0
+    cells = {}
+    for l, line in enumerate(lines):
+        for i, (x, y) in enumerate(line):
+            cells.setdefault((math.floor(x / cell), math.floor(y / cell)), []).append((l, i))
+
+    def foreign_vertex_between(l, i, j):
+        run = lines[l][i:j + 1]
+        xs = [x for x, _ in run]
+        ys = [y for _, y in run]
+        for cx in range(math.floor(min(xs) / cell), math.floor(max(xs) / cell) + 1):
+            for cy in range(math.floor(min(ys) / cell), math.floor(max(ys) / cell) + 1):
+                for m, k in cells.get((cx, cy), ()):
+                    if m == l and i <= k <= j:
+                        continue
+                    point = lines[m][k]
+                    if point in (run[0], run[-1]):
+                        continue
+                    if inside(point, run):
+                        return True
+        return False
+
+    kept = []
+    for l, line in enumerate(lines):
+        keep = sorted(anchors[l])
+        result = set(keep)
+        stack = list(zip(keep, keep[1:]))
+        while stack:
+            i, j = stack.pop()
+            if j - i < 2:
+                continue
+            far, far_distance = None, -1.0
+            for k in range(i + 1, j):
+                distance = point_segment(line[k], line[i], line[j])[1]
+                if distance > far_distance:
+                    far, far_distance = k, distance
+            if far_distance > tolerance or foreign_vertex_between(l, i, j):
+                result.add(far)
+                stack.extend(((i, far), (far, j)))
+        kept.append(sorted(result))
+    return kept
+
+
+def max_error(original, output, kept=None):
+    """
+    Largest distance from an original vertex to the output line, in metres.
+
+    Args:
+        original: List of (x, y)
+        output: List of (x, y) of the output line
+        kept: Positions in original of the output vertices (default: all)
+    """
+    kept = kept if kept is not None else range(len(original))
+    worst = 0.0
+    spans = list(zip(kept, kept[1:]))
+    for s, (i, j) in enumerate(spans):
+        for k in range(i, j + 1):
+            worst = max(worst, point_segment(original[k], output[s], output[s + 1])[1])
+    if len(output) == 1:
+        worst = max(worst, math.dist(original[0], output[0]))
+    return worst
+
+
+def simplify_footpaths(document, tolerance=TOLERANCE_METERS, digits=COORD_DIGITS):
+    """
+    Simplify and quantise a footpath FeatureCollection.
+
+    Returns:
+        Tuple of (new document, stats dict with vertices before / after,
+        largest error in metres and the lines as (lat, lng) before / after)
+    """
+    parts = line_parts(document)
+    source = [[(c[1], c[0]) for c in coordinates] for _, _, coordinates in parts]
+    plane = LocalPlane.around([p for line in source for p in line])
+    projected = [[plane.project(lat, lng) for lat, lng in line] for line in source]
+
+    anchors = junction_anchors(projected, tolerance)
+    kept = simplify_lines(projected, tolerance, anchors)
+
+    output = json.loads(json.dumps(document))
+    features = output.get('features', [])
+    simplified = []
+    worst = 0.0
+    for (f, p, coordinates), line, keep in zip(parts, projected, kept):
+        coords = quantise_coordinates([coordinates[k] for k in keep], digits)
+        geometry = features[f]['geometry']
+        if p is None:
+            geometry['coordinates'] = coords
+        else:
+            geometry['coordinates'][p] = coords
+        simplified.append([(lat, lng) for lng, lat in coords])
+        worst = max(worst, max_error(line, [plane.project(lat, lng) for lng, lat in coords], keep))
+    for feature in features:
+        geometry = feature.get('geometry') or {}
+        if geometry.get('type') not in ('LineString', 'MultiLineString') and 'coordinates' in geometry:
+            geometry['coordinates'] = quantise_coordinates(geometry['coordinates'], digits)
+
+    stats = {
+        'vertices': sum(map(len, source)),
+        'kept': sum(map(len, kept)),
+        'error': worst,
+        'before': source,
+        'after': simplified,
+    }
+    return output, stats
+
+
+def quantise_points(document, digits=COORD_DIGITS):
+    """
+    Quantise a FeatureCollection's coordinates without simplifying.
+
+    Returns:
+        Tuple of (new document, largest move of a coordinate in metres)
+    """
+    output = json.loads(json.dumps(document))
+    positions = []
+    for feature in output.get('features', []):
+        geometry = feature.get('geometry') or {}
+        if 'coordinates' in geometry:
+            original = geometry['coordinates']
+            geometry['coordinates'] = quantise_coordinates(original, digits)
+            positions.append((original, geometry['coordinates']))
+
+    def flatten(coordinates):
+        if coordinates and isinstance(coordinates[0], (int, float)):
+            return [coordinates]
+        return [p for item in coordinates for p in flatten(item)]
+
+    pairs = [(a, b) for original, quantised in positions for a, b in zip(flatten(original), flatten(quantised))]
+    if not pairs:
+        return output, 0.0
+    plane = LocalPlane.around([(a[1], a[0]) for a, _ in pairs])
+    worst = max(math.dist(plane.project(a[1], a[0]), plane.project(b[1], b[0])) for a, b in pairs)
+    return output, worst
+
+
+def build_topology(documents, digits=COORD_DIGITS):
+    """
+    TopoJSON-style topology of GeoJSON FeatureCollections.
+
+    Coordinates become integers on a grid of 10^-digits degrees
+    (transform); each line becomes one arc, delta-encoded. Points keep
+    absolute integer positions, as in TopoJSON.
+
+    Args:
+        documents: Dict of object name -> FeatureCollection
+            (Point, MultiPoint, LineString and MultiLineString geometries)
+
+    Returns:
+        Topology dict
+    """
+    scale = 10 ** -digits
+    positions = []
+
+    def collect(coordinates):
+        if coordinates and isinstance(coordinates[0], (int, float)):
+            positions.append(coordinates)
+        else:
+            for item in coordinates:
+                collect(item)
+
+    for document in documents.values():
+        for feature in document.get('features', []):
+            collect((feature.get('geometry') or {}).get('coordinates') or [])
+    translate = [round(min(p[0] for p in positions), digits), round(min(p[1] for p in positions), digits)] \
+        if positions else [0.0, 0.0]
+
+    def grid(position):
+        return [round((position[0] - translate[0]) / scale), round((position[1] - translate[1]) / scale)]
+
+    arcs = []
+
+    def arc(line):
+        points = [grid(p) for p in line]
+        encoded = [points[0]] + [[x - px, y - py] for (px, py), (x, y) in zip(points, points[1:])]
+        arcs.append(encoded)
+        return len(arcs) - 1
+
+    objects = {}
+    for name, document in documents.items():
+        geometries = []
+        for feature in document.get('features', []):
+            geometry = feature.get('geometry') or {}
+            kind = geometry.get('type')
+            if kind == 'Point':
+                item = {'type': kind, 'coordinates': grid(geometry['coordinates'])}
+            elif kind == 'MultiPoint':
+                item = {'type': kind, 'coordinates': [grid(p) for p in geometry['coordinates']]}
+            elif kind == 'LineString':
+                item = {'type': kind, 'arcs': [arc(geometry['coordinates'])]}
+            elif kind == 'MultiLineString':
+                item = {'type': kind, 'arcs': [[arc(part)] for part in geometry['coordinates']]}
+            else:
+                raise ValueError(f"{name}: unsupported geometry type {kind!r}")
+            if feature.get('properties'):
+                item['properties'] = feature['properties']
+            geometries.append(item)
+        objects[name] = {'type': 'GeometryCollection', 'geometries': geometries}
+
+    return {
+        'type': 'Topology',
+        'transform': {'scale': [scale, scale], 'translate': translate},
+        'objects': objects,
+        'arcs': arcs,
+    }
+
+
+def decode_topology(topology, digits=COORD_DIGITS):
+    """
+    FeatureCollections back from build_topology().
+
+    Returns:
+        Dict of object name -> FeatureCollection
+    """
+    scale_x, scale_y = topology['transform']['scale']
+    tx, ty = topology['transform']['translate']
+
+    def position(x, y):
+        return [round(x * scale_x + tx, digits), round(y * scale_y + ty, digits)]
+
+    lines = []
+    for encoded in topology['arcs']:
+        x = y = 0
+        line = []
+        for dx, dy in encoded:
+            x += dx
+            y += dy
+            line.append(position(x, y))
+        lines.append(line)
+
+    documents = {}
+    for name, collection in topology['objects'].items():
+        features = []
+        for item in collection['geometries']:
+            kind = item['type']
+            if kind == 'Point':
+                coordinates = position(*item['coordinates'])
+            elif kind == 'MultiPoint':
+                coordinates = [position(*p) for p in item['coordinates']]
+            elif kind == 'LineString':
+                coordinates = [p for a in item['arcs'] for p in lines[a]]
+            else:
+                coordinates = [[p for a in part for p in lines[a]] for part in item['arcs']]
+            features.append({'type': 'Feature', 'properties': item.get('properties', {}),
+                             'geometry': {'type': kind, 'coordinates': coordinates}})
+        documents[name] = {'type': 'FeatureCollection', 'features': features}
+    return documents
+
+
+def compact_size(document):
+    return len(json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simplify the footpaths and quantise the map geometry files.')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE_METERS,
+                        help=f'Footpath simplification tolerance in metres (default: {TOLERANCE_METERS:g})')
+    parser.add_argument('--digits', type=int, default=COORD_DIGITS,
+                        help=f'Decimal places kept in coordinates (default: {COORD_DIGITS})')
+    parser.add_argument('--out-dir', type=str, default=str(MIN_DIR),
+                        help=f'Directory for the copies (default: {MIN_DIR.relative_to(ROOT_DIR)})')
+    parser.add_argument('--topojson', type=str, default=None, help='Also write a TopoJSON-style topology here')
+    parser.add_argument('--dry-run', action='store_true', help='Report only, do not write any files')
+    args = parser.parse_args()
+
+    if args.digits < 0 or args.tolerance < 0:
+        print("Error: --digits and --tolerance must not be negative")
+        sys.exit(1)
+    out_dir = Path(args.out_dir)
+    if out_dir.resolve() == DATA_DIR.resolve():
+        print("Error: --out-dir must not be data/, which holds the master files")
+        sys.exit(1)
+
+    print("="*60)
+    print("Geometry Simplification")
+    print("="*60)
+
+    start = time.perf_counter()
+    outputs, rows, stats = simplify_masters(args.tolerance, args.digits, walls=bool(args.topojson))
+    graphs = [compile_graph(stats['before'])['stats'], compile_graph(stats['after'])['stats']]
+    topology = build_topology({path.stem: document for path, document in outputs.items()}, args.digits) \
+        if args.topojson else None
+    elapsed = time.perf_counter() - start
+    compact_before = sum(compact_size(load_geojson(path)) for path, _ in rows)
+
+    print(f"Footpaths: {stats['vertices']} vertices -> {stats['kept']} "
+          f"(tolerance {args.tolerance:g} m, {args.digits} decimal places)")
+    print(f"\n{'File':<22} {'Master':>10} {'Copy':>10} {'Saved':>7} {'Max error':>10}")
+    total_before = total_after = 0
+    for path, error in rows:
+        before = path.stat().st_size
+        after = compact_size(outputs[path])
+        total_before += before
+        total_after += after
+        print(f"{path.name:<22} {before / 1024:>7.1f} KB {after / 1024:>7.1f} KB "
+              f"{100 * (1 - after / before):>6.1f}% {error:>8.3f} m")
+    print(f"{'Total':<22} {total_before / 1024:>7.1f} KB {total_after / 1024:>7.1f} KB "
+          f"{100 * (1 - total_after / total_before):>6.1f}%")
+    print(f"(Compact JSON alone, at full precision: {compact_before / 1024:.1f} KB)")
+    if args.topojson:
+        print("(Wall files go into the topology only; js/afm-panels.js holds the browser's pins.)")
+    print(f"Only js/map-view.js's fallback fetches {FOOTPATHS_FILE.name} from "
+          f"{MIN_DIR.relative_to(ROOT_DIR)}/, when {GRAPH_FILE.relative_to(ROOT_DIR)} is missing.")
+
+    print("\nFootpath graph (footpath_graph.py):   before -> after")
+    changed = False
+    for key in ('junctions', 'bridges', 'components'):
+        same = graphs[0][key] == graphs[1][key]
+        changed |= not same
+        print(f"  {'✓' if same else '⚠'} {key.capitalize():<12} {graphs[0][key]:>6} -> {graphs[1][key]}")
+    print(f"    {'Nodes':<12} {graphs[0]['nodes']:>6} -> {graphs[1]['nodes']}")
+
+    if args.topojson:
+        topojson_size = compact_size(topology)
+        print(f"\nTopoJSON: {topojson_size / 1024:.1f} KB for all {len(outputs)} files "
+              f"({100 * (1 - topojson_size / total_before):.1f}% smaller than the masters)")
+
+    print(f"\nTime: {elapsed * 1000:.1f} ms")
+
+    if changed:
+        print("⚠ The footpath network's topology changed; lower --tolerance. Nothing written.")
+        sys.exit(1)
+    if args.dry_run:
+        print("Dry run: nothing written.")
+        return
+
+    written = write_outputs({FOOTPATHS_FILE: outputs[FOOTPATHS_FILE]}, out_dir)
+    print(f"✓ Wrote {', '.join(path.name for path in written)} to {out_dir}")
+    if args.topojson:
+        write_json_atomic(Path(args.topojson), topology, indent=None)
+        print(f"✓ Wrote {args.topojson}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,26 +1,316 @@
+"""
+Convert survey photos (HEIC, or JPEG/PNG) into web-ready JPEG (and WebP).
+
+Each photo is decoded once, turned upright from its EXIF orientation,
+resized to fit the same box image_compressor.py uses (1080x1440 by default)
+and encoded once per output format. The EXIF block, including the GPS
+position, is carried into the JPEG with the orientation tag removed (the
+pixels are already upright). Because the output already fits the box, a
+later image_compressor.py run skips these files instead of decoding and
+encoding them a second time.
+
+Photos are converted in a process pool. Every finished photo is appended to
+a journal (.heic_to_jpeg_journal.jsonl in the output folder) with the
+source's size and mtime and the conversion settings, so an interrupted
+batch picks up where it stopped: photos already in the journal, unchanged
+and with their outputs on disk, are not decoded again. Outputs are written
+atomically, so an interrupted write never leaves half a JPEG behind.
+
+HEIC decoding needs pillow-heif (pip install pillow-heif).
+
+Usage:
+  python Scrips/heic_to_jpeg.py FOLDER [--output FOLDER/zone] [--webp]
+      [--width 1080] [--height 1440] [--quality 85] [--jobs N] [--force]
+"""
+
+import argparse
+import io
+import json
 import os
-from PIL import Image
-import pillow_heif
-
-def convert_heic_to_jpeg(directory):
-    output_dir = os.path.join(directory, 'zone')
-    os.makedirs(output_dir, exist_ok=True)
-    for filename in os.listdir(directory):
-        if filename.lower().endswith('.heic'):
-            heic_path = os.path.join(directory, filename)
-            jpeg_path = os.path.join(output_dir, os.path.splitext(filename)[0] + '.jpeg')
-            try:
-                heif_file = pillow_heif.open_heif(heic_path)
-                image = Image.frombytes(
-                    heif_file.mode,
-                    heif_file.size,
-                    heif_file.data,
-                    "raw"
-                )
-                image.save(jpeg_path, "JPEG")
-                print(f"Converted: {filename} -> {os.path.basename(jpeg_path)}")
-            except Exception as e:
-                print(f"Skipped {filename}: {e}")
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from afm_dataset import write_bytes_atomic
+from image_compressor import TARGET_HEIGHT, TARGET_WIDTH, get_resized_dimensions, should_compress
+
+HEIF_EXTENSIONS = {'.heic', '.heif'}
+SOURCE_EXTENSIONS = HEIF_EXTENSIONS | {'.jpg', '.jpeg', '.png'}
+JOURNAL_NAME = '.heic_to_jpeg_journal.jsonl'
+ORIENTATION_TAG = 0x0112
+
+FORMATS = {
+    'jpeg': ('JPEG', '.jpeg'),
+    'webp': ('WEBP', '.webp'),
+}
+
+
+def register_heif():
+    """
+    Let Pillow open HEIC files.
+
+    Returns:
+        True if pillow-heif is installed
+    """
+    try:
+        from pillow_heif import register_heif_opener
+    except ImportError:
+        return False
+    register_heif_opener()
+    return True
+
+
+def settings_key(settings):
+    """Conversion settings as stored in the journal; changing any of them redoes every photo."""
+    return [settings['width'], settings['height'], settings['quality'], sorted(settings['formats'])]
+
+
+def output_paths(source, output_dir, formats):
+    """Output file for each format: <output>/<source stem>.<ext>."""
+    return {fmt: Path(output_dir) / (Path(source).stem + FORMATS[fmt][1]) for fmt in formats}
+
+
+def convert_photo(task):
+    """
+    Decode, orient, resize and encode one photo.
+
+    Kept at module level so it can run in a process pool.
+
+    Args:
+        task: Tuple of (source path, output folder, settings dict)
+
+    Returns:
+        Dict with source, outputs (format -> [path, bytes]), size, gps and
+        seconds, or source and error
+    """
+    source, output_dir, settings = task
+    start = time.perf_counter()
+    try:
+        if Path(source).suffix.lower() in HEIF_EXTENSIONS:
+            register_heif()
+        with Image.open(source) as img:
+            exif = img.getexif()
+            width, height = img.size
+            if exif.get(ORIENTATION_TAG) in (5, 6, 7, 8):
+                width, height = height, width
+            target = (settings['width'], settings['height'])
+            if should_compress(width, height, *target):
+                new_size = get_resized_dimensions(width, height, *target)
+            else:
+                new_size = (width, height)
+
+            # JPEG sources can be reduced while decoding (box given in stored orientation)
+            if img.format == 'JPEG':
+                draft = new_size if (width, height) == img.size else new_size[::-1]
+                img.draft('RGB', draft)
+            upright = ImageOps.exif_transpose(img)
+            if upright.mode not in ('RGB', 'L'):
+                upright = upright.convert('RGB')
+            if upright.size != new_size:
+                upright = upright.resize(new_size, Image.Resampling.LANCZOS)
+
+        # Pixels are upright now; keep every other tag, GPS included
+        if ORIENTATION_TAG in exif:
+            del exif[ORIENTATION_TAG]
+        exif_bytes = exif.tobytes() if len(exif) else b''
+
+        outputs = {}
+        for fmt, path in output_paths(source, output_dir, settings['formats']).items():
+            buffer = io.BytesIO()
+            options = {'quality': settings['quality']}
+            if fmt == 'jpeg':
+                options.update(optimize=True, progressive=True)
+            else:
+                options.update(method=4)
+            if exif_bytes:
+                options['exif'] = exif_bytes
+            upright.save(buffer, FORMATS[fmt][0], **options)
+            write_bytes_atomic(path, buffer.getvalue())
+            outputs[fmt] = [path.name, buffer.tell()]
+    except Exception as e:
+        return {'source': str(source), 'error': f"{type(e).__name__}: {e}",
+                'seconds': time.perf_counter() - start}
+
+    return {
+        'source': str(source),
+        'outputs': outputs,
+        'size': list(new_size),
+        'gps': bool(exif.get_ifd(0x8825)),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def source_signature(path):
+    """Journal signature of a source file: [size, mtime_ns]."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_journal(journal_path, settings):
+    """
+    Read the resume journal.
+
+    Lines written with other settings, and a torn last line from an
+    interrupted run, are ignored.
+
+    Returns:
+        Dict source file name -> journal record
+    """
+    done = {}
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('settings') == settings_key(settings):
+                    done[record['source']] = record
+    except OSError:
+        pass
+    return done
+
+
+def is_done(record, source, output_dir):
+    """True if a journal record still matches the source and its outputs exist."""
+    if record is None or record.get('signature') != source_signature(source):
+        return False
+    return all((Path(output_dir) / name).exists() for name, _ in record['outputs'].values())
+
+
+def find_sources(folder):
+    """Photos directly inside folder, sorted."""
+    return sorted(p for p in Path(folder).iterdir() if p.is_file() and p.suffix.lower() in SOURCE_EXTENSIONS)
+
+
+def convert_folder(folder, output_dir, settings, jobs=None, force=False, on_result=None):
+    """
+    Convert every photo in folder, resuming from the journal.
+
+    Args:
+        folder: Source folder
+        output_dir: Output folder (created if needed)
+        settings: Dict with width, height, quality and formats
+        jobs: Worker processes (None for one per CPU)
+        force: Ignore the journal and convert everything
+        on_result: Function(result) called as each photo finishes
+
+    Returns:
+        Dict with converted, resumed (skipped via the journal), errors (list
+        of (source, message)) and seconds
+    """
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    journal_path = output_dir / JOURNAL_NAME
+
+    if force and journal_path.exists():
+        journal_path.unlink()
+    journal = load_journal(journal_path, settings)
+
+    sources = find_sources(folder)
+    todo = [source for source in sources if not is_done(journal.get(source.name), source, output_dir)]
+
+    converted = 0
+    errors = []
+    jobs = jobs or os.cpu_count() or 1
+    tasks = [(str(source), str(output_dir), settings) for source in todo]
+    with open(journal_path, 'a', encoding='utf-8') as journal_file:
+        def record(result):
+            nonlocal converted
+            if 'error' in result:
+                errors.append((result['source'], result['error']))
+            else:
+                converted += 1
+                source = Path(result['source'])
+                journal_file.write(json.dumps({
+                    'source': source.name,
+                    'signature': source_signature(source),
+                    'settings': settings_key(settings),
+                    'outputs': result['outputs'],
+                    'size': result['size'],
+                    'gps': result['gps'],
+                }, ensure_ascii=False) + '\n')
+                journal_file.flush()
+            if on_result:
+                on_result(result)
+
+        if jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                for future in as_completed([pool.submit(convert_photo, task) for task in tasks]):
+                    record(future.result())
+        else:
+            for task in tasks:
+                record(convert_photo(task))
+
+    return {
+        'converted': converted,
+        'resumed': len(sources) - len(todo),
+        'errors': errors,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert HEIC survey photos to resized JPEG/WebP in one pass.')
+    parser.add_argument('folder', type=str, help='Folder of HEIC (or JPEG/PNG) photos')
+    parser.add_argument('--output', type=str, default=None, help='Output folder (default: FOLDER/zone)')
+    parser.add_argument('--webp', action='store_true', help='Also write a WebP next to each JPEG')
+    parser.add_argument('--width', type=int, default=TARGET_WIDTH, help=f'Target width (default: {TARGET_WIDTH})')
+    parser.add_argument('--height', type=int, default=TARGET_HEIGHT,
+                        help=f'Target height (default: {TARGET_HEIGHT})')
+    parser.add_argument('--quality', type=int, default=85, help='Encoder quality (default: 85)')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='Ignore the resume journal')
+    args = parser.parse_args()
+
+    folder = Path(args.folder)
+    if not folder.is_dir():
+        print(f"Error: '{folder}' is not a directory.")
+        sys.exit(1)
+    output_dir = Path(args.output) if args.output else folder / 'zone'
+    settings = {
+        'width': args.width,
+        'height': args.height,
+        'quality': args.quality,
+        'formats': ['jpeg', 'webp'] if args.webp else ['jpeg'],
+    }
+
+    print("="*60)
+    print("HEIC to JPEG")
+    print("="*60)
+    print(f"Source: {folder}")
+    print(f"Output: {output_dir}")
+    print(f"Target: {args.width}x{args.height}, quality {args.quality}, {' + '.join(settings['formats'])}")
+
+    if any(p.suffix.lower() in HEIF_EXTENSIONS for p in find_sources(folder)) and not register_heif():
+        print("\npillow-heif is needed to read HEIC files:")
+        print("pip install pillow-heif")
+        sys.exit(1)
+    print()
+
+    def show(result):
+        name = Path(result['source']).name
+        if 'error' in result:
+            print(f"  ✗ {name}: {result['error']}")
+        else:
+            width, height = result['size']
+            gps = ', GPS' if result['gps'] else ''
+            print(f"  ✓ {name} -> {width}x{height}{gps} ({result['seconds']:.2f} s)")
+
+    stats = convert_folder(folder, output_dir, settings, jobs=args.jobs, force=args.force, on_result=show)
+
+    print(f"\n{'='*60}")
+    print("Summary:")
+    print(f"  Converted: {stats['converted']}")
+    print(f"  Already done (journal): {stats['resumed']}")
+    print(f"  Errors: {len(stats['errors'])}")
+    print(f"  Time: {stats['seconds']:.2f} s")
+    print(f"{'='*60}\n")
+
 
 if __name__ == "__main__":
-    convert_heic_to_jpeg(os.path.dirname(os.path.abspath(__file__)))
\ No newline at end of file
+    main()
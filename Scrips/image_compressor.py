@@ -1,4 +1,8 @@
 import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from PIL import Image
 import argparse
 
@@ -6,6 +10,15 @@ import argparse
 TARGET_WIDTH = 1080
 TARGET_HEIGHT = 1440
 
+JPEG_EXTENSIONS = {'.jpg', '.jpeg', '.JPG', '.JPEG'}
+
+# Bulk mode defaults: every img/zone* folder, with a cache of files already done.
+# The cache is local build state, kept out of the served img/ tree (and out of git).
+ROOT_DIR = Path(__file__).parent.parent
+IMG_DIR = ROOT_DIR / 'img'
+CACHE_FILE = ROOT_DIR / '.cache' / 'image_compressor.json'
+CACHE_VERSION = 2
+
 def get_resized_dimensions(width, height, target_width, target_height):
     """
     Calculate new dimensions while maintaining aspect ratio.
@@ -33,34 +46,62 @@ def should_compress(width, height, target_width, target_height):
     """
     return width > target_width or height > target_height
 
-def compress_image(image_path, target_width, target_height):
+def load_for_resize(img, target_width, target_height):
+    """
+    Decode a JPEG at a reduced scale when possible.
+
+    JPEG draft mode lets the decoder scale by 1/2, 1/4 or 1/8 while decoding
+    (DCT scaling), so a 3024x4032 photo is decoded at about 1512x2016 instead
+    of full size. The draft size never drops below the requested size, so the
+    final LANCZOS resample still has at least as many pixels as it outputs.
+    """
+    if img.format == 'JPEG':
+        img.draft('RGB', (target_width, target_height))
+    return img
+
+def compress_image(image_path, target_width, target_height, verbose=True):
     """
     Compress a single image to fit within target dimensions.
+
+    Returns:
+        True if the image was rewritten, False if skipped, None on error
     """
+    name = os.path.basename(image_path)
     try:
+        # Image.open only parses the header; pixels are decoded on resize
         with Image.open(image_path) as img:
             width, height = img.size
             
             # Check if compression is needed
             if not should_compress(width, height, target_width, target_height):
-                print(f"  ⏭️  Skipped (already {width}x{height}): {os.path.basename(image_path)}")
+                if verbose:
+                    print(f"  ⏭️  Skipped (already {width}x{height}): {name}")
                 return False
             
             # Calculate new dimensions
             new_width, new_height = get_resized_dimensions(width, height, target_width, target_height)
             
-            # Resize the image
+            # Resize the image, decoding at a reduced scale first
+            load_for_resize(img, new_width, new_height)
             img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
             
             # Save with high quality
             img_resized.save(image_path, 'JPEG', quality=85, optimize=True)
             
-            print(f"  ✓ Compressed {width}x{height} → {new_width}x{new_height}: {os.path.basename(image_path)}")
+            if verbose:
+                print(f"  ✓ Compressed {width}x{height} → {new_width}x{new_height}: {name}")
             return True
             
     except Exception as e:
-        print(f"  ✗ Error processing {os.path.basename(image_path)}: {str(e)}")
-        return False
+        print(f"  ✗ Error processing {name}: {str(e)}")
+        return None
+
+def _compress_worker(task):
+    """Process pool entry point: (path, width, height) -> (path, result, seconds)."""
+    image_path, target_width, target_height = task
+    start = time.perf_counter()
+    result = compress_image(image_path, target_width, target_height, verbose=False)
+    return image_path, result, time.perf_counter() - start
 
 def compress_images_in_folder(folder_path, target_width=TARGET_WIDTH, target_height=TARGET_HEIGHT):
     """
@@ -75,11 +116,10 @@ def compress_images_in_folder(folder_path, target_width=TARGET_WIDTH, target_hei
         return
     
     # Find all JPEG files
-    jpeg_extensions = {'.jpg', '.jpeg', '.JPG', '.JPEG'}
     image_files = [
         f for f in os.listdir(folder_path)
         if os.path.isfile(os.path.join(folder_path, f)) and 
-        os.path.splitext(f)[1] in jpeg_extensions
+        os.path.splitext(f)[1] in JPEG_EXTENSIONS
     ]
     
     if not image_files:
@@ -111,6 +151,122 @@ def compress_images_in_folder(folder_path, target_width=TARGET_WIDTH, target_hei
     print(f"  Errors: {error_count}")
     print(f"{'='*60}\n")
 
+def find_zone_images(img_dir=IMG_DIR):
+    """
+    List every JPEG under the img/zone* folders.
+
+    Returns:
+        Sorted list of file paths (str)
+    """
+    files = []
+    for zone in sorted(Path(img_dir).glob('zone*')):
+        for path in zone.rglob('*'):
+            if path.is_file() and path.suffix in JPEG_EXTENSIONS:
+                files.append(str(path))
+    return sorted(files)
+
+def load_cache(cache_file, img_dir, target_width, target_height):
+    """
+    Load the skip cache: path -> [mtime_ns, size] of files known to be done.
+
+    A cache written for another image folder or other target dimensions is ignored.
+    """
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if (cache.get('version') != CACHE_VERSION or cache.get('img_dir') != str(Path(img_dir).resolve())
+            or cache.get('target') != [target_width, target_height]):
+        return {}
+    return cache.get('files', {})
+
+def save_cache(cache_file, files, img_dir, target_width, target_height):
+    """Write the skip cache atomically."""
+    cache_file = Path(cache_file)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'img_dir': str(Path(img_dir).resolve()),
+                   'target': [target_width, target_height],
+                   'files': files}, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, cache_file)
+
+def file_key(path):
+    """Stat signature used by the cache: [mtime_ns, size]."""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def compress_all_zones(img_dir=IMG_DIR, target_width=TARGET_WIDTH, target_height=TARGET_HEIGHT,
+                       jobs=None, cache_file=CACHE_FILE, use_cache=True):
+    """
+    Compress every JPEG under img/zone* in a process pool.
+
+    Files whose path, mtime and size match the cache are skipped without being
+    opened. After a run every file that is now within the target size is
+    recorded with its new mtime and size.
+
+    Args:
+        img_dir: The img/ folder
+        target_width: Maximum width
+        target_height: Maximum height
+        jobs: Worker processes (None for one per CPU)
+        cache_file: Skip cache location
+        use_cache: Read the cache (it is always rewritten)
+
+    Returns:
+        Dict with compressed, skipped, cached, errors, seconds and
+        images_per_second (over the files actually checked, not cache hits)
+    """
+    start = time.perf_counter()
+    image_files = find_zone_images(img_dir)
+    root = Path(img_dir)
+
+    cache = load_cache(cache_file, img_dir, target_width, target_height) if use_cache else {}
+    done = {}
+    todo = []
+    for image_path in image_files:
+        key = os.path.relpath(image_path, root)
+        signature = file_key(image_path)
+        if cache.get(key) == signature:
+            done[key] = signature
+        else:
+            todo.append(image_path)
+
+    print(f"Found {len(image_files)} JPEG file(s) under {img_dir}/zone*")
+    print(f"Cached as already done: {len(done)}, to check: {len(todo)}")
+    print(f"Target dimensions: {target_width}x{target_height}\n")
+
+    counts = {True: 0, False: 0, None: 0}
+    tasks = [(image_path, target_width, target_height) for image_path in todo]
+    jobs = jobs or os.cpu_count() or 1
+    work_start = time.perf_counter()
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_compress_worker, tasks, chunksize=4))
+    else:
+        results = [_compress_worker(task) for task in tasks]
+    work_seconds = time.perf_counter() - work_start
+
+    for image_path, result, seconds in results:
+        counts[result] += 1
+        if result is True:
+            print(f"  ✓ Compressed in {seconds:.2f} s: {os.path.relpath(image_path, root)}")
+        if result is not None:
+            done[os.path.relpath(image_path, root)] = file_key(image_path)
+
+    save_cache(cache_file, done, img_dir, target_width, target_height)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'compressed': counts[True],
+        'skipped': counts[False],
+        'cached': len(image_files) - len(todo),
+        'errors': counts[None],
+        'seconds': elapsed,
+        'images_per_second': len(todo) / work_seconds if todo and work_seconds else 0.0,
+    }
+
 def main():
     parser = argparse.ArgumentParser(
         description='Compress JPEG images to fit within specified dimensions.',
@@ -119,15 +275,36 @@ def main():
 Examples:
   python "image compressor.py" "C:\\path\\to\\images"
   python "image compressor.py" "C:\\path\\to\\images" --width 1920 --height 1080
+  python "image compressor.py" --all-zones --jobs 4
         """
     )
     
     parser.add_argument(
         'path',
         type=str,
+        nargs='?',
         help='Path to the folder containing JPEG images'
     )
     
+    parser.add_argument(
+        '--all-zones',
+        action='store_true',
+        help='Compress every JPEG under img/zone* in parallel, skipping cached files'
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Worker processes for --all-zones (default: one per CPU)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore the --all-zones skip cache and check every file'
+    )
+    
     parser.add_argument(
         '--width',
         type=int,
@@ -144,7 +321,24 @@ Examples:
     
     args = parser.parse_args()
     
-    compress_images_in_folder(args.path, args.width, args.height)
+    if args.all_zones:
+        img_dir = Path(args.path) if args.path else IMG_DIR
+        stats = compress_all_zones(img_dir, args.width, args.height, jobs=args.jobs,
+                                   use_cache=not args.no_cache)
+        print(f"\n{'='*60}")
+        print(f"Summary:")
+        print(f"  Compressed: {stats['compressed']}")
+        print(f"  Skipped: {stats['skipped']}")
+        print(f"  Cached: {stats['cached']}")
+        print(f"  Errors: {stats['errors']}")
+        print(f"  Time: {stats['seconds']:.2f} s")
+        if stats['images_per_second']:
+            print(f"  Throughput: {stats['images_per_second']:.1f} images/second over files checked")
+        print(f"{'='*60}\n")
+    elif args.path:
+        compress_images_in_folder(args.path, args.width, args.height)
+    else:
+        parser.error('give a folder path or --all-zones')
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,286 @@
+"""
+Generate responsive JPEG and WebP variants of the memorial photos.
+
+Every image under img/zone* is written at up to three widths, each in JPEG
+and WebP:
+
+  thumb    320 px wide   AR overlays and list thumbnails (150 css px at 2x)
+  medium   720 px wide   detail pages on phones
+  full    1080 px wide   the size image_compressor.py produces
+
+Variants are turned upright by the EXIF orientation, as browsers show the
+original. Widths larger than the (upright) source are not generated (no
+upscaling); the largest variant never exceeds the source width. Output goes to
+img/derived/zone<N>/<name>.<size>.<jpg|webp> and data/image-derivatives.json
+lists, for every source, the width, height, byte size and content hash of
+each variant so pages can pick the smallest one that is big enough
+(js/image-variants.js).
+
+Work is spread over a process pool and is incremental: a source whose mtime
+and size match the manifest, and whose variants are all still on disk, is
+not decoded again.
+
+Usage:
+  python Scrips/image_derivatives.py [--jobs N] [--force]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from afm_dataset import write_bytes_atomic, write_json_atomic
+
+ROOT_DIR = Path(__file__).parent.parent
+IMG_DIR = ROOT_DIR / 'img'
+DERIVED_DIR = IMG_DIR / 'derived'
+MANIFEST_FILE = ROOT_DIR / 'data' / 'image-derivatives.json'
+MANIFEST_VERSION = 2
+ORIENTATION_TAG = 0x0112
+
+SIZES = (
+    ('thumb', 320),
+    ('medium', 720),
+    ('full', 1080),
+)
+FORMATS = (
+    ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+)
+SOURCE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+HASH_LENGTH = 16
+
+
+def find_sources(img_dir=IMG_DIR):
+    """
+    List the source photos under img/zone*.
+
+    Returns:
+        Sorted list of (key, path) where key is "zone<N>/<file name>"
+    """
+    sources = []
+    for zone in sorted(Path(img_dir).glob('zone*')):
+        for path in sorted(zone.iterdir()):
+            if path.is_file() and path.suffix.lower() in SOURCE_EXTENSIONS:
+                sources.append((f"{zone.name}/{path.name}", path))
+    return sources
+
+
+def target_widths(source_width):
+    """
+    Pick the variant widths for a source image.
+
+    Returns:
+        List of (size name, width), smallest first, never wider than the source
+    """
+    widths = []
+    for name, width in SIZES:
+        if width < source_width:
+            widths.append((name, width))
+        else:
+            widths.append((name, source_width))
+            break
+    return widths
+
+
+def site_root(derived_dir):
+    """Folder variant URLs are relative to (the parent of img/)."""
+    return Path(derived_dir).parent.parent
+
+
+def variant_path(key, size, ext, derived_dir=DERIVED_DIR):
+    """Output path for one variant of a source key."""
+    zone, file_name = key.split('/', 1)
+    return Path(derived_dir) / zone / f"{Path(file_name).stem}.{size}.{ext}"
+
+
+def build_variants(task):
+    """
+    Decode one source and write all of its variants.
+
+    Kept at module level so it can run in a process pool.
+
+    Args:
+        task: Tuple of (key, source path, derived dir)
+
+    Returns:
+        Tuple of (key, list of variant dicts, seconds), or (key, error string, seconds)
+    """
+    key, source, derived_dir = task
+    start = time.perf_counter()
+    try:
+        with Image.open(source) as img:
+            width, height = img.size
+            turned = img.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8)
+            if turned:
+                width, height = height, width
+            widths = target_widths(width)
+            # Decode once, reduced as far as the largest variant allows (box given in stored orientation)
+            if img.format == 'JPEG':
+                largest = widths[-1][1]
+                draft = (largest, round(height * largest / width))
+                img.draft('RGB', draft[::-1] if turned else draft)
+            img = ImageOps.exif_transpose(img).convert('RGB')
+
+            variants = []
+            for size, width in reversed(widths):
+                height = round(img.height * width / img.width)
+                resized = img if width == img.width else img.resize((width, height), Image.Resampling.LANCZOS)
+                for ext, fmt, options in FORMATS:
+                    buffer = io.BytesIO()
+                    resized.save(buffer, fmt, **options)
+                    data = buffer.getvalue()
+                    path = variant_path(key, size, ext, derived_dir)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    if not path.exists() or path.read_bytes() != data:
+                        write_bytes_atomic(path, data)
+                    variants.append({
+                        'size': size,
+                        'format': ext,
+                        'url': path.relative_to(site_root(derived_dir)).as_posix(),
+                        'width': width,
+                        'height': resized.height,
+                        'bytes': len(data),
+                        'hash': hashlib.sha256(data).hexdigest()[:HASH_LENGTH],
+                    })
+                img = resized
+    except Exception as e:
+        return key, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+    variants.sort(key=lambda v: (v['width'], v['format']))
+    return key, variants, time.perf_counter() - start
+
+
+def load_manifest(path=MANIFEST_FILE):
+    """Load the derivative manifest, or an empty one."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('images', {})
+
+
+def is_current(record, source, root):
+    """True if a manifest record still describes this source and its files exist."""
+    stat = source.stat()
+    if record.get('source') != {'mtime_ns': stat.st_mtime_ns, 'bytes': stat.st_size}:
+        return False
+    return all((root / variant['url']).exists() for variant in record.get('variants', []))
+
+
+def generate(img_dir=IMG_DIR, derived_dir=DERIVED_DIR, manifest_file=MANIFEST_FILE, jobs=None, force=False):
+    """
+    Bring the derivatives and manifest up to date.
+
+    Returns:
+        Dict with built, current, errors (list of (key, message)), removed,
+        seconds and the manifest images dict
+    """
+    start = time.perf_counter()
+    root = site_root(derived_dir)
+    previous = {} if force else load_manifest(manifest_file)
+    sources = find_sources(img_dir)
+
+    images = {}
+    tasks = []
+    for key, source in sources:
+        record = previous.get(key)
+        if record and is_current(record, source, root):
+            images[key] = record
+        else:
+            tasks.append((key, source, derived_dir))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(build_variants, tasks, chunksize=2))
+    else:
+        results = [build_variants(task) for task in tasks]
+
+    errors = []
+    for (key, source, _), (_, variants, _) in zip(tasks, results):
+        if isinstance(variants, str):
+            errors.append((key, variants))
+            continue
+        stat = source.stat()
+        images[key] = {
+            'source': {'mtime_ns': stat.st_mtime_ns, 'bytes': stat.st_size},
+            'variants': variants,
+        }
+
+    # Remove variants whose source has gone
+    expected = {root / v['url'] for record in images.values() for v in record['variants']}
+    removed = 0
+    for path in Path(derived_dir).rglob('*'):
+        if path.is_file() and path not in expected:
+            path.unlink()
+            removed += 1
+
+    write_json_atomic(manifest_file, {
+        'version': MANIFEST_VERSION,
+        'sizes': dict(SIZES),
+        'images': {key: images[key] for key in sorted(images)},
+    }, indent=None)
+
+    return {
+        'built': len(tasks) - len(errors),
+        'current': len(sources) - len(tasks),
+        'errors': errors,
+        'removed': removed,
+        'seconds': time.perf_counter() - start,
+        'images': images,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate responsive JPEG/WebP variants of the memorial photos.')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='Rebuild every variant')
+    parser.add_argument('--img-dir', type=str, default=None, help='Image folder (default: img/)')
+    parser.add_argument('--manifest', type=str, default=None,
+                        help='Manifest file (default: data/image-derivatives.json)')
+    args = parser.parse_args()
+
+    img_dir = Path(args.img_dir) if args.img_dir else IMG_DIR
+    manifest_file = Path(args.manifest) if args.manifest else MANIFEST_FILE
+
+    print("="*60)
+    print("Responsive Image Derivatives")
+    print("="*60)
+    print(f"Sizes: {', '.join(f'{name} {width}px' for name, width in SIZES)}")
+    print(f"Formats: {', '.join(ext for ext, _, _ in FORMATS)}")
+    print()
+
+    stats = generate(img_dir, img_dir / 'derived', manifest_file, jobs=args.jobs, force=args.force)
+
+    totals = {}
+    for record in stats['images'].values():
+        for variant in record['variants']:
+            key = (variant['size'], variant['format'])
+            count, size = totals.get(key, (0, 0))
+            totals[key] = (count + 1, size + variant['bytes'])
+
+    print(f"{'Variant':<16}{'Files':>8}{'Average':>12}")
+    print("-"*36)
+    for (size, ext), (count, total) in sorted(totals.items(), key=lambda item: dict(SIZES)[item[0][0]]):
+        print(f"{size + ' ' + ext:<16}{count:>8}{total / count / 1024:>9.1f} KB")
+
+    print()
+    print(f"Built: {stats['built']}, up to date: {stats['current']}, removed stale files: {stats['removed']}")
+    for key, message in stats['errors']:
+        print(f"  ✗ {key}: {message}")
+    print(f"Time: {stats['seconds']:.2f} s")
+    print(f"Manifest: {manifest_file}")
+
+
+if __name__ == '__main__':
+    main()
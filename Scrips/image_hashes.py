@@ -0,0 +1,353 @@
+"""
+Precompute perceptual hashes of the memorial photos for identification.
+
+js/identify-memorial.js used to identify a photo by downloading every
+memorial image and hashing each one in the browser on every scan. This
+script does the hashing once, ahead of time, and writes
+data/image-hashes.json, so the page downloads one small file and compares
+the snapshot's hashes against it.
+
+Three 64-bit hashes are stored per memorial photo:
+
+  ahash   8x8 grey thumbnail, bit set where a pixel >= the mean
+          (the hash the page has always used)
+  dhash   9x8 grey thumbnail, bit set where a pixel > its right neighbour
+  phash   32x32 grey thumbnail -> 2-D DCT, low 8x8 frequencies, bit set where
+          a coefficient > their median
+
+Bits are packed row-major, first pixel in the most significant bit. Hashes
+are written as 16 hex digits because JSON numbers cannot hold 64-bit
+integers exactly in JavaScript.
+
+Photos are found through the image manifest logic (image_index.py), so
+every entry is a memorial key "<zone>/<name>" with its exact file.
+
+The module also holds the reference matcher: Hamming distance by popcount
+on Python ints, a NumPy scan over all hashes at once (the fastest way to
+find the nearest few of a few hundred photos), and a BK-tree for radius
+queries such as "any photo within 6 bits?", which prunes most of the tree
+and keeps working as the collection grows.
+
+Usage:
+  python Scrips/image_hashes.py               rebuild data/image-hashes.json
+  python Scrips/image_hashes.py --query PHOTO print the closest memorials
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from afm_dataset import write_json_atomic
+from image_index import IMG_DIR, MEMORIALS_JSON, build_index, scan_images
+
+ROOT_DIR = Path(__file__).parent.parent
+HASHES_FILE = ROOT_DIR / 'data' / 'image-hashes.json'
+HASHES_VERSION = 1
+
+HASH_SIZE = 8
+PHASH_SIZE = 32
+ALGORITHMS = ('ahash', 'dhash', 'phash')
+HASH_BITS = HASH_SIZE * HASH_SIZE
+
+# Number of set bits in every byte value, for NumPy popcounts
+POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _dct_matrix(n):
+    """Orthonormal DCT-II matrix, so the 2-D DCT of x is D @ x @ D.T."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    d = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    d[0] /= np.sqrt(2)
+    return d
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def load_grey(source, size=PHASH_SIZE * 4):
+    """
+    Open a photo upright and in greyscale, reduced while decoding.
+
+    Args:
+        source: Path or PIL image
+        size: Smallest side needed afterwards; JPEGs are decoded at a reduced
+            scale that still covers it
+
+    Returns:
+        PIL image in mode 'L'
+    """
+    img = Image.open(source) if not isinstance(source, Image.Image) else source
+    if img.format == 'JPEG':
+        img.draft('RGB', (size, size))
+    img = ImageOps.exif_transpose(img)
+    return img.convert('L')
+
+
+def _pack(bits):
+    """Pack a boolean array (64 values, row-major) into an int."""
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), 'big')
+
+
+def _thumbnail(grey, width, height):
+    return np.asarray(grey.resize((width, height), Image.Resampling.BOX), dtype=np.float64)
+
+
+def ahash(grey):
+    """Average hash of a greyscale image."""
+    pixels = _thumbnail(grey, HASH_SIZE, HASH_SIZE)
+    return _pack(pixels >= pixels.mean())
+
+
+def dhash(grey):
+    """Difference hash (horizontal gradient) of a greyscale image."""
+    pixels = _thumbnail(grey, HASH_SIZE + 1, HASH_SIZE)
+    return _pack(pixels[:, :-1] > pixels[:, 1:])
+
+
+def phash(grey):
+    """DCT hash of a greyscale image."""
+    pixels = _thumbnail(grey, PHASH_SIZE, PHASH_SIZE)
+    low = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    return _pack(low > np.median(low))
+
+
+HASH_FUNCTIONS = {'ahash': ahash, 'dhash': dhash, 'phash': phash}
+
+
+def image_hashes(source):
+    """
+    Compute every hash for one photo.
+
+    Returns:
+        Dict algorithm -> 64-bit int
+    """
+    grey = load_grey(source)
+    return {name: HASH_FUNCTIONS[name](grey) for name in ALGORITHMS}
+
+
+def hamming(a, b):
+    """Number of differing bits between two int hashes."""
+    return (a ^ b).bit_count()
+
+
+def to_array(hashes):
+    """Convert a sequence of int hashes to a uint64 array."""
+    return np.array(hashes, dtype=np.uint64)
+
+
+def hamming_many(query, hashes):
+    """
+    Hamming distance from one hash to many.
+
+    Args:
+        query: int hash
+        hashes: uint64 array (see to_array)
+
+    Returns:
+        Array of distances, same length as hashes
+    """
+    diff = np.bitwise_xor(hashes, np.uint64(query))
+    return POPCOUNT8[diff.view(np.uint8)].reshape(len(hashes), 8).sum(axis=1, dtype=np.int64)
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over int hashes with Hamming distance.
+
+    Each child edge is labelled with its distance to the parent, so a query
+    only descends into edges within the current radius of its own distance
+    (triangle inequality).
+    """
+
+    def __init__(self, items=()):
+        self.root = None
+        self.size = 0
+        for hash_value, value in items:
+            self.add(hash_value, value)
+
+    def add(self, hash_value, value):
+        """Insert a hash with its payload (duplicate hashes keep all payloads)."""
+        self.size += 1
+        if self.root is None:
+            self.root = [hash_value, [value], {}]
+            return
+        node = self.root
+        while True:
+            d = hamming(hash_value, node[0])
+            if d == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [hash_value, [value], {}]
+                return
+            node = child
+
+    def search(self, hash_value, radius):
+        """
+        Every payload within radius bits.
+
+        Returns:
+            List of (distance, payload), closest first
+        """
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            d = hamming(hash_value, node[0])
+            if d <= radius:
+                found.extend((d, value) for value in node[1])
+            for edge, child in node[2].items():
+                if d - radius <= edge <= d + radius:
+                    stack.append(child)
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, hash_value, k=1):
+        """
+        The k closest payloads, shrinking the search radius as matches are found.
+
+        Returns:
+            List of (distance, payload), closest first
+        """
+        best = []
+        radius = float('inf')
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            d = hamming(hash_value, node[0])
+            if d <= radius:
+                best.extend((d, value) for value in node[1])
+                best.sort(key=lambda item: item[0])
+                del best[k:]
+                if len(best) == k:
+                    radius = best[-1][0]
+            for edge, child in node[2].items():
+                if d - radius <= edge <= d + radius:
+                    stack.append(child)
+        return best
+
+
+def nearest_linear(query, hashes, k=1):
+    """
+    The k closest hashes by a full NumPy scan.
+
+    With a few hundred photos this is faster than the BK-tree, whose
+    pruning only pays off for small radii or much larger collections.
+
+    Args:
+        query: int hash
+        hashes: uint64 array (see to_array)
+
+    Returns:
+        List of (distance, position in hashes), closest first
+    """
+    distances = hamming_many(query, hashes)
+    k = min(k, len(distances))
+    top = np.argpartition(distances, k - 1)[:k] if k else []
+    return sorted((int(distances[i]), int(i)) for i in top)
+
+
+def combined(hashes):
+    """Concatenate one photo's hashes into a single int (Hamming over all of them)."""
+    value = 0
+    for name in ALGORITHMS:
+        value = (value << HASH_BITS) | hashes[name]
+    return value
+
+
+def load_index(path=HASHES_FILE):
+    """
+    Read data/image-hashes.json back into ints.
+
+    Returns:
+        List of dicts with key, file and one int per algorithm
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [dict(entry, **{name: int(entry[name], 16) for name in ALGORITHMS}) for entry in data['images']]
+
+
+def build_hashes(img_dir=IMG_DIR, memorials_json=MEMORIALS_JSON):
+    """
+    Hash the photo of every memorial.
+
+    Returns:
+        Tuple of (list of index entries with hex hashes, list of (file, error))
+    """
+    with open(memorials_json, 'r', encoding='utf-8') as f:
+        memorials = json.load(f)
+    images, _ = build_index(memorials, scan_images(img_dir))
+
+    entries = []
+    errors = []
+    for key in sorted(images):
+        file_name = images[key]['file']
+        try:
+            hashes = image_hashes(Path(img_dir) / file_name)
+        except Exception as e:
+            errors.append((file_name, f"{type(e).__name__}: {e}"))
+            continue
+        entry = {'key': key, 'file': file_name}
+        entry.update((name, f"{hashes[name]:016x}") for name in ALGORITHMS)
+        entries.append(entry)
+    return entries, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute perceptual hashes of the memorial photos.')
+    parser.add_argument('--query', type=str, default=None,
+                        help='Match this photo against the existing index instead of rebuilding it')
+    parser.add_argument('--top', type=int, default=5, help='Matches to show with --query (default: 5)')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("Memorial Photo Hashes")
+    print("="*60)
+
+    if args.query:
+        entries = load_index()
+        arrays = {name: to_array([entry[name] for entry in entries]) for name in ALGORITHMS}
+        query = image_hashes(args.query)
+        for name in ALGORITHMS:
+            start = time.perf_counter()
+            matches = nearest_linear(query[name], arrays[name], args.top)
+            elapsed = time.perf_counter() - start
+            print(f"\n{name} ({elapsed * 1e6:.0f} µs):")
+            for distance, position in matches:
+                print(f"  {distance:>4}  {entries[position]['key']}")
+
+        # Sum of the three distances = Hamming distance of the concatenated hashes
+        start = time.perf_counter()
+        total = sum(hamming_many(query[name], arrays[name]) for name in ALGORITHMS)
+        order = np.argsort(total, kind='stable')[:args.top]
+        elapsed = time.perf_counter() - start
+        print(f"\ncombined ({elapsed * 1e6:.0f} µs):")
+        for position in order:
+            print(f"  {int(total[position]):>4}  {entries[position]['key']}")
+        return
+
+    start = time.perf_counter()
+    entries, errors = build_hashes()
+    elapsed = time.perf_counter() - start
+
+    write_json_atomic(HASHES_FILE, {
+        'version': HASHES_VERSION,
+        'bits': HASH_BITS,
+        'algorithms': list(ALGORITHMS),
+        'images': entries,
+    }, indent=None)
+
+    print(f"Hashed: {len(entries)} photos in {elapsed:.2f} s")
+    for file_name, message in errors:
+        print(f"  ✗ {file_name}: {message}")
+    print(f"Index: {HASHES_FILE} ({HASHES_FILE.stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Resolve every memorial in data/memorials.json to its exact photo file.
+
+Photos live in img/zone<N>/<memorial name>.<ext>, but the extension varies
+(.jpeg, .JPEG, .jpg, .png), some file names differ from the memorial name in
+case, and files copied from macOS may be stored in Unicode NFD while the
+JSON is NFC. Pages used to guess: build a path per extension and try them in
+turn, so a photo could cost up to four requests and three 404s first.
+
+This script lists each img/zone* folder once, matches names by their
+normalised form (NFC + casefold + trimmed), and writes data/image-manifest.json:
+
+  {"version": 1, "images": {"<zone>/<memorial name>": {
+      "file": "zone<N>/<file name on disk>",
+      "url":  "img/zone<N>/<percent-encoded file name>"}}}
+
+"url" is relative to the site root and already percent-encoded from the
+on-disk name, so clients use it as is (js/image-index.js) and never call
+encodeURIComponent on a name themselves. "file" is the key used by
+data/image-derivatives.json.
+
+The same pass reports memorials without a photo, matches that were only
+found after case or Unicode normalisation (rename the file to fix them),
+names with several candidate files, and photos no memorial uses.
+
+Usage:
+  python Scrips/image_index.py [--report image_index_report.json]
+"""
+
+import argparse
+import json
+import os
+import time
+import unicodedata
+from pathlib import Path
+from urllib.parse import quote
+
+from afm_dataset import write_json_atomic
+
+ROOT_DIR = Path(__file__).parent.parent
+IMG_DIR = ROOT_DIR / 'img'
+MEMORIALS_JSON = ROOT_DIR / 'data' / 'memorials.json'
+MANIFEST_FILE = ROOT_DIR / 'data' / 'image-manifest.json'
+MANIFEST_VERSION = 1
+
+# Preferred extension first when a name has more than one candidate file
+IMAGE_EXTENSIONS = ('.jpeg', '.jpg', '.png')
+
+
+def match_key(name):
+    """Normalised form used to compare memorial names with file names."""
+    return unicodedata.normalize('NFC', name).casefold().strip()
+
+
+def scan_images(img_dir=IMG_DIR):
+    """
+    List every zone folder once.
+
+    Args:
+        img_dir: Folder holding the zone<N> subfolders
+
+    Returns:
+        Dict zone (string, e.g. "5") -> dict match key -> list of file names
+    """
+    zones = {}
+    for entry in os.scandir(img_dir):
+        if not entry.is_dir() or not entry.name.startswith('zone'):
+            continue
+        files = {}
+        for item in os.scandir(entry.path):
+            stem, ext = os.path.splitext(item.name)
+            if ext.lower() in IMAGE_EXTENSIONS and item.is_file():
+                files.setdefault(match_key(stem), []).append(item.name)
+        zones[entry.name[len('zone'):]] = files
+    return zones
+
+
+def choose_file(name, candidates):
+    """
+    Pick one file for a memorial name.
+
+    An exact stem match wins, then the preferred extension, then the file name.
+
+    Returns:
+        Tuple of (file name, how it matched: 'exact', 'case' or 'unicode')
+    """
+    def rank(file_name):
+        stem, ext = os.path.splitext(file_name)
+        return (stem != name, IMAGE_EXTENSIONS.index(ext.lower()), file_name)
+
+    file_name = min(candidates, key=rank)
+    stem = os.path.splitext(file_name)[0]
+    if stem == name:
+        return file_name, 'exact'
+    if unicodedata.normalize('NFC', stem) == unicodedata.normalize('NFC', name):
+        return file_name, 'unicode'
+    return file_name, 'case'
+
+
+def image_url(zone, file_name):
+    """Site-relative, percent-encoded URL of a photo."""
+    return f"img/zone{zone}/{quote(file_name, safe='')}"
+
+
+def build_index(memorials, zones):
+    """
+    Resolve memorials to photo files.
+
+    Args:
+        memorials: List of memorial dicts with name and zone
+        zones: Result of scan_images()
+
+    Returns:
+        Tuple of (images dict for the manifest, report dict)
+    """
+    images = {}
+    report = {'missing': [], 'normalised': [], 'ambiguous': [], 'unused': [], 'no_zone': []}
+    used = set()
+
+    for memorial in memorials:
+        name = memorial.get('name')
+        zone = str(memorial.get('zone') or '')
+        if not name or not zone:
+            report['no_zone'].append({'name': name, 'zone': zone or None})
+            continue
+
+        key = match_key(name)
+        candidates = zones.get(zone, {}).get(key)
+        if not candidates:
+            report['missing'].append({'name': name, 'zone': zone})
+            continue
+
+        file_name, how = choose_file(name, candidates)
+        used.add((zone, key))
+        images[f"{zone}/{name}"] = {'file': f"zone{zone}/{file_name}", 'url': image_url(zone, file_name)}
+        if how != 'exact':
+            report['normalised'].append({'name': name, 'zone': zone, 'file': file_name, 'match': how})
+        if len(candidates) > 1:
+            report['ambiguous'].append({'name': name, 'zone': zone, 'files': sorted(candidates), 'chosen': file_name})
+
+    for zone, files in zones.items():
+        for key, file_names in files.items():
+            if (zone, key) not in used:
+                report['unused'].extend(f"zone{zone}/{file_name}" for file_name in sorted(file_names))
+
+    report['unused'].sort()
+    return images, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resolve memorial photos and write data/image-manifest.json.')
+    parser.add_argument('--report', type=str, default=None, help='Also write the full report as JSON')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("Memorial Image Index")
+    print("="*60)
+
+    start = time.perf_counter()
+    with open(MEMORIALS_JSON, 'r', encoding='utf-8') as f:
+        memorials = json.load(f)
+    zones = scan_images()
+    images, report = build_index(memorials, zones)
+    elapsed = time.perf_counter() - start
+
+    write_json_atomic(MANIFEST_FILE, {
+        'version': MANIFEST_VERSION,
+        'images': {key: images[key] for key in sorted(images)},
+    }, indent=None)
+
+    photos = sum(len(names) for files in zones.values() for names in files.values())
+    print(f"Memorials: {len(memorials)}")
+    print(f"Photos on disk: {photos} in {len(zones)} zone folders")
+    resolved = len(memorials) - len(report['missing']) - len(report['no_zone'])
+    print(f"✓ Resolved: {resolved} ({len(images)} distinct zone/name keys)")
+    print(f"✗ Missing: {len(report['missing'])}")
+    for item in report['missing']:
+        print(f"    Zone {item['zone']}: {item['name']}")
+    if report['no_zone']:
+        print(f"⚠ Without name or zone: {len(report['no_zone'])}")
+    if report['normalised']:
+        print(f"⚠ Matched only after {'/'.join(sorted({i['match'] for i in report['normalised']}))} "
+              f"normalisation (consider renaming): {len(report['normalised'])}")
+        for item in report['normalised']:
+            print(f"    Zone {item['zone']}: {item['name']!r} -> {item['file']!r}")
+    if report['ambiguous']:
+        print(f"⚠ Several candidate files: {len(report['ambiguous'])}")
+        for item in report['ambiguous']:
+            print(f"    Zone {item['zone']}: {item['files']} (using {item['chosen']!r})")
+    if report['unused']:
+        print(f"⚠ Photos no memorial uses: {len(report['unused'])}")
+        for path in report['unused']:
+            print(f"    {path}")
+
+    print(f"\nTime: {elapsed * 1000:.1f} ms")
+    print(f"Manifest: {MANIFEST_FILE}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📄 Report saved to: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Compiled, single-pass version of clean_name() from clean_afm_names.py.
+
+clean_name() runs about 30 str.replace calls, a loop over accented letters
+and four re.sub passes for every name. NameCleaner compiles the same rules
+once into
+
+  - one str.translate table for the character rules (deletions, spaces,
+    accented letters), and
+  - one combined regex for the pattern rules ("& Bar" spacing, trailing
+    OCR numbers, whitespace runs),
+
+so each name is cleaned with a translate, one sub and a strip. clean_many()
+cleans a whole list in one call by joining the names, which turns the
+per-name overhead into a handful of C-level passes over one string.
+
+Rules are plain data (CHAR_RULES, PATTERN_RULES) and can be replaced by
+passing different lists to NameCleaner. Character rules are applied before
+pattern rules, as in clean_name(); if two character rules map the same
+character, the earlier rule wins. Pattern rules are tried in list order at
+each position, so a rule that must win over a more general one (trailing
+numbers before whitespace) has to come first.
+
+Every cleaner keeps a count of how often each rule changed a name.
+
+Usage:
+  python Scrips/name_cleaner.py    prints the rule statistics for afm-memorials.json
+"""
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+# (rule name, {character: replacement}) - replacements are '' or plain text
+CHAR_RULES = [
+    ('bullet', {'•': ''}),
+    ('asterisk', {'*': ''}),
+    ('colon', {':': ''}),
+    ('exclamation', {'!': ''}),
+    ('quote', {'"': ''}),
+    ('plus', {'+': ''}),
+    ('bom', {'\ufeff': ''}),
+    ('degree', {'°': ''}),
+    ('comma', {',': ' '}),
+    ('nbsp', {'\xa0': ' '}),
+    ('zero_width_space', {'\u200b': ''}),
+    ('unicode_space', {chr(c): ' ' for c in [*range(0x2000, 0x2010), 0x202f, 0x205f]}),
+    ('accent', {
+        'Á': 'A', 'À': 'A', 'Ä': 'A', 'Â': 'A',
+        'É': 'E', 'È': 'E', 'Ë': 'E', 'Ê': 'E',
+        'Í': 'I', 'Ì': 'I', 'Ï': 'I', 'Î': 'I',
+        'Ó': 'O', 'Ò': 'O', 'Ö': 'O', 'Ô': 'O',
+        'Ú': 'U', 'Ù': 'U', 'Ü': 'U', 'Û': 'U', 'Ư': 'U',
+        'Ç': 'C', 'Ñ': 'N',
+    }),
+]
+
+# (rule name, regex, replacement) - replacement may use \1..\9 for the
+# rule's own groups
+PATTERN_RULES = [
+    ('bar_spacing', r'&\s*Bar', '& Bar'),
+    ('numbered_bar_spacing', r'&\s*(\d+)\s*Bar', r'& \1 Bar'),
+    ('trailing_number', r'\s+\d{1,3}$', ''),
+    # Same result as \s+ -> ' ', but single plain spaces are not matched
+    ('whitespace', r'\s{2,}|[^\S ]', ' '),
+]
+
+# Joins names for clean_many(); names containing it are cleaned one by one
+_SEPARATOR = '\x00'
+# "$" inside a rule must mean the end of one name, not of the joined text
+_END_OF_NAME = r'(?=\n?(?:\x00|\Z))'
+
+_END_ANCHOR = re.compile(r'(?<!\\)\$')
+_GROUP_REF = re.compile(r'\\(\d)')
+
+
+class _PatternRule:
+    """One compiled pattern rule inside the combined regex."""
+
+    def __init__(self, name, pattern, replacement, outer_group):
+        self.name = name
+        self.group_count = re.compile(pattern).groups
+        self.outer_group = outer_group
+        # Alternating literal text and group numbers: "a\1b" -> ['a', 1, 'b']
+        parts = _GROUP_REF.split(replacement)
+        self.parts = [int(part) if i % 2 else part for i, part in enumerate(parts)]
+
+    def expand(self, match):
+        if len(self.parts) == 1:
+            return self.parts[0]
+        out = []
+        for i, part in enumerate(self.parts):
+            if i % 2:
+                out.append(match.group(self.outer_group + part) or '')
+            else:
+                out.append(part)
+        return ''.join(out)
+
+
+def _check_char_rules(table):
+    """Reject rule sets where one replacement feeds another rule."""
+    for replacement in table.values():
+        for ch in replacement or '':
+            if ord(ch) in table:
+                raise ValueError(f"Character rule output {replacement!r} is matched by another rule")
+
+
+class NameCleaner:
+    """
+    Compiled name-cleaning rules.
+
+    Args:
+        char_rules: List of (rule name, {character: replacement})
+        pattern_rules: List of (rule name, regex, replacement)
+    """
+
+    def __init__(self, char_rules=CHAR_RULES, pattern_rules=PATTERN_RULES):
+        self.stats = Counter()
+
+        self._table = {}
+        self._char_rule = {}
+        for name, mapping in char_rules:
+            for ch, replacement in mapping.items():
+                if ord(ch) not in self._table:
+                    self._table[ord(ch)] = replacement or None
+                    self._char_rule[ch] = name
+        _check_char_rules(self._table)
+
+        self._rules = {}
+        alternatives = []
+        group = 1
+        for index, (name, pattern, replacement) in enumerate(pattern_rules):
+            key = f'r{index}'
+            self._rules[key] = _PatternRule(name, pattern, replacement, group)
+            alternatives.append(f'(?P<{key}>{pattern})')
+            group += 1 + self._rules[key].group_count
+        combined = '|'.join(alternatives)
+        self._regex = re.compile(combined)
+        self._joined_regex = re.compile(_END_ANCHOR.sub(lambda m: _END_OF_NAME, combined))
+
+    def _replace(self, match):
+        rule = self._rules[match.lastgroup]
+        text = match.group()
+        replacement = rule.expand(match)
+        if replacement != text:
+            self.stats[rule.name] += 1
+        return replacement
+
+    def _count_chars(self, text):
+        for ch, rule in self._char_rule.items():
+            count = text.count(ch)
+            if count:
+                self.stats[rule] += count
+
+    def clean(self, name):
+        """
+        Clean one name; same result as clean_afm_names.clean_name().
+
+        Args:
+            name: Raw name
+
+        Returns:
+            The cleaned name
+        """
+        translated = name.translate(self._table)
+        if translated != name:
+            self._count_chars(name)
+        return self._regex.sub(self._replace, translated).strip()
+
+    def clean_many(self, names):
+        """
+        Clean a list of names in a few passes over one joined string.
+
+        Args:
+            names: List of raw names
+
+        Returns:
+            List of cleaned names, in the same order
+        """
+        joined = _SEPARATOR.join(names)
+        if joined.count(_SEPARATOR) != max(len(names) - 1, 0):
+            return [self.clean(name) for name in names]
+
+        self._count_chars(joined)
+        joined = self._joined_regex.sub(self._replace, joined.translate(self._table))
+        return [name.strip() for name in joined.split(_SEPARATOR)] if names else []
+
+    def report(self):
+        """Return (rule name, times changed) pairs, most frequent first."""
+        return self.stats.most_common()
+
+
+def main():
+    json_file = Path(__file__).parent.parent / 'data' / 'afm-memorials.json'
+
+    print("="*60)
+    print("Name Cleaning Rule Statistics")
+    print("="*60)
+
+    with open(json_file, 'r', encoding='utf-8') as f:
+        names = [entry['name'] for entry in json.load(f)]
+
+    cleaner = NameCleaner()
+    cleaned = cleaner.clean_many(names)
+    changed = sum(1 for before, after in zip(names, cleaned) if before != after)
+
+    print(f"Names: {len(names)}, would change: {changed}")
+    print()
+    for rule, count in cleaner.report():
+        print(f"  {rule:<24}{count:>8}")
+    if not cleaner.stats:
+        print("  (no rule fired)")
+
+
+if __name__ == '__main__':
+    main()
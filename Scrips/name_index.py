@@ -0,0 +1,318 @@
+"""
+Prebuilt, sharded name search index for the AFM roll of honour and the
+memorials list.
+
+The search pages currently load every record and run a lowercase
+includes() over all names on each keystroke. This index answers the same
+substring question by loading a single small shard.
+
+Names are normalized (case-folded, accents removed, punctuation turned into
+single spaces). Every query of two or more characters starts with some
+bigram, so the index is sharded by bigram: shard "ev" holds
+
+  names   [[id, name], ...] for every record whose normalized name contains
+          "ev", sorted by normalized name
+  grams   {"eva": [i, ...], "evi": [...], ...} postings (positions in names)
+          for every trigram that starts with "ev"
+
+A query "evan" loads shard "ev", takes the candidates from trigram "eva"
+(or the whole shard for a 2-character query), and checks each candidate for
+the full substring. Results rank names that start with the query first,
+then names with a word starting with the query, then other matches.
+
+Record ids are global: ids [offset, offset + count) belong to the source
+listed in index.json (afm-memorials.json first, then memorials.json).
+
+Usage:
+  python Scrips/name_index.py    writes data/search/
+"""
+
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+from afm_dataset import write_bytes_atomic, write_json_atomic
+
+INDEX_VERSION = 1
+MIN_QUERY = 2
+
+SOURCES = (
+    ('afm', 'afm-memorials.json'),
+    ('memorials', 'memorials.json'),
+)
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(text):
+    """
+    Normalize a name or query for matching.
+
+    Args:
+        text: Raw name or query
+
+    Returns:
+        Lowercase ASCII text with accents removed and every run of
+        punctuation or whitespace collapsed to a single space
+    """
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', text.casefold()).strip()
+
+
+def shard_filename(key):
+    """File name for a bigram shard (spaces become underscores)."""
+    return key.replace(' ', '_') + '.json'
+
+
+def load_sources(data_dir):
+    """
+    Load the names from every source dataset.
+
+    Args:
+        data_dir: The data/ directory
+
+    Returns:
+        Tuple of (names list indexed by global id, sources list for index.json)
+    """
+    names = []
+    sources = []
+    for source, filename in SOURCES:
+        with open(Path(data_dir) / filename, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        sources.append({
+            'name': source,
+            'file': filename,
+            'offset': len(names),
+            'count': len(records),
+        })
+        names.extend(record.get('name') or '' for record in records)
+    return names, sources
+
+
+def build_shards(names):
+    """
+    Build every bigram shard in memory.
+
+    Args:
+        names: List of display names indexed by global id
+
+    Returns:
+        Dict of bigram -> shard dict
+    """
+    normalized = [normalize_name(name) for name in names]
+    order = sorted(range(len(names)), key=lambda i: (normalized[i], i))
+
+    members = {}
+    for record_id in order:
+        text = normalized[record_id]
+        seen = set()
+        for pos in range(len(text) - 1):
+            bigram = text[pos:pos + 2]
+            if bigram not in seen:
+                seen.add(bigram)
+                members.setdefault(bigram, []).append(record_id)
+
+    shards = {}
+    for bigram, ids in members.items():
+        grams = {}
+        for local, record_id in enumerate(ids):
+            text = normalized[record_id]
+            seen = set()
+            start = text.find(bigram)
+            while start != -1:
+                trigram = text[start:start + 3]
+                if len(trigram) == 3 and trigram not in seen:
+                    seen.add(trigram)
+                    grams.setdefault(trigram, []).append(local)
+                start = text.find(bigram, start + 1)
+        shards[bigram] = {
+            'key': bigram,
+            'names': [[record_id, names[record_id]] for record_id in ids],
+            'grams': grams,
+        }
+    return shards
+
+
+def write_index(data_dir, output_dir):
+    """
+    Build the index from the datasets and write it to output_dir.
+
+    Args:
+        data_dir: The data/ directory containing the source datasets
+        output_dir: Destination directory (index.json plus shards/)
+
+    Returns:
+        The index.json manifest dict
+    """
+    names, sources = load_sources(data_dir)
+    return write_index_for_names(names, sources, output_dir)
+
+
+def write_index_for_names(names, sources, output_dir):
+    """
+    Build the index for an explicit list of names and write it to output_dir.
+
+    Args:
+        names: List of display names indexed by global id
+        sources: Source descriptions recorded in index.json
+        output_dir: Destination directory (index.json plus shards/)
+
+    Returns:
+        The index.json manifest dict
+    """
+    output_dir = Path(output_dir)
+    shard_dir = output_dir / 'shards'
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    shards = build_shards(names)
+
+    shard_sizes = {}
+    for bigram, shard in shards.items():
+        data = json.dumps(shard, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        write_bytes_atomic(shard_dir / shard_filename(bigram), data)
+        shard_sizes[bigram] = len(data)
+
+    expected = {shard_filename(bigram) for bigram in shards}
+    for path in shard_dir.glob('*.json'):
+        if path.name not in expected:
+            path.unlink()
+
+    manifest = {
+        'version': INDEX_VERSION,
+        'min_query': MIN_QUERY,
+        'sources': sources,
+        'count': len(names),
+        'shards': {bigram: shard_sizes[bigram] for bigram in sorted(shards)},
+    }
+    write_json_atomic(output_dir / 'index.json', manifest, indent=None)
+    return manifest
+
+
+class NameIndex:
+    """
+    Query API over a directory written by write_index().
+
+    Shards are loaded on first use and cached; shards_loaded counts how many
+    shard files have been read.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = Path(index_dir)
+        with open(self.index_dir / 'index.json', 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported name index version: {self.manifest.get('version')}")
+        self._shards = {}
+        self._names = {}
+        self.shards_loaded = 0
+
+    def _shard(self, bigram):
+        if bigram not in self._shards:
+            shard = None
+            if bigram in self.manifest['shards']:
+                with open(self.index_dir / 'shards' / shard_filename(bigram), 'r', encoding='utf-8') as f:
+                    shard = json.load(f)
+                shard['normalized'] = [normalize_name(name) for _, name in shard['names']]
+                self._names.update(shard['names'])
+                self.shards_loaded += 1
+            self._shards[bigram] = shard
+        return self._shards[bigram]
+
+    @property
+    def loaded_keys(self):
+        """Bigrams of the shards read so far."""
+        return [key for key, shard in self._shards.items() if shard is not None]
+
+    def search(self, query, limit=None):
+        """
+        Find records whose normalized name contains the normalized query.
+
+        Args:
+            query: The text typed by the user
+            limit: Maximum number of ids to return (None for all)
+
+        Returns:
+            List of global record ids, best matches first
+        """
+        query = normalize_name(query)
+        if len(query) < MIN_QUERY:
+            return []
+
+        shard = self._shard(query[:2])
+        if shard is None:
+            return []
+
+        if len(query) >= 3:
+            candidates = shard['grams'].get(query[:3], [])
+        else:
+            candidates = range(len(shard['names']))
+
+        ranked = ([], [], [])
+        for local in candidates:
+            text = shard['normalized'][local]
+            pos = text.find(query)
+            if pos == -1:
+                continue
+            if pos == 0:
+                rank = 0
+            elif text[pos - 1] == ' ':
+                rank = 1
+            else:
+                rank = 2
+            ranked[rank].append(shard['names'][local][0])
+
+        results = ranked[0] + ranked[1] + ranked[2]
+        return results if limit is None else results[:limit]
+
+    def name(self, record_id):
+        """
+        Return the display name for an id returned by search().
+
+        Only ids from shards that have already been loaded can be resolved.
+        """
+        return self._names.get(record_id)
+
+    def resolve(self, record_id):
+        """
+        Map a global id to its source dataset.
+
+        Returns:
+            Tuple of (source name, file name, index within that file)
+        """
+        for source in self.manifest['sources']:
+            if source['offset'] <= record_id < source['offset'] + source['count']:
+                return source['name'], source['file'], record_id - source['offset']
+        raise KeyError(record_id)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    data_dir = script_dir.parent / 'data'
+    output_dir = data_dir / 'search'
+
+    print("="*60)
+    print("Name Search Index Builder")
+    print("="*60)
+    print(f"Sources: {', '.join(filename for _, filename in SOURCES)}")
+    print(f"Output directory: {output_dir}")
+    print()
+
+    manifest = write_index(data_dir, output_dir)
+
+    for source in manifest['sources']:
+        print(f"  {source['file']}: {source['count']} names (ids {source['offset']}+)")
+
+    sizes = sorted(manifest['shards'].values())
+    print()
+    print(f"Shards: {len(sizes)}")
+    print(f"  median {sizes[len(sizes) // 2] / 1024:.1f} KB, "
+          f"largest {sizes[-1] / 1024:.1f} KB, total {sum(sizes) / 1024:.0f} KB")
+    print("\nDone!")
+
+
+if __name__ == '__main__':
+    main()
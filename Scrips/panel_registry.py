@@ -0,0 +1,191 @@
+"""
+Panel registry: which wall, pin file and what3words code a panel belongs to.
+
+The ranges live in data/afm-panel-registry.json. They used to be written out
+three times (the if/elif chain in add_panel_groups.py, the list scan in
+add_what3words.py and the if/else chain in js/afm-detail.js). Each range
+list is kept sorted by first panel, so a lookup is one bisect on the range
+starts plus a check against that range's end. Gaps between ranges (panel
+206) resolve to None.
+
+The web client gets the same tables from js/afm-panels.js, which this
+script generates together with each panel's resolved map pin (afm_pins.py).
+
+Usage:
+  python Scrips/panel_registry.py    regenerates js/afm-panels.js
+"""
+
+import json
+from bisect import bisect_right
+from pathlib import Path
+
+from afm_dataset import DATA_DIR, write_bytes_atomic
+
+REGISTRY_JSON = DATA_DIR / 'afm-panel-registry.json'
+JS_TABLE = Path(__file__).parent.parent / 'js' / 'afm-panels.js'
+
+
+class RangeTable:
+    """
+    Sorted, non-overlapping inclusive panel ranges with bisect lookup.
+
+    Args:
+        ranges: Iterable of dicts with 'first', 'last' and any other fields
+    """
+
+    def __init__(self, ranges):
+        self.ranges = sorted(ranges, key=lambda r: r['first'])
+        self.starts = [r['first'] for r in self.ranges]
+        for previous, current in zip(self.ranges, self.ranges[1:]):
+            if current['first'] <= previous['last']:
+                raise ValueError(f"Panel ranges overlap: {previous['first']}-{previous['last']} "
+                                 f"and {current['first']}-{current['last']}")
+
+    def find(self, panel):
+        """
+        Return the range containing panel, or None.
+
+        Args:
+            panel: Panel number (int or numeric string)
+        """
+        if panel is None:
+            return None
+        panel = int(panel)
+        pos = bisect_right(self.starts, panel) - 1
+        if pos >= 0 and panel <= self.ranges[pos]['last']:
+            return self.ranges[pos]
+        return None
+
+
+class PanelRegistry:
+    """Lookups over the registry file."""
+
+    def __init__(self, path=REGISTRY_JSON):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.walls = RangeTable(data['walls'])
+        self.what3words = RangeTable(data['what3words'])
+
+    def wall(self, panel):
+        """Wall / panel group letter (A-I), or None."""
+        found = self.walls.find(panel)
+        return found['wall'] if found else None
+
+    def pin_file(self, panel):
+        """Name of the wall's pin GeoJSON in data/, or None."""
+        found = self.walls.find(panel)
+        return found['pins'] if found else None
+
+    def pin_index(self, panel):
+        """Index of the panel's pin in its wall's pin file, or None."""
+        found = self.walls.find(panel)
+        return int(panel) - found['first'] if found else None
+
+    def what3words_code(self, panel):
+        """what3words address covering the panel, or None."""
+        found = self.what3words.find(panel)
+        return found['code'] if found else None
+
+    def wall_ranges(self):
+        """List of (wall, first panel, last panel) in panel order."""
+        return [(r['wall'], r['first'], r['last']) for r in self.walls.ranges]
+
+
+_default = None
+
+
+def registry():
+    """Return the registry loaded from REGISTRY_JSON (loaded once)."""
+    global _default
+    if _default is None:
+        _default = PanelRegistry()
+    return _default
+
+
+def render_js(reg, panel_pins=None):
+    """
+    Render the registry as a small browser script.
+
+    The script defines window.AFMPanels with the range tables, the panel
+    pins and a lookup(panel) function using the same binary search.
+
+    Args:
+        reg: PanelRegistry
+        panel_pins: Dict panel -> [lng, lat] (see afm_pins.resolve_panel_pins)
+    """
+    pins = {str(panel): pin for panel, pin in sorted((panel_pins or {}).items())}
+    walls = [[r['first'], r['last'], r['wall'], r['pins']] for r in reg.walls.ranges]
+    w3w = [[r['first'], r['last'], r['code']] for r in reg.what3words.ranges]
+    return f"""// Generated by Scrips/panel_registry.py from data/afm-panel-registry.json - do not edit.
+(function () {{
+  // [first panel, last panel, wall, pin file]
+  const WALLS = {json.dumps(walls, separators=(',', ':'))};
+  // [first panel, last panel, what3words]
+  const W3W = {json.dumps(w3w, ensure_ascii=False, separators=(',', ':'))};
+  // panel -> [lng, lat] of its pin on the wall map
+  const PINS = {json.dumps(pins, separators=(',', ':'))};
+
+  function find(ranges, panel) {{
+    let lo = 0;
+    let hi = ranges.length - 1;
+    while (lo <= hi) {{
+      const mid = (lo + hi) >> 1;
+      if (panel < ranges[mid][0]) {{
+        hi = mid - 1;
+      }} else if (panel > ranges[mid][1]) {{
+        lo = mid + 1;
+      }} else {{
+        return ranges[mid];
+      }}
+    }}
+    return null;
+  }}
+
+  // Returns {{ wall, pinFile, pinIndex, pin, what3words }} or null for unknown panels
+  // (pin is [lng, lat], or null if the wall file has no pin for the panel)
+  function lookup(panel) {{
+    const number = parseInt(panel, 10);
+    if (Number.isNaN(number)) {{
+      return null;
+    }}
+    const wall = find(WALLS, number);
+    if (!wall) {{
+      return null;
+    }}
+    const w3w = find(W3W, number);
+    return {{
+      wall: wall[2],
+      pinFile: wall[3],
+      pinIndex: number - wall[0],
+      pin: PINS[number] || null,
+      what3words: w3w ? w3w[2] : null
+    }};
+  }}
+
+  window.AFMPanels = {{ WALLS, W3W, PINS, lookup }};
+}})();
+"""
+
+
+def main():
+    # afm_pins imports this module, so load it only when generating
+    from afm_pins import resolve_panel_pins
+
+    print("="*60)
+    print("AFM Panel Registry")
+    print("="*60)
+
+    reg = registry()
+    panel_pins, checks = resolve_panel_pins(reg=reg)
+    for wall, check in zip(reg.walls.ranges, checks):
+        note = f" (no pin for {check['missing']})" if check['missing'] else ''
+        print(f"  Wall {check['wall']}: panels {wall['first']}-{wall['last']} -> {check['file']}{note}")
+    print(f"  what3words ranges: {len(reg.what3words.ranges)}")
+    print(f"  Panels with a pin: {len(panel_pins)}")
+
+    write_bytes_atomic(JS_TABLE, render_js(reg, panel_pins).encode('utf-8'))
+    print(f"\nWrote {JS_TABLE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+"""
+Build a spatial grid and nearest-neighbour lists for memorial locations.
+
+The nearby list and the AR view used to work out the distance to every
+memorial and sort the lot on each GPS update. This build stage does the
+spatial work once:
+
+  1. Project each memorial's lat/lng onto a local flat plane in metres
+     (LocalPlane: equirectangular around the centre of the site).
+  2. Bucket the points into square cells of --cell metres.
+  3. For every memorial, find its --k nearest neighbours through the grid.
+
+and writes data/memorial-grid.json:
+
+  {"version": 2, "count": <records in memorials.json>,
+   "fingerprint": <positions_fingerprint of the indexed positions>,
+   "origin": [lat, lng], "scale": [metres per degree lat, per degree lng],
+   "cell": 25,
+   "cells": {"<cx>,<cy>": [memorial index, ...]},
+   "k": 5, "neighbours": [[[index, metres], ...] or null, ...]}
+
+Indexes are positions in memorials.json. A client projects its position
+with origin/scale, reads the few cells its search radius covers
+(js/memorial-grid.js) and measures distance only to those memorials. If
+count does not match memorials.json the grid is stale and clients fall back
+to scanning everything. A coordinate edit keeps the count, so clients also
+compare the fingerprint with one computed from the memorials.json they
+loaded (js/memorial-positions.js).
+
+Memorial positions follow js/ar-view.js: the top-level lat/lng, else
+location.lat/lng, with numeric strings accepted.
+
+Usage:
+  python Scrips/spatial_index.py [--cell 25] [--k 5]
+  python Scrips/spatial_index.py --near 52.7281,-1.7264 [--radius 50]
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+from afm_dataset import write_json_atomic
+
+ROOT_DIR = Path(__file__).parent.parent
+MEMORIALS_JSON = ROOT_DIR / 'data' / 'memorials.json'
+GRID_FILE = ROOT_DIR / 'data' / 'memorial-grid.json'
+GRID_VERSION = 2
+
+EARTH_RADIUS = 6371000.0
+# Cell edge in metres; the 50 m nearby radius then covers at most 5x5 cells
+CELL_SIZE = 25.0
+NEIGHBOURS = 5
+
+
+def memorial_position(memorial):
+    """
+    Coordinates of a memorial record.
+
+    Returns:
+        Tuple of (lat, lng) floats, or None if the record has no usable position
+    """
+    location = memorial.get('location') or {}
+    try:
+        lat = float(memorial.get('lat') or location.get('lat'))
+        lng = float(memorial.get('lng') or location.get('lng'))
+    except (TypeError, ValueError):
+        return None
+    if not (math.isfinite(lat) and math.isfinite(lng)):
+        return None
+    return lat, lng
+
+
+def positions_fingerprint(positions):
+    """
+    Short hash of memorial positions, to tell whether derived data is stale.
+
+    FNV-1a (32 bit) of the positions rounded to 6 decimal places (about
+    10 cm); js/memorial-positions.js computes the same value in the browser.
+
+    Args:
+        positions: List of (lat, lng) or None, one per memorial record
+
+    Returns:
+        8-digit hex string
+    """
+    text = ';'.join('' if p is None else f"{p[0]:.6f},{p[1]:.6f}" for p in positions)
+    value = 0x811c9dc5
+    for byte in text.encode('ascii'):
+        value = ((value ^ byte) * 0x01000193) & 0xffffffff
+    return f"{value:08x}"
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    """Great-circle distance in metres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin(math.radians(lat2 - lat1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class LocalPlane:
+    """
+    Equirectangular projection to metres east / north of an origin.
+
+    Over an area the size of the site (about 1 km) the error against
+    haversine is a few centimetres.
+
+    Args:
+        origin: (lat, lng) of the plane's origin
+    """
+
+    def __init__(self, origin):
+        self.origin = tuple(origin)
+        metres_per_degree = math.pi * EARTH_RADIUS / 180
+        self.scale = (metres_per_degree, metres_per_degree * math.cos(math.radians(self.origin[0])))
+
+    @classmethod
+    def around(cls, positions):
+        """Plane centred on the bounding box of (lat, lng) positions."""
+        located = [p for p in positions if p is not None]
+        if not located:
+            return cls((0.0, 0.0))
+        lats = [lat for lat, _ in located]
+        lngs = [lng for _, lng in located]
+        return cls((round((min(lats) + max(lats)) / 2, 6), round((min(lngs) + max(lngs)) / 2, 6)))
+
+    def project(self, lat, lng):
+        """(x, y) in metres east / north of the origin."""
+        return (lng - self.origin[1]) * self.scale[1], (lat - self.origin[0]) * self.scale[0]
+
+    def unproject(self, x, y):
+        """(lat, lng) of a point on the plane."""
+        return self.origin[0] + y / self.scale[0], self.origin[1] + x / self.scale[1]
+
+
+class SpatialIndex:
+    """
+    Uniform grid over memorial positions in a local metric plane.
+
+    Args:
+        positions: List of (lat, lng) or None, one per memorial record
+        cell: Cell edge in metres
+        origin: (lat, lng) of the plane's origin (default: centre of the points)
+    """
+
+    def __init__(self, positions, cell=CELL_SIZE, origin=None):
+        self.cell = float(cell)
+        self.count = len(positions)
+        self.plane = LocalPlane(origin) if origin is not None else LocalPlane.around(positions)
+        self.origin = self.plane.origin
+        self.scale = self.plane.scale
+
+        self.fingerprint = positions_fingerprint(positions)
+        self.points = [self.project(*p) if p is not None else None for p in positions]
+        self.cells = {}
+        for i, point in enumerate(self.points):
+            if point is not None:
+                self.cells.setdefault(self.cell_of(*point), []).append(i)
+        if self.cells:
+            self.bounds = (min(cx for cx, _ in self.cells), min(cy for _, cy in self.cells),
+                           max(cx for cx, _ in self.cells), max(cy for _, cy in self.cells))
+        else:
+            self.bounds = None
+
+    @classmethod
+    def from_memorials(cls, memorials, cell=CELL_SIZE):
+        """Index memorial records (see memorial_position)."""
+        return cls([memorial_position(m) for m in memorials], cell)
+
+    def project(self, lat, lng):
+        """(x, y) in metres east / north of the origin."""
+        return self.plane.project(lat, lng)
+
+    def cell_of(self, x, y):
+        return math.floor(x / self.cell), math.floor(y / self.cell)
+
+    def _distance(self, x, y, i):
+        px, py = self.points[i]
+        return math.hypot(px - x, py - y)
+
+    def within(self, lat, lng, radius):
+        """
+        Memorials within radius metres of a position.
+
+        Returns:
+            List of (index, metres), nearest first
+        """
+        x, y = self.project(lat, lng)
+        cx0, cy0 = self.cell_of(x - radius, y - radius)
+        cx1, cy1 = self.cell_of(x + radius, y + radius)
+        found = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for i in self.cells.get((cx, cy), ()):
+                    d = self._distance(x, y, i)
+                    if d <= radius:
+                        found.append((i, d))
+        found.sort(key=lambda item: (item[1], item[0]))
+        return found
+
+    def nearest(self, lat, lng, k=NEIGHBOURS, exclude=None):
+        """
+        The k memorials nearest to a position.
+
+        Searches square rings of cells outwards from the position's cell and
+        stops once no unvisited cell can hold anything nearer than the k-th
+        point found.
+
+        Args:
+            exclude: Memorial index to leave out (the memorial itself)
+
+        Returns:
+            List of (index, metres), nearest first
+        """
+        if self.bounds is None or k <= 0:
+            return []
+        x, y = self.project(lat, lng)
+        qx, qy = self.cell_of(x, y)
+        min_cx, min_cy, max_cx, max_cy = self.bounds
+        last_ring = max(qx - min_cx, max_cx - qx, qy - min_cy, max_cy - qy)
+
+        found = []
+        for ring in range(last_ring + 1):
+            for cx in range(qx - ring, qx + ring + 1):
+                edge = cx in (qx - ring, qx + ring)
+                for cy in (range(qy - ring, qy + ring + 1) if edge else (qy - ring, qy + ring)):
+                    for i in self.cells.get((cx, cy), ()):
+                        if i != exclude:
+                            found.append((i, self._distance(x, y, i)))
+            if len(found) >= k:
+                found.sort(key=lambda item: (item[1], item[0]))
+                del found[k:]
+                # Anything in ring + 1 is at least ring * cell away
+                if found[-1][1] < ring * self.cell:
+                    break
+        found.sort(key=lambda item: (item[1], item[0]))
+        return found[:k]
+
+    def neighbours(self, k=NEIGHBOURS):
+        """k nearest other memorials of every memorial (None where it has no position)."""
+        result = []
+        for i, point in enumerate(self.points):
+            if point is None:
+                result.append(None)
+                continue
+            result.append(self.nearest(*self.plane.unproject(*point), k, exclude=i))
+        return result
+
+    def to_json(self, k=NEIGHBOURS):
+        """The data/memorial-grid.json document."""
+        return {
+            'version': GRID_VERSION,
+            'count': self.count,
+            'fingerprint': self.fingerprint,
+            'origin': list(self.origin),
+            'scale': [round(s, 4) for s in self.scale],
+            'cell': self.cell,
+            'cells': {f"{cx},{cy}": members for (cx, cy), members in sorted(self.cells.items())},
+            'k': k,
+            'neighbours': [None if items is None else [[i, round(d, 1)] for i, d in items]
+                           for items in self.neighbours(k)],
+        }
+
+
+def load_memorials(path=MEMORIALS_JSON):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build data/memorial-grid.json for nearby-memorial lookups.')
+    parser.add_argument('--cell', type=float, default=CELL_SIZE, help=f'Cell size in metres (default: {CELL_SIZE:g})')
+    parser.add_argument('--k', type=int, default=NEIGHBOURS, help=f'Neighbours per memorial (default: {NEIGHBOURS})')
+    parser.add_argument('--near', type=str, default=None,
+                        help='Query instead of building: "lat,lng" of a position')
+    parser.add_argument('--radius', type=float, default=50, help='Radius for --near in metres (default: 50)')
+    args = parser.parse_args()
+
+    memorials = load_memorials()
+
+    if args.near:
+        try:
+            lat, lng = (float(part) for part in args.near.split(','))
+        except ValueError:
+            print(f"Error: --near expects 'lat,lng', got '{args.near}'")
+            sys.exit(1)
+        index = SpatialIndex.from_memorials(memorials, args.cell)
+        found = index.within(lat, lng, args.radius)
+        print(f"Memorials within {args.radius:g} m of {lat}, {lng}: {len(found)}")
+        for i, d in found:
+            print(f"  {d:7.1f} m  {memorials[i]['name']}")
+        return
+
+    print("="*60)
+    print("Memorial Spatial Grid")
+    print("="*60)
+
+    start = time.perf_counter()
+    index = SpatialIndex.from_memorials(memorials, args.cell)
+    grid = index.to_json(args.k)
+    elapsed = time.perf_counter() - start
+    write_json_atomic(GRID_FILE, grid, indent=None)
+
+    located = sum(point is not None for point in index.points)
+    sizes = [len(members) for members in index.cells.values()]
+    print(f"Memorials: {len(memorials)} ({located} with coordinates)")
+    print(f"Origin: {index.origin[0]}, {index.origin[1]}")
+    print(f"Cells: {len(index.cells)} of {args.cell:g} m, "
+          f"{max(sizes, default=0)} memorials in the fullest, {located / max(len(sizes), 1):.1f} on average")
+    print(f"Neighbours: {args.k} per memorial")
+    print(f"\nTime: {elapsed * 1000:.1f} ms")
+    print(f"Grid: {GRID_FILE} ({GRID_FILE.stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
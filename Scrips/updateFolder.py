@@ -3,6 +3,8 @@ import json
 import re
 import os
 
+from coordinate_matcher import MutualMatcher
+
 def clean_name(name):
     # Remove .HEIC and any trailing image extension, plus whitespace
     return re.sub(r'\.HEIC(\s*)$', '', name.strip(), flags=re.IGNORECASE)
@@ -28,15 +30,24 @@ with open(csv_path, newline='', encoding='utf-8') as csvfile:
 with open(json_path, encoding='utf-8') as f:
     memorials = json.load(f)
 
-# Update JSON with lat/lon from CSV
+# Update JSON with lat/lon from CSV (photo names drift in case, spacing and
+# copy suffixes, so match through the index; weak or ambiguous ones, and photos
+# that match another memorial better, are listed)
+matcher = MutualMatcher(csv_data.keys(), [clean_name(memorial['name']) for memorial in memorials])
+unmatched = []
 for memorial in memorials:
-    key = clean_name(memorial['name'])
-    if key in csv_data:
-        memorial['latitude'] = csv_data[key]['latitude']
-        memorial['longitude'] = csv_data[key]['longitude']
+    match = matcher.match(clean_name(memorial['name']))
+    if match.accepted:
+        memorial['latitude'] = csv_data[match.key]['latitude']
+        memorial['longitude'] = csv_data[match.key]['longitude']
+    elif match.key is not None:
+        unmatched.append(match)
 
 # Save updated JSON
 with open(json_path, 'w', encoding='utf-8') as f:
     json.dump(memorials, f, indent=2, ensure_ascii=False)
 
-print("memorials.json updated with latitude and longitude.")
\ No newline at end of file
+print("memorials.json updated with latitude and longitude.")
+for match in unmatched:
+    claimed = f", better match for '{match.claimed_by}'" if match.claimed_by else ''
+    print(f"  ? {match.query} -> '{match.key}' ({match.confidence:.2f}{', ambiguous' if match.ambiguous else ''}{claimed})")
\ No newline at end of file
@@ -1,12 +1,22 @@
 """
 Update memorials.json with coordinates from tmp_data.txt
 Handles duplicate entries in the source data
+
+Also reads the .csv / .jsonl output of extract_heic_coordinates.py:
+  python Scrips/update_memorial_coordinates.py --input photos/heic_coordinates.csv
+
+Names are matched with coordinate_matcher.MutualMatcher (exact, normalized,
+then token/fuzzy, and the photo must match back to the same memorial);
+weak or ambiguous matches are listed instead of applied.
 """
 
+import argparse
+import csv
 import json
-import re
 from pathlib import Path
 
+from coordinate_matcher import MIN_CONFIDENCE, MutualMatcher
+
 def parse_tmp_data(txt_file):
     """Parse the tmp_data.txt file and extract unique coordinates."""
     coordinates = {}
@@ -42,21 +52,46 @@ def parse_tmp_data(txt_file):
     
     return coordinates
 
-def normalize_name(name):
-    """Normalize memorial name for matching."""
-    # Remove common punctuation variations
-    normalized = name.strip()
-    # Handle special cases
-    normalized = normalized.replace('  ', ' ')
-    return normalized
+def parse_extracted_coordinates(path):
+    """Read the CSV or JSON Lines written by extract_heic_coordinates.py."""
+    path = Path(path)
+    coordinates = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.suffix.lower() in ('.jsonl', '.json'):
+            rows = ((row['file'], row['lat'], row['lng']) for row in map(json.loads, f) if row)
+        else:
+            rows = ((row['Filename'], row['Latitude'], row['Longitude']) for row in csv.DictReader(f))
+        for file_name, lat, lng in rows:
+            if lat in (None, '') or lng in (None, ''):
+                continue
+            # Photos are named after the memorial
+            coordinates[Path(file_name).stem] = {'lat': float(lat), 'lng': float(lng)}
+    return coordinates
+
+def load_coordinates(path):
+    """Parse coordinates from tmp_data.txt or an extract_heic_coordinates.py output."""
+    if Path(path).suffix.lower() in ('.csv', '.jsonl', '.json'):
+        return parse_extracted_coordinates(path)
+    return parse_tmp_data(path)
 
 def update_memorials(json_file, coordinates):
-    """Update memorials.json with coordinates."""
+    """
+    Update memorials.json with coordinates.
+
+    Photo names are resolved through a MutualMatcher built once over the
+    coordinate names and all memorial names; only confident, unambiguous
+    matches whose photo resolves back to the same memorial are applied.
+
+    Returns:
+        Tuple of (updated count, names not found, list of weak or ambiguous Match)
+    """
     with open(json_file, 'r', encoding='utf-8') as f:
         memorials = json.load(f)
     
+    matcher = MutualMatcher(coordinates.keys(), [memorial.get('name', '') for memorial in memorials])
     updated_count = 0
     not_found = []
+    uncertain = []
     
     for memorial in memorials:
         memorial_name = memorial.get('name', '')
@@ -67,66 +102,78 @@ def update_memorials(json_file, coordinates):
         if current_lat and current_lng and current_lat != "" and current_lng != "":
             continue
         
-        # Try to find matching coordinates
-        found = False
-        for coord_name, coords in coordinates.items():
-            # Try exact match or close match
-            if (normalize_name(coord_name) == normalize_name(memorial_name) or
-                normalize_name(coord_name) in normalize_name(memorial_name) or
-                normalize_name(memorial_name) in normalize_name(coord_name)):
-                
-                memorial['lat'] = coords['lat']
-                memorial['lng'] = coords['lng']
-                
-                # Also update location object if it exists
-                if 'location' in memorial:
-                    memorial['location']['lat'] = coords['lat']
-                    memorial['location']['lng'] = coords['lng']
-                else:
-                    memorial['location'] = {
-                        'lat': coords['lat'],
-                        'lng': coords['lng']
-                    }
-                
-                print(f"✓ Updated: {memorial_name}")
-                updated_count += 1
-                found = True
-                break
-        
-        if not found and (not current_lat or current_lat == ""):
+        match = matcher.match(memorial_name)
+        if not match.accepted:
             not_found.append(memorial_name)
+            if match.key is not None:
+                uncertain.append(match)
+            continue
+        
+        coords = coordinates[match.key]
+        memorial['lat'] = coords['lat']
+        memorial['lng'] = coords['lng']
+        
+        # Also update location object if it exists
+        if 'location' in memorial:
+            memorial['location']['lat'] = coords['lat']
+            memorial['location']['lng'] = coords['lng']
+        else:
+            memorial['location'] = {
+                'lat': coords['lat'],
+                'lng': coords['lng']
+            }
+        
+        via = '' if match.method == 'exact' else f" (from '{match.key}', {match.method} {match.confidence:.2f})"
+        print(f"✓ Updated: {memorial_name}{via}")
+        updated_count += 1
     
     # Save updated memorials
     with open(json_file, 'w', encoding='utf-8') as f:
         json.dump(memorials, f, indent=2, ensure_ascii=False)
     
-    return updated_count, not_found
+    return updated_count, not_found, uncertain
 
 def main():
     # File paths
     script_dir = Path(__file__).parent.parent
-    txt_file = script_dir / 'data' / 'tmp_data.txt'
+    parser = argparse.ArgumentParser(description='Update memorials.json with photo coordinates.')
+    parser.add_argument('--input', type=str, default=None,
+                        help='tmp_data.txt, or the .csv/.jsonl from extract_heic_coordinates.py '
+                             '(default: data/tmp_data.txt)')
+    args = parser.parse_args()
+    txt_file = Path(args.input) if args.input else script_dir / 'data' / 'tmp_data.txt'
     json_file = script_dir / 'data' / 'memorials.json'
     
     print("=" * 80)
-    print("Updating memorials.json with coordinates from tmp_data.txt")
+    print(f"Updating memorials.json with coordinates from {txt_file.name}")
     print("=" * 80)
     print()
     
-    # Parse coordinates from txt file
-    print("Reading tmp_data.txt...")
-    coordinates = parse_tmp_data(txt_file)
+    # Parse coordinates from the input file
+    print(f"Reading {txt_file.name}...")
+    coordinates = load_coordinates(txt_file)
     print(f"Found {len(coordinates)} unique memorials with coordinates\n")
     
     # Update memorials.json
     print("Updating memorials.json...")
     print()
-    updated_count, not_found = update_memorials(json_file, coordinates)
+    updated_count, not_found, uncertain = update_memorials(json_file, coordinates)
     
     print()
     print("=" * 80)
     print(f"Summary: Updated {updated_count} memorials")
     
+    if uncertain:
+        print(f"\nNot applied, check by hand ({len(uncertain)}):")
+        for match in uncertain:
+            if match.claimed_by:
+                reason = f"better match for '{match.claimed_by}'"
+            else:
+                reason = 'ambiguous' if match.ambiguous else f"below {MIN_CONFIDENCE:.2f}"
+            others = ', '.join(f"'{key}'" for key, _ in match.candidates[1:3])
+            print(f"  ? {match.query} -> '{match.key}' ({match.confidence:.2f}, {reason})"
+                  + (f"; also {others}" if match.ambiguous and others else ''))
+    
     if not_found:
         print(f"\nMemorials still missing coordinates ({len(not_found)}):")
         for name in not_found[:10]:  # Show first 10
@@ -0,0 +1,335 @@
+"""
+Rule-based validator for data/afm-memorials.json.
+
+Replaces the one-question check_*.py / verify_*.py scripts (nulls, panel 8
+and 230 spot checks, group assignment, CSV agreement). The dataset is loaded
+once and walked once; that pass runs every record rule and builds the
+indexes the dataset rules need:
+
+  by_panel     panel -> entry indexes, in file order
+  by_wall      wall (panel group A-I) -> panels, in file order
+  by_name      name -> entry indexes
+
+Dataset rules then only look at those indexes, so the whole validation is
+linear in the number of entries.
+
+Rules have a severity: any "error" makes the script exit with status 1.
+The report is written as JSON (--report) with a count and the first few
+examples for every rule.
+
+Usage:
+  python Scrips/validate_afm.py [--report validation_report.json] [--no-csv]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from add_panel_groups import get_panel_group
+from afm_dataset import AFM_JSON, DATA_DIR
+from afm_panels import (MAX_PANEL, MAX_YEAR, MIN_PANEL, MIN_YEAR, SERVICE_NORMALIZE,
+                        calculate_panel_location, iter_all_entries)
+from clean_afm_names import clean_name
+
+REQUIRED_FIELDS = ('name', 'service', 'date', 'panel', 'panel_Loc', 'panel_number')
+KNOWN_SERVICES = frozenset(SERVICE_NORMALIZE.values())
+CSV_DIR = DATA_DIR / 'AFM-Panels'
+MAX_EXAMPLES = 10
+
+
+class Rule:
+    """
+    One named check.
+
+    Args:
+        name: Rule name used in the report
+        severity: 'error' or 'warning'
+        description: One-line summary
+        record: Function(entry) -> message or None, run during the single pass
+        dataset: Function(index) -> iterable of (entry index or None, message),
+            run on the indexes after the pass
+    """
+
+    def __init__(self, name, severity, description, record=None, dataset=None):
+        if (record is None) == (dataset is None):
+            raise ValueError(f"Rule {name!r} needs exactly one of record= or dataset=")
+        self.name = name
+        self.severity = severity
+        self.description = description
+        self.record = record
+        self.dataset = dataset
+
+
+class DatasetIndex:
+    """Indexes over a list of entries, filled in by validate()."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.by_panel = {}
+        self.by_wall = {}
+        self.by_name = {}
+
+    def add(self, index, entry):
+        panel = entry.get('panel')
+        if panel not in self.by_panel:
+            self.by_panel[panel] = []
+            self.by_wall.setdefault(get_panel_group(panel), []).append(panel)
+        self.by_panel[panel].append(index)
+        self.by_name.setdefault(entry.get('name'), []).append(index)
+
+
+# Record rules
+
+def check_required(entry):
+    missing = [field for field in REQUIRED_FIELDS if entry.get(field) is None]
+    if missing:
+        return f"null {', '.join(missing)}"
+    return None
+
+
+def check_panel_range(entry):
+    panel = entry.get('panel')
+    if isinstance(panel, int) and not MIN_PANEL <= panel <= MAX_PANEL:
+        return f"panel {panel} outside {MIN_PANEL}-{MAX_PANEL}"
+    if panel is not None and get_panel_group(panel) is None:
+        return f"panel {panel} is not on any wall"
+    return None
+
+
+def check_panel_group(entry):
+    if 'panel_group' not in entry:
+        return None
+    expected = get_panel_group(entry.get('panel'))
+    if entry['panel_group'] != expected:
+        return f"panel_group {entry['panel_group']!r}, panel {entry.get('panel')} is on wall {expected!r}"
+    return None
+
+
+def check_date_range(entry):
+    date = entry.get('date')
+    if date is not None and not (isinstance(date, int) and MIN_YEAR <= date <= MAX_YEAR):
+        return f"date {date!r} outside {MIN_YEAR}-{MAX_YEAR}"
+    return None
+
+
+def check_service(entry):
+    service = entry.get('service')
+    if service is not None and service not in KNOWN_SERVICES:
+        return f"unknown service {service!r}"
+    return None
+
+
+# Dataset rules
+
+def check_panel_numbers(index):
+    """panel_number runs 1..n on every panel, in file order."""
+    for panel, indexes in index.by_panel.items():
+        for expected, entry_index in enumerate(indexes, 1):
+            actual = index.entries[entry_index].get('panel_number')
+            if actual != expected:
+                yield entry_index, f"panel {panel}: panel_number {actual!r}, expected {expected}"
+                break
+
+
+def check_panel_locations(index):
+    """panel_Loc is the third of the panel the position falls in."""
+    for panel, indexes in index.by_panel.items():
+        total = len(indexes)
+        for position, entry_index in enumerate(indexes):
+            actual = index.entries[entry_index].get('panel_Loc')
+            expected = calculate_panel_location(position, total)
+            if actual is not None and actual != expected:
+                yield entry_index, f"panel {panel} #{position + 1}: panel_Loc {actual!r}, expected {expected!r}"
+
+
+def check_panels_contiguous(index):
+    """Every panel's entries are in one run of the file."""
+    previous = None
+    seen = set()
+    for entry_index, entry in enumerate(index.entries):
+        panel = entry.get('panel')
+        if panel != previous:
+            if panel in seen:
+                yield entry_index, f"panel {panel} appears again after panel {previous}"
+            seen.add(panel)
+            previous = panel
+
+
+def check_wall_dates(index):
+    """Dates never go backwards along a wall (panels in file order)."""
+    for wall, panels in index.by_wall.items():
+        latest = None
+        for panel in panels:
+            for entry_index in index.by_panel[panel]:
+                date = index.entries[entry_index].get('date')
+                if not isinstance(date, int):
+                    continue
+                if latest is not None and date < latest[0]:
+                    yield entry_index, f"wall {wall}: {date} on panel {panel} after {latest[0]} on panel {latest[1]}"
+                latest = (date, panel) if latest is None or date >= latest[0] else latest
+
+
+def check_duplicate_names(index):
+    """The same name twice on one panel is usually an OCR repeat."""
+    for name, indexes in index.by_name.items():
+        if len(indexes) < 2:
+            continue
+        panels = set()
+        for entry_index in indexes:
+            panel = index.entries[entry_index].get('panel')
+            if panel in panels:
+                yield entry_index, f"{name!r} appears more than once on panel {panel}"
+            panels.add(panel)
+
+
+def csv_agreement_rule(csv_dir):
+    """Build a rule comparing the JSON with a fresh parse of the wall CSVs."""
+    def check_csv(index):
+        position = {}
+        for panel, indexes in index.by_panel.items():
+            for entry_index in indexes:
+                position[(panel, index.entries[entry_index].get('panel_number'))] = entry_index
+
+        parsed = 0
+        for entry in iter_all_entries(csv_dir):
+            parsed += 1
+            entry_index = position.pop((entry['panel'], entry['panel_number']), None)
+            if entry_index is None:
+                yield None, f"P{entry['panel']}#{entry['panel_number']} {entry['name']!r} is in the CSVs but not the JSON"
+                continue
+            stored = index.entries[entry_index].get('name')
+            if entry['name'] != stored and clean_name(entry['name']) != stored:
+                yield entry_index, f"name {stored!r}, CSV has {entry['name']!r}"
+            for field in ('service', 'date'):
+                if entry[field] is not None and entry[field] != index.entries[entry_index].get(field):
+                    yield entry_index, f"{field} {index.entries[entry_index].get(field)!r}, CSV has {entry[field]!r}"
+        if parsed == 0:
+            yield None, f"no wall CSVs found in {csv_dir}"
+        for entry_index in sorted(position.values()):
+            yield entry_index, "entry is in the JSON but not the CSVs"
+    return check_csv
+
+
+RULES = [
+    Rule('required_fields', 'error', 'Every entry has name, service, date, panel, panel_Loc and panel_number',
+         record=check_required),
+    Rule('panel_range', 'error', 'Panel numbers fall on a known wall',
+         record=check_panel_range),
+    Rule('panel_group', 'error', 'panel_group (if present) matches the wall ranges',
+         record=check_panel_group),
+    Rule('date_range', 'error', f'Dates are years {MIN_YEAR}-{MAX_YEAR}',
+         record=check_date_range),
+    Rule('service', 'error', 'Service is one of the normalized service names',
+         record=check_service),
+    Rule('panel_number_contiguous', 'error', 'panel_number runs 1..n on every panel',
+         dataset=check_panel_numbers),
+    Rule('panel_location', 'error', 'panel_Loc matches the position on the panel',
+         dataset=check_panel_locations),
+    Rule('panels_contiguous', 'error', "Each panel's entries are together in the file",
+         dataset=check_panels_contiguous),
+    Rule('wall_date_order', 'warning', 'Dates do not go backwards along a wall',
+         dataset=check_wall_dates),
+    Rule('duplicate_name_on_panel', 'warning', 'No name appears twice on the same panel',
+         dataset=check_duplicate_names),
+]
+
+
+def validate(entries, rules=RULES):
+    """
+    Run every rule over entries.
+
+    Args:
+        entries: List of memorial entries
+        rules: Rules to evaluate
+
+    Returns:
+        Tuple of (report dict, DatasetIndex)
+    """
+    results = {rule.name: {'rule': rule.name, 'severity': rule.severity,
+                           'description': rule.description, 'count': 0, 'examples': []}
+               for rule in rules}
+    timings = {}
+
+    def record_issue(rule, entry_index, message):
+        result = results[rule.name]
+        result['count'] += 1
+        if len(result['examples']) < MAX_EXAMPLES:
+            example = {'message': message}
+            if entry_index is not None:
+                entry = entries[entry_index]
+                example.update(index=entry_index, name=entry.get('name'),
+                               panel=entry.get('panel'), panel_number=entry.get('panel_number'))
+            result['examples'].append(example)
+
+    index = DatasetIndex(entries)
+    record_rules = [rule for rule in rules if rule.record is not None]
+
+    start = time.perf_counter()
+    for entry_index, entry in enumerate(entries):
+        index.add(entry_index, entry)
+        for rule in record_rules:
+            message = rule.record(entry)
+            if message is not None:
+                record_issue(rule, entry_index, message)
+    timings['record_pass'] = time.perf_counter() - start
+
+    for rule in rules:
+        if rule.dataset is None:
+            continue
+        start = time.perf_counter()
+        for entry_index, message in rule.dataset(index):
+            record_issue(rule, entry_index, message)
+        timings[rule.name] = time.perf_counter() - start
+
+    report = {
+        'entries': len(entries),
+        'errors': sum(r['count'] for r in results.values() if r['severity'] == 'error'),
+        'warnings': sum(r['count'] for r in results.values() if r['severity'] == 'warning'),
+        'timings_ms': {name: round(seconds * 1000, 1) for name, seconds in timings.items()},
+        'rules': list(results.values()),
+    }
+    return report, index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate afm-memorials.json against all rules in one pass.')
+    parser.add_argument('--report', type=str, default='validation_report.json',
+                        help='JSON report file (default: validation_report.json)')
+    parser.add_argument('--no-csv', action='store_true', help='Skip the comparison with the wall CSVs')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("AFM Dataset Validator")
+    print("="*60)
+
+    with open(AFM_JSON, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    print(f"Loaded {len(entries)} entries")
+
+    rules = list(RULES)
+    if not args.no_csv:
+        rules.append(Rule('csv_agreement', 'error', 'Entries match a fresh parse of the wall CSVs',
+                          dataset=csv_agreement_rule(CSV_DIR)))
+
+    report, _ = validate(entries, rules)
+    report['source'] = AFM_JSON.name
+
+    print()
+    for result in report['rules']:
+        mark = '✓' if result['count'] == 0 else ('✗' if result['severity'] == 'error' else '⚠')
+        print(f"  {mark} {result['rule']:<26}{result['count']:>6}  {result['description']}")
+        for example in result['examples'][:3]:
+            print(f"        {example['message']}")
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nErrors: {report['errors']}, warnings: {report['warnings']}")
+    print(f"📄 Report saved to: {args.report}")
+
+    if report['errors']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Round-trip checks for the columnar AFM encoding (afm_columnar.py).
+
+Encodes and decodes the real dataset plus a set of awkward hand-made cases
+(nulls, gaps in panel_number, names with newlines, extra fields) and checks
+that decode(encode(records)) gives back exactly the same records.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from afm_columnar import decode, encode
+
+def sample_cases():
+    """Small record lists that exercise the fallback encodings."""
+    base = {'name': 'EVANS HR', 'service': 'Army', 'date': 1945,
+            'panel': 1, 'panel_Loc': 'Top', 'panel_number': 1}
+    return {
+        'empty': [],
+        'single record': [dict(base)],
+        'null service and date': [
+            dict(base, service=None, date=None),
+            dict(base, name='WILSON IC', panel_number=2),
+        ],
+        'panel_number restarts and gaps': [
+            dict(base, panel=1, panel_number=1),
+            dict(base, panel=1, panel_number=2),
+            dict(base, panel=2, panel_number=1),
+            dict(base, panel=2, panel_number=5),
+        ],
+        'null panel_number': [dict(base, panel_number=None), dict(base)],
+        'newline in name': [dict(base, name='LINE\nBREAK'), dict(base)],
+        'empty and unicode names': [dict(base, name=''), dict(base, name='CORNÉS JR “’')],
+        'extra low-cardinality fields': [
+            dict(base, panel_group='A', what3words='///woke.fastening.rinses'),
+            dict(base, panel_group='A', what3words=None),
+            dict(base, panel_group='B', what3words=None),
+        ],
+        'mixed value types': [dict(base, date=1945), dict(base, date='1945'), dict(base, date=True)],
+    }
+
+def round_trip(records):
+    """Encode, serialize, parse and decode records."""
+    text = json.dumps(encode(records), ensure_ascii=False, separators=(',', ':'))
+    return decode(json.loads(text))
+
+def main():
+    script_dir = Path(__file__).parent
+    json_file = script_dir.parent / 'data' / 'afm-memorials.json'
+
+    print("="*60)
+    print("Verify columnar AFM encoding round trip")
+    print("="*60)
+
+    cases = sample_cases()
+    with open(json_file, 'r', encoding='utf-8') as f:
+        cases['afm-memorials.json'] = json.load(f)
+
+    failures = 0
+    for label, records in cases.items():
+        decoded = round_trip(records)
+        if decoded == records and all(
+                [type(v) for v in a.values()] == [type(v) for v in b.values()]
+                for a, b in zip(decoded, records)):
+            print(f"  ✓ {label} ({len(records)} records)")
+        else:
+            failures += 1
+            print(f"  ✗ {label}")
+
+    try:
+        encode([{'name': 'A', 'panel': 1}, {'panel': 1, 'name': 'B'}])
+    except ValueError:
+        print("  ✓ records with differing keys are rejected")
+    else:
+        failures += 1
+        print("  ✗ records with differing keys were accepted")
+
+    if failures:
+        print(f"\n✗ {failures} check(s) failed")
+        sys.exit(1)
+
+    print("\n✓ All round trips match")
+
+if __name__ == '__main__':
+    main()
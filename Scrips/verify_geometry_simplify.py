@@ -0,0 +1,144 @@
+"""
+Checks for the footpath simplification and geometry quantisation (geometry_simplify.py).
+
+- At several tolerances every master footpath vertex is within tolerance
+  (plus the quantisation grid) of the output. The compiled footpath graph
+  (footpath_graph.py) also keeps its junctions, bridges and components.
+- Hand-made cases check that simplification keeps shared vertices and
+  never moves a path across a vertex of another.
+- The TopoJSON-style topology decodes back to exactly the quantised files.
+- Quantised wall files give the same AFM panel pins (afm_pins.py).
+- Writing the footpath copy leaves the masters untouched, two runs give the
+  same bytes, data/min/ is up to date and holds no wall copies, and the
+  masters cannot be overwritten.
+
+Usage:
+  python Scrips/verify_geometry_simplify.py
+"""
+
+import filecmp
+import sys
+import tempfile
+from pathlib import Path
+
+from afm_dataset import write_json_atomic
+from afm_pins import COORD_DIGITS, load_wall_pins
+from footpath_graph import FOOTPATHS_FILE, compile_graph
+from geometry_simplify import (DATA_DIR, MIN_DIR, build_topology, decode_topology, load_geojson,
+                               quantise_points, simplify_footpaths, simplify_masters, wall_files,
+                               write_outputs)
+from spatial_index import LocalPlane
+
+TOLERANCES = (0.25, 0.5, 1.0, 2.0)
+# Largest move rounding to COORD_DIGITS places can add (half a grid cell, diagonally)
+GRID_ERROR = 0.01
+
+def collection(plane, lines):
+    """FeatureCollection of LineStrings given in metres around plane's origin."""
+    features = []
+    for line in lines:
+        coordinates = [list(reversed(plane.unproject(x, y))) for x, y in line]
+        features.append({'type': 'Feature', 'properties': {},
+                         'geometry': {'type': 'LineString', 'coordinates': coordinates}})
+    return {'type': 'FeatureCollection', 'features': features}
+
+def sample_cases():
+    """(name, lines in metres, tolerance, expected vertices kept per line)."""
+    zigzag = [(0, 0), (10, 0.4), (20, 0)]
+    return [
+        ('lone bend within tolerance', [zigzag], 0.5, [2]),
+        ('bend beyond tolerance', [[(0, 0), (10, 0.8), (20, 0)]], 0.5, [3]),
+        ('another path starts on the bend', [zigzag, [(10, 0.4), (10, 20)]], 0.5, [3, 2]),
+        ('another path passes inside the bend', [zigzag, [(5, -20), (10, 0.25), (15, -20)]], 0.5, [3, 3]),
+        ('another path passes outside the bend', [zigzag, [(5, 20), (10, 1.5), (15, 20)]], 0.5, [2, 3]),
+        ('crossing paths', [[(0, 0), (5, 0.1), (10, 0.2), (15, 0.1), (20, 0)], [(10, -10), (10, 10)]], 0.5, [5, 2]),
+    ]
+
+def main():
+    failures = 0
+    plane = LocalPlane((52.7275, -1.728))
+
+    print("Hand-made cases:")
+    for name, lines, tolerance, expected in sample_cases():
+        output, _ = simplify_footpaths(collection(plane, lines), tolerance)
+        kept = [len(feature['geometry']['coordinates']) for feature in output['features']]
+        ok = kept == expected
+        failures += not ok
+        print(f"  {'✓' if ok else '✗'} {name}: kept {kept}" + ('' if ok else f", expected {expected}"))
+
+    print(f"\n{FOOTPATHS_FILE.name}:")
+    footpaths = load_geojson(FOOTPATHS_FILE)
+    for tolerance in TOLERANCES:
+        output, stats = simplify_footpaths(footpaths, tolerance)
+        before = compile_graph(stats['before'])['stats']
+        after = compile_graph(stats['after'])['stats']
+        topology = all(before[key] == after[key] for key in ('junctions', 'bridges', 'components'))
+        ok = stats['error'] <= tolerance + GRID_ERROR and topology
+        failures += not ok
+        print(f"  {'✓' if ok else '✗'} {tolerance:g} m: {stats['vertices']} -> {stats['kept']} vertices, "
+              f"max error {stats['error']:.3f} m, "
+              f"{after['components']} components, {after['bridges']} bridges, {after['junctions']} junctions"
+              + ('' if topology else f" (was {before['components']}, {before['bridges']}, {before['junctions']})"))
+
+    quantised = {FOOTPATHS_FILE.stem: simplify_footpaths(footpaths)[0]}
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in wall_files():
+            document, error = quantise_points(load_geojson(path))
+            quantised[path.stem] = document
+            copy = Path(tmp) / path.name
+            write_json_atomic(copy, document, indent=None)
+            same = load_wall_pins(copy) == load_wall_pins(path)
+            ok = same and error <= GRID_ERROR
+            failures += not ok
+            print(f"  {'✓' if ok else '✗'} {path.name}: max error {error:.4f} m, "
+                  f"{'same' if same else 'different'} panel pins at {COORD_DIGITS} places")
+
+    decoded = decode_topology(build_topology(quantised))
+    wrong = [name for name, document in quantised.items()
+             if [f['geometry'] for f in decoded[name]['features']] != [f['geometry'] for f in document['features']]
+             or [f['properties'] for f in decoded[name]['features']] != [f['properties'] for f in document['features']]]
+    failures += bool(wrong)
+    print(f"\n  {'✓' if not wrong else '✗'} TopoJSON round trip: "
+          f"{len(quantised) - len(wrong)}/{len(quantised)} objects decode to the quantised files")
+
+    print("\nCopies:")
+    masters = [FOOTPATHS_FILE] + wall_files()
+    master_bytes = {path: path.read_bytes() for path in masters}
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = []
+        for run in ('first', 'second'):
+            out_dir = Path(tmp) / run
+            written = write_outputs(simplify_masters()[0], out_dir)
+            runs.append({path.name: path.read_bytes() for path in written})
+        untouched = all(path.read_bytes() == data for path, data in master_bytes.items())
+        failures += not untouched
+        print(f"  {'✓' if untouched else '✗'} masters unchanged after writing the copies twice")
+        same = runs[0] == runs[1]
+        failures += not same
+        print(f"  {'✓' if same else '✗'} two runs write identical copies")
+        extra = sorted(path.name for path in MIN_DIR.glob('*') if path.name not in runs[0])
+        only = list(runs[0]) == [FOOTPATHS_FILE.name] and not extra
+        failures += not only
+        print(f"  {'✓' if only else '✗'} only {FOOTPATHS_FILE.name} is written, no wall copies"
+              + ('' if not extra else f" (remove {', '.join(extra)})"))
+        stale = [name for name in runs[0]
+                 if not (MIN_DIR / name).exists() or not filecmp.cmp(Path(tmp) / 'first' / name, MIN_DIR / name,
+                                                                     shallow=False)]
+        failures += bool(stale)
+        print(f"  {'✓' if not stale else '✗'} {MIN_DIR.relative_to(DATA_DIR.parent)}/ is up to date"
+              + ('' if not stale else f" (rerun geometry_simplify.py: {', '.join(stale)})"))
+    try:
+        write_outputs({FOOTPATHS_FILE: footpaths}, DATA_DIR)
+        refused = False
+    except ValueError:
+        refused = True
+    failures += not refused
+    print(f"  {'✓' if refused else '✗'} refuses to write over the masters")
+
+    if failures:
+        print(f"\n✗ {failures} check(s) failed")
+        sys.exit(1)
+    print("\n✓ All geometry checks passed")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Check the header-only HEIC GPS reader in extract_heic_coordinates.py.
+
+Builds small synthetic HEIF files in a temporary folder covering the layouts
+cameras and converters produce (iloc versions 0, 1 and 2, EXIF stored in
+idat, meta after mdat, 64-bit box sizes, no EXIF, EXIF without GPS) plus a
+JPEG, and checks the coordinates that come back. The image data is a sparse
+hole of several megabytes, so a reader that touched it would be slow.
+
+Then extracts a few hundred files through the thread pool, writes CSV and
+JSON Lines, and checks that update_memorial_coordinates.py reads both.
+
+Usage:
+  python Scrips/verify_heic_metadata.py [--files 300]
+"""
+
+import argparse
+import io
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from extract_heic_coordinates import (GPS_IFD, StreamWriter, extract_all, extract_coordinates_from_heic,
+                                      find_photos)
+from update_memorial_coordinates import load_coordinates
+
+IMAGE_BYTES = 8 * 1024 * 1024
+
+
+def box(box_type, payload, large=False):
+    if large:
+        return struct.pack('>I4sQ', 1, box_type, len(payload) + 16) + payload
+    return struct.pack('>I4s', len(payload) + 8, box_type) + payload
+
+
+def full_box(box_type, version, payload):
+    return box(box_type, bytes([version, 0, 0, 0]) + payload)
+
+
+def exif_item(lat, lng):
+    """Exif item payload: TIFF header offset, then 'Exif\\0\\0' and the TIFF block."""
+    exif = Image.Exif()
+    if lat is not None:
+        exif[GPS_IFD] = {1: 'N' if lat >= 0 else 'S', 2: dms(abs(lat)),
+                         3: 'E' if lng >= 0 else 'W', 4: dms(abs(lng))}
+    else:
+        exif[0x010F] = 'Test camera'
+    return struct.pack('>I', 6) + exif.tobytes()
+
+
+def dms(value):
+    degrees = int(value)
+    minutes = int((value - degrees) * 60)
+    return (float(degrees), float(minutes), round((value - degrees - minutes / 60) * 3600, 4))
+
+
+def heif_bytes(exif, iloc_version=0, use_idat=False, meta_last=False, large_mdat=False):
+    """
+    Build a HEIF file whose item 1 is an (empty) image and item 2 the Exif block.
+
+    Returns:
+        Tuple of (file bytes before the image hole, image hole size, bytes after it)
+    """
+    ftyp = box(b'ftyp', b'heic' + b'\x00\x00\x00\x00' + b'mif1heic')
+    items = [(1, b'hvc1')] + ([(2, b'Exif')] if exif is not None else [])
+    infes = b''.join(full_box(b'infe', 2, struct.pack('>HH', item_id, 0) + kind + b'\x00')
+                     for item_id, kind in items)
+    iinf = full_box(b'iinf', 0, struct.pack('>H', len(items)) + infes)
+
+    def build_meta(exif_offset):
+        id_format = '>I' if iloc_version == 2 else '>H'
+        entries = b''
+        for item_id, kind in items:
+            method = 1 if (kind == b'Exif' and use_idat) else 0
+            offset, length = (exif_offset, len(exif)) if kind == b'Exif' else (0, 0)
+            entry = struct.pack(id_format, item_id)
+            if iloc_version in (1, 2):
+                entry += struct.pack('>H', method)
+            entry += struct.pack('>HIH', 0, 0, 1)  # data ref, base offset, one extent
+            entry += struct.pack('>II', offset, length)
+            entries += entry
+        count = struct.pack(id_format, len(items))
+        iloc = full_box(b'iloc', iloc_version, struct.pack('>H', 0x4440) + count + entries)
+        idat = box(b'idat', exif) if use_idat and exif is not None else b''
+        return full_box(b'meta', 0, full_box(b'hdlr', 0, b'\x00' * 4 + b'pict' + b'\x00' * 13) + iinf + iloc + idat)
+
+    # Exif bytes sit at the start of mdat, the image hole after them
+    stored_exif = exif if exif is not None and not use_idat else b''
+    mdat_header = 16 if large_mdat else 8
+    mdat_payload_size = len(stored_exif) + IMAGE_BYTES
+    if meta_last:
+        exif_offset = len(ftyp) + mdat_header if stored_exif else 0
+        meta = build_meta(0 if use_idat else exif_offset)
+    else:
+        meta_size = len(build_meta(0))
+        exif_offset = len(ftyp) + meta_size + mdat_header if stored_exif else 0
+        meta = build_meta(0 if use_idat else exif_offset)
+
+    if large_mdat:
+        mdat_head = struct.pack('>I4sQ', 1, b'mdat', mdat_payload_size + 16)
+    else:
+        mdat_head = struct.pack('>I4s', mdat_payload_size + 8, b'mdat')
+    if meta_last:
+        return ftyp + mdat_head + stored_exif, IMAGE_BYTES, meta
+    return ftyp + meta + mdat_head + stored_exif, IMAGE_BYTES, b''
+
+
+def write_sparse(path, parts):
+    head, hole, tail = parts
+    with open(path, 'wb') as f:
+        f.write(head)
+        f.seek(hole, 1)
+        f.write(tail)
+        f.truncate()
+
+
+CASES = [
+    ('iloc v0', dict(iloc_version=0), (51.7084, -1.7863)),
+    ('iloc v1', dict(iloc_version=1), (-33.8568, 151.2153)),
+    ('iloc v2', dict(iloc_version=2), (52.7293, -1.7295)),
+    ('exif in idat', dict(iloc_version=1, use_idat=True), (40.7128, -74.006)),
+    ('meta after mdat', dict(meta_last=True), (48.8584, 2.2945)),
+    ('64-bit mdat size', dict(large_mdat=True), (52.72795, -1.72812)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify the header-only HEIC GPS reader.')
+    parser.add_argument('--files', type=int, default=300, help='Files in the batch run (default: 300)')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("Verify HEIC metadata extraction")
+    print("="*60)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for label, options, (lat, lng) in CASES:
+            path = tmp / f"{label}.heic"
+            write_sparse(path, heif_bytes(exif_item(lat, lng), **options))
+            got = extract_coordinates_from_heic(path)
+            ok = got[0] is not None and abs(got[0] - lat) < 1e-6 and abs(got[1] - lng) < 1e-6
+            failures += not ok
+            print(f"  {'✓' if ok else '✗'} {label:<20} {got}")
+
+        for label, exif in (('no exif item', None), ('exif without gps', exif_item(None, None))):
+            path = tmp / f"{label}.heic"
+            write_sparse(path, heif_bytes(exif))
+            got = extract_coordinates_from_heic(path)
+            ok = got == (None, None)
+            failures += not ok
+            print(f"  {'✓' if ok else '✗'} {label:<20} {got}")
+
+        jpeg = tmp / 'camera.jpg'
+        buffer = io.BytesIO()
+        exif = Image.Exif()
+        exif[GPS_IFD] = {1: 'N', 2: dms(52.7281), 3: 'W', 4: dms(1.7264)}
+        Image.new('RGB', (64, 48)).save(buffer, 'JPEG', exif=exif.tobytes())
+        jpeg.write_bytes(buffer.getvalue())
+        got = extract_coordinates_from_heic(jpeg)
+        ok = abs(got[0] - 52.7281) < 1e-6 and abs(got[1] + 1.7264) < 1e-6
+        failures += not ok
+        print(f"  {'✓' if ok else '✗'} {'jpeg':<20} {got}")
+
+        # Batch run through the pool, streamed to CSV and JSON Lines
+        batch = tmp / 'batch'
+        batch.mkdir()
+        expected = {}
+        for i in range(args.files):
+            lat, lng = 52.72 + i * 1e-5, -1.73 + i * 1e-5
+            name = f"Memorial {i:04d}"
+            expected[name] = (lat, lng)
+            write_sparse(batch / f"{name}.HEIC", heif_bytes(exif_item(lat, lng), iloc_version=i % 3))
+        photos = find_photos([batch])
+        total_size = sum(p.stat().st_size for p in photos)
+
+        for suffix in ('.csv', '.jsonl'):
+            output = tmp / f"coords{suffix}"
+            start = time.perf_counter()
+            with StreamWriter(output) as writer:
+                results = extract_all(photos, writer, root=batch)
+            elapsed = time.perf_counter() - start
+            coordinates = load_coordinates(output)
+            wrong = [name for name, (lat, lng) in expected.items()
+                     if name not in coordinates
+                     or abs(coordinates[name]['lat'] - lat) > 1e-6 or abs(coordinates[name]['lng'] - lng) > 1e-6]
+            ok = len(results) == args.files and not wrong
+            failures += not ok
+            print(f"  {'✓' if ok else '✗'} {len(results)} files ({total_size / 1e9:.1f} GB of photos) -> "
+                  f"{output.name} in {elapsed:.2f} s, {len(coordinates)} read back"
+                  + (f", {len(wrong)} wrong" if wrong else ''))
+
+    if failures:
+        print(f"\n✗ {failures} check(s) failed")
+        sys.exit(1)
+    print("\n✓ All HEIC metadata checks passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Check the responsive photo variants written by image_derivatives.py.
+
+Builds JPEG and PNG sources in a temporary img/ folder, upright and stored
+sideways with EXIF orientations 6 and 8, each with a red block in the
+top-left corner of the picture as viewers show it. Every variant must come
+out upright: portrait sources give portrait variants of the expected
+widths, with the red block still top-left. The photos in img/zone* that
+carry an orientation tag are copied in and checked the same way.
+
+Usage:
+  python Scrips/verify_image_derivatives.py
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+from image_derivatives import IMG_DIR, ORIENTATION_TAG, find_sources, generate, target_widths
+
+# (file name, upright size, orientation, format)
+CASES = [
+    ('landscape.jpg', (1600, 1200), 1, 'JPEG'),
+    ('portrait.jpg', (1200, 1600), 1, 'JPEG'),
+    ('portrait rotated 6.jpg', (1200, 1600), 6, 'JPEG'),
+    ('portrait rotated 8.jpg', (1200, 1600), 8, 'JPEG'),
+    ('small portrait rotated 6.jpg', (600, 800), 6, 'JPEG'),
+    ('portrait.png', (900, 1200), 1, 'PNG'),
+]
+# How the picture is stored so that the orientation tag turns it upright
+STORED = {1: None, 6: Image.Transpose.ROTATE_90, 8: Image.Transpose.ROTATE_270}
+
+
+def make_source(path, size, orientation, fmt):
+    upright = Image.new('RGB', size, (40, 90, 160))
+    upright.paste((220, 20, 20), (0, 0, size[0] // 4, size[1] // 4))
+    stored = upright.transpose(STORED[orientation]) if STORED[orientation] is not None else upright
+    exif = Image.Exif()
+    if orientation != 1:
+        exif[ORIENTATION_TAG] = orientation
+    stored.save(path, fmt, exif=exif.tobytes())
+
+
+def red_corner(path):
+    with Image.open(path) as img:
+        img = img.convert('RGB')
+        r, g, b = img.getpixel((img.width // 10, img.height // 10))
+    return r > 150 and g < 100 and b < 100
+
+
+def main():
+    print("="*60)
+    print("Verify responsive image derivatives")
+    print("="*60)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        img_dir = tmp / 'img'
+        zone = img_dir / 'zone1'
+        zone.mkdir(parents=True)
+        expected = {}
+        for name, size, orientation, fmt in CASES:
+            make_source(zone / name, size, orientation, fmt)
+            expected[f"zone1/{name}"] = (size, True)
+
+        real = img_dir / 'zone99'
+        real.mkdir()
+        for _, path in find_sources(IMG_DIR):
+            with Image.open(path) as img:
+                orientation = img.getexif().get(ORIENTATION_TAG, 1)
+                size = img.size[::-1] if orientation in (5, 6, 7, 8) else img.size
+            if orientation != 1:
+                copy = real / path.name
+                shutil.copy(path, copy)
+                expected[f"zone99/{copy.name}"] = (size, False)
+
+        stats = generate(img_dir, img_dir / 'derived', tmp / 'manifest.json', jobs=1)
+        for key, message in stats['errors']:
+            failures += 1
+            print(f"  ✗ {key}: {message}")
+
+        for key, ((width, height), marked) in expected.items():
+            variants = stats['images'].get(key, {}).get('variants', [])
+            widths = sorted({v['width'] for v in variants})
+            shapes_ok = widths == [w for _, w in target_widths(width)] and all(
+                abs(v['height'] - v['width'] * height / width) <= 1 for v in variants)
+            corner_ok = not marked or all(red_corner(tmp / v['url']) for v in variants)
+            ok = bool(variants) and shapes_ok and corner_ok
+            failures += not ok
+            largest = max(variants, key=lambda v: v['width']) if variants else None
+            shape = f"{largest['width']}x{largest['height']}" if largest else 'none'
+            print(f"  {'✓' if ok else '✗'} {key}: upright {width}x{height}, largest variant {shape}"
+                  + ('' if corner_ok else ', picture not upright'))
+
+    if failures:
+        print(f"\n✗ {failures} check(s) failed")
+        sys.exit(1)
+    print("\n✓ All image derivative checks passed")
+
+
+if __name__ == '__main__':
+    main()
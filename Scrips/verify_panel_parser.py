@@ -0,0 +1,73 @@
+"""
+Check that the shared panel parser (afm_panels.py) still reproduces
+data/afm-memorials.json.
+
+The JSON has been through the fix-up scripts since it was generated, so:
+  - name, panel, panel_Loc and panel_number must match exactly
+    (names may differ only by what clean_name() removes)
+  - service and date must match wherever the parser found a marker
+    (the fix-up scripts only fill values the parser left as null)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from afm_panels import iter_all_entries
+from clean_afm_names import clean_name
+
+POSITION_FIELDS = ('panel', 'panel_Loc', 'panel_number')
+MARKER_FIELDS = ('service', 'date')
+
+def main():
+    script_dir = Path(__file__).parent
+    csv_dir = script_dir.parent / 'data' / 'AFM-Panels'
+    json_file = script_dir.parent / 'data' / 'afm-memorials.json'
+
+    print("="*60)
+    print("Verify panel parser against afm-memorials.json")
+    print("="*60)
+
+    with open(json_file, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+
+    mismatches = []
+    parsed_count = 0
+
+    for index, entry in enumerate(iter_all_entries(csv_dir)):
+        parsed_count += 1
+        if index >= len(expected):
+            continue
+        stored = expected[index]
+
+        for field in POSITION_FIELDS:
+            if entry[field] != stored.get(field):
+                mismatches.append((index, field, entry[field], stored.get(field)))
+
+        if entry['name'] != stored.get('name') and clean_name(entry['name']) != stored.get('name'):
+            mismatches.append((index, 'name', entry['name'], stored.get('name')))
+
+        for field in MARKER_FIELDS:
+            if entry[field] is not None and entry[field] != stored.get(field):
+                mismatches.append((index, field, entry[field], stored.get(field)))
+
+    print(f"Parsed entries: {parsed_count}")
+    print(f"JSON entries:   {len(expected)}")
+
+    if parsed_count != len(expected):
+        print(f"\n✗ Entry count differs by {parsed_count - len(expected)}")
+
+    if mismatches:
+        print(f"\n✗ {len(mismatches)} field mismatch(es):")
+        for index, field, parsed, stored in mismatches[:20]:
+            print(f"  #{index} {field}: parsed={parsed!r} json={stored!r}")
+        if len(mismatches) > 20:
+            print(f"  ... and {len(mismatches) - 20} more")
+
+    if parsed_count != len(expected) or mismatches:
+        sys.exit(1)
+
+    print("\n✓ Parser output matches afm-memorials.json")
+
+if __name__ == '__main__':
+    main()
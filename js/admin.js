@@ -29,6 +29,7 @@
       const response = await fetch('../data/memorials.json');
       if (!response.ok) throw new Error('Failed to load memorials data');
       const memorials = await response.json();
+      const imageIndex = window.ImageIndex ? await window.ImageIndex.load() : null;
 
       resultsContainer.innerHTML = '<div class="progress">Checking images for ' + memorials.length + ' memorials...</div>';
 
@@ -48,8 +49,9 @@
           continue;
         }
 
-        // Construct image path - images are in ../img/zone<number>/<memorial name>.jpeg
-        const imagePath = `../img/zone${memorial.zone}/${memorial.name}.jpeg`;
+        // Exact path from the image manifest, else ../img/zone<number>/<memorial name>.jpeg
+        const imagePath = (imageIndex && window.ImageIndex.path(imageIndex, memorial.zone, memorial.name))
+          || `../img/zone${memorial.zone}/${memorial.name}.jpeg`;
         const exists = await imageExists(imagePath);
 
         if (!exists) {
@@ -0,0 +1,48 @@
+// Generated by Scrips/panel_registry.py from data/afm-panel-registry.json - do not edit.
+(function () {
+  // [first panel, last panel, wall, pin file]
+  const WALLS = [[1,77,"A","AFM-Wall-A.json"],[78,118,"B","AFM-Wall-B.json"],[119,134,"C","AFM-Wall-C.json"],[135,150,"D","AFM-Wall-D.json"],[151,166,"E","AFM-Wall-E.json"],[167,182,"F","AFM-Wall-F.json"],[183,205,"G","AFM-Wall-G.json"],[207,223,"H","AFM-Wall-H.json"],[224,230,"I","AFM-Wall-I.json"]];
+  // [first panel, last panel, what3words]
+  const W3W = [[1,5,"///woke.fastening.rinses"],[6,10,"///timeless.craziest.tasteful"],[11,15,"///doll.caravans.begun"],[16,20,"///vandalism.angle.copiers"],[21,25,"///ripe.decorated.risk"],[26,30,"///quaking.public.ranted"],[31,35,"///wrenching.directors.aliens"],[36,40,"///icon.scrubbing.survey"],[41,45,"///coil.initial.gourmet"],[46,49,"///outer.simulator.harder"],[50,53,"///salaried.waddled.clashes"],[54,57,"///condiment.irrigate.exhales"],[58,61,"///marathons.crispier.crystal"],[62,65,"///talkative.term.universes"],[66,69,"///feasted.residual.stitch"],[70,73,"///rosier.landscape.minds"],[74,77,"///upgrading.revolting.belong"]];
+  // panel -> [lng, lat] of its pin on the wall map
+  const PINS = {"1":[-1.7281878,52.727478],"2":[-1.7281816,52.7274848],"3":[-1.7281753,52.7274914],"4":[-1.7281688,52.7274979],"5":[-1.7281621,52.7275043],"6":[-1.7281554,52.7275105],"7":[-1.7281485,52.7275165],"8":[-1.7281414,52.7275224],"9":[-1.7281343,52.7275282],"10":[-1.728127,52.7275338],"11":[-1.7281196,52.7275392],"12":[-1.728112,52.7275444],"13":[-1.7281044,52.7275495],"14":[-1.7280966,52.7275544],"15":[-1.7280887,52.7275591],"16":[-1.7280808,52.7275637],"17":[-1.7280727,52.7275681],"18":[-1.7280645,52.7275722],"19":[-1.7280562,52.7275763],"20":[-1.7280479,52.7275801],"21":[-1.7280395,52.7275837],"22":[-1.7280309,52.7275872],"23":[-1.7280224,52.7275904],"24":[-1.7280137,52.7275935],"25":[-1.728005,52.7275963],"26":[-1.7279962,52.727599],"27":[-1.7279873,52.7276015],"28":[-1.7279784,52.7276038],"29":[-1.7279695,52.7276058],"30":[-1.7279605,52.7276077],"31":[-1.7279515,52.7276094],"32":[-1.7279424,52.7276109],"33":[-1.7279333,52.7276121],"34":[-1.7279242,52.7276132],"35":[-1.7279151,52.7276141],"36":[-1.7279059,52.7276147],"37":[-1.7278967,52.7276152],"38":[-1.7278875,52.7276154],"39":[-1.7278784,52.7276155],"40":[-1.7278692,52.7276153],"41":[-1.72786,52.7276149],"42":[-1.7278508,52.7276144],"43":[-1.7278417,52.7276136],"44":[-1.7278326,52.7276126],"45":[-1.7278234,52.7276114],"46":[-1.7278144,52.72761],"47":[-1.7278053,52.7276084],"48":[-1.7277963,52.7276066],"49":[-1.7277874,52.7276047],"50":[-1.7277784,52.7276025],"51":[-1.7277696,52.7276001],"52":[-1.7277608,52.7275975],"53":[-1.727752,52.7275947],"54":[-1.7277433,52.7275917],"55":[-1.7277347,52.7275885],"56":[-1.7277262,52.7275852],"57":[-1.7277177,52.7275816],"58":[-1.7277093,52.7275779],"59":[-1.727701,52.7275739],"60":[-1.7276928,52.7275698],"61":[-1.7276847,52.7275655],"62":[-1.7276767,52.727561],"63":[-1.7276688,52.7275564],"64":[-1.7276609,52.7275515],"65":[-1.7276532,52.7275465],"66":[-1.7276457,52.7275414],"67":[-1.7276382,52.727536],"68":[-1.7276308,52.7275305],"69":[-1.7276236,52.7275248],"70":[-1.7276165,52.727519],"71":[-1.7276096,52.727513],"72":[-1.7276027,52.7275069],"73":[-1.7275961,52.7275006],"74":[-1.7275895,52.7274941],"75":[-1.7275831,52.7274875],"76":[-1.7275769,52.7274808],"77":[-1.7275708,52.7274739],"78":[-1.727641,52.7275243],"79":[-1.7276533,52.7275243],"80":[-1.7276656,52.7275243],"81":[-1.7276779,52.7275243],"82":[-1.7276902,52.7275243],"83":[-1.7277025,52.7275243],"84":[-1.7277148,52.7275244],"85":[-1.727727,52.7275244],"86":[-1.7277393,52.7275244],"87":[-1.7277516,52.7275244],"88":[-1.7277639,52.7275244],"89":[-1.7277762,52.7275244],"90":[-1.7277885,52.7275245],"91":[-1.7278008,52.7275245],"92":[-1.727813,52.7275245],"93":[-1.7278253,52.7275245],"94":[-1.7278376,52.7275245],"95":[-1.7278499,52.7275245],"96":[-1.7278622,52.7275246],"97":[-1.7278745,52.7275246],"98":[-1.7278868,52.7275246],"99":[-1.727899,52.7275246],"100":[-1.7279113,52.7275246],"101":[-1.7279236,52.7275246],"102":[-1.7279359,52.7275247],"103":[-1.7279482,52.7275247],"104":[-1.7279605,52.7275247],"105":[-1.7279728,52.7275247],"106":[-1.727985,52.7275247],"107":[-1.7279973,52.7275247],"108":[-1.7280096,52.7275248],"109":[-1.7280219,52.7275248],"110":[-1.7280342,52.7275248],"111":[-1.7280465,52.7275248],"112":[-1.7280588,52.7275248],"113":[-1.728071,52.7275248],"114":[-1.7280833,52.7275249],"115":[-1.7280956,52.7275249],"116":[-1.7281079,52.7275249],"117":[-1.7281202,52.7275249],"119":[-1.7281136,52.7275053],"120":[-1.7281003,52.7275053],"121":[-1.728087,52.7275054],"122":[-1.7280737,52.7275054],"123":[-1.7280604,52.7275054],"124":[-1.7280472,52.7275055],"125":[-1.7280339,52.7275055],"126":[-1.7280206,52.7275055],"127":[-1.7280073,52.7275055],"128":[-1.727994,52.7275056],"129":[-1.7279807,52.7275056],"130":[-1.7279675,52.7275056],"131":[-1.7279542,52.7275056],"132":[-1.7279409,52.7275057],"133":[-1.7279276,52.7275057],"135":[-1.7278183,52.7275052],"136":[-1.7278067,52.7275052],"137":[-1.7277951,52.7275052],"138":[-1.7277835,52.7275052],"139":[-1.7277719,52.7275052],"140":[-1.7277603,52.7275052],"141":[-1.7277486,52.7275052],"142":[-1.727737,52.7275053],"143":[-1.7277254,52.7275053],"144":[-1.7277138,52.7275053],"145":[-1.7277022,52.7275053],"146":[-1.7276906,52.7275053],"147":[-1.727679,52.7275053],"148":[-1.7276674,52.7275053],"149":[-1.7276558,52.7275053],"150":[-1.7276442,52.7275053],"151":[-1.7276454,52.7273602],"152":[-1.7276566,52.7273603],"153":[-1.7276678,52.7273603],"154":[-1.727679,52.7273604],"155":[-1.7276902,52.7273604],"156":[-1.7277014,52.7273604],"157":[-1.7277126,52.7273605],"158":[-1.7277238,52.7273605],"159":[-1.727735,52.7273606],"160":[-1.7277462,52.7273606],"161":[-1.7277574,52.7273607],"162":[-1.7277686,52.7273607],"163":[-1.7277798,52.7273608],"164":[-1.727791,52.7273608],"165":[-1.7278022,52.7273609],"166":[-1.7278135,52.7273609],"167":[-1.7279284,52.727362],"168":[-1.727939,52.727362],"169":[-1.7279496,52.7273621],"170":[-1.7279602,52.7273622],"171":[-1.7279708,52.7273622],"172":[-1.7279814,52.7273623],"173":[-1.727992,52.7273624],"174":[-1.7280026,52.7273624],"175":[-1.7280132,52.7273625],"176":[-1.7280238,52.7273626],"177":[-1.7280344,52.7273626],"178":[-1.728045,52.7273627],"179":[-1.7280556,52.7273628],"180":[-1.7280662,52.7273628],"181":[-1.7280768,52.7273629],"182":[-1.7280874,52.727363],"183":[-1.7281108,52.7273399],"184":[-1.7280996,52.72734],"185":[-1.7280884,52.7273401],"186":[-1.7280772,52.7273402],"187":[-1.728066,52.7273403],"188":[-1.7280548,52.7273404],"189":[-1.7280436,52.7273405],"190":[-1.7280324,52.7273406],"191":[-1.7280212,52.7273406],"192":[-1.7280101,52.7273407],"193":[-1.7279989,52.7273408],"194":[-1.7279877,52.7273409],"195":[-1.7279765,52.727341],"196":[-1.7279653,52.7273411],"197":[-1.7279541,52.7273412],"198":[-1.7279429,52.7273413],"199":[-1.7279317,52.7273414],"200":[-1.7279205,52.7273415],"201":[-1.7279093,52.7273416],"202":[-1.7278981,52.7273417],"203":[-1.7278869,52.7273418],"204":[-1.7278757,52.7273419],"205":[-1.7278757,52.7273419],"207":[-1.7278638,52.7273406],"208":[-1.727849,52.7273406],"209":[-1.7278342,52.7273406],"210":[-1.7278195,52.7273407],"211":[-1.7278047,52.7273407],"212":[-1.7277899,52.7273407],"213":[-1.7277751,52.7273407],"214":[-1.7277604,52.7273408],"215":[-1.7277456,52.7273408],"216":[-1.7277308,52.7273408],"217":[-1.727716,52.7273408],"218":[-1.7277013,52.7273408],"219":[-1.7276865,52.7273409],"220":[-1.7276717,52.7273409],"221":[-1.7276569,52.7273409],"222":[-1.7276422,52.7273409],"224":[-1.727583,52.7273909],"225":[-1.7275887,52.7273838],"226":[-1.7275946,52.7273768],"227":[-1.7276006,52.72737],"228":[-1.7276068,52.7273633],"229":[-1.7276131,52.7273568],"230":[-1.7276196,52.7273504]};
+
+  function find(ranges, panel) {
+    let lo = 0;
+    let hi = ranges.length - 1;
+    while (lo <= hi) {
+      const mid = (lo + hi) >> 1;
+      if (panel < ranges[mid][0]) {
+        hi = mid - 1;
+      } else if (panel > ranges[mid][1]) {
+        lo = mid + 1;
+      } else {
+        return ranges[mid];
+      }
+    }
+    return null;
+  }
+
+  // Returns { wall, pinFile, pinIndex, pin, what3words } or null for unknown panels
+  // (pin is [lng, lat], or null if the wall file has no pin for the panel)
+  function lookup(panel) {
+    const number = parseInt(panel, 10);
+    if (Number.isNaN(number)) {
+      return null;
+    }
+    const wall = find(WALLS, number);
+    if (!wall) {
+      return null;
+    }
+    const w3w = find(W3W, number);
+    return {
+      wall: wall[2],
+      pinFile: wall[3],
+      pinIndex: number - wall[0],
+      pin: PINS[number] || null,
+      what3words: w3w ? w3w[2] : null
+    };
+  }
+
+  window.AFMPanels = { WALLS, W3W, PINS, lookup };
+})();
@@ -16,6 +16,8 @@ class ARMemorialView {
     this.userHeading = 0;
     this.userPitch = 0; // Device tilt (up/down)
     this.memorials = [];
+    this.memorialsByIndex = []; // memorials.json position -> memorial, or null without coordinates
+    this.memorialGrid = null; // Spatial grid cells (js/memorial-grid.js)
     this.canvas = null;
     this.ctx = null;
     this.video = null;
@@ -30,6 +32,8 @@ class ARMemorialView {
     // Memorial AR specific
     this.memorialElements = new Map(); // Track image elements for each memorial
     this.preloadedImages = new Map(); // Preloaded images
+    this.imageVariants = null; // Responsive variant index (js/image-variants.js)
+    this.imageIndex = null; // Exact photo URLs (js/image-index.js)
     
     // Smoothing for GPS and heading
     this.locationHistory = [];
@@ -288,15 +292,12 @@ class ARMemorialView {
         throw new Error('Invalid memorials data format');
       }
       
-      // Filter memorials that have valid coordinates
-      this.memorials = data.filter(memorial => {
-        const lat = parseFloat(memorial.lat || memorial.location?.lat);
-        const lng = parseFloat(memorial.lng || memorial.location?.lng);
-        return !isNaN(lat) && !isNaN(lng);
-      }).map(memorial => {
+      // Keep memorials that have valid coordinates, by their position in the file
+      this.memorialsByIndex = data.map(memorial => {
         // Normalize the data structure
         const lat = parseFloat(memorial.lat || memorial.location?.lat);
         const lng = parseFloat(memorial.lng || memorial.location?.lng);
+        if (isNaN(lat) || isNaN(lng)) return null;
         return {
           name: memorial.name,
           zone: memorial.zone,
@@ -305,9 +306,13 @@ class ARMemorialView {
           description: memorial.description
         };
       });
+      this.memorials = this.memorialsByIndex.filter(Boolean);
       
       console.log(`Loaded ${this.memorials.length} memorials with valid coordinates`);
       
+      // Grid cells let each location update measure only nearby memorials
+      this.memorialGrid = window.MemorialGrid ? await window.MemorialGrid.load(data) : null;
+      
       // Preload images for memorials
       await this.preloadMemorialImages();
       
@@ -317,15 +322,34 @@ class ARMemorialView {
     }
   }
   
+  // Smallest responsive variant at least cssWidth wide, else the original photo
+  memorialImagePath(memorial, cssWidth) {
+    const record = window.ImageIndex
+      ? window.ImageIndex.lookup(this.imageIndex, memorial.zone, memorial.name)
+      : null;
+    const variant = window.ImageVariants
+      ? window.ImageVariants.pick(this.imageVariants, memorial.zone, memorial.name, cssWidth, record && record.file)
+      : null;
+    if (variant) return variant;
+    if (record) return '../' + record.url;
+    return `../img/zone${memorial.zone}/${memorial.name}.jpeg`;
+  }
+
   async preloadMemorialImages() {
     console.log('Preloading memorial images...');
     let loaded = 0;
     let failed = 0;
     
+    // Overlays are at most baseImageSize wide, so thumbnails are enough here
+    [this.imageVariants, this.imageIndex] = await Promise.all([
+      window.ImageVariants ? window.ImageVariants.load() : null,
+      window.ImageIndex ? window.ImageIndex.load() : null
+    ]);
+    
     const promises = this.memorials.map(memorial => {
       return new Promise((resolve) => {
         const img = new Image();
-        const imagePath = `../img/zone${memorial.zone}/${memorial.name}.jpeg`;
+        const imagePath = this.memorialImagePath(memorial, this.baseImageSize);
         
         img.onload = () => {
           this.preloadedImages.set(memorial.name, img);
@@ -724,7 +748,13 @@ class ARMemorialView {
     // Use larger distance when searching for a specific memorial
     const effectiveMaxDistance = this.searchActive ? this.searchMaxDistance : this.maxDistance;
     
-    this.memorials.forEach(memorial => {
+    // Memorials in the grid cells within range (every memorial without a grid)
+    const candidates = this.memorialGrid
+      ? window.MemorialGrid.candidates(this.memorialGrid, this.userLat, this.userLon, effectiveMaxDistance)
+          .map(i => this.memorialsByIndex[i]).filter(Boolean)
+      : this.memorials;
+    
+    candidates.forEach(memorial => {
       // Apply search filter if active
       if (this.searchActive && this.searchQuery) {
         if (!memorial.name.toLowerCase().includes(this.searchQuery.toLowerCase())) {
@@ -779,7 +809,7 @@ class ARMemorialView {
     const showPopup = (e) => {
       e.preventDefault();
       e.stopPropagation();
-      this.showMemorialPopup(memorial, distance, img.src);
+      this.showMemorialPopup(memorial, distance, this.memorialImagePath(memorial, window.innerWidth));
     };
     
     // Create or update image element
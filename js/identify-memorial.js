@@ -18,9 +18,15 @@
   const dataPath = location.pathname.includes('/pages/')
     ? '../data/memorials.json'
     : 'data/memorials.json';
+  // Precomputed photo hashes (Scrips/image_hashes.py)
+  const hashesPath = location.pathname.includes('/pages/')
+    ? '../data/image-hashes.json'
+    : 'data/image-hashes.json';
+  const HASH_ALGORITHMS = ['ahash', 'dhash', 'phash'];
 
   let stream = null;
   let memorials = null;
+  let hashIndexPromise = null;
   let isSearching = false;
   let cancelSearch = false;
 
@@ -142,8 +148,16 @@
     });
   }
 
+  // Exact photo URL from the image manifest; guess extensions only without one
+  async function memorialImagePaths(memorial) {
+    const index = window.ImageIndex ? await window.ImageIndex.load() : null;
+    if (!index) return candidatePaths(memorial);
+    const path = window.ImageIndex.path(index, memorial.zone, memorial.name);
+    return path ? [path] : [];
+  }
+
   async function loadMemorialImage(memorial) {
-    const paths = candidatePaths(memorial);
+    const paths = await memorialImagePaths(memorial);
     for (const path of paths) {
       try {
         const img = await loadImage(path);
@@ -189,6 +203,150 @@
     return computeAHashFromCanvas(temp);
   }
 
+  // Grey thumbnail (0.299/0.587/0.114 luma) as a Float64Array, row-major.
+  // Large sources are halved step by step first so the final draw averages
+  // over the whole area, like the box filter used when building the index.
+  function greyThumbnail(source, width, height) {
+    let current = source;
+    let w = source.width;
+    let h = source.height;
+    while (w >= width * 4 && h >= height * 4) {
+      const half = document.createElement('canvas');
+      half.width = Math.round(w / 2);
+      half.height = Math.round(h / 2);
+      const hctx = half.getContext('2d');
+      hctx.imageSmoothingQuality = 'high';
+      hctx.drawImage(current, 0, 0, half.width, half.height);
+      current = half;
+      w = half.width;
+      h = half.height;
+    }
+    const temp = document.createElement('canvas');
+    temp.width = width;
+    temp.height = height;
+    const tctx = temp.getContext('2d', { willReadFrequently: true });
+    tctx.imageSmoothingQuality = 'high';
+    tctx.drawImage(current, 0, 0, width, height);
+    const data = tctx.getImageData(0, 0, width, height).data;
+    const grey = new Float64Array(width * height);
+    for (let i = 0; i < data.length; i += 4) {
+      grey[i / 4] = data[i] * 0.299 + data[i + 1] * 0.587 + data[i + 2] * 0.114;
+    }
+    return grey;
+  }
+
+  // 64 booleans, first in the most significant bit -> [high 32 bits, low 32 bits]
+  function packBits(bits) {
+    let hi = 0;
+    let lo = 0;
+    for (let i = 0; i < 32; i++) {
+      hi = (hi << 1) | (bits[i] ? 1 : 0);
+      lo = (lo << 1) | (bits[i + 32] ? 1 : 0);
+    }
+    return [hi >>> 0, lo >>> 0];
+  }
+
+  let dctMatrix = null;
+  function lowFrequencyDct(pixels, n, keep) {
+    if (!dctMatrix) {
+      dctMatrix = [];
+      for (let k = 0; k < keep; k++) {
+        const row = new Float64Array(n);
+        const scale = Math.sqrt(2 / n) / (k === 0 ? Math.SQRT2 : 1);
+        for (let i = 0; i < n; i++) {
+          row[i] = Math.cos(Math.PI * (2 * i + 1) * k / (2 * n)) * scale;
+        }
+        dctMatrix.push(row);
+      }
+    }
+    // rows[k][x] = sum_y D[k][y] * pixels[y][x]
+    const rows = dctMatrix.map(d => {
+      const out = new Float64Array(n);
+      for (let y = 0; y < n; y++) {
+        for (let x = 0; x < n; x++) out[x] += d[y] * pixels[y * n + x];
+      }
+      return out;
+    });
+    const coeffs = [];
+    for (let k = 0; k < keep; k++) {
+      for (let l = 0; l < keep; l++) {
+        let sum = 0;
+        for (let x = 0; x < n; x++) sum += rows[k][x] * dctMatrix[l][x];
+        coeffs.push(sum);
+      }
+    }
+    return coeffs;
+  }
+
+  // aHash, dHash and pHash of a canvas, computed as in Scrips/image_hashes.py
+  function computeHashes(canvas) {
+    const a = greyThumbnail(canvas, 8, 8);
+    const mean = a.reduce((sum, v) => sum + v, 0) / a.length;
+
+    const d = greyThumbnail(canvas, 9, 8);
+    const dBits = [];
+    for (let y = 0; y < 8; y++) {
+      for (let x = 0; x < 8; x++) dBits.push(d[y * 9 + x] > d[y * 9 + x + 1]);
+    }
+
+    const coeffs = lowFrequencyDct(greyThumbnail(canvas, 32, 32), 32, 8);
+    const sorted = coeffs.slice().sort((x, y) => x - y);
+    const median = (sorted[31] + sorted[32]) / 2;
+
+    return {
+      ahash: packBits(Array.from(a, v => v >= mean)),
+      dhash: packBits(dBits),
+      phash: packBits(coeffs.map(v => v > median))
+    };
+  }
+
+  function popcount32(v) {
+    v = v - ((v >>> 1) & 0x55555555);
+    v = (v & 0x33333333) + ((v >>> 2) & 0x33333333);
+    return (((v + (v >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+  }
+
+  function hamming64(a, b) {
+    return popcount32((a[0] ^ b[0]) >>> 0) + popcount32((a[1] ^ b[1]) >>> 0);
+  }
+
+  // Load the hash index once; resolves to [{ name, ahash, dhash, phash }] or null
+  function loadHashIndex() {
+    if (!hashIndexPromise) {
+      hashIndexPromise = fetch(hashesPath)
+        .then(res => (res.ok ? res.json() : null))
+        .then(data => {
+          if (!data || !Array.isArray(data.images)) return null;
+          return data.images.map(entry => {
+            const item = { name: entry.key.slice(entry.key.indexOf('/') + 1) };
+            HASH_ALGORITHMS.forEach(alg => {
+              item[alg] = [parseInt(entry[alg].slice(0, 8), 16), parseInt(entry[alg].slice(8), 16)];
+            });
+            return item;
+          });
+        })
+        .catch(() => null);
+    }
+    return hashIndexPromise;
+  }
+
+  // Best three memorials by the summed aHash + dHash + pHash distance
+  function matchHashes(target, index) {
+    const maxDist = 64 * HASH_ALGORITHMS.length;
+    const best = [];
+    for (const item of index) {
+      let dist = 0;
+      for (const alg of HASH_ALGORITHMS) dist += hamming64(target[alg], item[alg]);
+      if (best.length < 3 || dist < best[best.length - 1].dist) {
+        const score = Math.max(0, Math.min(100, Math.round((1 - dist / maxDist) * 100)));
+        best.push({ name: item.name, score, dist });
+        best.sort((a, b) => a.dist - b.dist);
+        if (best.length > 3) best.length = 3;
+      }
+    }
+    return best;
+  }
+
   function hammingDistance(a, b) {
     if (!a || !b || a.length !== b.length) return Number.POSITIVE_INFINITY;
     let dist = 0;
@@ -250,6 +408,16 @@
     setProgress('Loading memorial list...');
 
     try {
+      const hashIndex = await loadHashIndex();
+      if (hashIndex) {
+        const best = matchHashes(computeHashes(snapshot), hashIndex);
+        setProgress('');
+        setStatus('Scan complete. Review the suggestions below.', 'success');
+        updateMatches(best.map(({ name, score }) => ({ name, score })));
+        return;
+      }
+
+      // No hash index: download and hash every memorial photo
       const targetHash = computeAHashFromCanvas(snapshot);
       const items = await loadMemorials();
       const total = items.length;
@@ -0,0 +1,39 @@
+/**
+ * Memorial photo index
+ * Maps a memorial's zone and name to its exact photo URL using
+ * data/image-manifest.json (written by Scrips/image_index.py), so pages
+ * request each photo once instead of trying every extension in turn.
+ * URLs in the manifest are already percent-encoded; do not encode them again.
+ * load() resolves to null when the manifest is unavailable and path() returns
+ * null for unknown memorials, so callers can fall back to guessing.
+ */
+
+(function () {
+  const MANIFEST_URL = '../data/image-manifest.json';
+  let manifestPromise = null;
+
+  // Load the manifest once; resolves to the images object or null
+  function load() {
+    if (!manifestPromise) {
+      manifestPromise = fetch(MANIFEST_URL)
+        .then(response => (response.ok ? response.json() : null))
+        .then(manifest => (manifest && manifest.images ? manifest.images : null))
+        .catch(() => null);
+    }
+    return manifestPromise;
+  }
+
+  // Manifest record { file, url } for a memorial, or null
+  function lookup(index, zone, name) {
+    if (!index || !zone || !name) return null;
+    return index[`${zone}/${name}`] || null;
+  }
+
+  // Page-relative photo URL for a memorial, or null
+  function path(index, zone, name) {
+    const record = lookup(index, zone, name);
+    return record ? '../' + record.url : null;
+  }
+
+  window.ImageIndex = { load, lookup, path };
+})();
@@ -0,0 +1,58 @@
+/**
+ * Responsive image variants
+ * Picks the smallest pre-generated photo variant (data/image-derivatives.json,
+ * written by Scrips/image_derivatives.py) that is at least as wide as needed.
+ * Falls back to null when the manifest or the image is missing, so callers
+ * can keep using the original photo path.
+ */
+
+(function () {
+  const MANIFEST_URL = '../data/image-derivatives.json';
+  let manifestPromise = null;
+
+  const supportsWebP = (() => {
+    try {
+      return document.createElement('canvas').toDataURL('image/webp').indexOf('data:image/webp') === 0;
+    } catch (e) {
+      return false;
+    }
+  })();
+
+  // Load the manifest once and index it by "zone<N>/<name without extension>"
+  function load() {
+    if (!manifestPromise) {
+      manifestPromise = fetch(MANIFEST_URL)
+        .then(response => (response.ok ? response.json() : null))
+        .then(manifest => {
+          if (!manifest || !manifest.images) return null;
+          const byName = new Map();
+          Object.entries(manifest.images).forEach(([key, record]) => {
+            byName.set(key.replace(/\.[^./]+$/, ''), record.variants);
+          });
+          return byName;
+        })
+        .catch(() => null);
+    }
+    return manifestPromise;
+  }
+
+  // cssWidth is the displayed width in CSS pixels; device pixel ratio is applied here.
+  // file is the photo's "zone<N>/<file name>" from the image manifest (js/image-index.js),
+  // needed when the file name differs from the memorial name in case or normalisation.
+  function pick(index, zone, name, cssWidth, file) {
+    if (!index) return null;
+    const variants = index.get(file ? file.replace(/\.[^./]+$/, '') : `zone${zone}/${name}`);
+    if (!variants || variants.length === 0) return null;
+
+    const format = supportsWebP ? 'webp' : 'jpg';
+    const candidates = variants.filter(v => v.format === format);
+    if (candidates.length === 0) return null;
+
+    const needed = cssWidth * (window.devicePixelRatio || 1);
+    // Variants are sorted by width; take the first wide enough, else the largest
+    const chosen = candidates.find(v => v.width >= needed) || candidates[candidates.length - 1];
+    return '../' + chosen.url + '?v=' + chosen.hash;
+  }
+
+  window.ImageVariants = { load, pick };
+})();
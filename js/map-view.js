@@ -1,6 +1,8 @@
 (function(){
   const dataPath = '../data/memorials.json';
-  const footpathsPath = '../data/footpaths.geojson';
+  const footpathsPath = '../data/min/footpaths.geojson';
+  const footpathGraphPath = '../data/footpath-graph.json'; // compiled by Scrips/footpath_graph.py
+  const footpathRoutesPath = '../data/footpath-routes.json'; // precomputed by Scrips/footpath_routes.py
   // --- DEBUG FLAG ---
   const DEBUG_ROUTING = false;
   // Show individual footpath node (blue) debug markers?
@@ -89,6 +91,8 @@
 
   let footpathsLayer = null; // ADDED
   let footpathGraph = { nodes: [], adj: new Map() }; // ADDED
+  let memorialSnaps = null; // Precompiled [a, b, t, metres] per memorials.json record
+  let footpathRoutes = null; // Shortest-path trees from the entrances, matching the compiled graph
   let routeLayer = null; // ADDED
   let lastRouteDistance = 0; // ADDED
 
@@ -472,8 +476,60 @@
     let t; return (...a)=>{ clearTimeout(t); t=setTimeout(()=>fn(...a), ms); };
   }
 
-  // ADDED: load + add footpaths layer
+  // Use the compiled graph when available; rebuild from the GeoJSON otherwise
   function loadFootpaths(){
+    fetch(footpathGraphPath)
+      .then(r=> r.ok ? r.json() : null)
+      .catch(()=> null)
+      .then(graph=>{
+        if (graph && Array.isArray(graph.offsets)){
+          useCompiledGraph(graph);
+          loadFootpathRoutes(graph);
+        } else {
+          loadFootpathsGeoJSON();
+        }
+      });
+  }
+
+  // Precomputed routes are only usable with the graph and memorials they were built from
+  function loadFootpathRoutes(graph){
+    fetch(footpathRoutesPath)
+      .then(r=> r.ok ? r.json() : null)
+      .catch(()=> null)
+      .then(routes=>{
+        if (!routes || !routes.entrances || !memorialSnaps) return;
+        const entrance = routes.entrances[0];
+        if (!entrance || entrance.parent.length !== graph.nodes.length) return;
+        const info = routes.memorials;
+        if (info.count !== all.length || info.fingerprint !== graph.memorials.fingerprint) return;
+        footpathRoutes = routes;
+        dbg('Precomputed routes from', entrance.name);
+      });
+  }
+
+  // Adjacency from the compiled CSR arrays (nodes, offsets, targets, weights)
+  function useCompiledGraph(graph){
+    const bridges = new Set((graph.bridges || []).map(([a,b])=> a+','+b));
+    footpathGraph = { nodes: [], adj: new Map() };
+    graph.nodes.forEach(([lat,lng], id)=>{
+      footpathGraph.nodes.push({id,lat,lng});
+      const edges = [];
+      for (let k = graph.offsets[id]; k < graph.offsets[id+1]; k++){
+        const to = graph.targets[k];
+        edges.push({to, w:graph.weights[k], bridge:bridges.has(Math.min(id,to)+','+Math.max(id,to)), second:false});
+      }
+      footpathGraph.adj.set(id, edges);
+    });
+    // Snaps are by position in memorials.json, and only valid for the positions they were made from
+    const memorialsInfo = graph.memorials || {};
+    const current = memorialsInfo.count === all.length && window.MemorialPositions &&
+      memorialsInfo.fingerprint === window.MemorialPositions.fingerprint(all);
+    memorialSnaps = current ? memorialsInfo.snaps : null;
+    dbg('Compiled graph: nodes', footpathGraph.nodes.length, 'snaps', memorialSnaps ? 'yes' : 'stale');
+  }
+
+  // ADDED: load + add footpaths layer
+  function loadFootpathsGeoJSON(){
     fetch(footpathsPath)
       .then(r=>{ if(!r.ok) throw new Error('Footpaths load failed '+r.status); return r.json(); })
       .then(gj=>{
@@ -663,8 +719,30 @@
       return vId;
     }
 
+    const precomputed = precomputedRoute(memorial, START_POINT);
+    if (precomputed){
+      dbg('Using precomputed route from', footpathRoutes.entrances[0].name);
+      drawRoute(precomputed, START_POINT, targetLatLng, memorial.name);
+      return;
+    }
+
+    // Precompiled snap of the memorial onto its nearest path, if the graph has one
+    function compiledSnap(){
+      const snap = memorialSnaps && memorialSnaps[all.indexOf(memorial)];
+      if (!snap) return null;
+      const [a, b, t, offset] = snap;
+      if (t <= 0 || t >= 1) return {type:'node', nodeId: t <= 0 ? a : b, distMeters:offset};
+      const A = footpathGraph.nodes[a], B = footpathGraph.nodes[b];
+      const len = haversineMeters([A.lat,A.lng],[B.lat,B.lng]);
+      return {
+        type:'segment', a, b,
+        projLat: A.lat + t*(B.lat-A.lat), projLng: A.lng + t*(B.lng-A.lng),
+        distMeters: offset, aDist: t*len, bDist: (1-t)*len
+      };
+    }
+
     const startSnap = snapPoint(START_POINT[0], START_POINT[1],'start');
-    const targetSnap = snapPoint(targetLatLng[0], targetLatLng[1],'target');
+    const targetSnap = compiledSnap() || snapPoint(targetLatLng[0], targetLatLng[1],'target');
     const startId = integrateSnap(startSnap,'start');
     const targetId = integrateSnap(targetSnap,'target');
 
@@ -704,6 +782,31 @@
       coords = simplified;
     }
 
+    drawRoute(coords, START_POINT, targetLatLng, memorial.name);
+  }
+
+  // Route from the entrance along its precomputed shortest-path tree, when no
+  // location fix moved the start away from the entrance the tree was built for
+  function precomputedRoute(memorial, startPoint){
+    if (!footpathRoutes || userMarker) return null;
+    const entrance = footpathRoutes.entrances[0];
+    if (haversineMeters(entrance.position, startPoint) > 1) return null;
+    const index = all.indexOf(memorial);
+    const reach = footpathRoutes.memorials.routes[index];
+    const snap = memorialSnaps[index];
+    if (!reach || !reach[0] || !snap) return null;
+    const nodeIds = [];
+    for (let node = reach[0][1]; node !== -1; node = entrance.parent[node]) nodeIds.push(node);
+    const coords = nodeIds.reverse().map(id=> [footpathGraph.nodes[id].lat, footpathGraph.nodes[id].lng]);
+    // Along the memorial's path to the point opposite it
+    const [a, b, t] = snap;
+    const A = footpathGraph.nodes[a], B = footpathGraph.nodes[b];
+    coords.push([A.lat + t*(B.lat-A.lat), A.lng + t*(B.lng-A.lng)]);
+    return coords;
+  }
+
+  // Draw a footpath route with dashed hops from the start and to the target
+  function drawRoute(coords, START_POINT, targetLatLng, targetName){
     // Start hop line if needed
     const distStartHop = haversineMeters(coords[0], START_POINT);
     if (distStartHop > 1.5){
@@ -740,7 +843,7 @@
 
     // Compute stats & show
     const distMeters = computeLineDistance(coords);
-    updateRouteInfo(distMeters, START_POINT, memorial.name);
+    updateRouteInfo(distMeters, START_POINT, targetName);
   }
 
   function drawDirectFallback(a,b,reason){
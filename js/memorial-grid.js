@@ -0,0 +1,55 @@
+/**
+ * Memorial spatial grid
+ * Answers "which memorials are near me" from data/memorial-grid.json
+ * (written by Scrips/spatial_index.py) by reading the few grid cells a
+ * search radius covers, instead of measuring the distance to every memorial.
+ * Cells hold positions in memorials.json; callers still measure the exact
+ * distance to each candidate from its own record.
+ * load() resolves to null when the grid is unavailable or was built from a
+ * different memorials.json (record count or position fingerprint, see
+ * js/memorial-positions.js), so callers can fall back to a full scan.
+ */
+
+(function () {
+  const GRID_URL = '../data/memorial-grid.json';
+  let gridPromise = null;
+
+  // Load the grid once; resolves to the grid, or null if it is missing or stale for memorials
+  function load(memorials) {
+    if (!gridPromise) {
+      gridPromise = fetch(GRID_URL)
+        .then(response => (response.ok ? response.json() : null))
+        .then(grid => (grid && grid.cells && grid.origin ? grid : null))
+        .catch(() => null);
+    }
+    return gridPromise.then(grid => {
+      if (!grid || !window.MemorialPositions || grid.count !== memorials.length) return null;
+      return grid.fingerprint === window.MemorialPositions.fingerprint(memorials) ? grid : null;
+    });
+  }
+
+  // Indexes of memorials in the cells within radius metres of a position
+  function candidates(grid, lat, lng, radius) {
+    const x = (lng - grid.origin[1]) * grid.scale[1];
+    const y = (lat - grid.origin[0]) * grid.scale[0];
+    const cx0 = Math.floor((x - radius) / grid.cell);
+    const cx1 = Math.floor((x + radius) / grid.cell);
+    const cy0 = Math.floor((y - radius) / grid.cell);
+    const cy1 = Math.floor((y + radius) / grid.cell);
+    const found = [];
+    for (let cx = cx0; cx <= cx1; cx++) {
+      for (let cy = cy0; cy <= cy1; cy++) {
+        const cell = grid.cells[`${cx},${cy}`];
+        if (cell) found.push(...cell);
+      }
+    }
+    return found;
+  }
+
+  // Precomputed [[index, metres], ...] nearest other memorials of memorial i
+  function neighbours(grid, index) {
+    return (grid && grid.neighbours && grid.neighbours[index]) || [];
+  }
+
+  window.MemorialGrid = { load, candidates, neighbours };
+})();
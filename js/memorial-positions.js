@@ -0,0 +1,42 @@
+/**
+ * Memorial positions
+ * Reads a memorial's coordinates the way Scrips/spatial_index.py does
+ * (top-level lat/lng, else location.lat/lng, numeric strings accepted), and
+ * fingerprints the positions of a whole memorials.json. Files built from
+ * memorials.json (memorial-grid.json, footpath-graph.json,
+ * footpath-routes.json) store the fingerprint they were built from; when it
+ * differs a coordinate was edited since, and the file must not be used.
+ */
+
+(function () {
+  function coordinate(value) {
+    if (value === undefined || value === null || typeof value === 'boolean') return null;
+    if (typeof value === 'string' && !value.trim()) return null;
+    const number = Number(value);
+    return Number.isFinite(number) ? number : null;
+  }
+
+  // [lat, lng] of a memorial record, or null (memorial_position in spatial_index.py)
+  function position(memorial) {
+    if (!memorial) return null;
+    const location = memorial.location || {};
+    const lat = coordinate(memorial.lat || location.lat);
+    const lng = coordinate(memorial.lng || location.lng);
+    return lat === null || lng === null ? null : [lat, lng];
+  }
+
+  // FNV-1a of the positions rounded to 6 places (positions_fingerprint in spatial_index.py)
+  function fingerprint(memorials) {
+    const text = memorials.map(m => {
+      const p = position(m);
+      return p ? `${p[0].toFixed(6)},${p[1].toFixed(6)}` : '';
+    }).join(';');
+    let value = 0x811c9dc5;
+    for (let i = 0; i < text.length; i++) {
+      value = Math.imul(value ^ text.charCodeAt(i), 0x01000193) >>> 0;
+    }
+    return value.toString(16).padStart(8, '0');
+  }
+
+  window.MemorialPositions = { position, fingerprint };
+})();
@@ -46,12 +46,15 @@
     ? '../data/memorials.json'
     : 'data/memorials.json';
 
+  // Photo manifest (js/image-index.js), fetched alongside the memorial data
+  const imageIndexPromise = window.ImageIndex ? window.ImageIndex.load() : Promise.resolve(null);
+
   fetch(dataPath)
     .then(r => {
       if (!r.ok) throw new Error('HTTP ' + r.status);
-      return r.json();
+      return Promise.all([r.json(), imageIndexPromise]);
     })
-    .then(all => {
+    .then(([all, imageIndex]) => {
       const item = (Array.isArray(all) ? all : []).find(m => m && m.name === name);
       if (!item) {
         root.innerHTML = '<p>Memorial not found.</p>';
@@ -74,8 +77,11 @@
       // Build image path (prefer item.photo, else fallback)
       let imgPath = item.photo;
       let triedExtensions = [];
-      if (!imgPath && item.zone && item.name) {
-        // Try .JPEG, .jpeg, .jpg in order
+      if (!imgPath && imageIndex) {
+        // Exact file from the manifest; no photo if the memorial is not listed
+        imgPath = window.ImageIndex.path(imageIndex, item.zone, item.name);
+      } else if (!imgPath && item.zone && item.name) {
+        // No manifest: try .JPEG, .jpeg, .jpg in order
         const basePath = `../img/zone${item.zone}/`;
         const baseName = item.name;
         triedExtensions = [
@@ -39,17 +39,25 @@
     ? '../data/memorials.json'
     : 'data/memorials.json';
 
+  const NEARBY_RADIUS = 50; // meters
+
   let memorials = [];
+  let byIndex = []; // memorials.json position -> record with coordinates, or null
+  let grid = null;  // js/memorial-grid.js cells, when available
 
   function loadData() {
     return fetch(dataPath)
       .then(r => { if (!r.ok) throw new Error(r.status); return r.json(); })
       .then(data => {
-        memorials = (Array.isArray(data) ? data : []).filter(m =>
+        const list = Array.isArray(data) ? data : [];
+        byIndex = list.map(m => (
           m && m.name && m.location &&
           Number.isFinite(m.location.lat) && Number.isFinite(m.location.lng)
-        );
-      });
+        ) ? m : null);
+        memorials = byIndex.filter(Boolean);
+        return window.MemorialGrid ? window.MemorialGrid.load(list) : null;
+      })
+      .then(g => { grid = g; });
   }
 
   function haversine(lat1, lon1, lat2, lon2) {
@@ -69,19 +77,22 @@
   }
 
   function render(userLat, userLng) {
-    const withDist = memorials.map(m => ({
-      ...m,
-      _distance: haversine(userLat, userLng, m.location.lat, m.location.lng)
-    })).sort((a,b) => a._distance - b._distance);
-
     listEl.innerHTML = '';
-    if (!withDist.length) {
+    if (!memorials.length) {
       listEl.innerHTML = '<li class="empty">No memorials with coordinates.</li>';
       return;
     }
 
+    // Only measure memorials in the grid cells around the user (all of them without a grid)
+    const candidates = grid
+      ? window.MemorialGrid.candidates(grid, userLat, userLng, NEARBY_RADIUS).map(i => byIndex[i]).filter(Boolean)
+      : memorials;
+
     // Filter to only show memorials within 50 meters
-    const nearby = withDist.filter(m => m._distance <= 50);
+    const nearby = candidates.map(m => ({
+      ...m,
+      _distance: haversine(userLat, userLng, m.location.lat, m.location.lng)
+    })).filter(m => m._distance <= NEARBY_RADIUS).sort((a,b) => a._distance - b._distance);
     if (!nearby.length) {
       listEl.innerHTML = '<li class="empty" style="padding: 40px 20px; text-align: center;"><div style="font-size: 36px; margin-bottom: 10px;">📍</div><strong>No Memorials Within 50 Meters</strong><div style="margin-top: 8px; font-size: 14px; opacity: 0.7;">Visit the memorial site to see nearby memorials.</div></li>';
       return;
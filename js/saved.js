@@ -4,6 +4,8 @@
   const SAVED_KEY = 'savedMemorials';
   const listEl = document.getElementById('memorial-list');
   const searchEl = document.getElementById('search');
+  const planBtn = document.getElementById('plan-walk');
+  const planEl = document.getElementById('walk-plan');
 
   if (!listEl || !searchEl) {
     console.error('Required elements #memorial-list or #search missing on this page.');
@@ -17,6 +19,11 @@
 
   let all = [];
   let saved = new Set(loadSaved());
+  // Position of each memorial in memorials.json, as the walk planner indexes them
+  const indexByName = new Map();
+  let records = [];
+  // Names in walk order with the metres of the leg leading to each, while a plan is shown
+  let walk = null;
 
   function loadSaved() {
     try {
@@ -32,12 +39,18 @@
   function render(filter = '') {
     const q = filter.trim().toLowerCase();
     // Only show saved memorials
-    const items = all.filter(m => {
+    let items = all.filter(m => {
       if (!m || !m.name) return false;
       if (!saved.has(m.name)) return false;
       if (!q) return true;
       return m.name.toLowerCase().includes(q);
     });
+    if (walk) {
+      const position = new Map(walk.map((stop, i) => [stop.name, i]));
+      items = items
+        .filter(m => position.has(m.name))
+        .sort((a, b) => position.get(a.name) - position.get(b.name));
+    }
 
     listEl.innerHTML = '';
     if (!items.length) {
@@ -52,6 +65,14 @@
       a.className = 'mem-link';
       a.href = `memorial.html?name=${encodeURIComponent(m.name)}&from=saved`;
       a.textContent = m.name;
+      if (walk) {
+        const stop = walk.find(s => s.name === m.name);
+        const leg = document.createElement('span');
+        leg.className = 'walk-leg';
+        leg.textContent = `${Math.round(stop.metres)} m`;
+        a.prepend(`${walk.indexOf(stop) + 1}. `);
+        a.appendChild(leg);
+      }
       const btn = document.createElement('button');
       btn.className = 'save-btn saved'; // Always saved in this view
       btn.type = 'button';
@@ -73,6 +94,7 @@
 
     saved.delete(name);
     saveSaved();
+    if (walk) clearWalk();
     
     // Remove the item from view immediately
     const li = btn.closest('li');
@@ -84,6 +106,59 @@
     }
   });
 
+  function formatMinutes(seconds) {
+    const minutes = Math.max(1, Math.round(seconds / 60));
+    return minutes < 60 ? `${minutes} min` : `${Math.floor(minutes / 60)} h ${minutes % 60} min`;
+  }
+
+  function clearWalk() {
+    walk = null;
+    planEl.hidden = true;
+    planEl.textContent = '';
+    planBtn.textContent = 'Plan walk';
+  }
+
+  // Order the saved memorials into a walk from the entrance over the footpaths
+  function planWalk() {
+    const indexes = [...saved].filter(name => indexByName.has(name)).map(name => indexByName.get(name));
+    if (!indexes.length) return;
+    planBtn.disabled = true;
+    window.WalkPlanner.load(records).then(planner => {
+      planBtn.disabled = false;
+      if (!planner) {
+        planEl.hidden = false;
+        planEl.textContent = 'Walk planning is unavailable.';
+        return;
+      }
+      const result = window.WalkPlanner.plan(planner, indexes);
+      const names = new Map([...indexByName].map(([name, index]) => [index, name]));
+      walk = result.order.map((index, i) => ({ name: names.get(index), metres: result.legs[i] }));
+      const entrance = planner.routes.entrances[0].name;
+      let summary = `Walk from the ${entrance}: ${walk.length} stops, ` +
+        `${(result.metres / 1000).toFixed(1)} km, about ${formatMinutes(result.seconds)}.`;
+      if (result.skipped.length) {
+        summary += ` ${result.skipped.length} not on the footpaths: ` +
+          result.skipped.map(index => names.get(index)).join(', ') + '.';
+      }
+      planEl.hidden = false;
+      planEl.textContent = summary;
+      planBtn.textContent = 'Clear walk';
+      render(searchEl.value);
+    });
+  }
+
+  if (planBtn && planEl && window.WalkPlanner) {
+    planBtn.hidden = false;
+    planBtn.addEventListener('click', () => {
+      if (walk) {
+        clearWalk();
+        render(searchEl.value);
+      } else {
+        planWalk();
+      }
+    });
+  }
+
   // Live search
   let t;
   searchEl.addEventListener('input', () => {
@@ -98,7 +173,11 @@
       return r.json();
     })
     .then(data => {
-      all = (Array.isArray(data) ? data : []).filter(m => m && m.name);
+      records = Array.isArray(data) ? data : [];
+      records.forEach((m, i) => {
+        if (m && m.name && !indexByName.has(m.name)) indexByName.set(m.name, i);
+      });
+      all = records.filter(m => m && m.name);
       all.sort((a, b) => a.name.localeCompare(b.name));
       render('');
     })
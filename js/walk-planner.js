@@ -0,0 +1,210 @@
+/**
+ * Walk planner
+ * Orders a set of memorials into a short walk over the footpaths, starting
+ * at the site entrance. Uses the compiled graph (data/footpath-graph.json,
+ * Scrips/footpath_graph.py) and the entrance routes precomputed by
+ * Scrips/footpath_routes.py (data/footpath-routes.json); the ordering is the
+ * same as footpath_routes.plan_tour: nearest neighbour, then 2-opt and
+ * Or-opt moves until nothing improves or the time budget runs out.
+ * load() resolves to null when either file is missing or was built from
+ * other memorial positions (count or js/memorial-positions.js fingerprint),
+ * so callers can hide the feature.
+ */
+
+(function () {
+  const GRAPH_URL = '../data/footpath-graph.json';
+  const ROUTES_URL = '../data/footpath-routes.json';
+  const BUDGET_MS = 200;
+  let plannerPromise = null;
+
+  function fetchJson(url) {
+    return fetch(url).then(response => (response.ok ? response.json() : null)).catch(() => null);
+  }
+
+  // Load both files once; resolves to { graph, routes }, or null if missing or stale for memorials
+  function load(memorials) {
+    if (!plannerPromise) {
+      plannerPromise = Promise.all([fetchJson(GRAPH_URL), fetchJson(ROUTES_URL)])
+        .then(([graph, routes]) => (graph && routes && graph.offsets && routes.entrances ? { graph, routes } : null));
+    }
+    return plannerPromise.then(planner => {
+      if (!planner || !window.MemorialPositions) return null;
+      const built = planner.graph.memorials;
+      if (built.count !== memorials.length || planner.routes.memorials.fingerprint !== built.fingerprint) return null;
+      return built.fingerprint === window.MemorialPositions.fingerprint(memorials) ? planner : null;
+    });
+  }
+
+  function edgeLength(graph, a, b) {
+    for (let k = graph.offsets[a]; k < graph.offsets[a + 1]; k++) {
+      if (graph.targets[k] === b) return graph.weights[k];
+    }
+    return Infinity;
+  }
+
+  // Node -> metres from a memorial to the two ends of the path it snaps to
+  function memorialSeeds(graph, index) {
+    const snap = graph.memorials.snaps[index];
+    if (!snap) return null;
+    const [a, b, t, offset] = snap;
+    const length = edgeLength(graph, a, b);
+    return [[a, offset + t * length], [b, offset + (1 - t) * length]];
+  }
+
+  // Dijkstra over the CSR arrays with a binary heap
+  function shortestDistances(graph, seeds) {
+    const dist = new Float64Array(graph.nodes.length).fill(Infinity);
+    const heap = [];
+    const push = (d, node) => {
+      heap.push([d, node]);
+      let i = heap.length - 1;
+      while (i > 0) {
+        const up = (i - 1) >> 1;
+        if (heap[up][0] <= heap[i][0]) break;
+        [heap[up], heap[i]] = [heap[i], heap[up]];
+        i = up;
+      }
+    };
+    const pop = () => {
+      const top = heap[0];
+      const last = heap.pop();
+      if (heap.length) {
+        heap[0] = last;
+        let i = 0;
+        for (;;) {
+          const l = 2 * i + 1, r = l + 1;
+          let m = i;
+          if (l < heap.length && heap[l][0] < heap[m][0]) m = l;
+          if (r < heap.length && heap[r][0] < heap[m][0]) m = r;
+          if (m === i) break;
+          [heap[m], heap[i]] = [heap[i], heap[m]];
+          i = m;
+        }
+      }
+      return top;
+    };
+    for (const [node, d] of seeds) {
+      if (d < dist[node]) { dist[node] = d; push(d, node); }
+    }
+    while (heap.length) {
+      const [d, node] = pop();
+      if (d > dist[node]) continue;
+      for (let k = graph.offsets[node]; k < graph.offsets[node + 1]; k++) {
+        const other = graph.targets[k];
+        const nd = d + graph.weights[k];
+        if (nd < dist[other]) { dist[other] = nd; push(nd, other); }
+      }
+    }
+    return dist;
+  }
+
+  function reach(dist, seeds) {
+    let best = Infinity;
+    for (const [node, d] of seeds) best = Math.min(best, dist[node] + d);
+    return best;
+  }
+
+  function tourLength(matrix, order) {
+    let total = 0;
+    for (let i = 1; i < order.length; i++) total += matrix[order[i - 1]][order[i]];
+    return total;
+  }
+
+  // Open tour from point 0: nearest neighbour, then 2-opt and Or-opt until stable or out of time
+  function planOrder(matrix, deadline) {
+    const n = matrix.length;
+    let order = [0];
+    const left = new Set();
+    for (let j = 1; j < n; j++) left.add(j);
+    while (left.size) {
+      const last = order[order.length - 1];
+      let next = -1;
+      for (const j of left) if (next === -1 || matrix[last][j] < matrix[last][next]) next = j;
+      order.push(next);
+      left.delete(next);
+    }
+
+    const cost = (a, b) => matrix[a][b];
+    let improved = true;
+    while (improved && performance.now() < deadline) {
+      improved = false;
+      const lastIndex = order.length - 1;
+      for (let i = 1; i <= lastIndex; i++) {
+        for (let j = i + 1; j <= lastIndex; j++) {
+          const before = cost(order[i - 1], order[i]) + (j < lastIndex ? cost(order[j], order[j + 1]) : 0);
+          const after = cost(order[i - 1], order[j]) + (j < lastIndex ? cost(order[i], order[j + 1]) : 0);
+          if (after < before - 1e-9) {
+            order = order.slice(0, i).concat(order.slice(i, j + 1).reverse(), order.slice(j + 1));
+            improved = true;
+          }
+        }
+        if (performance.now() >= deadline) break;
+      }
+      for (const run of [1, 2, 3]) {
+        for (let i = 1; i + run <= lastIndex + 1 && performance.now() < deadline; i++) {
+          const segment = order.slice(i, i + run);
+          const rest = order.slice(0, i).concat(order.slice(i + run));
+          const afterSegment = i + run <= lastIndex ? order[i + run] : null;
+          let saved = cost(order[i - 1], segment[0]);
+          if (afterSegment !== null) {
+            saved += cost(segment[run - 1], afterSegment) - cost(order[i - 1], afterSegment);
+          }
+          let best = null;
+          for (let k = 1; k <= rest.length; k++) {
+            if (k === i) continue;
+            for (const piece of [segment, segment.slice().reverse()]) {
+              let added = cost(rest[k - 1], piece[0]);
+              if (k < rest.length) added += cost(piece[run - 1], rest[k]) - cost(rest[k - 1], rest[k]);
+              if (added < saved - 1e-9 && (!best || added < best.added)) best = { added, k, piece };
+            }
+          }
+          if (best) {
+            order = rest.slice(0, best.k).concat(best.piece, rest.slice(best.k));
+            improved = true;
+          }
+        }
+      }
+    }
+    return order;
+  }
+
+  /**
+   * Plan a walk from the first entrance past memorials.
+   * @param planner Result of load()
+   * @param indexes Memorial positions in memorials.json
+   * @returns { order, legs, metres, seconds, skipped }; skipped memorials have
+   *   no position or are on paths the entrance does not reach
+   */
+  function plan(planner, indexes, budgetMs = BUDGET_MS) {
+    const deadline = performance.now() + budgetMs;
+    const { graph, routes } = planner;
+    const stops = [];
+    const skipped = [];
+    for (const index of new Set(indexes)) {
+      const fromEntrance = routes.memorials.routes[index];
+      if (fromEntrance && fromEntrance[0] && memorialSeeds(graph, index)) stops.push(index);
+      else skipped.push(index);
+    }
+
+    // Row 0 is the entrance; its distances are precomputed
+    const matrix = [[0].concat(stops.map(i => routes.memorials.routes[i][0][0]))];
+    stops.forEach((index, row) => {
+      const dist = shortestDistances(graph, memorialSeeds(graph, index));
+      matrix.push([matrix[0][row + 1]].concat(stops.map(other => reach(dist, memorialSeeds(graph, other)))));
+    });
+
+    const order = planOrder(matrix, deadline);
+    const legs = [];
+    for (let i = 1; i < order.length; i++) legs.push(matrix[order[i - 1]][order[i]]);
+    const metres = tourLength(matrix, order);
+    return {
+      order: order.slice(1).map(k => stops[k - 1]),
+      legs,
+      metres,
+      seconds: metres / routes.speed,
+      skipped
+    };
+  }
+
+  window.WalkPlanner = { load, plan };
+})();